@@ -1,12 +1,52 @@
-from apps.api.agents.completion import CompletionClient, StubCompletionClient
+from apps.api.agents.completion import (
+    CompletionClient,
+    StreamingCompletionClient,
+    StubCompletionClient,
+)
+from apps.api.agents.completion_batching import (
+    BatchCompletionBackend,
+    BatchingCompletionClient,
+    CompletionBatchStats,
+    CompletionRequest,
+)
+from apps.api.agents.completion_cache import CachedCompletionClient, CompletionCacheStats
+from apps.api.agents.completion_http import (
+    CompletionCircuitOpenError,
+    CompletionError,
+    HttpCompletionClient,
+    HttpCompletionSettings,
+)
+from apps.api.agents.delegation import DelegationSettings
 from apps.api.agents.policy import ActorContext, PolicyEngine
-from apps.api.agents.runtime import AgentRuntime, SpecialistAgent
+from apps.api.agents.run_access import RunAccessCache, RunAccessCacheStats
+from apps.api.agents.runtime import (
+    AgentRuntime,
+    CompanionStageTimings,
+    PartialOutput,
+    SpecialistAgent,
+)
 
 __all__ = [
     "ActorContext",
     "AgentRuntime",
+    "BatchCompletionBackend",
+    "BatchingCompletionClient",
+    "CachedCompletionClient",
+    "CompanionStageTimings",
+    "CompletionBatchStats",
+    "CompletionCacheStats",
+    "CompletionCircuitOpenError",
     "CompletionClient",
+    "CompletionError",
+    "CompletionRequest",
+    "DelegationSettings",
+    "HttpCompletionClient",
+    "HttpCompletionSettings",
+    "PartialOutput",
     "PolicyEngine",
+    "RunAccessCache",
+    "RunAccessCacheStats",
     "SpecialistAgent",
+    "StreamingCompletionClient",
     "StubCompletionClient",
 ]
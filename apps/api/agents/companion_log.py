@@ -0,0 +1,38 @@
+import math
+import os
+from datetime import datetime, timezone
+
+from apps.api.events.outbox import CompanionSegment
+
+DEFAULT_COMPANION_SEGMENT_SECONDS = 86_400.0
+
+
+def resolve_companion_segment_seconds(segment_seconds: float | None = None) -> float:
+    if segment_seconds is not None:
+        return segment_seconds
+    return float(
+        os.getenv(
+            "ELARA_COMPANION_SEGMENT_SECONDS",
+            str(DEFAULT_COMPANION_SEGMENT_SECONDS),
+        )
+    )
+
+
+def companion_segment(
+    *,
+    workspace_id: str,
+    at: datetime,
+    segment_seconds: float,
+) -> CompanionSegment:
+    """The segment of ``workspace_id``'s companion log that a message at ``at`` belongs to.
+
+    Segments are fixed UTC windows of ``segment_seconds``, so the current one is computed
+    rather than looked up, and each is its own run with its own seq counter.
+    """
+    bucket = math.floor(at.timestamp() / segment_seconds) * segment_seconds
+    started_at = datetime.fromtimestamp(bucket, timezone.utc)
+    return CompanionSegment(
+        workspace_id=workspace_id,
+        agent_run_id=f"companion-{workspace_id}-{started_at:%Y%m%dT%H%M%SZ}",
+        started_at=started_at.isoformat(),
+    )
@@ -1,4 +1,10 @@
-from typing import Protocol
+import asyncio
+import os
+import re
+from collections.abc import AsyncIterator
+from typing import Protocol, runtime_checkable
+
+_TOKEN_PATTERN = re.compile(r"\s*\S+")
 
 
 class CompletionClient(Protocol):
@@ -10,8 +16,47 @@ class CompletionClient(Protocol):
     ) -> str: ...
 
 
+@runtime_checkable
+class StreamingCompletionClient(CompletionClient, Protocol):
+    """A completion client that can also yield its output incrementally."""
+
+    def stream(
+        self,
+        *,
+        system_prompt: str,
+        user_input: str,
+    ) -> AsyncIterator[str]: ...
+
+
+def resolve_stub_token_delay(token_delay_seconds: float | None = None) -> float:
+    if token_delay_seconds is not None:
+        return token_delay_seconds
+    return float(os.getenv("ELARA_STUB_TOKEN_DELAY_SECONDS", "0"))
+
+
+async def stream_completion(
+    client: CompletionClient,
+    *,
+    system_prompt: str,
+    user_input: str,
+) -> AsyncIterator[str]:
+    """Chunks from a ``StreamingCompletionClient``, or the whole completion as one chunk."""
+    if not isinstance(client, StreamingCompletionClient):
+        yield await client.complete(system_prompt=system_prompt, user_input=user_input)
+        return
+    async for chunk in client.stream(system_prompt=system_prompt, user_input=user_input):
+        yield chunk
+
+
 class StubCompletionClient:
-    """Deterministic local completion stub used for development and tests."""
+    """Deterministic local completion stub used for development and tests.
+
+    ``stream`` yields the completion one whitespace-delimited token at a time, waiting
+    ``token_delay_seconds`` before each token to imitate a model generating output.
+    """
+
+    def __init__(self, *, token_delay_seconds: float | None = None) -> None:
+        self._token_delay_seconds = resolve_stub_token_delay(token_delay_seconds)
 
     async def complete(
         self,
@@ -21,3 +66,14 @@ class StubCompletionClient:
     ) -> str:
         return f"[{system_prompt}] {user_input}"
 
+    async def stream(
+        self,
+        *,
+        system_prompt: str,
+        user_input: str,
+    ) -> AsyncIterator[str]:
+        completion = await self.complete(system_prompt=system_prompt, user_input=user_input)
+        for token in _TOKEN_PATTERN.findall(completion):
+            if self._token_delay_seconds > 0:
+                await asyncio.sleep(self._token_delay_seconds)
+            yield token
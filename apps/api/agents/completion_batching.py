@@ -0,0 +1,196 @@
+import asyncio
+import os
+import time
+from collections.abc import AsyncIterator, Sequence
+from dataclasses import dataclass
+from typing import Protocol
+
+DEFAULT_COMPLETION_BATCH_WINDOW_SECONDS = 0.005
+DEFAULT_COMPLETION_BATCH_MAX_SIZE = 16
+
+
+def resolve_completion_batching(enabled: str | None = None) -> bool:
+    value = enabled if enabled is not None else os.getenv("ELARA_COMPLETION_BATCHING", "0")
+    return value == "1"
+
+
+def resolve_completion_batch_window(window_seconds: float | None = None) -> float:
+    if window_seconds is not None:
+        return window_seconds
+    return float(
+        os.getenv(
+            "ELARA_COMPLETION_BATCH_WINDOW_SECONDS",
+            str(DEFAULT_COMPLETION_BATCH_WINDOW_SECONDS),
+        )
+    )
+
+
+def resolve_completion_batch_max_size(max_batch_size: int | None = None) -> int:
+    if max_batch_size is not None:
+        return max_batch_size
+    return int(
+        os.getenv(
+            "ELARA_COMPLETION_BATCH_MAX_SIZE",
+            str(DEFAULT_COMPLETION_BATCH_MAX_SIZE),
+        )
+    )
+
+
+@dataclass(frozen=True)
+class CompletionRequest:
+    system_prompt: str
+    user_input: str
+
+
+class BatchCompletionBackend(Protocol):
+    async def complete_batch(self, requests: Sequence[CompletionRequest]) -> list[str]: ...
+
+
+class StubBatchCompletionBackend:
+    """Deterministic batched backend used for development and tests.
+
+    Produces the same completions as ``StubCompletionClient`` and records the size of every
+    batch it receives. ``batch_delay_seconds`` imitates one round trip per batch.
+    """
+
+    def __init__(self, *, batch_delay_seconds: float = 0.0) -> None:
+        self.batch_sizes: list[int] = []
+        self._batch_delay_seconds = batch_delay_seconds
+
+    async def complete_batch(self, requests: Sequence[CompletionRequest]) -> list[str]:
+        self.batch_sizes.append(len(requests))
+        if self._batch_delay_seconds > 0:
+            await asyncio.sleep(self._batch_delay_seconds)
+        return [f"[{request.system_prompt}] {request.user_input}" for request in requests]
+
+
+@dataclass(frozen=True)
+class CompletionBatchStats:
+    requests: int
+    batches: int
+    mean_batch_size: float
+    batch_size_histogram: dict[int, int]
+    mean_queue_delay_seconds: float
+    max_queue_delay_seconds: float
+
+
+@dataclass(frozen=True)
+class _PendingCompletion:
+    request: CompletionRequest
+    future: asyncio.Future[str]
+    enqueued_at: float
+
+
+class BatchingCompletionClient:
+    """Completion client that coalesces concurrent requests into batched backend calls.
+
+    The first request of a batch opens a ``window_seconds`` window; the batch is dispatched
+    when the window closes or as soon as it holds ``max_batch_size`` requests, and each
+    caller receives its own completion. Dispatches run as tasks, so a new batch can fill
+    while the previous one is in flight. A backend error fails every request in its batch.
+
+    ``stream`` yields the batched completion as a single chunk.
+    """
+
+    def __init__(
+        self,
+        backend: BatchCompletionBackend,
+        *,
+        window_seconds: float | None = None,
+        max_batch_size: int | None = None,
+    ) -> None:
+        self._backend = backend
+        self._window_seconds = resolve_completion_batch_window(window_seconds)
+        self._max_batch_size = max(1, resolve_completion_batch_max_size(max_batch_size))
+        self._pending: list[_PendingCompletion] = []
+        self._window: asyncio.TimerHandle | None = None
+        self._dispatches: set[asyncio.Task[None]] = set()
+        self._requests = 0
+        self._batch_size_histogram: dict[int, int] = {}
+        self._total_queue_delay = 0.0
+        self._max_queue_delay = 0.0
+
+    def stats(self) -> CompletionBatchStats:
+        batches = sum(self._batch_size_histogram.values())
+        dispatched = sum(size * count for size, count in self._batch_size_histogram.items())
+        return CompletionBatchStats(
+            requests=self._requests,
+            batches=batches,
+            mean_batch_size=dispatched / batches if batches else 0.0,
+            batch_size_histogram=dict(sorted(self._batch_size_histogram.items())),
+            mean_queue_delay_seconds=self._total_queue_delay / dispatched if dispatched else 0.0,
+            max_queue_delay_seconds=self._max_queue_delay,
+        )
+
+    async def complete(
+        self,
+        *,
+        system_prompt: str,
+        user_input: str,
+    ) -> str:
+        loop = asyncio.get_running_loop()
+        pending = _PendingCompletion(
+            request=CompletionRequest(system_prompt=system_prompt, user_input=user_input),
+            future=loop.create_future(),
+            enqueued_at=time.perf_counter(),
+        )
+        self._requests += 1
+        self._pending.append(pending)
+        if len(self._pending) >= self._max_batch_size:
+            self._dispatch()
+        elif self._window is None:
+            self._window = loop.call_later(self._window_seconds, self._dispatch)
+        return await pending.future
+
+    async def stream(
+        self,
+        *,
+        system_prompt: str,
+        user_input: str,
+    ) -> AsyncIterator[str]:
+        yield await self.complete(system_prompt=system_prompt, user_input=user_input)
+
+    async def aclose(self) -> None:
+        """Dispatch anything still queued and wait for in-flight batches."""
+        if self._pending:
+            self._dispatch()
+        if self._dispatches:
+            await asyncio.gather(*self._dispatches, return_exceptions=True)
+
+    def _dispatch(self) -> None:
+        if self._window is not None:
+            self._window.cancel()
+            self._window = None
+        batch = [pending for pending in self._pending if not pending.future.cancelled()]
+        self._pending = []
+        if not batch:
+            return
+        dispatched_at = time.perf_counter()
+        for pending in batch:
+            delay = dispatched_at - pending.enqueued_at
+            self._total_queue_delay += delay
+            self._max_queue_delay = max(self._max_queue_delay, delay)
+        size = len(batch)
+        self._batch_size_histogram[size] = self._batch_size_histogram.get(size, 0) + 1
+        task = asyncio.get_running_loop().create_task(self._complete_batch(batch))
+        self._dispatches.add(task)
+        task.add_done_callback(self._dispatches.discard)
+
+    async def _complete_batch(self, batch: list[_PendingCompletion]) -> None:
+        try:
+            completions = await self._backend.complete_batch([pending.request for pending in batch])
+            if len(completions) != len(batch):
+                raise RuntimeError(
+                    f"batch backend returned {len(completions)} completions "
+                    f"for {len(batch)} requests"
+                )
+        except BaseException as exc:
+            for pending in batch:
+                if not pending.future.done():
+                    pending.future.set_exception(exc)
+            if not isinstance(exc, Exception):
+                raise
+            return
+        for pending, completion in zip(batch, completions, strict=True):
+            if not pending.future.done():
+                pending.future.set_result(completion)
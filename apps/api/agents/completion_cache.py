@@ -0,0 +1,297 @@
+import asyncio
+import hashlib
+import json
+import os
+import sqlite3
+import time
+from collections import OrderedDict
+from collections.abc import AsyncIterator, Mapping
+from dataclasses import dataclass
+from typing import Literal, cast
+
+from apps.api.agents.completion import CompletionClient, stream_completion
+from apps.api.db.pool import StateConnectionPool, run_state_operation
+
+CompletionCacheMode = Literal["off", "memory", "persistent"]
+
+DEFAULT_COMPLETION_CACHE_MAX_ENTRIES = 1024
+DEFAULT_COMPLETION_CACHE_TTL_SECONDS = 3600.0
+
+
+def resolve_completion_cache_mode(mode: str | None = None) -> CompletionCacheMode:
+    value = (mode or os.getenv("ELARA_COMPLETION_CACHE") or "off").strip().lower()
+    if value not in {"off", "memory", "persistent"}:
+        raise ValueError("ELARA_COMPLETION_CACHE must be one of: off, memory, persistent")
+    return cast(CompletionCacheMode, value)
+
+
+def resolve_completion_cache_max_entries(max_entries: int | None = None) -> int:
+    if max_entries is not None:
+        return max_entries
+    return int(
+        os.getenv(
+            "ELARA_COMPLETION_CACHE_MAX_ENTRIES",
+            str(DEFAULT_COMPLETION_CACHE_MAX_ENTRIES),
+        )
+    )
+
+
+def resolve_completion_cache_ttl(ttl_seconds: float | None = None) -> float:
+    if ttl_seconds is not None:
+        return ttl_seconds
+    return float(
+        os.getenv(
+            "ELARA_COMPLETION_CACHE_TTL_SECONDS",
+            str(DEFAULT_COMPLETION_CACHE_TTL_SECONDS),
+        )
+    )
+
+
+@dataclass(frozen=True)
+class CompletionCacheStats:
+    hits: int
+    persistent_hits: int
+    coalesced: int
+    misses: int
+    evictions: int
+    entries: int
+    hit_rate: float
+    saved_seconds: float
+
+
+@dataclass(frozen=True)
+class _CacheEntry:
+    completion: str
+    expires_at: float
+    latency_seconds: float
+
+
+class CachedCompletionClient:
+    """Completion client wrapper that reuses results for identical requests.
+
+    Entries are keyed by a SHA-256 of ``(model, system_prompt, user_input, params)``, expire
+    after ``ttl_seconds`` and are evicted least-recently-used beyond ``max_entries``. With a
+    state pool, results are also written to ``completion_cache_record`` so they survive
+    restarts and are shared between processes. Concurrent misses for the same key share a
+    single upstream call.
+
+    Streaming hits replay the cached completion as one chunk; streaming misses pass the
+    upstream chunks through and cache the joined result without single-flight, so callers
+    still see output as it is generated.
+    """
+
+    def __init__(
+        self,
+        client: CompletionClient,
+        *,
+        model: str = "default",
+        params: Mapping[str, object] | None = None,
+        max_entries: int | None = None,
+        ttl_seconds: float | None = None,
+        database_path: str | None = None,
+        connection: sqlite3.Connection | None = None,
+        pool: StateConnectionPool | None = None,
+    ) -> None:
+        self._client = client
+        self._model = model
+        self._params = dict(params or {})
+        self._max_entries = resolve_completion_cache_max_entries(max_entries)
+        self._ttl_seconds = resolve_completion_cache_ttl(ttl_seconds)
+        self._pool = pool
+        self._owns_pool = False
+        if self._pool is None and (connection is not None or database_path is not None):
+            self._pool = StateConnectionPool(database_path=database_path, connection=connection)
+            self._owns_pool = connection is None
+        self._entries: OrderedDict[str, _CacheEntry] = OrderedDict()
+        self._in_flight: dict[str, asyncio.Future[str]] = {}
+        self._hits = 0
+        self._persistent_hits = 0
+        self._coalesced = 0
+        self._misses = 0
+        self._evictions = 0
+        self._saved_seconds = 0.0
+
+    def close(self) -> None:
+        if self._pool is None or not self._owns_pool:
+            return
+        self._pool.close()
+        self._pool = None
+
+    def __del__(self) -> None:
+        self.close()
+
+    def cache_key(self, *, system_prompt: str, user_input: str) -> str:
+        material = json.dumps(
+            [self._model, system_prompt, user_input, self._params],
+            sort_keys=True,
+            separators=(",", ":"),
+            default=str,
+        )
+        return hashlib.sha256(material.encode("utf-8")).hexdigest()
+
+    def stats(self) -> CompletionCacheStats:
+        served = self._hits + self._coalesced
+        requests = served + self._misses
+        return CompletionCacheStats(
+            hits=self._hits,
+            persistent_hits=self._persistent_hits,
+            coalesced=self._coalesced,
+            misses=self._misses,
+            evictions=self._evictions,
+            entries=len(self._entries),
+            hit_rate=served / requests if requests else 0.0,
+            saved_seconds=self._saved_seconds,
+        )
+
+    async def complete(
+        self,
+        *,
+        system_prompt: str,
+        user_input: str,
+    ) -> str:
+        key = self.cache_key(system_prompt=system_prompt, user_input=user_input)
+        while True:
+            in_flight = self._in_flight.get(key)
+            if in_flight is None:
+                cached = await self._lookup(key)
+                if cached is not None:
+                    return cached
+                # The persistent lookup awaits, so another caller may have started meanwhile.
+                in_flight = self._in_flight.get(key)
+            if in_flight is None:
+                return await self._lead(key, system_prompt=system_prompt, user_input=user_input)
+            try:
+                completion = await asyncio.shield(in_flight)
+            except asyncio.CancelledError:
+                current = asyncio.current_task()
+                if not in_flight.cancelled() or (current is not None and current.cancelling()):
+                    raise
+                # The leader was cancelled, not this caller: look again and lead if needed.
+                continue
+            self._coalesced += 1
+            return completion
+
+    async def _lead(self, key: str, *, system_prompt: str, user_input: str) -> str:
+        future: asyncio.Future[str] = asyncio.get_running_loop().create_future()
+        self._in_flight[key] = future
+        self._misses += 1
+        try:
+            started = time.perf_counter()
+            completion = await self._client.complete(
+                system_prompt=system_prompt,
+                user_input=user_input,
+            )
+            await self._store(key, completion, latency_seconds=time.perf_counter() - started)
+        except asyncio.CancelledError:
+            # Only this caller gave up; waiters retry rather than inherit its cancellation.
+            future.cancel()
+            raise
+        except BaseException as exc:
+            future.set_exception(exc)
+            # Mark the exception retrieved; waiters, if any, still receive it.
+            future.exception()
+            raise
+        finally:
+            del self._in_flight[key]
+        future.set_result(completion)
+        return completion
+
+    async def stream(
+        self,
+        *,
+        system_prompt: str,
+        user_input: str,
+    ) -> AsyncIterator[str]:
+        key = self.cache_key(system_prompt=system_prompt, user_input=user_input)
+        cached = await self._lookup(key)
+        if cached is not None:
+            yield cached
+            return
+
+        self._misses += 1
+        started = time.perf_counter()
+        chunks: list[str] = []
+        async for chunk in stream_completion(
+            self._client,
+            system_prompt=system_prompt,
+            user_input=user_input,
+        ):
+            chunks.append(chunk)
+            yield chunk
+        await self._store(key, "".join(chunks), latency_seconds=time.perf_counter() - started)
+
+    async def _lookup(self, key: str) -> str | None:
+        now = time.time()
+        entry = self._entries.get(key)
+        if entry is not None and entry.expires_at <= now:
+            del self._entries[key]
+            entry = None
+        if entry is None and self._pool is not None:
+            entry = await run_state_operation(self._pool, self._load_persisted, key=key, now=now)
+            if entry is not None:
+                self._persistent_hits += 1
+                self._remember(key, entry)
+        if entry is None:
+            return None
+        self._entries.move_to_end(key)
+        self._hits += 1
+        self._saved_seconds += entry.latency_seconds
+        return entry.completion
+
+    async def _store(self, key: str, completion: str, *, latency_seconds: float) -> None:
+        now = time.time()
+        entry = _CacheEntry(
+            completion=completion,
+            expires_at=now + self._ttl_seconds,
+            latency_seconds=latency_seconds,
+        )
+        self._remember(key, entry)
+        if self._pool is not None:
+            await run_state_operation(self._pool, self._persist, key=key, entry=entry, now=now)
+
+    def _remember(self, key: str, entry: _CacheEntry) -> None:
+        self._entries[key] = entry
+        self._entries.move_to_end(key)
+        while len(self._entries) > self._max_entries:
+            self._entries.popitem(last=False)
+            self._evictions += 1
+
+    def _load_persisted(self, *, key: str, now: float) -> _CacheEntry | None:
+        if self._pool is None:
+            return None
+        with self._pool.reader() as connection:
+            row = connection.execute(
+                """
+                select completion, expires_at, latency_seconds
+                from completion_cache_record
+                where cache_key = ? and expires_at > ?
+                """,
+                (key, now),
+            ).fetchone()
+        if row is None:
+            return None
+        return _CacheEntry(
+            completion=str(row[0]),
+            expires_at=float(row[1]),
+            latency_seconds=float(row[2]),
+        )
+
+    def _persist(self, *, key: str, entry: _CacheEntry, now: float) -> None:
+        if self._pool is None:
+            return
+        with self._pool.writer() as connection:
+            connection.execute("delete from completion_cache_record where expires_at <= ?", (now,))
+            connection.execute(
+                """
+                insert into completion_cache_record (
+                  cache_key, completion, expires_at, latency_seconds
+                )
+                values (?, ?, ?, ?)
+                on conflict(cache_key) do update set
+                  completion = excluded.completion,
+                  expires_at = excluded.expires_at,
+                  latency_seconds = excluded.latency_seconds
+                """,
+                (key, entry.completion, entry.expires_at, entry.latency_seconds),
+            )
+            connection.commit()
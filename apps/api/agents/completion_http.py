@@ -0,0 +1,308 @@
+import asyncio
+import json
+import os
+import random
+import time
+from collections.abc import AsyncIterator
+from dataclasses import dataclass
+
+import httpx
+
+RETRYABLE_STATUS_CODES = frozenset({408, 429, 500, 502, 503, 504})
+
+
+class CompletionError(RuntimeError):
+    """The completion server rejected the request or kept failing after retries."""
+
+
+class CompletionCircuitOpenError(CompletionError):
+    """The circuit breaker is open; requests fail fast until the reset timeout elapses."""
+
+
+@dataclass(frozen=True)
+class HttpCompletionSettings:
+    base_url: str
+    model: str = "default"
+    api_key: str | None = None
+    max_connections: int = 32
+    max_keepalive_connections: int = 16
+    keepalive_expiry_seconds: float = 30.0
+    max_concurrency: int = 32
+    deadline_seconds: float = 30.0
+    max_attempts: int = 3
+    backoff_base_seconds: float = 0.1
+    backoff_max_seconds: float = 2.0
+    breaker_failure_threshold: int = 5
+    breaker_reset_seconds: float = 30.0
+
+
+def resolve_http_completion_settings(
+    settings: HttpCompletionSettings | None = None,
+) -> HttpCompletionSettings | None:
+    """Settings from ``ELARA_COMPLETION_*``, or ``None`` when no completion server is set."""
+    if settings is not None:
+        return settings
+    base_url = os.getenv("ELARA_COMPLETION_URL")
+    if not base_url:
+        return None
+    defaults = HttpCompletionSettings(base_url=base_url)
+    return HttpCompletionSettings(
+        base_url=base_url,
+        model=os.getenv("ELARA_COMPLETION_MODEL", defaults.model),
+        api_key=os.getenv("ELARA_COMPLETION_API_KEY") or None,
+        max_connections=int(
+            os.getenv("ELARA_COMPLETION_MAX_CONNECTIONS", str(defaults.max_connections))
+        ),
+        max_keepalive_connections=int(
+            os.getenv(
+                "ELARA_COMPLETION_MAX_KEEPALIVE_CONNECTIONS",
+                str(defaults.max_keepalive_connections),
+            )
+        ),
+        max_concurrency=int(
+            os.getenv("ELARA_COMPLETION_MAX_CONCURRENCY", str(defaults.max_concurrency))
+        ),
+        deadline_seconds=float(
+            os.getenv("ELARA_COMPLETION_DEADLINE_SECONDS", str(defaults.deadline_seconds))
+        ),
+        max_attempts=int(os.getenv("ELARA_COMPLETION_MAX_ATTEMPTS", str(defaults.max_attempts))),
+        breaker_failure_threshold=int(
+            os.getenv(
+                "ELARA_COMPLETION_BREAKER_THRESHOLD",
+                str(defaults.breaker_failure_threshold),
+            )
+        ),
+        breaker_reset_seconds=float(
+            os.getenv(
+                "ELARA_COMPLETION_BREAKER_RESET_SECONDS",
+                str(defaults.breaker_reset_seconds),
+            )
+        ),
+    )
+
+
+class CircuitBreaker:
+    """Consecutive-failure circuit breaker.
+
+    After ``failure_threshold`` consecutive failures the circuit opens and ``check()``
+    raises until ``reset_seconds`` have passed. The circuit then lets a single trial request
+    through; its success closes the circuit and its failure opens it again.
+    """
+
+    def __init__(self, *, failure_threshold: int, reset_seconds: float) -> None:
+        self._failure_threshold = max(1, failure_threshold)
+        self._reset_seconds = reset_seconds
+        self._failures = 0
+        self._opened_at: float | None = None
+        self._trial_in_flight = False
+
+    @property
+    def state(self) -> str:
+        if self._opened_at is None:
+            return "closed"
+        if time.monotonic() - self._opened_at >= self._reset_seconds:
+            return "half_open"
+        return "open"
+
+    def check(self) -> None:
+        state = self.state
+        if state == "closed":
+            return
+        if state == "half_open" and not self._trial_in_flight:
+            self._trial_in_flight = True
+            return
+        raise CompletionCircuitOpenError("completion server circuit is open")
+
+    def record_success(self) -> None:
+        self._failures = 0
+        self._opened_at = None
+        self._trial_in_flight = False
+
+    def release_trial(self) -> None:
+        """Give up a trial slot without a verdict, e.g. when the request was cancelled."""
+        self._trial_in_flight = False
+
+    def record_failure(self) -> None:
+        self._failures += 1
+        if self._trial_in_flight or self._failures >= self._failure_threshold:
+            self._opened_at = time.monotonic()
+        self._trial_in_flight = False
+
+
+class _RetryableError(Exception):
+    pass
+
+
+class HttpCompletionClient:
+    """Completion client for an HTTP model server over a shared keep-alive pool.
+
+    ``complete`` posts ``{"model", "system_prompt", "user_input"}`` to ``/v1/completions``
+    and reads ``{"completion": ...}``; ``stream`` adds ``"stream": true`` and reads one JSON
+    object with a ``text`` field per line. One ``httpx.AsyncClient`` is reused for every
+    request, and a semaphore caps requests in flight. Each call has a deadline covering all
+    of its attempts; transport errors and retryable statuses are retried with full-jitter
+    exponential backoff, and consecutive failures trip a circuit breaker. Streams are only
+    retried before their first chunk.
+    """
+
+    def __init__(
+        self,
+        settings: HttpCompletionSettings,
+        *,
+        transport: httpx.AsyncBaseTransport | None = None,
+    ) -> None:
+        self._settings = settings
+        headers = {"Accept": "application/json"}
+        if settings.api_key:
+            headers["Authorization"] = f"Bearer {settings.api_key}"
+        self._http = httpx.AsyncClient(
+            base_url=settings.base_url,
+            headers=headers,
+            limits=httpx.Limits(
+                max_connections=settings.max_connections,
+                max_keepalive_connections=settings.max_keepalive_connections,
+                keepalive_expiry=settings.keepalive_expiry_seconds,
+            ),
+            timeout=httpx.Timeout(settings.deadline_seconds),
+            transport=transport,
+        )
+        self._slots = asyncio.Semaphore(settings.max_concurrency)
+        self._breaker = CircuitBreaker(
+            failure_threshold=settings.breaker_failure_threshold,
+            reset_seconds=settings.breaker_reset_seconds,
+        )
+
+    @property
+    def breaker(self) -> CircuitBreaker:
+        return self._breaker
+
+    async def aclose(self) -> None:
+        await self._http.aclose()
+
+    def _payload(self, *, system_prompt: str, user_input: str, stream: bool) -> dict[str, object]:
+        payload: dict[str, object] = {
+            "model": self._settings.model,
+            "system_prompt": system_prompt,
+            "user_input": user_input,
+        }
+        if stream:
+            payload["stream"] = True
+        return payload
+
+    def _backoff_seconds(self, attempt: int) -> float:
+        ceiling = min(
+            self._settings.backoff_max_seconds,
+            self._settings.backoff_base_seconds * (2**attempt),
+        )
+        return random.uniform(0.0, ceiling)
+
+    def _raise_for_status(self, response: httpx.Response) -> None:
+        if response.status_code in RETRYABLE_STATUS_CODES:
+            raise _RetryableError(f"completion server returned {response.status_code}")
+        if response.is_error:
+            raise CompletionError(f"completion server returned {response.status_code}")
+
+    async def complete(
+        self,
+        *,
+        system_prompt: str,
+        user_input: str,
+    ) -> str:
+        payload = self._payload(system_prompt=system_prompt, user_input=user_input, stream=False)
+        try:
+            async with asyncio.timeout(self._settings.deadline_seconds):
+                return await self._complete_with_retries(payload)
+        except TimeoutError:
+            self._breaker.record_failure()
+            raise
+
+    async def _complete_with_retries(self, payload: dict[str, object]) -> str:
+        for attempt in range(self._settings.max_attempts):
+            self._breaker.check()
+            try:
+                async with self._slots:
+                    response = await self._http.post("/v1/completions", json=payload)
+                self._raise_for_status(response)
+                completion = str(response.json()["completion"])
+            except (_RetryableError, httpx.TransportError) as exc:
+                self._breaker.record_failure()
+                if attempt + 1 >= self._settings.max_attempts:
+                    raise CompletionError(str(exc) or type(exc).__name__) from exc
+                await asyncio.sleep(self._backoff_seconds(attempt))
+                continue
+            except (KeyError, ValueError) as exc:
+                self._breaker.record_failure()
+                raise CompletionError("malformed completion response") from exc
+            except CompletionError:
+                # A rejected request still proves the server is up.
+                self._breaker.record_success()
+                raise
+            except BaseException:
+                self._breaker.release_trial()
+                raise
+            self._breaker.record_success()
+            return completion
+        raise CompletionError("completion retries exhausted")
+
+    async def stream(
+        self,
+        *,
+        system_prompt: str,
+        user_input: str,
+    ) -> AsyncIterator[str]:
+        payload = self._payload(system_prompt=system_prompt, user_input=user_input, stream=True)
+        # The deadline is applied to each await rather than with asyncio.timeout(), which
+        # would cancel the consuming task while it is suspended outside this generator.
+        deadline = time.monotonic() + self._settings.deadline_seconds
+
+        def remaining() -> float:
+            left = deadline - time.monotonic()
+            if left <= 0:
+                raise TimeoutError("completion deadline exceeded")
+            return left
+
+        for attempt in range(self._settings.max_attempts):
+            self._breaker.check()
+            started = False
+            try:
+                async with self._slots:
+                    request = self._http.build_request("POST", "/v1/completions", json=payload)
+                    response = await asyncio.wait_for(
+                        self._http.send(request, stream=True), remaining()
+                    )
+                    try:
+                        self._raise_for_status(response)
+                        lines = response.aiter_lines()
+                        while True:
+                            try:
+                                line = await asyncio.wait_for(anext(lines), remaining())
+                            except StopAsyncIteration:
+                                break
+                            if not line.strip():
+                                continue
+                            text = str(json.loads(line)["text"])
+                            started = True
+                            yield text
+                    finally:
+                        await response.aclose()
+            except (_RetryableError, httpx.TransportError) as exc:
+                self._breaker.record_failure()
+                if started or attempt + 1 >= self._settings.max_attempts:
+                    raise CompletionError(str(exc) or type(exc).__name__) from exc
+                await asyncio.sleep(min(self._backoff_seconds(attempt), remaining()))
+                continue
+            except (KeyError, ValueError) as exc:
+                self._breaker.record_failure()
+                raise CompletionError("malformed completion response") from exc
+            except CompletionError:
+                self._breaker.record_success()
+                raise
+            except TimeoutError:
+                self._breaker.record_failure()
+                raise
+            except BaseException:
+                self._breaker.release_trial()
+                raise
+            self._breaker.record_success()
+            return
+        raise CompletionError("completion retries exhausted")
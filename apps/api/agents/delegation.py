@@ -0,0 +1,30 @@
+import os
+from dataclasses import dataclass
+
+
+@dataclass(frozen=True)
+class DelegationSettings:
+    max_specialists: int = 2
+    max_concurrency_per_run: int = 4
+    max_concurrency: int = 16
+    task_timeout_seconds: float = 60.0
+
+
+def resolve_delegation_settings(settings: DelegationSettings | None = None) -> DelegationSettings:
+    if settings is not None:
+        return settings
+    defaults = DelegationSettings()
+    return DelegationSettings(
+        max_specialists=int(
+            os.getenv("ELARA_DELEGATION_MAX_SPECIALISTS", str(defaults.max_specialists))
+        ),
+        max_concurrency_per_run=int(
+            os.getenv("ELARA_DELEGATION_RUN_CONCURRENCY", str(defaults.max_concurrency_per_run))
+        ),
+        max_concurrency=int(
+            os.getenv("ELARA_DELEGATION_MAX_CONCURRENCY", str(defaults.max_concurrency))
+        ),
+        task_timeout_seconds=float(
+            os.getenv("ELARA_DELEGATION_TASK_TIMEOUT_SECONDS", str(defaults.task_timeout_seconds))
+        ),
+    )
@@ -0,0 +1,88 @@
+import os
+import time
+from collections import OrderedDict
+from dataclasses import dataclass
+
+DEFAULT_RUN_ACCESS_CACHE_MAX_ENTRIES = 4096
+DEFAULT_RUN_ACCESS_CACHE_TTL_SECONDS = 600.0
+
+
+def resolve_run_access_cache_max_entries(max_entries: int | None = None) -> int:
+    if max_entries is not None:
+        return max_entries
+    return int(
+        os.getenv(
+            "ELARA_RUN_ACCESS_CACHE_MAX_ENTRIES",
+            str(DEFAULT_RUN_ACCESS_CACHE_MAX_ENTRIES),
+        )
+    )
+
+
+def resolve_run_access_cache_ttl(ttl_seconds: float | None = None) -> float:
+    if ttl_seconds is not None:
+        return ttl_seconds
+    return float(
+        os.getenv(
+            "ELARA_RUN_ACCESS_CACHE_TTL_SECONDS",
+            str(DEFAULT_RUN_ACCESS_CACHE_TTL_SECONDS),
+        )
+    )
+
+
+@dataclass(frozen=True)
+class RunAccessCacheStats:
+    hits: int
+    misses: int
+    evictions: int
+    entries: int
+
+
+class RunAccessCache:
+    """LRU of ``(agent_run_id, actor_id)`` grants known to be committed to the outbox.
+
+    Only positive answers are cached: a miss means "ask the outbox", never "denied", so an
+    evicted or expired grant costs one lookup rather than a wrong answer. Entries expire
+    ``ttl_seconds`` after they were last added, bounding how long an idle run stays resident.
+    """
+
+    def __init__(
+        self,
+        *,
+        max_entries: int | None = None,
+        ttl_seconds: float | None = None,
+    ) -> None:
+        self._max_entries = max(1, resolve_run_access_cache_max_entries(max_entries))
+        self._ttl_seconds = resolve_run_access_cache_ttl(ttl_seconds)
+        self._expires_at: OrderedDict[tuple[str, str], float] = OrderedDict()
+        self._hits = 0
+        self._misses = 0
+        self._evictions = 0
+
+    def contains(self, *, agent_run_id: str, actor_id: str) -> bool:
+        key = (agent_run_id, actor_id)
+        expires_at = self._expires_at.get(key)
+        if expires_at is not None and expires_at <= time.monotonic():
+            del self._expires_at[key]
+            expires_at = None
+        if expires_at is None:
+            self._misses += 1
+            return False
+        self._hits += 1
+        self._expires_at.move_to_end(key)
+        return True
+
+    def add(self, *, agent_run_id: str, actor_id: str) -> None:
+        key = (agent_run_id, actor_id)
+        self._expires_at[key] = time.monotonic() + self._ttl_seconds
+        self._expires_at.move_to_end(key)
+        while len(self._expires_at) > self._max_entries:
+            self._expires_at.popitem(last=False)
+            self._evictions += 1
+
+    def stats(self) -> RunAccessCacheStats:
+        return RunAccessCacheStats(
+            hits=self._hits,
+            misses=self._misses,
+            evictions=self._evictions,
+            entries=len(self._expires_at),
+        )
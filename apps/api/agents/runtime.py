@@ -1,10 +1,19 @@
+import asyncio
+import time
+from collections.abc import Awaitable, Callable
 from dataclasses import asdict, dataclass, field
+from datetime import datetime, timezone
 from uuid import uuid4
 
-from apps.api.agents.completion import CompletionClient
+from apps.api.agents.companion_log import companion_segment, resolve_companion_segment_seconds
+from apps.api.agents.completion import CompletionClient, stream_completion
+from apps.api.agents.delegation import DelegationSettings, resolve_delegation_settings
 from apps.api.agents.policy import ActorContext, Capability, PolicyEngine
+from apps.api.agents.run_access import RunAccessCache
+from apps.api.agents.unit_of_work import RunStepUnitOfWork
 from apps.api.audit import ImmutableAuditLog
-from apps.api.events.outbox import AgentRunEventOutbox
+from apps.api.events.broker import RunEventBroker, RunEventStream
+from apps.api.events.outbox import AgentRunEvent, AgentRunEventOutbox, CompanionEventPage
 from apps.api.memory.store_base import MemoryStore
 from apps.api.safety import ApprovalRequiredError, ApprovalService
 
@@ -26,10 +35,46 @@ class DelegatedTaskResult:
     output: str
 
 
+@dataclass(frozen=True)
+class PartialOutput:
+    """A chunk of output as it is generated; ``source`` is a specialist id or the companion."""
+
+    source: str
+    text: str
+
+
+PartialOutputFn = Callable[[PartialOutput], Awaitable[None]]
+
+
+@dataclass(frozen=True)
+class CompanionStageTimings:
+    """Seconds spent in each stage of a companion reply.
+
+    ``memory_write`` and ``memory_search`` run in sequence alongside ``completion``;
+    ``bookkeeping`` starts once both branches have finished.
+    """
+
+    memory_write_seconds: float
+    memory_search_seconds: float
+    completion_seconds: float
+    bookkeeping_seconds: float
+    total_seconds: float
+
+    @property
+    def critical_path(self) -> list[str]:
+        """The stages that determined ``total_seconds``, in order."""
+        memory_seconds = self.memory_write_seconds + self.memory_search_seconds
+        if memory_seconds > self.completion_seconds:
+            return ["memory_write", "memory_search", "bookkeeping"]
+        return ["completion", "bookkeeping"]
+
+
 @dataclass(frozen=True)
 class CompanionReply:
+    agent_run_id: str
     response: str
     memory_hits: list[str]
+    timings: CompanionStageTimings
 
 
 @dataclass(frozen=True)
@@ -49,6 +94,9 @@ class AgentRuntime:
         completion_client: CompletionClient,
         approval_service: ApprovalService,
         audit_log: ImmutableAuditLog,
+        delegation: DelegationSettings | None = None,
+        run_access_cache: RunAccessCache | None = None,
+        companion_segment_seconds: float | None = None,
     ) -> None:
         self._memory_store = memory_store
         self._policy = policy_engine
@@ -57,24 +105,43 @@ class AgentRuntime:
         self._approvals = approval_service
         self._audit = audit_log
         self._specialists_by_workspace: dict[str, dict[str, SpecialistAgent]] = {}
-        self._run_workspace_by_id: dict[str, str] = {}
-        self._run_actor_ids_by_id: dict[str, set[str]] = {}
-
-    def _grant_run_access(self, *, agent_run_id: str, workspace_id: str, actor_id: str) -> None:
-        self._run_workspace_by_id[agent_run_id] = workspace_id
-        actors = self._run_actor_ids_by_id.setdefault(agent_run_id, set())
-        actors.add(actor_id)
-        self._outbox.register_run_access(
+        self._run_access = run_access_cache or RunAccessCache()
+        self._companion_segment_seconds = max(
+            1.0, resolve_companion_segment_seconds(companion_segment_seconds)
+        )
+        self._event_broker: RunEventBroker | None = None
+        self._delegation = resolve_delegation_settings(delegation)
+        self._delegation_slots = asyncio.Semaphore(self._delegation.max_concurrency)
+
+    def _step(self) -> RunStepUnitOfWork:
+        return RunStepUnitOfWork(outbox=self._outbox, audit_log=self._audit)
+
+    def _grant_run_access(
+        self,
+        step: RunStepUnitOfWork,
+        *,
+        agent_run_id: str,
+        workspace_id: str,
+        actor_id: str,
+    ) -> bool:
+        """Add the grant to ``step`` unless it is cached; ``True`` when it was added.
+
+        The caller records an added grant in the cache once the step has committed.
+        """
+        if self._run_access.contains(agent_run_id=agent_run_id, actor_id=actor_id):
+            return False
+        step.add_run_access(
             agent_run_id=agent_run_id,
             workspace_id=workspace_id,
             actor_id=actor_id,
         )
+        return True
 
     def list_specialists(self, *, workspace_id: str) -> list[SpecialistAgent]:
         specialists = self._specialists_by_workspace.get(workspace_id, {})
         return sorted(specialists.values(), key=lambda specialist: specialist.id)
 
-    def upsert_specialist(
+    async def upsert_specialist(
         self,
         *,
         workspace_id: str,
@@ -87,7 +154,7 @@ class AgentRuntime:
 
         workspace_agents = self._specialists_by_workspace.setdefault(workspace_id, {})
         workspace_agents[specialist.id] = specialist
-        self._audit.append_event(
+        await self._audit.append_event(
             workspace_id=workspace_id,
             actor_id=actor.user_id,
             action="specialist.upserted",
@@ -105,49 +172,126 @@ class AgentRuntime:
         workspace_id: str,
         actor_id: str,
         message: str,
+        on_partial: PartialOutputFn | None = None,
     ) -> CompanionReply:
-        memory_id = f"memory-{uuid4()}"
-        await self._memory_store.upsert_memory(
-            workspace_id=workspace_id,
-            agent_id="companion_primary",
-            memory_id=memory_id,
-            content=message,
-        )
-
-        matches = await self._memory_store.search(
+        """Reply to a companion message.
+
+        The completion runs concurrently with storing the message as a memory and searching
+        memories (the search waits for the write so it can match the new memory). The run
+        access, run event and audit event are then written in one step. ``timings`` records
+        how long each stage took.
+
+        The run event goes to the workspace's current companion log segment, named by
+        ``agent_run_id``; see ``replay_companion_events`` to read the log across segments.
+
+        With ``on_partial`` the reply is streamed from the completion client and handed over
+        chunk by chunk as it is generated; the chunks concatenate to ``response``.
+        """
+        started = time.perf_counter()
+        stage_seconds: dict[str, float] = {}
+        prefix = f"I hear you, {actor_id}. "
+
+        async def recall() -> list[str]:
+            stage_started = time.perf_counter()
+            await self._memory_store.upsert_memory(
+                workspace_id=workspace_id,
+                agent_id="companion_primary",
+                memory_id=f"memory-{uuid4()}",
+                content=message,
+            )
+            searched = time.perf_counter()
+            stage_seconds["memory_write"] = searched - stage_started
+            matches = await self._memory_store.search(
+                workspace_id=workspace_id,
+                agent_id="companion_primary",
+                query=message,
+                top_k=3,
+            )
+            stage_seconds["memory_search"] = time.perf_counter() - searched
+            return [match.memory_id for match in matches]
+
+        async def generate() -> str:
+            stage_started = time.perf_counter()
+            if on_partial is None:
+                completion = await self._completion_client.complete(
+                    system_prompt="companion_primary",
+                    user_input=message,
+                )
+            else:
+                await on_partial(PartialOutput(source="companion_primary", text=prefix))
+                chunks: list[str] = []
+                async for chunk in stream_completion(
+                    self._completion_client,
+                    system_prompt="companion_primary",
+                    user_input=message,
+                ):
+                    chunks.append(chunk)
+                    await on_partial(PartialOutput(source="companion_primary", text=chunk))
+                completion = "".join(chunks)
+            stage_seconds["completion"] = time.perf_counter() - stage_started
+            return completion
+
+        try:
+            async with asyncio.TaskGroup() as group:
+                recalled = group.create_task(recall())
+                generated = group.create_task(generate())
+        except BaseExceptionGroup as exc:
+            raise exc.exceptions[0] from None
+        memory_hits = recalled.result()
+
+        suffix = f" ({len(memory_hits)} memory hit(s))."
+        if on_partial is not None:
+            await on_partial(PartialOutput(source="companion_primary", text=suffix))
+        response = f"{prefix}{generated.result()}{suffix}"
+
+        bookkeeping_started = time.perf_counter()
+        segment = companion_segment(
             workspace_id=workspace_id,
-            agent_id="companion_primary",
-            query=message,
-            top_k=3,
+            at=datetime.now(timezone.utc),
+            segment_seconds=self._companion_segment_seconds,
         )
-        memory_hits = [match.memory_id for match in matches]
-
-        completion = await self._completion_client.complete(
-            system_prompt="companion_primary",
-            user_input=message,
-        )
-        response = f"I hear you, {actor_id}. {completion} ({len(memory_hits)} memory hit(s))."
-
-        self._outbox.append_event(
-            agent_run_id=f"companion-{workspace_id}",
-            event_type="companion.message",
-            payload={"memory_hit_count": len(memory_hits)},
-        )
-        self._grant_run_access(
-            agent_run_id=f"companion-{workspace_id}",
-            workspace_id=workspace_id,
-            actor_id=actor_id,
+        async with self._step() as step:
+            granted = self._grant_run_access(
+                step,
+                agent_run_id=segment.agent_run_id,
+                workspace_id=workspace_id,
+                actor_id=actor_id,
+            )
+            if granted:
+                # Misses also happen on each new actor's first grant and after a cache
+                # eviction or expiry, not just on a segment's first message; re-registering
+                # is harmless because the segment insert is idempotent (insert or ignore).
+                step.add_companion_segment(segment=segment)
+            step.add_run_event(
+                agent_run_id=segment.agent_run_id,
+                event_type="companion.message",
+                payload={"memory_hit_count": len(memory_hits)},
+            )
+            step.add_audit_event(
+                workspace_id=workspace_id,
+                actor_id=actor_id,
+                action="companion.message",
+                outcome="success",
+                metadata={"memory_hit_count": len(memory_hits)},
+            )
+        if granted:
+            self._run_access.add(agent_run_id=segment.agent_run_id, actor_id=actor_id)
+        finished = time.perf_counter()
+
+        timings = CompanionStageTimings(
+            memory_write_seconds=stage_seconds["memory_write"],
+            memory_search_seconds=stage_seconds["memory_search"],
+            completion_seconds=stage_seconds["completion"],
+            bookkeeping_seconds=finished - bookkeeping_started,
+            total_seconds=finished - started,
         )
-        self._audit.append_event(
-            workspace_id=workspace_id,
-            actor_id=actor_id,
-            action="companion.message",
-            outcome="success",
-            metadata={"memory_hit_count": len(memory_hits)},
+        return CompanionReply(
+            agent_run_id=segment.agent_run_id,
+            response=response,
+            memory_hits=memory_hits,
+            timings=timings,
         )
 
-        return CompanionReply(response=response, memory_hits=memory_hits)
-
     async def execute_goal(
         self,
         *,
@@ -155,6 +299,7 @@ class AgentRuntime:
         actor: ActorContext,
         goal: str,
         approved_request_ids: set[str] | None = None,
+        on_partial: PartialOutputFn | None = None,
     ) -> ExecutionReply:
         approved_ids = approved_request_ids or set()
         specialists = self.list_specialists(workspace_id=workspace_id)
@@ -182,7 +327,7 @@ class AgentRuntime:
                 None,
             )
             if high_impact_denied is not None:
-                self._audit.append_event(
+                await self._audit.append_event(
                     workspace_id=workspace_id,
                     actor_id=actor.user_id,
                     action="goal.execute",
@@ -191,7 +336,7 @@ class AgentRuntime:
                 )
                 raise PermissionError(high_impact_denied)
 
-            self._audit.append_event(
+            await self._audit.append_event(
                 workspace_id=workspace_id,
                 actor_id=actor.user_id,
                 action="goal.execute",
@@ -210,27 +355,28 @@ class AgentRuntime:
                 else "run_tool"
             )
             action_scope = f"delegate:{specialist.id}:{goal}"
-            has_approval = any(
-                self._approvals.is_approved(
+            has_approval = False
+            for approval_id in sorted(approved_ids):
+                if await self._approvals.is_approved(
                     approval_id=approval_id,
                     workspace_id=workspace_id,
                     actor_id=actor.user_id,
                     capability=capability,
                     action=action_scope,
-                )
-                for approval_id in approved_ids
-            )
+                ):
+                    has_approval = True
+                    break
             if has_approval:
                 continue
 
-            request = self._approvals.create_request(
+            request = await self._approvals.create_request(
                 workspace_id=workspace_id,
                 actor_id=actor.user_id,
                 capability=capability,
                 action=action_scope,
                 reason="high-impact delegation requires explicit approval",
             )
-            self._audit.append_event(
+            await self._audit.append_event(
                 workspace_id=workspace_id,
                 actor_id=actor.user_id,
                 action="approval.requested",
@@ -247,79 +393,111 @@ class AgentRuntime:
             )
 
         agent_run_id = f"run-{uuid4()}"
-        self._grant_run_access(
-            agent_run_id=agent_run_id,
-            workspace_id=workspace_id,
-            actor_id=actor.user_id,
-        )
-        self._outbox.append_event(
-            agent_run_id=agent_run_id,
-            event_type="run.started",
-            payload={"goal": goal, "actor_id": actor.user_id},
-        )
-        self._audit.append_event(
-            workspace_id=workspace_id,
-            actor_id=actor.user_id,
-            action="goal.execute",
-            outcome="started",
-            metadata={"agent_run_id": agent_run_id, "goal": goal},
-        )
-
-        delegated_results: list[DelegatedTaskResult] = []
-        for index, specialist_entry in enumerate(eligible_specialists[:2], start=1):
-            specialist = specialist_entry[0]
-            task = f"Subtask {index}: contribute to goal '{goal}'"
-            self._outbox.append_event(
+        async with self._step() as step:
+            granted = self._grant_run_access(
+                step,
                 agent_run_id=agent_run_id,
-                event_type="task.delegated",
-                payload={"specialist_id": specialist.id, "task": task},
-            )
-
-            output = await self._completion_client.complete(
-                system_prompt=f"{specialist.prompt} | soul={specialist.soul}",
-                user_input=task,
-            )
-            delegated = DelegatedTaskResult(
-                specialist_id=specialist.id,
-                specialist_name=specialist.name,
-                task=task,
-                output=output,
+                workspace_id=workspace_id,
+                actor_id=actor.user_id,
             )
-            delegated_results.append(delegated)
-
-            self._outbox.append_event(
+            step.add_run_event(
                 agent_run_id=agent_run_id,
-                event_type="task.completed",
-                payload=asdict(delegated),
+                event_type="run.started",
+                payload={"goal": goal, "actor_id": actor.user_id},
             )
-            self._audit.append_event(
+            step.add_audit_event(
                 workspace_id=workspace_id,
                 actor_id=actor.user_id,
-                action="task.delegated",
-                outcome="completed",
-                metadata={
-                    "agent_run_id": agent_run_id,
-                    "specialist_id": specialist.id,
-                    "task": task,
-                },
+                action="goal.execute",
+                outcome="started",
+                metadata={"agent_run_id": agent_run_id, "goal": goal},
+            )
+        if granted:
+            self._run_access.add(agent_run_id=agent_run_id, actor_id=actor.user_id)
+
+        delegations = [
+            (specialist, f"Subtask {index}: contribute to goal '{goal}'")
+            for index, (specialist, _) in enumerate(
+                eligible_specialists[: self._delegation.max_specialists], start=1
             )
+        ]
+        async with self._step() as step:
+            for specialist, task in delegations:
+                step.add_run_event(
+                    agent_run_id=agent_run_id,
+                    event_type="task.delegated",
+                    payload={"specialist_id": specialist.id, "task": task},
+                )
+
+        outputs = await self._run_delegations(delegations, on_partial=on_partial)
+
+        delegated_results: list[DelegatedTaskResult] = []
+        async with self._step() as step:
+            for (specialist, task), output in zip(delegations, outputs, strict=True):
+                if output is None:
+                    step.add_run_event(
+                        agent_run_id=agent_run_id,
+                        event_type="task.failed",
+                        payload={
+                            "specialist_id": specialist.id,
+                            "task": task,
+                            "reason": "timed out",
+                        },
+                    )
+                    step.add_audit_event(
+                        workspace_id=workspace_id,
+                        actor_id=actor.user_id,
+                        action="task.delegated",
+                        outcome="timed_out",
+                        metadata={
+                            "agent_run_id": agent_run_id,
+                            "specialist_id": specialist.id,
+                            "task": task,
+                        },
+                    )
+                    continue
+
+                delegated = DelegatedTaskResult(
+                    specialist_id=specialist.id,
+                    specialist_name=specialist.name,
+                    task=task,
+                    output=output,
+                )
+                delegated_results.append(delegated)
+                step.add_run_event(
+                    agent_run_id=agent_run_id,
+                    event_type="task.completed",
+                    payload=asdict(delegated),
+                )
+                step.add_audit_event(
+                    workspace_id=workspace_id,
+                    actor_id=actor.user_id,
+                    action="task.delegated",
+                    outcome="completed",
+                    metadata={
+                        "agent_run_id": agent_run_id,
+                        "specialist_id": specialist.id,
+                        "task": task,
+                    },
+                )
 
         summary = (
             f"Completed goal with {len(delegated_results)} delegated "
             "specialist contribution(s)."
         )
-        self._outbox.append_event(
-            agent_run_id=agent_run_id,
-            event_type="run.completed",
-            payload={"summary": summary},
-        )
-        self._audit.append_event(
-            workspace_id=workspace_id,
-            actor_id=actor.user_id,
-            action="goal.execute",
-            outcome="completed",
-            metadata={"agent_run_id": agent_run_id, "summary": summary},
-        )
+        async with self._step() as step:
+            step.add_run_event(
+                agent_run_id=agent_run_id,
+                event_type="run.completed",
+                payload={"summary": summary},
+            )
+            step.add_audit_event(
+                workspace_id=workspace_id,
+                actor_id=actor.user_id,
+                action="goal.execute",
+                outcome="completed",
+                metadata={"agent_run_id": agent_run_id, "summary": summary},
+            )
 
         return ExecutionReply(
             agent_run_id=agent_run_id,
@@ -327,33 +505,125 @@ class AgentRuntime:
             delegated_results=delegated_results,
         )
 
-    def replay_events(
+    async def _run_delegations(
+        self,
+        delegations: list[tuple[SpecialistAgent, str]],
+        *,
+        on_partial: PartialOutputFn | None = None,
+    ) -> list[str | None]:
+        """Run the delegated completions concurrently; outputs follow ``delegations`` order.
+
+        Concurrency is bounded per run and across every run on this runtime. A task that
+        exceeds ``task_timeout_seconds`` yields ``None``; any other failure cancels the
+        remaining tasks and propagates. With ``on_partial`` each specialist's output is
+        streamed and forwarded as it arrives, interleaved across specialists.
+        """
+        run_slots = asyncio.Semaphore(self._delegation.max_concurrency_per_run)
+
+        async def generate(specialist: SpecialistAgent, task: str) -> str:
+            system_prompt = f"{specialist.prompt} | soul={specialist.soul}"
+            if on_partial is None:
+                return await self._completion_client.complete(
+                    system_prompt=system_prompt,
+                    user_input=task,
+                )
+            chunks: list[str] = []
+            async for chunk in stream_completion(
+                self._completion_client,
+                system_prompt=system_prompt,
+                user_input=task,
+            ):
+                chunks.append(chunk)
+                await on_partial(PartialOutput(source=specialist.id, text=chunk))
+            return "".join(chunks)
+
+        async def complete(specialist: SpecialistAgent, task: str) -> str | None:
+            async with run_slots, self._delegation_slots:
+                try:
+                    async with asyncio.timeout(self._delegation.task_timeout_seconds):
+                        return await generate(specialist, task)
+                except TimeoutError:
+                    return None
+
+        try:
+            async with asyncio.TaskGroup() as group:
+                tasks = [
+                    group.create_task(complete(specialist, task))
+                    for specialist, task in delegations
+                ]
+        except BaseExceptionGroup as exc:
+            raise exc.exceptions[0] from None
+        return [task.result() for task in tasks]
+
+    async def _authorize_run_replay(self, *, agent_run_id: str, actor: ActorContext) -> None:
+        if self._run_access.contains(agent_run_id=agent_run_id, actor_id=actor.user_id):
+            return
+
+        persisted_authorization = await self._outbox.is_run_access_allowed(
+            agent_run_id=agent_run_id,
+            actor_id=actor.user_id,
+        )
+        if persisted_authorization is not True:
+            raise PermissionError("actor is not authorized to replay this run")
+        self._run_access.add(agent_run_id=agent_run_id, actor_id=actor.user_id)
+
+    @staticmethod
+    def serialize_event(event: AgentRunEvent) -> dict[str, object]:
+        return {
+            "agent_run_id": event.agent_run_id,
+            "seq": event.seq,
+            "event_type": event.event_type,
+            "payload": event.payload,
+            "created_at": event.created_at,
+        }
+
+    async def replay_events(
         self,
         *,
         agent_run_id: str,
         actor: ActorContext,
         last_seq: int = 0,
     ) -> list[dict[str, object]]:
-        authorized_actor_ids = self._run_actor_ids_by_id.get(agent_run_id)
-        if authorized_actor_ids is not None:
-            if actor.user_id not in authorized_actor_ids:
-                raise PermissionError("actor is not authorized to replay this run")
-        else:
-            persisted_authorization = self._outbox.is_run_access_allowed(
-                agent_run_id=agent_run_id,
-                actor_id=actor.user_id,
-            )
-            if persisted_authorization is not True:
-                raise PermissionError("actor is not authorized to replay this run")
-
-        events = self._outbox.replay(agent_run_id=agent_run_id, last_seq=last_seq)
-        return [
-            {
-                "agent_run_id": event.agent_run_id,
-                "seq": event.seq,
-                "event_type": event.event_type,
-                "payload": event.payload,
-                "created_at": event.created_at,
-            }
-            for event in events
-        ]
+        await self._authorize_run_replay(agent_run_id=agent_run_id, actor=actor)
+        events = await self._outbox.replay(agent_run_id=agent_run_id, last_seq=last_seq)
+        return [self.serialize_event(event) for event in events]
+
+    async def replay_companion_events(
+        self,
+        *,
+        workspace_id: str,
+        actor: ActorContext,
+        cursor: str | None = None,
+        limit: int = 100,
+    ) -> CompanionEventPage:
+        """Page through the workspace's companion log across segments, oldest first.
+
+        Covers the segments ``actor`` has access to. Pass ``next_cursor`` back as ``cursor``
+        for the following page; a malformed or foreign cursor raises ``ValueError``.
+        """
+        return await self._outbox.replay_companion(
+            workspace_id=workspace_id,
+            actor_id=actor.user_id,
+            cursor=cursor,
+            limit=limit,
+        )
+
+    async def open_event_stream(
+        self,
+        *,
+        agent_run_id: str,
+        actor: ActorContext,
+        last_seq: int = 0,
+    ) -> RunEventStream:
+        """Authorize once, then return the backlog after ``last_seq`` followed by live events."""
+        await self._authorize_run_replay(agent_run_id=agent_run_id, actor=actor)
+        if self._event_broker is None:
+            self._event_broker = RunEventBroker()
+            self._outbox.add_append_listener(self._event_broker.publish)
+        subscription = self._event_broker.subscribe(agent_run_id)
+        try:
+            backlog = await self._outbox.replay(agent_run_id=agent_run_id, last_seq=last_seq)
+        except BaseException:
+            subscription.close()
+            raise
+        return RunEventStream(subscription=subscription, backlog=backlog, last_seq=last_seq)
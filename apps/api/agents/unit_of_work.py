@@ -0,0 +1,166 @@
+from types import TracebackType
+
+from apps.api.audit import AuditEvent, ImmutableAuditLog, PendingAuditEvent
+from apps.api.db.pool import StateConnectionPool
+from apps.api.events.outbox import (
+    AgentRunEvent,
+    AgentRunEventOutbox,
+    CompanionSegment,
+    PendingRunEvent,
+    RunAccessGrant,
+)
+
+
+class RunStepUnitOfWork:
+    """Buffers the run access, outbox and audit writes of one runtime step and flushes them.
+
+    Used as ``async with``: buffered writes are flushed when the block exits cleanly and
+    discarded if it raises. When the outbox and audit log share a connection pool the whole
+    step commits in one transaction; otherwise each service writes its batch in one.
+    """
+
+    def __init__(self, *, outbox: AgentRunEventOutbox, audit_log: ImmutableAuditLog) -> None:
+        self._outbox = outbox
+        self._audit = audit_log
+        self._run_access: list[RunAccessGrant] = []
+        self._companion_segments: list[CompanionSegment] = []
+        self._run_events: dict[str, list[PendingRunEvent]] = {}
+        self._audit_events: list[PendingAuditEvent] = []
+
+    async def __aenter__(self) -> "RunStepUnitOfWork":
+        return self
+
+    async def __aexit__(
+        self,
+        exc_type: type[BaseException] | None,
+        exc: BaseException | None,
+        traceback: TracebackType | None,
+    ) -> None:
+        if exc_type is None:
+            await self.flush()
+            return
+        self._run_access.clear()
+        self._companion_segments.clear()
+        self._run_events.clear()
+        self._audit_events.clear()
+
+    def add_run_access(self, *, agent_run_id: str, workspace_id: str, actor_id: str) -> None:
+        """Grant ``actor_id`` access to the run; written before the step's run events."""
+        self._run_access.append(
+            RunAccessGrant(
+                agent_run_id=agent_run_id,
+                workspace_id=workspace_id,
+                actor_id=actor_id,
+            )
+        )
+
+    def add_companion_segment(self, *, segment: CompanionSegment) -> None:
+        """Index a companion log segment; written before the step's run events."""
+        self._companion_segments.append(segment)
+
+    def add_run_event(
+        self,
+        *,
+        agent_run_id: str,
+        event_type: str,
+        payload: dict[str, object],
+    ) -> None:
+        self._run_events.setdefault(agent_run_id, []).append(
+            PendingRunEvent(event_type=event_type, payload=payload)
+        )
+
+    def add_audit_event(
+        self,
+        *,
+        workspace_id: str,
+        actor_id: str,
+        action: str,
+        outcome: str,
+        metadata: dict[str, object] | None = None,
+    ) -> None:
+        self._audit_events.append(
+            PendingAuditEvent(
+                workspace_id=workspace_id,
+                actor_id=actor_id,
+                action=action,
+                outcome=outcome,
+                metadata=metadata,
+            )
+        )
+
+    async def flush(self) -> None:
+        run_access = self._run_access
+        companion_segments = self._companion_segments
+        run_events = self._run_events
+        audit_events = self._audit_events
+        self._run_access = []
+        self._companion_segments = []
+        self._run_events = {}
+        self._audit_events = []
+        if not run_access and not companion_segments and not run_events and not audit_events:
+            return
+
+        pool = self._outbox.pool
+        if pool is not None and pool is self._audit.pool:
+            appended, audited = await pool.run(
+                self._write_together,
+                pool,
+                run_access,
+                companion_segments,
+                run_events,
+                audit_events,
+            )
+            self._outbox.notify_appended(appended)
+            self._audit.notify_appended(audited)
+            return
+
+        for grant in run_access:
+            await self._outbox.register_run_access(
+                agent_run_id=grant.agent_run_id,
+                workspace_id=grant.workspace_id,
+                actor_id=grant.actor_id,
+            )
+        for segment in companion_segments:
+            await self._outbox.register_companion_segment(segment=segment)
+        for agent_run_id, events in run_events.items():
+            await self._outbox.append_events(agent_run_id=agent_run_id, events=events)
+        if audit_events:
+            await self._audit.append_events(events=audit_events)
+
+    def _write_together(
+        self,
+        pool: StateConnectionPool,
+        run_access: list[RunAccessGrant],
+        companion_segments: list[CompanionSegment],
+        run_events: dict[str, list[PendingRunEvent]],
+        audit_events: list[PendingAuditEvent],
+    ) -> tuple[list[AgentRunEvent], list[AuditEvent]]:
+        appended: list[AgentRunEvent] = []
+        audited: list[AuditEvent] = []
+        with pool.writer() as connection:
+            try:
+                connection.execute("begin immediate")
+                for grant in run_access:
+                    self._outbox.write_run_access(
+                        connection,
+                        agent_run_id=grant.agent_run_id,
+                        workspace_id=grant.workspace_id,
+                        actor_id=grant.actor_id,
+                    )
+                for segment in companion_segments:
+                    self._outbox.write_companion_segment(connection, segment=segment)
+                for agent_run_id, events in run_events.items():
+                    appended.extend(
+                        self._outbox.write_events(
+                            connection,
+                            agent_run_id=agent_run_id,
+                            events=events,
+                        )
+                    )
+                if audit_events:
+                    audited = self._audit.write_events(connection, events=audit_events)
+                connection.commit()
+            except Exception:
+                connection.rollback()
+                raise
+        return appended, audited
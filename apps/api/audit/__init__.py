@@ -1,3 +1,15 @@
-from apps.api.audit.logging import AuditEvent, ImmutableAuditLog
+from apps.api.audit.logging import (
+    AuditChainCheckpoint,
+    AuditEvent,
+    ChainVerification,
+    ImmutableAuditLog,
+    PendingAuditEvent,
+)
 
-__all__ = ["AuditEvent", "ImmutableAuditLog"]
+__all__ = [
+    "AuditChainCheckpoint",
+    "AuditEvent",
+    "ChainVerification",
+    "ImmutableAuditLog",
+    "PendingAuditEvent",
+]
@@ -1,11 +1,19 @@
 import hashlib
+import hmac
 import json
+import logging
+import os
+import secrets
 import sqlite3
+from collections.abc import Callable, Iterable, Sequence
 from dataclasses import dataclass
-from datetime import datetime, timezone
+from datetime import datetime, timedelta, timezone
+from typing import cast
 from uuid import uuid4
 
-from apps.api.db.state import connect_state_db
+from apps.api.db.pool import StateConnectionPool, run_state_operation
+
+logger = logging.getLogger(__name__)
 
 
 @dataclass(frozen=True)
@@ -19,6 +27,86 @@ class AuditEvent:
     previous_hash: str
     event_hash: str
     created_at: str
+    seq: int = 0
+
+
+@dataclass(frozen=True)
+class PendingAuditEvent:
+    workspace_id: str
+    actor_id: str
+    action: str
+    outcome: str
+    metadata: dict[str, object] | None = None
+
+
+@dataclass(frozen=True)
+class AuditEventPage:
+    """One page of audit history, oldest first; pass ``next_cursor`` to read older events."""
+
+    events: list[AuditEvent]
+    next_cursor: int | None
+
+
+@dataclass(frozen=True)
+class AuditChainCheckpoint:
+    workspace_id: str
+    last_event_id: str
+    last_event_hash: str
+    last_created_at: str
+    event_count: int
+    signature: str
+    created_at: str
+
+
+@dataclass(frozen=True)
+class ChainVerification:
+    """Outcome of ``verify_chain``; truthy when the whole chain verified."""
+
+    workspace_id: str
+    valid: bool
+    verified_count: int
+    checked_count: int
+    last_event_id: str | None
+    last_event_hash: str
+    last_created_at: str
+    resumed_from: str | None = None
+    resumed_count: int = 0
+    broken_event_id: str | None = None
+    broken_reason: str | None = None
+
+    def __bool__(self) -> bool:
+        return self.valid
+
+
+@dataclass(frozen=True)
+class _ChainHead:
+    seq: int = 0
+    event_hash: str = ""
+    created_at: str = ""
+
+
+_EMPTY_CHAIN_HEAD = _ChainHead()
+
+
+def resolve_audit_checkpoint_key(key: str | None = None) -> bytes | None:
+    """Checkpoint signing key from ``ELARA_AUDIT_CHECKPOINT_KEY``, or None when unset.
+
+    Stored checkpoints must be verifiable after a restart and by other processes, so they
+    are only read and written with a configured key.
+    """
+    value = key if key is not None else os.getenv("ELARA_AUDIT_CHECKPOINT_KEY")
+    if not value:
+        return None
+    return value.encode("utf-8")
+
+
+def _next_created_at(previous_created_at: str) -> str:
+    """Current UTC time, nudged past the chain head so batched events never tie."""
+    now = datetime.now(timezone.utc)
+    if previous_created_at:
+        floor = datetime.fromisoformat(previous_created_at) + timedelta(microseconds=1)
+        now = max(now, floor)
+    return now.isoformat()
 
 
 class ImmutableAuditLog:
@@ -29,24 +117,45 @@ class ImmutableAuditLog:
         *,
         database_path: str | None = None,
         connection: sqlite3.Connection | None = None,
+        pool: StateConnectionPool | None = None,
+        checkpoint_key: str | None = None,
     ) -> None:
-        self._connection = connection
-        self._owns_connection = False
-        if self._connection is None and database_path is not None:
-            self._connection = connect_state_db(database_path)
-            self._owns_connection = True
+        self._pool = pool
+        self._owns_pool = False
+        if self._pool is None and (connection is not None or database_path is not None):
+            self._pool = StateConnectionPool(database_path=database_path, connection=connection)
+            self._owns_pool = connection is None
         self._events_by_workspace: dict[str, list[AuditEvent]] = {}
-        self._last_hash_by_workspace: dict[str, str] = {}
+        self._checkpoints_by_workspace: dict[str, AuditChainCheckpoint] = {}
+        self._chain_heads: dict[str, _ChainHead] = {}
+        configured_key = resolve_audit_checkpoint_key(checkpoint_key)
+        self._stores_checkpoints = configured_key is not None
+        # In-memory checkpoints never leave this instance, so a per-instance key is enough.
+        self._checkpoint_key = configured_key or secrets.token_bytes(32)
+        if self._pool is not None and not self._stores_checkpoints:
+            logger.warning(
+                "ELARA_AUDIT_CHECKPOINT_KEY is not set: audit chain checkpoints are disabled "
+                "and every verification re-hashes the full chain"
+            )
 
     def close(self) -> None:
-        if self._connection is None or not self._owns_connection:
+        if self._pool is None or not self._owns_pool:
             return
-        self._connection.close()
-        self._connection = None
+        self._pool.close()
+        self._pool = None
 
     def __del__(self) -> None:
         self.close()
 
+    @property
+    def stores_checkpoints(self) -> bool:
+        """Whether a checkpoint key is configured, so stored checkpoints are read and written."""
+        return self._stores_checkpoints
+
+    @property
+    def pool(self) -> StateConnectionPool | None:
+        return self._pool
+
     @staticmethod
     def _serialize_payload(
         *,
@@ -71,26 +180,81 @@ class ImmutableAuditLog:
     def _hash_event(*, previous_hash: str, serialized_payload: str) -> str:
         return hashlib.sha256(f"{previous_hash}:{serialized_payload}".encode("utf-8")).hexdigest()
 
-    def _last_hash_for_workspace(self, *, workspace_id: str) -> str:
-        if self._connection is None:
-            return self._last_hash_by_workspace.get(workspace_id, "")
+    def _memory_chain_head(self, workspace_id: str) -> _ChainHead:
+        events = self._events_by_workspace.get(workspace_id)
+        if not events:
+            return _EMPTY_CHAIN_HEAD
+        return _ChainHead(
+            seq=events[-1].seq,
+            event_hash=events[-1].event_hash,
+            created_at=events[-1].created_at,
+        )
 
-        cursor = self._connection.execute(
+    @staticmethod
+    def _stored_chain_head(connection: sqlite3.Connection, workspace_id: str) -> _ChainHead:
+        cursor = connection.execute(
             """
-            select event_hash
-            from audit_event_record
+            select last_seq, last_event_hash, last_created_at
+            from audit_chain_head_record
             where workspace_id = ?
-            order by created_at desc
-            limit 1
             """,
             (workspace_id,),
         )
         row = cursor.fetchone()
         if row is None:
-            return ""
-        return str(row[0])
+            return _EMPTY_CHAIN_HEAD
+        return _ChainHead(seq=int(row[0]), event_hash=str(row[1]), created_at=str(row[2]))
 
-    def append_event(
+    @staticmethod
+    def _advance_chain_heads(
+        connection: sqlite3.Connection,
+        *,
+        previous: dict[str, _ChainHead],
+        current: dict[str, _ChainHead],
+    ) -> bool:
+        """Move each stored head from ``previous`` to ``current``; False if any had moved on.
+
+        The compare-and-swap runs under a savepoint inside the caller's transaction, so a
+        stale head leaves no partial updates and a later rollback also undoes the heads.
+        """
+        connection.execute("savepoint audit_chain_head")
+        try:
+            for workspace_id, head in current.items():
+                expected = previous[workspace_id]
+                if expected.seq == 0:
+                    cursor = connection.execute(
+                        """
+                        insert into audit_chain_head_record (
+                          workspace_id, last_seq, last_event_hash, last_created_at
+                        ) values (?, ?, ?, ?)
+                        on conflict (workspace_id) do nothing
+                        """,
+                        (workspace_id, head.seq, head.event_hash, head.created_at),
+                    )
+                else:
+                    cursor = connection.execute(
+                        """
+                        update audit_chain_head_record
+                        set last_seq = ?, last_event_hash = ?, last_created_at = ?
+                        where workspace_id = ? and last_seq = ? and last_event_hash = ?
+                        """,
+                        (
+                            head.seq,
+                            head.event_hash,
+                            head.created_at,
+                            workspace_id,
+                            expected.seq,
+                            expected.event_hash,
+                        ),
+                    )
+                if cursor.rowcount != 1:
+                    connection.execute("rollback to audit_chain_head")
+                    return False
+            return True
+        finally:
+            connection.execute("release audit_chain_head")
+
+    async def append_event(
         self,
         *,
         workspace_id: str,
@@ -99,47 +263,99 @@ class ImmutableAuditLog:
         outcome: str,
         metadata: dict[str, object] | None = None,
     ) -> AuditEvent:
-        previous_hash = self._last_hash_for_workspace(workspace_id=workspace_id)
-        payload = metadata or {}
-        created_at = datetime.now(timezone.utc).isoformat()
-
-        serialized = self._serialize_payload(
+        return await run_state_operation(
+            self._pool,
+            self._append_event,
             workspace_id=workspace_id,
             actor_id=actor_id,
             action=action,
             outcome=outcome,
-            metadata=payload,
-            created_at=created_at,
+            metadata=metadata,
         )
-        event_hash = self._hash_event(previous_hash=previous_hash, serialized_payload=serialized)
 
-        event = AuditEvent(
-            id=f"audit-{uuid4()}",
+    def _append_event(
+        self,
+        *,
+        workspace_id: str,
+        actor_id: str,
+        action: str,
+        outcome: str,
+        metadata: dict[str, object] | None = None,
+    ) -> AuditEvent:
+        pending = PendingAuditEvent(
             workspace_id=workspace_id,
             actor_id=actor_id,
             action=action,
             outcome=outcome,
-            metadata=payload,
-            previous_hash=previous_hash,
-            event_hash=event_hash,
-            created_at=created_at,
+            metadata=metadata,
         )
+        return self._append_events(events=[pending])[0]
+
+    async def append_events(self, *, events: Sequence[PendingAuditEvent]) -> list[AuditEvent]:
+        """Chain and persist several events in one transaction, in the order given."""
+        return await run_state_operation(self._pool, self._append_events, events=events)
+
+    def _append_events(self, *, events: Sequence[PendingAuditEvent]) -> list[AuditEvent]:
+        if self._pool is None:
+            chained = self._chain_events(events, chain_head=self._memory_chain_head)
+            for event in chained:
+                self._events_by_workspace.setdefault(event.workspace_id, []).append(event)
+            return chained
+
+        with self._pool.writer() as connection:
+            try:
+                chained = self.write_events(connection, events=events)
+                connection.commit()
+            except Exception:
+                connection.rollback()
+                raise
+        self.notify_appended(chained)
+        return chained
+
+    def write_events(
+        self,
+        connection: sqlite3.Connection,
+        *,
+        events: Sequence[PendingAuditEvent],
+    ) -> list[AuditEvent]:
+        """Insert events on a borrowed writer connection; the caller owns the commit.
 
-        if self._connection is None:
-            workspace_events = self._events_by_workspace.setdefault(workspace_id, [])
-            workspace_events.append(event)
-            self._last_hash_by_workspace[workspace_id] = event_hash
+        Chain heads come from the in-process cache and are validated by the head update
+        itself, so appends need no read round trip unless another writer moved a head. A
+        transaction is opened here if the caller has none, so the head update can never
+        commit without its events; call ``notify_appended`` once the commit succeeds.
+        """
+        if not events:
+            return []
+        if not connection.in_transaction:
+            connection.execute("begin immediate")
+        workspace_ids = list(dict.fromkeys(event.workspace_id for event in events))
+        for use_cache in (True, False):
+            heads = {
+                workspace_id: (self._chain_heads.get(workspace_id) if use_cache else None)
+                or self._stored_chain_head(connection, workspace_id)
+                for workspace_id in workspace_ids
+            }
+            chained = self._chain_events(events, chain_head=heads.__getitem__)
+            current = self._heads_after(chained)
+            if self._advance_chain_heads(connection, previous=heads, current=current):
+                break
+            for workspace_id in workspace_ids:
+                self._chain_heads.pop(workspace_id, None)
         else:
-            self._connection.execute(
-                """
-                insert into audit_event_record (
-                  id, workspace_id, actor_id, action, outcome, metadata_json,
-                  previous_hash, event_hash, created_at
-                ) values (?, ?, ?, ?, ?, ?, ?, ?, ?)
-                """,
+            raise RuntimeError("audit chain head moved while appending")
+        connection.executemany(
+            """
+            insert into audit_event_record (
+              id, workspace_id, seq, actor_id, action, outcome, metadata_json,
+              previous_hash, event_hash, created_at
+            ) values (?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
+            """,
+            [
                 (
                     event.id,
                     event.workspace_id,
+                    event.seq,
                     event.actor_id,
                     event.action,
                     event.outcome,
@@ -147,47 +363,359 @@ class ImmutableAuditLog:
                     event.previous_hash,
                     event.event_hash,
                     event.created_at,
-                ),
+                )
+                for event in chained
+            ],
+        )
+        return chained
+
+    def notify_appended(self, events: Sequence[AuditEvent]) -> None:
+        """Advance the cached chain heads past events whose transaction has committed."""
+        self._chain_heads.update(self._heads_after(events))
+
+    def _chain_events(
+        self,
+        events: Sequence[PendingAuditEvent],
+        *,
+        chain_head: Callable[[str], _ChainHead],
+    ) -> list[AuditEvent]:
+        heads: dict[str, _ChainHead] = {}
+        chained: list[AuditEvent] = []
+        for pending in events:
+            head = heads.get(pending.workspace_id)
+            if head is None:
+                head = chain_head(pending.workspace_id)
+            event = self._build_event(
+                workspace_id=pending.workspace_id,
+                actor_id=pending.actor_id,
+                action=pending.action,
+                outcome=pending.outcome,
+                metadata=pending.metadata,
+                previous_hash=head.event_hash,
+                created_at=_next_created_at(head.created_at),
+                seq=head.seq + 1,
+            )
+            heads[pending.workspace_id] = _ChainHead(
+                seq=event.seq,
+                event_hash=event.event_hash,
+                created_at=event.created_at,
+            )
+            chained.append(event)
+        return chained
+
+    @staticmethod
+    def _heads_after(chained: Sequence[AuditEvent]) -> dict[str, _ChainHead]:
+        return {
+            event.workspace_id: _ChainHead(
+                seq=event.seq,
+                event_hash=event.event_hash,
+                created_at=event.created_at,
+            )
+            for event in chained
+        }
+
+    def _build_event(
+        self,
+        *,
+        workspace_id: str,
+        actor_id: str,
+        action: str,
+        outcome: str,
+        metadata: dict[str, object] | None,
+        previous_hash: str,
+        created_at: str,
+        seq: int,
+    ) -> AuditEvent:
+        payload = metadata or {}
+
+        serialized = self._serialize_payload(
+            workspace_id=workspace_id,
+            actor_id=actor_id,
+            action=action,
+            outcome=outcome,
+            metadata=payload,
+            created_at=created_at,
+        )
+        return AuditEvent(
+            id=f"audit-{uuid4()}",
+            workspace_id=workspace_id,
+            actor_id=actor_id,
+            action=action,
+            outcome=outcome,
+            metadata=payload,
+            previous_hash=previous_hash,
+            event_hash=self._hash_event(previous_hash=previous_hash, serialized_payload=serialized),
+            created_at=created_at,
+            seq=seq,
+        )
+
+    @staticmethod
+    def _event_from_row(row: tuple[object, ...]) -> AuditEvent:
+        return AuditEvent(
+            id=str(row[0]),
+            workspace_id=str(row[1]),
+            actor_id=str(row[2]),
+            action=str(row[3]),
+            outcome=str(row[4]),
+            metadata=json.loads(str(row[5])),
+            previous_hash=str(row[6]),
+            event_hash=str(row[7]),
+            created_at=str(row[8]),
+            seq=int(cast(int, row[9])),
+        )
+
+    async def list_events(
+        self,
+        *,
+        workspace_id: str,
+        limit: int = 100,
+        before_seq: int | None = None,
+        action: str | None = None,
+        actor_id: str | None = None,
+        outcome: str | None = None,
+        since: str | None = None,
+        until: str | None = None,
+    ) -> list[AuditEvent]:
+        page = await self.list_event_page(
+            workspace_id=workspace_id,
+            limit=limit,
+            before_seq=before_seq,
+            action=action,
+            actor_id=actor_id,
+            outcome=outcome,
+            since=since,
+            until=until,
+        )
+        return page.events
+
+    async def list_event_page(
+        self,
+        *,
+        workspace_id: str,
+        limit: int = 100,
+        before_seq: int | None = None,
+        action: str | None = None,
+        actor_id: str | None = None,
+        outcome: str | None = None,
+        since: str | None = None,
+        until: str | None = None,
+    ) -> AuditEventPage:
+        """Newest ``limit`` matching events with ``seq < before_seq``, returned oldest first.
+
+        Pages are keyed on the workspace ``seq``, so each page costs an index seek no matter
+        how deep into the history it is. ``since`` is inclusive and ``until`` exclusive.
+        """
+        return await run_state_operation(
+            self._pool,
+            self._list_event_page,
+            workspace_id=workspace_id,
+            limit=limit,
+            before_seq=before_seq,
+            action=action,
+            actor_id=actor_id,
+            outcome=outcome,
+            since=since,
+            until=until,
+        )
+
+    def _list_event_page(
+        self,
+        *,
+        workspace_id: str,
+        limit: int = 100,
+        before_seq: int | None = None,
+        action: str | None = None,
+        actor_id: str | None = None,
+        outcome: str | None = None,
+        since: str | None = None,
+        until: str | None = None,
+    ) -> AuditEventPage:
+        if self._pool is None:
+            matching = [
+                event
+                for event in self._events_by_workspace.get(workspace_id, [])
+                if (before_seq is None or event.seq < before_seq)
+                and (action is None or event.action == action)
+                and (actor_id is None or event.actor_id == actor_id)
+                and (outcome is None or event.outcome == outcome)
+                and (since is None or event.created_at >= since)
+                and (until is None or event.created_at < until)
+            ]
+            return self._page_from(list(reversed(matching[-(limit + 1) :])), limit=limit)
+
+        with self._pool.snapshot() as connection:
+            lower_seq = 1
+            upper_seq = before_seq
+            if since is not None:
+                first_seq = self._first_seq_at(connection, workspace_id, since)
+                if first_seq is None:
+                    return AuditEventPage(events=[], next_cursor=None)
+                lower_seq = first_seq
+            if until is not None:
+                until_seq = self._first_seq_at(connection, workspace_id, until)
+                if until_seq is not None:
+                    upper_seq = until_seq if upper_seq is None else min(upper_seq, until_seq)
+
+            clauses = ["workspace_id = ?", "seq >= ?"]
+            parameters: list[object] = [workspace_id, lower_seq]
+            if upper_seq is not None:
+                clauses.append("seq < ?")
+                parameters.append(upper_seq)
+            for column, value in (("action", action), ("actor_id", actor_id), ("outcome", outcome)):
+                if value is not None:
+                    clauses.append(f"{column} = ?")
+                    parameters.append(value)
+            parameters.append(limit + 1)
+            cursor = connection.execute(
+                f"""
+                select id, workspace_id, actor_id, action, outcome, metadata_json,
+                       previous_hash, event_hash, created_at, seq
+                from audit_event_record
+                where {" and ".join(clauses)}
+                order by seq desc
+                limit ?
+                """,
+                parameters,
+            )
+            newest_first = [self._event_from_row(row) for row in cursor.fetchall()]
+        return self._page_from(newest_first, limit=limit)
+
+    @staticmethod
+    def _first_seq_at(
+        connection: sqlite3.Connection, workspace_id: str, created_at: str
+    ) -> int | None:
+        """Lowest seq created at or after ``created_at``.
+
+        ``created_at`` never decreases along a chain, so a time bound maps onto a seq bound
+        with one probe of ``idx_audit_event_workspace_created`` and the page query itself
+        stays on a seq range.
+        """
+        row = connection.execute(
+            """
+            select seq from audit_event_record
+            where workspace_id = ? and created_at >= ?
+            order by created_at asc, seq asc
+            limit 1
+            """,
+            (workspace_id, created_at),
+        ).fetchone()
+        return None if row is None else int(row[0])
+
+    @staticmethod
+    def _page_from(newest_first: list[AuditEvent], *, limit: int) -> AuditEventPage:
+        page = newest_first[:limit]
+        next_cursor = page[-1].seq if len(newest_first) > limit else None
+        return AuditEventPage(events=list(reversed(page)), next_cursor=next_cursor)
+
+    async def verify_chain(self, *, workspace_id: str, full: bool = False) -> ChainVerification:
+        """Verify the workspace chain, resuming from its last signed checkpoint.
+
+        Only events after the checkpoint are re-hashed, streamed from a cursor in chain
+        order. A checkpoint whose signature or anchor row no longer matches is ignored, and
+        ``full=True`` always verifies from the first event. On return the checkpoint is
+        advanced to the last event that verified.
+        """
+        return await run_state_operation(
+            self._pool,
+            self._verify_chain,
+            workspace_id=workspace_id,
+            full=full,
+        )
+
+    def _verify_chain(self, *, workspace_id: str, full: bool = False) -> ChainVerification:
+        if self._pool is None:
+            checkpoint = None if full else self._checkpoints_by_workspace.get(workspace_id)
+            if checkpoint is not None and not self._checkpoint_is_trusted(checkpoint):
+                checkpoint = None
+            events = self._events_by_workspace.get(workspace_id, [])
+            start = 0 if checkpoint is None else checkpoint.event_count
+            result = self._verify_events(
+                workspace_id=workspace_id,
+                events=events[start:],
+                checkpoint=checkpoint,
             )
-            self._connection.commit()
-        return event
+            if result.verified_count > start:
+                self._checkpoints_by_workspace[workspace_id] = self._sign_checkpoint(result)
+            return result
+
+        with self._pool.snapshot() as connection:
+            result = self.verify_stored_chain(connection, workspace_id=workspace_id, full=full)
+        if self._stores_checkpoints and result.verified_count > result.resumed_count:
+            with self._pool.writer() as connection:
+                self.write_checkpoint(connection, result)
+                connection.commit()
+        return result
 
-    def list_events(self, *, workspace_id: str, limit: int = 100) -> list[AuditEvent]:
-        if self._connection is None:
-            return self._events_by_workspace.get(workspace_id, [])[-limit:]
+    def verify_stored_chain(
+        self,
+        connection: sqlite3.Connection,
+        *,
+        workspace_id: str,
+        full: bool = False,
+    ) -> ChainVerification:
+        """Verify a workspace chain on a borrowed (possibly read-only) connection.
 
-        cursor = self._connection.execute(
+        Does not record a checkpoint; pass the result to ``write_checkpoint`` for that.
+        Without a checkpoint key the whole chain is verified.
+        """
+        checkpoint = None
+        if self._stores_checkpoints and not full:
+            checkpoint = self._load_checkpoint(connection, workspace_id)
+        if checkpoint is not None and not self._checkpoint_is_trusted(
+            checkpoint,
+            connection=connection,
+        ):
+            checkpoint = None
+        cursor = connection.execute(
             """
             select id, workspace_id, actor_id, action, outcome, metadata_json,
-                   previous_hash, event_hash, created_at
+                   previous_hash, event_hash, created_at, seq
             from audit_event_record
-            where workspace_id = ?
-            order by created_at desc
-            limit ?
+            where workspace_id = ? and seq > ?
+            order by seq asc
             """,
-            (workspace_id, limit),
-        )
-        rows = list(reversed(cursor.fetchall()))
-        return [
-            AuditEvent(
-                id=str(row[0]),
-                workspace_id=str(row[1]),
-                actor_id=str(row[2]),
-                action=str(row[3]),
-                outcome=str(row[4]),
-                metadata=json.loads(str(row[5])),
-                previous_hash=str(row[6]),
-                event_hash=str(row[7]),
-                created_at=str(row[8]),
-            )
-            for row in rows
-        ]
+            (workspace_id, 0 if checkpoint is None else checkpoint.event_count),
+        )
+        return self._verify_events(
+            workspace_id=workspace_id,
+            events=(self._event_from_row(row) for row in cursor),
+            checkpoint=checkpoint,
+        )
 
-    def verify_chain(self, *, workspace_id: str) -> bool:
-        events = self.list_events(workspace_id=workspace_id, limit=1_000_000)
-        previous_hash = ""
+    def _verify_events(
+        self,
+        *,
+        workspace_id: str,
+        events: Iterable[AuditEvent],
+        checkpoint: AuditChainCheckpoint | None,
+    ) -> ChainVerification:
+        verified_count = 0 if checkpoint is None else checkpoint.event_count
+        last_event_id = None if checkpoint is None else checkpoint.last_event_id
+        last_created_at = "" if checkpoint is None else checkpoint.last_created_at
+        previous_hash = "" if checkpoint is None else checkpoint.last_event_hash
+        checked_count = 0
+
+        def outcome(
+            broken: AuditEvent | None = None, reason: str | None = None
+        ) -> ChainVerification:
+            return ChainVerification(
+                workspace_id=workspace_id,
+                valid=broken is None,
+                verified_count=verified_count,
+                checked_count=checked_count,
+                last_event_id=last_event_id,
+                last_event_hash=previous_hash,
+                last_created_at=last_created_at,
+                resumed_from=None if checkpoint is None else checkpoint.last_event_id,
+                resumed_count=0 if checkpoint is None else checkpoint.event_count,
+                broken_event_id=None if broken is None else broken.id,
+                broken_reason=reason,
+            )
 
         for event in events:
+            checked_count += 1
+            if event.previous_hash != previous_hash:
+                return outcome(event, "previous_hash does not match the preceding event")
             serialized = self._serialize_payload(
                 workspace_id=event.workspace_id,
                 actor_id=event.actor_id,
@@ -200,11 +728,149 @@ class ImmutableAuditLog:
                 previous_hash=previous_hash,
                 serialized_payload=serialized,
             )
-
-            if event.previous_hash != previous_hash:
-                return False
             if event.event_hash != computed_hash:
-                return False
+                return outcome(event, "event_hash does not match the event contents")
             previous_hash = event.event_hash
+            last_event_id = event.id
+            last_created_at = event.created_at
+            verified_count += 1
+
+        return outcome()
+
+    def _signature(
+        self,
+        *,
+        workspace_id: str,
+        last_event_id: str,
+        last_event_hash: str,
+        last_created_at: str,
+        event_count: int,
+    ) -> str:
+        message = json.dumps(
+            [workspace_id, last_event_id, last_event_hash, last_created_at, event_count],
+            separators=(",", ":"),
+        )
+        return hmac.new(self._checkpoint_key, message.encode("utf-8"), hashlib.sha256).hexdigest()
+
+    def _sign_checkpoint(self, result: ChainVerification) -> AuditChainCheckpoint:
+        last_event_id = result.last_event_id or ""
+        return AuditChainCheckpoint(
+            workspace_id=result.workspace_id,
+            last_event_id=last_event_id,
+            last_event_hash=result.last_event_hash,
+            last_created_at=result.last_created_at,
+            event_count=result.verified_count,
+            signature=self._signature(
+                workspace_id=result.workspace_id,
+                last_event_id=last_event_id,
+                last_event_hash=result.last_event_hash,
+                last_created_at=result.last_created_at,
+                event_count=result.verified_count,
+            ),
+            created_at=datetime.now(timezone.utc).isoformat(),
+        )
+
+    def _checkpoint_is_trusted(
+        self,
+        checkpoint: AuditChainCheckpoint,
+        *,
+        connection: sqlite3.Connection | None = None,
+    ) -> bool:
+        expected = self._signature(
+            workspace_id=checkpoint.workspace_id,
+            last_event_id=checkpoint.last_event_id,
+            last_event_hash=checkpoint.last_event_hash,
+            last_created_at=checkpoint.last_created_at,
+            event_count=checkpoint.event_count,
+        )
+        if not hmac.compare_digest(expected, checkpoint.signature):
+            return False
+        if connection is None:
+            events = self._events_by_workspace.get(checkpoint.workspace_id, [])
+            if len(events) < checkpoint.event_count:
+                return False
+            anchor = events[checkpoint.event_count - 1]
+            return (anchor.id, anchor.event_hash, anchor.created_at) == (
+                checkpoint.last_event_id,
+                checkpoint.last_event_hash,
+                checkpoint.last_created_at,
+            )
+
+        cursor = connection.execute(
+            """
+            select 1
+            from audit_event_record
+            where id = ? and workspace_id = ? and seq = ? and event_hash = ? and created_at = ?
+            """,
+            (
+                checkpoint.last_event_id,
+                checkpoint.workspace_id,
+                checkpoint.event_count,
+                checkpoint.last_event_hash,
+                checkpoint.last_created_at,
+            ),
+        )
+        return cursor.fetchone() is not None
+
+    @staticmethod
+    def _load_checkpoint(
+        connection: sqlite3.Connection,
+        workspace_id: str,
+    ) -> AuditChainCheckpoint | None:
+        cursor = connection.execute(
+            """
+            select workspace_id, last_event_id, last_event_hash, last_created_at,
+                   event_count, signature, created_at
+            from audit_chain_checkpoint_record
+            where workspace_id = ?
+            """,
+            (workspace_id,),
+        )
+        row = cursor.fetchone()
+        if row is None:
+            return None
+        return AuditChainCheckpoint(
+            workspace_id=str(row[0]),
+            last_event_id=str(row[1]),
+            last_event_hash=str(row[2]),
+            last_created_at=str(row[3]),
+            event_count=int(row[4]),
+            signature=str(row[5]),
+            created_at=str(row[6]),
+        )
+
+    def write_checkpoint(self, connection: sqlite3.Connection, result: ChainVerification) -> None:
+        """Sign and store a checkpoint at the last verified event; the caller owns the commit.
 
-        return True
+        A stored checkpoint is only ever moved forward. Requires a configured checkpoint key.
+        """
+        if not self._stores_checkpoints:
+            raise RuntimeError("ELARA_AUDIT_CHECKPOINT_KEY is required to write audit checkpoints")
+        if result.last_event_id is None:
+            return
+        checkpoint = self._sign_checkpoint(result)
+        connection.execute(
+            """
+            insert into audit_chain_checkpoint_record (
+              workspace_id, last_event_id, last_event_hash, last_created_at,
+              event_count, signature, created_at
+            ) values (?, ?, ?, ?, ?, ?, ?)
+            on conflict (workspace_id) do update set
+              last_event_id = excluded.last_event_id,
+              last_event_hash = excluded.last_event_hash,
+              last_created_at = excluded.last_created_at,
+              event_count = excluded.event_count,
+              signature = excluded.signature,
+              created_at = excluded.created_at
+            where excluded.event_count > audit_chain_checkpoint_record.event_count
+            """,
+            (
+                checkpoint.workspace_id,
+                checkpoint.last_event_id,
+                checkpoint.last_event_hash,
+                checkpoint.last_created_at,
+                checkpoint.event_count,
+                checkpoint.signature,
+                checkpoint.created_at,
+            ),
+        )
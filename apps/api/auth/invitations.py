@@ -4,7 +4,7 @@ from dataclasses import dataclass
 from datetime import datetime, timedelta, timezone
 from typing import Literal
 
-from apps.api.db.state import connect_state_db
+from apps.api.db.pool import StateConnectionPool, run_state_operation
 
 InviteRole = Literal["member"]
 
@@ -35,21 +35,22 @@ class InvitationService:
         *,
         database_path: str | None = None,
         connection: sqlite3.Connection | None = None,
+        pool: StateConnectionPool | None = None,
     ) -> None:
-        self._connection = connection
-        self._owns_connection = False
-        if self._connection is None and database_path is not None:
-            self._connection = connect_state_db(database_path)
-            self._owns_connection = True
+        self._pool = pool
+        self._owns_pool = False
+        if self._pool is None and (connection is not None or database_path is not None):
+            self._pool = StateConnectionPool(database_path=database_path, connection=connection)
+            self._owns_pool = connection is None
 
         self._invitations: dict[str, Invitation] = {}
         self._memberships_by_workspace: dict[str, list[WorkspaceMembership]] = {}
 
     def close(self) -> None:
-        if self._connection is None or not self._owns_connection:
+        if self._pool is None or not self._owns_pool:
             return
-        self._connection.close()
-        self._connection = None
+        self._pool.close()
+        self._pool = None
 
     def __del__(self) -> None:
         self.close()
@@ -59,19 +60,21 @@ class InvitationService:
         *,
         workspace_id: str,
     ) -> list[Invitation]:
-        if self._connection is None:
+        if self._pool is None:
             raise RuntimeError("database connection is required")
 
-        cursor = self._connection.execute(
-            """
-            select token, workspace_id, email, role, invited_by, created_at, expires_at, accepted
-            from invitation_record
-            where workspace_id = ?
-            order by created_at asc
-            """,
-            (workspace_id,),
-        )
-        rows = cursor.fetchall()
+        with self._pool.reader() as connection:
+            cursor = connection.execute(
+                """
+                select token, workspace_id, email, role, invited_by, created_at, expires_at,
+                       accepted
+                from invitation_record
+                where workspace_id = ?
+                order by created_at asc
+                """,
+                (workspace_id,),
+            )
+            rows = cursor.fetchall()
         return [
             Invitation(
                 token=row[0],
@@ -86,7 +89,26 @@ class InvitationService:
             for row in rows
         ]
 
-    def create_invitation(
+    async def create_invitation(
+        self,
+        *,
+        workspace_id: str,
+        email: str,
+        invited_by: str,
+        role: InviteRole = "member",
+        ttl_hours: int = 72,
+    ) -> Invitation:
+        return await run_state_operation(
+            self._pool,
+            self._create_invitation,
+            workspace_id=workspace_id,
+            email=email,
+            invited_by=invited_by,
+            role=role,
+            ttl_hours=ttl_hours,
+        )
+
+    def _create_invitation(
         self,
         *,
         workspace_id: str,
@@ -106,10 +128,12 @@ class InvitationService:
             expires_at=(created_at + timedelta(hours=ttl_hours)).isoformat(),
             accepted=False,
         )
-        if self._connection is None:
+        if self._pool is None:
             self._invitations[invitation.token] = invitation
-        else:
-            self._connection.execute(
+            return invitation
+
+        with self._pool.writer() as connection:
+            connection.execute(
                 """
                 insert into invitation_record (
                   token, workspace_id, email, role, invited_by, created_at, expires_at, accepted
@@ -125,16 +149,29 @@ class InvitationService:
                     invitation.expires_at,
                 ),
             )
-            self._connection.commit()
+            connection.commit()
         return invitation
 
-    def list_invitations(
+    async def list_invitations(
         self,
         *,
         workspace_id: str,
         include_accepted: bool = True,
     ) -> list[Invitation]:
-        if self._connection is not None:
+        return await run_state_operation(
+            self._pool,
+            self._list_invitations,
+            workspace_id=workspace_id,
+            include_accepted=include_accepted,
+        )
+
+    def _list_invitations(
+        self,
+        *,
+        workspace_id: str,
+        include_accepted: bool = True,
+    ) -> list[Invitation]:
+        if self._pool is not None:
             invitations = self._invitations_from_db(workspace_id=workspace_id)
             if include_accepted:
                 return invitations
@@ -151,12 +188,27 @@ class InvitationService:
         pending = [invitation for invitation in invitations if not invitation.accepted]
         return sorted(pending, key=lambda invitation: invitation.created_at)
 
-    def accept_invitation(self, *, token: str, user_id: str) -> WorkspaceMembership:
-        invitation: Invitation | None
-        if self._connection is None:
-            invitation = self._invitations.get(token)
-        else:
-            cursor = self._connection.execute(
+    async def accept_invitation(self, *, token: str, user_id: str) -> WorkspaceMembership:
+        return await run_state_operation(
+            self._pool,
+            self._accept_invitation,
+            token=token,
+            user_id=user_id,
+        )
+
+    def _accept_invitation(self, *, token: str, user_id: str) -> WorkspaceMembership:
+        if self._pool is None:
+            accepted, membership = self._accept(
+                invitation=self._invitations.get(token),
+                user_id=user_id,
+            )
+            self._invitations[token] = accepted
+            members = self._memberships_by_workspace.setdefault(accepted.workspace_id, [])
+            members.append(membership)
+            return membership
+
+        with self._pool.writer() as connection:
+            cursor = connection.execute(
                 """
                 select token, workspace_id, email, role,
                        invited_by, created_at, expires_at, accepted
@@ -166,20 +218,50 @@ class InvitationService:
                 (token,),
             )
             row = cursor.fetchone()
-            invitation = (
-                None
-                if row is None
-                else Invitation(
-                    token=row[0],
-                    workspace_id=row[1],
-                    email=row[2],
-                    role=row[3],
-                    invited_by=row[4],
-                    created_at=row[5],
-                    expires_at=row[6],
-                    accepted=bool(row[7]),
-                )
+            accepted, membership = self._accept(
+                invitation=(
+                    None
+                    if row is None
+                    else Invitation(
+                        token=row[0],
+                        workspace_id=row[1],
+                        email=row[2],
+                        role=row[3],
+                        invited_by=row[4],
+                        created_at=row[5],
+                        expires_at=row[6],
+                        accepted=bool(row[7]),
+                    )
+                ),
+                user_id=user_id,
             )
+            connection.execute(
+                "update invitation_record set accepted = 1 where token = ?",
+                (token,),
+            )
+            connection.execute(
+                """
+                insert or replace into workspace_membership_record (
+                  workspace_id, user_id, role, invited_via, created_at
+                ) values (?, ?, ?, ?, ?)
+                """,
+                (
+                    membership.workspace_id,
+                    membership.user_id,
+                    membership.role,
+                    membership.invited_via,
+                    datetime.now(timezone.utc).isoformat(),
+                ),
+            )
+            connection.commit()
+        return membership
+
+    @staticmethod
+    def _accept(
+        *,
+        invitation: Invitation | None,
+        user_id: str,
+    ) -> tuple[Invitation, WorkspaceMembership]:
         if invitation is None:
             raise ValueError("invitation token not found")
 
@@ -199,62 +281,47 @@ class InvitationService:
             expires_at=invitation.expires_at,
             accepted=True,
         )
-        if self._connection is None:
-            self._invitations[token] = accepted
-        else:
-            self._connection.execute(
-                "update invitation_record set accepted = 1 where token = ?",
-                (token,),
-            )
-
         membership = WorkspaceMembership(
             workspace_id=invitation.workspace_id,
             user_id=user_id,
             role=invitation.role,
-            invited_via=token,
+            invited_via=invitation.token,
         )
-        if self._connection is None:
-            members = self._memberships_by_workspace.setdefault(invitation.workspace_id, [])
-            members.append(membership)
-        else:
-            self._connection.execute(
-                """
-                insert or replace into workspace_membership_record (
-                  workspace_id, user_id, role, invited_via, created_at
-                ) values (?, ?, ?, ?, ?)
-                """,
-                (
-                    membership.workspace_id,
-                    membership.user_id,
-                    membership.role,
-                    membership.invited_via,
-                    datetime.now(timezone.utc).isoformat(),
-                ),
-            )
-            self._connection.commit()
-        return membership
+        return accepted, membership
 
-    def list_memberships(self, *, workspace_id: str | None = None) -> list[WorkspaceMembership]:
-        if self._connection is not None:
-            if workspace_id is None:
-                cursor = self._connection.execute(
-                    """
-                    select workspace_id, user_id, role, invited_via
-                    from workspace_membership_record
-                    order by created_at asc
-                    """
-                )
-            else:
-                cursor = self._connection.execute(
-                    """
-                    select workspace_id, user_id, role, invited_via
-                    from workspace_membership_record
-                    where workspace_id = ?
-                    order by created_at asc
-                    """,
-                    (workspace_id,),
-                )
-            rows = cursor.fetchall()
+    async def list_memberships(
+        self,
+        *,
+        workspace_id: str | None = None,
+    ) -> list[WorkspaceMembership]:
+        return await run_state_operation(
+            self._pool,
+            self._list_memberships,
+            workspace_id=workspace_id,
+        )
+
+    def _list_memberships(self, *, workspace_id: str | None = None) -> list[WorkspaceMembership]:
+        if self._pool is not None:
+            with self._pool.reader() as connection:
+                if workspace_id is None:
+                    cursor = connection.execute(
+                        """
+                        select workspace_id, user_id, role, invited_via
+                        from workspace_membership_record
+                        order by created_at asc
+                        """
+                    )
+                else:
+                    cursor = connection.execute(
+                        """
+                        select workspace_id, user_id, role, invited_via
+                        from workspace_membership_record
+                        where workspace_id = ?
+                        order by created_at asc
+                        """,
+                        (workspace_id,),
+                    )
+                rows = cursor.fetchall()
             return [
                 WorkspaceMembership(
                     workspace_id=row[0],
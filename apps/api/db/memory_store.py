@@ -1,3 +1,9 @@
-from apps.api.memory.store_base import MemoryItem, MemoryMatch, MemoryStore
+from apps.api.memory.store_base import (
+    MemoryItem,
+    MemoryMatch,
+    MemoryStore,
+    MemoryUpsert,
+    MemoryUpsertResult,
+)
 
-__all__ = ["MemoryItem", "MemoryMatch", "MemoryStore"]
+__all__ = ["MemoryItem", "MemoryMatch", "MemoryStore", "MemoryUpsert", "MemoryUpsertResult"]
@@ -0,0 +1,11 @@
+create table if not exists memory_token_record (
+  backend text not null,
+  workspace_id text not null,
+  agent_id text not null,
+  token text not null,
+  memory_id text not null,
+  primary key (backend, workspace_id, agent_id, token, memory_id)
+) without rowid;
+
+create index if not exists idx_memory_token_memory
+  on memory_token_record(backend, workspace_id, agent_id, memory_id);
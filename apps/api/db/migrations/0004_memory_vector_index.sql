@@ -0,0 +1,25 @@
+create table if not exists memory_vector_index_record (
+  backend text not null,
+  workspace_id text not null,
+  agent_id text not null,
+  embedding_dim integer not null,
+  list_count integer not null,
+  trained_count integer not null,
+  vector_count integer not null,
+  centroids blob not null,
+  built_at text not null,
+  primary key (backend, workspace_id, agent_id, embedding_dim)
+);
+
+create table if not exists memory_vector_list_record (
+  backend text not null,
+  workspace_id text not null,
+  agent_id text not null,
+  memory_id text not null,
+  embedding_dim integer not null,
+  list_id integer not null,
+  primary key (backend, workspace_id, agent_id, memory_id)
+) without rowid;
+
+create index if not exists idx_memory_vector_list
+  on memory_vector_list_record(backend, workspace_id, agent_id, embedding_dim, list_id);
@@ -0,0 +1,6 @@
+-- Embeddings move from JSON text to packed little-endian BLOBs.
+-- `embedding_encoding` is one of 'float32', 'float16' or 'int8'; legacy
+-- `embedding_json` values are re-encoded by SqliteMemoryStore on startup and
+-- then cleared.
+alter table memory_record add column embedding_blob blob;
+alter table memory_record add column embedding_encoding text;
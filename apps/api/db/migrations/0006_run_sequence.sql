@@ -0,0 +1,13 @@
+-- Per-run sequence counters for the event outbox.
+-- AgentRunEventOutbox allocates the next seq with a single
+-- `insert ... on conflict do update ... returning last_seq` statement inside the
+-- append transaction instead of reading max(seq) from run_event_record.
+create table if not exists run_sequence_record (
+  agent_run_id text primary key,
+  last_seq integer not null
+);
+
+insert or ignore into run_sequence_record (agent_run_id, last_seq)
+select agent_run_id, max(seq)
+from run_event_record
+group by agent_run_id;
@@ -0,0 +1,21 @@
+-- Lease-based outbox claiming for multiple worker processes.
+-- Workers claim a batch of unpublished rows with one
+-- `update ... set claimed_by, lease_until ... returning` statement; rows whose
+-- lease expired without an acknowledgement become claimable again.
+-- `created_at` is copied from run_event_record so the partial index below
+-- covers both the `published = 0` predicate and the drain ordering.
+alter table run_event_outbox_record add column created_at text not null default '';
+alter table run_event_outbox_record add column claimed_by text;
+alter table run_event_outbox_record add column lease_until real;
+
+update run_event_outbox_record
+set created_at = (
+  select re.created_at
+  from run_event_record re
+  where re.agent_run_id = run_event_outbox_record.agent_run_id
+    and re.seq = run_event_outbox_record.seq
+);
+
+create index if not exists idx_run_event_outbox_unpublished
+  on run_event_outbox_record(created_at, agent_run_id, seq)
+  where published = 0;
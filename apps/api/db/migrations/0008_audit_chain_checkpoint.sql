@@ -0,0 +1,15 @@
+-- Signed audit chain checkpoints.
+-- ImmutableAuditLog.verify_chain resumes from the last verified event of a
+-- workspace instead of re-hashing the whole chain. `signature` is an
+-- HMAC-SHA256 over the other checkpoint fields keyed by
+-- ELARA_AUDIT_CHECKPOINT_KEY; checkpoints that fail the signature or no longer
+-- match their anchor event are ignored.
+create table if not exists audit_chain_checkpoint_record (
+  workspace_id text primary key,
+  last_event_id text not null,
+  last_event_hash text not null,
+  last_created_at text not null,
+  event_count integer not null,
+  signature text not null,
+  created_at text not null
+);
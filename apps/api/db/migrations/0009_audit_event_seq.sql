@@ -0,0 +1,39 @@
+-- Deterministic audit chain order and a stored chain head per workspace.
+-- `seq` numbers each workspace's events from 1 in chain order; timestamps can
+-- tie within a microsecond, so ordering no longer relies on `created_at`.
+-- ImmutableAuditLog caches the head in process and advances
+-- audit_chain_head_record with a compare-and-swap update in the append
+-- transaction, so appends need no `order by ... limit 1` lookup.
+alter table audit_event_record add column seq integer not null default 0;
+
+create table if not exists audit_chain_head_record (
+  workspace_id text primary key,
+  last_seq integer not null,
+  last_event_hash text not null,
+  last_created_at text not null
+);
+
+with ordered as (
+  select rowid as event_rowid,
+         row_number() over (
+           partition by workspace_id order by created_at asc, rowid asc
+         ) as event_seq
+  from audit_event_record
+)
+update audit_event_record
+set seq = ordered.event_seq
+from ordered
+where audit_event_record.rowid = ordered.event_rowid;
+
+insert or ignore into audit_chain_head_record (
+  workspace_id, last_seq, last_event_hash, last_created_at
+)
+select workspace_id, seq, event_hash, created_at
+from audit_event_record ae
+where seq = (
+  select max(seq) from audit_event_record latest
+  where latest.workspace_id = ae.workspace_id
+);
+
+create unique index if not exists idx_audit_event_workspace_seq
+  on audit_event_record(workspace_id, seq);
@@ -0,0 +1,18 @@
+-- Keyset pagination and filters for audit event listings.
+-- Pages are read with `seq < :cursor order by seq desc`, so every index ends
+-- in `seq`: filtering by action, actor or outcome seeks straight to the page.
+-- Time bounds are mapped to seq bounds through the created_at index, which
+-- now carries `seq` so the lowest seq at a timestamp is a single probe.
+drop index if exists idx_audit_event_workspace_created;
+
+create index if not exists idx_audit_event_workspace_created
+  on audit_event_record(workspace_id, created_at, seq);
+
+create index if not exists idx_audit_event_workspace_action
+  on audit_event_record(workspace_id, action, seq);
+
+create index if not exists idx_audit_event_workspace_actor
+  on audit_event_record(workspace_id, actor_id, seq);
+
+create index if not exists idx_audit_event_workspace_outcome
+  on audit_event_record(workspace_id, outcome, seq);
@@ -0,0 +1,14 @@
+-- Persistent tier of the completion cache.
+-- CachedCompletionClient keys rows by a SHA-256 of (model, system_prompt,
+-- user_input, params). `expires_at` is a Unix timestamp; expired rows are
+-- ignored on read and pruned on write. `latency_seconds` is the upstream
+-- latency of the cached call, reported as saved time on every hit.
+create table if not exists completion_cache_record (
+  cache_key text primary key,
+  completion text not null,
+  expires_at real not null,
+  latency_seconds real not null
+);
+
+create index if not exists idx_completion_cache_expires
+  on completion_cache_record(expires_at);
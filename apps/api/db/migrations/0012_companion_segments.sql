@@ -0,0 +1,20 @@
+-- Segmented companion logs.
+-- Companion events used to go to a single run per workspace
+-- (`companion-{workspace_id}`), which grew without bound. Each segment is now
+-- its own run, named `companion-{workspace_id}-{segment start}`. This table
+-- lists a workspace's segments in order so replay can page across them.
+create table if not exists companion_segment_record (
+  workspace_id text not null,
+  agent_run_id text not null unique,
+  started_at text not null,
+  primary key (workspace_id, started_at, agent_run_id)
+);
+
+-- Index each workspace's legacy single run as its first segment. Its start is
+-- pinned to '' rather than its first event's time: legacy events can postdate
+-- the start of the first new window (e.g. written mid-morning on the day a
+-- midnight window opened), and the legacy run must still replay first.
+insert or ignore into companion_segment_record (workspace_id, agent_run_id, started_at)
+select distinct access.workspace_id, access.agent_run_id, ''
+from run_access_record access
+where access.agent_run_id = 'companion-' || access.workspace_id;
@@ -0,0 +1,9 @@
+-- One-time data migrations.
+-- Backfills that cannot be expressed in SQL (re-tokenizing memories,
+-- re-encoding JSON embeddings) run in the application on startup. Each records
+-- its name here once it has finished, so later startups skip it instead of
+-- re-scanning the tables it migrated.
+create table if not exists state_migration_record (
+  name text primary key,
+  applied_at text not null
+);
@@ -0,0 +1,178 @@
+import asyncio
+import os
+import queue
+import sqlite3
+import threading
+from collections.abc import Callable, Iterator
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import contextmanager
+from functools import partial
+from typing import ParamSpec, TypeVar
+
+from apps.api.db.sqlite import (
+    DurabilityProfile,
+    apply_durability_profile,
+    resolve_durability_profile,
+)
+from apps.api.db.state import connect_state_db, resolve_state_db_path
+
+DEFAULT_STATE_DB_READERS = 4
+
+P = ParamSpec("P")
+T = TypeVar("T")
+
+
+def resolve_state_db_readers(readers: int | None = None) -> int:
+    if readers is not None:
+        return readers
+    return int(os.getenv("ELARA_STATE_DB_READERS", str(DEFAULT_STATE_DB_READERS)))
+
+
+def _is_in_memory(path: str) -> bool:
+    return path == ":memory:" or path.startswith("file::memory:") or "mode=memory" in path
+
+
+class StateConnectionPool:
+    """One writer connection plus up to ``readers`` read-only WAL connections.
+
+    Services borrow a connection per operation: ``writer()`` serialises writes on the single
+    write handle, while ``reader()`` hands out query-only connections that read the last
+    committed snapshot concurrently. Readers run in autocommit, so each statement sees the
+    latest commit; reads spanning several statements borrow ``snapshot()`` instead, which
+    holds one read transaction open. In-memory databases and pools wrapping a caller-owned
+    ``connection`` have no readers and route reads through the writer.
+
+    ``run()`` executes blocking database work on a dedicated thread pool sized to the
+    connections (``readers + 1``) so async handlers never block the event loop on SQLite.
+    Pools wrapping a caller-owned connection run work inline, since that connection may not
+    be usable from other threads.
+    """
+
+    def __init__(
+        self,
+        *,
+        database_path: str | None = None,
+        connection: sqlite3.Connection | None = None,
+        readers: int | None = None,
+        durability: DurabilityProfile | None = None,
+    ) -> None:
+        self._durability = resolve_durability_profile(durability)
+        self._writer = connection
+        self._owns_writer = False
+        self._path = ":memory:"
+        if self._writer is None:
+            self._path = resolve_state_db_path(database_path)
+            self._writer = connect_state_db(self._path, durability=self._durability)
+            self._owns_writer = True
+        self._writer_lock = threading.RLock()
+        self._max_readers = (
+            0
+            if not self._owns_writer or _is_in_memory(self._path)
+            else resolve_state_db_readers(readers)
+        )
+        self._idle_readers: queue.LifoQueue[sqlite3.Connection] = queue.LifoQueue()
+        self._readers: list[sqlite3.Connection] = []
+        self._readers_lock = threading.Lock()
+        # Filled by the workers themselves; the initializer must not reference the pool, or
+        # the worker threads would keep it alive.
+        self._thread_ids: set[int] = set()
+        thread_ids = self._thread_ids
+        self._executor: ThreadPoolExecutor | None = (
+            ThreadPoolExecutor(
+                max_workers=self._max_readers + 1,
+                thread_name_prefix="state-db",
+                initializer=lambda: thread_ids.add(threading.get_ident()),
+            )
+            if self._owns_writer
+            else None
+        )
+
+    @property
+    def reader_count(self) -> int:
+        return len(self._readers)
+
+    @contextmanager
+    def writer(self) -> Iterator[sqlite3.Connection]:
+        with self._writer_lock:
+            if self._writer is None:
+                raise RuntimeError("connection pool is closed")
+            yield self._writer
+
+    @contextmanager
+    def reader(self) -> Iterator[sqlite3.Connection]:
+        if self._max_readers == 0:
+            with self.writer() as connection:
+                yield connection
+            return
+
+        connection = self._acquire_reader()
+        try:
+            yield connection
+        finally:
+            self._idle_readers.put(connection)
+
+    @contextmanager
+    def snapshot(self) -> Iterator[sqlite3.Connection]:
+        """A reader whose statements all see the same committed WAL snapshot."""
+        with self.reader() as connection:
+            if connection.in_transaction:
+                # A writer already inside the caller's transaction reads a stable view.
+                yield connection
+                return
+            connection.execute("begin")
+            try:
+                yield connection
+            finally:
+                connection.commit()
+
+    async def run(self, operation: Callable[P, T], /, *args: P.args, **kwargs: P.kwargs) -> T:
+        """Run blocking database work off the event loop and await its result."""
+        if self._executor is None:
+            return operation(*args, **kwargs)
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(self._executor, partial(operation, *args, **kwargs))
+
+    def _acquire_reader(self) -> sqlite3.Connection:
+        try:
+            return self._idle_readers.get_nowait()
+        except queue.Empty:
+            pass
+        with self._readers_lock:
+            if self._writer is None:
+                raise RuntimeError("connection pool is closed")
+            if len(self._readers) < self._max_readers:
+                connection = sqlite3.connect(self._path, check_same_thread=False)
+                apply_durability_profile(connection, self._durability)
+                connection.execute("PRAGMA query_only = ON;")
+                self._readers.append(connection)
+                return connection
+        return self._idle_readers.get()
+
+    def close(self) -> None:
+        if self._executor is not None:
+            # A service finalized on one of this pool's threads (its last reference dropped
+            # by a finished operation) closes the pool from that thread, which cannot join
+            # itself; the work it was running has already completed.
+            self._executor.shutdown(wait=threading.get_ident() not in self._thread_ids)
+            self._executor = None
+        with self._readers_lock:
+            for connection in self._readers:
+                connection.close()
+            self._readers.clear()
+        with self._writer_lock:
+            if self._writer is not None and self._owns_writer:
+                self._writer.close()
+            self._writer = None
+
+
+async def run_state_operation(
+    pool: StateConnectionPool | None,
+    operation: Callable[P, T],
+    /,
+    *args: P.args,
+    **kwargs: P.kwargs,
+) -> T:
+    """Await a service operation: in-memory services (no pool) run it inline."""
+    if pool is None:
+        return operation(*args, **kwargs)
+    return await pool.run(operation, *args, **kwargs)
@@ -1,6 +1,21 @@
 import os
 import sqlite3
-from typing import Callable, Protocol, cast
+from typing import Callable, Literal, Protocol, cast
+
+DurabilityProfile = Literal["strict", "balanced", "fast"]
+
+DEFAULT_DURABILITY_PROFILE: DurabilityProfile = "balanced"
+_SYNCHRONOUS_BY_PROFILE: dict[DurabilityProfile, str] = {
+    "strict": "FULL",
+    "balanced": "NORMAL",
+    "fast": "OFF",
+}
+_TUNING_PRAGMAS = (
+    "PRAGMA temp_store = MEMORY;",
+    "PRAGMA cache_size = -65536;",
+    "PRAGMA mmap_size = 268435456;",
+    "PRAGMA busy_timeout = 5000;",
+)
 
 
 class SqlCipherResult(Protocol):
@@ -13,6 +28,42 @@ class SqlCipherConnection(Protocol):
     def close(self) -> None: ...
 
 
+class PragmaConnection(Protocol):
+    def execute(self, query: str, /) -> object: ...
+
+
+def resolve_durability_profile(profile: str | None = None) -> DurabilityProfile:
+    value = profile if profile is not None else os.getenv("ELARA_SQLITE_DURABILITY")
+    if value is None or value == "":
+        return DEFAULT_DURABILITY_PROFILE
+    for known in _SYNCHRONOUS_BY_PROFILE:
+        if value == known:
+            return known
+    raise ValueError(f"unknown SQLite durability profile: {value}")
+
+
+def durability_pragmas(profile: DurabilityProfile) -> tuple[str, ...]:
+    """WAL journaling for every profile; the profile only chooses the ``synchronous`` level.
+
+    ``strict`` fsyncs on every commit, ``balanced`` fsyncs at checkpoints (a power loss may
+    drop the last commits but never corrupts), and ``fast`` leaves flushing to the OS.
+    """
+    return (
+        "PRAGMA journal_mode = WAL;",
+        f"PRAGMA synchronous = {_SYNCHRONOUS_BY_PROFILE[profile]};",
+        *_TUNING_PRAGMAS,
+    )
+
+
+def apply_durability_profile(connection: PragmaConnection, profile: DurabilityProfile) -> None:
+    """Apply connection pragmas; run after ``PRAGMA key`` on SQLCipher connections.
+
+    SQLCipher ignores ``mmap_size`` for encrypted databases, so that setting is a no-op there.
+    """
+    for pragma in durability_pragmas(profile):
+        connection.execute(pragma)
+
+
 def validate_sqlcipher_connection(connection: SqlCipherConnection) -> None:
     cipher_version = connection.execute("PRAGMA cipher_version;").fetchone()
     if not cipher_version or not cipher_version[0]:
@@ -25,11 +76,15 @@ def connect_sqlcipher(
     connect_fn: Callable[[str], SqlCipherConnection],
     database_url: str,
     db_key: str,
+    *,
+    durability: DurabilityProfile | None = None,
 ) -> SqlCipherConnection:
     connection = connect_fn(database_url)
     connection.execute("PRAGMA key = ?;", (db_key,))
     connection.execute("PRAGMA foreign_keys = ON;")
     validate_sqlcipher_connection(connection)
+    if durability is not None:
+        apply_durability_profile(connection, durability)
     return connection
 
 
@@ -66,5 +121,7 @@ def enforce_sqlite_security_if_enabled(
 
         connect_fn = sqlite_connect
 
+    # Only validates the key; the durability profile belongs on the pool's long-lived
+    # connections, not on this one.
     connection = connect_sqlcipher(connect_fn, database_url, db_key)
     connection.close()
@@ -1,5 +1,12 @@
 import os
 import sqlite3
+from datetime import datetime, timezone
+
+from apps.api.db.sqlite import (
+    DurabilityProfile,
+    apply_durability_profile,
+    resolve_durability_profile,
+)
 
 
 def resolve_state_db_path(database_path: str | None = None) -> str:
@@ -8,8 +15,162 @@ def resolve_state_db_path(database_path: str | None = None) -> str:
     return os.getenv("ELARA_STATE_DB_PATH", ":memory:")
 
 
+def ensure_column(
+    connection: sqlite3.Connection,
+    *,
+    table: str,
+    column: str,
+    definition: str,
+) -> None:
+    """Add a column to a table created by an earlier schema revision."""
+    existing = {str(row[1]) for row in connection.execute(f"pragma table_info({table})")}
+    if column not in existing:
+        connection.execute(f"alter table {table} add column {column} {definition}")
+
+
+def _table_exists(connection: sqlite3.Connection, table: str) -> bool:
+    cursor = connection.execute(
+        "select 1 from sqlite_master where type = 'table' and name = ?",
+        (table,),
+    )
+    return cursor.fetchone() is not None
+
+
+def migration_applied(connection: sqlite3.Connection, name: str) -> bool:
+    """Whether the one-time data migration ``name`` has already run on this database."""
+    cursor = connection.execute("select 1 from state_migration_record where name = ?", (name,))
+    return cursor.fetchone() is not None
+
+
+def record_migration(connection: sqlite3.Connection, name: str) -> None:
+    """Mark the data migration ``name`` as done; the caller owns the commit."""
+    connection.execute(
+        """
+        insert or ignore into state_migration_record (name, applied_at)
+        values (?, ?)
+        """,
+        (name, datetime.now(timezone.utc).isoformat()),
+    )
+
+
+def _ensure_outbox_claim_columns(connection: sqlite3.Connection) -> None:
+    """Add the lease columns and the unpublished-row index to older outbox tables."""
+    existing = {
+        str(row[1]) for row in connection.execute("pragma table_info(run_event_outbox_record)")
+    }
+    for column, definition in (
+        ("created_at", "text not null default ''"),
+        ("claimed_by", "text"),
+        ("lease_until", "real"),
+    ):
+        ensure_column(
+            connection,
+            table="run_event_outbox_record",
+            column=column,
+            definition=definition,
+        )
+    if "created_at" not in existing:
+        connection.execute(
+            """
+            update run_event_outbox_record
+            set created_at = (
+              select re.created_at
+              from run_event_record re
+              where re.agent_run_id = run_event_outbox_record.agent_run_id
+                and re.seq = run_event_outbox_record.seq
+            )
+            """
+        )
+    connection.execute(
+        """
+        create index if not exists idx_run_event_outbox_unpublished
+          on run_event_outbox_record(created_at, agent_run_id, seq)
+          where published = 0
+        """
+    )
+
+
+def _ensure_audit_event_seq(connection: sqlite3.Connection) -> None:
+    """Number older audit rows per workspace in chain order and seed their chain heads."""
+    existing = {str(row[1]) for row in connection.execute("pragma table_info(audit_event_record)")}
+    if "seq" not in existing:
+        ensure_column(
+            connection,
+            table="audit_event_record",
+            column="seq",
+            definition="integer not null default 0",
+        )
+        connection.execute(
+            """
+            with ordered as (
+              select rowid as event_rowid,
+                     row_number() over (
+                       partition by workspace_id order by created_at asc, rowid asc
+                     ) as event_seq
+              from audit_event_record
+            )
+            update audit_event_record
+            set seq = ordered.event_seq
+            from ordered
+            where audit_event_record.rowid = ordered.event_rowid
+            """
+        )
+        connection.execute(
+            """
+            insert or ignore into audit_chain_head_record (
+              workspace_id, last_seq, last_event_hash, last_created_at
+            )
+            select workspace_id, seq, event_hash, created_at
+            from audit_event_record ae
+            where seq = (
+              select max(seq) from audit_event_record latest
+              where latest.workspace_id = ae.workspace_id
+            )
+            """
+        )
+    connection.execute(
+        """
+        create unique index if not exists idx_audit_event_workspace_seq
+          on audit_event_record(workspace_id, seq)
+        """
+    )
+    _ensure_audit_event_filter_indexes(connection)
+
+
+def _ensure_audit_event_filter_indexes(connection: sqlite3.Connection) -> None:
+    """Composite indexes behind keyset-paged, filtered audit listings."""
+    created_columns = [
+        str(row[2])
+        for row in connection.execute("pragma index_info(idx_audit_event_workspace_created)")
+    ]
+    if created_columns and "seq" not in created_columns:
+        connection.execute("drop index idx_audit_event_workspace_created")
+    for name, column in (
+        ("idx_audit_event_workspace_created", "created_at"),
+        ("idx_audit_event_workspace_action", "action"),
+        ("idx_audit_event_workspace_actor", "actor_id"),
+        ("idx_audit_event_workspace_outcome", "outcome"),
+    ):
+        connection.execute(
+            f"create index if not exists {name} on audit_event_record(workspace_id, {column}, seq)"
+        )
+
+
+# Before companion logs were segmented, each workspace wrote to one run named
+# ``companion-{workspace_id}``; index it as the workspace's first segment. Its start is
+# pinned to '' because legacy events can postdate the first new window's start.
+_BACKFILL_COMPANION_SEGMENTS = """
+    insert or ignore into companion_segment_record (workspace_id, agent_run_id, started_at)
+    select distinct access.workspace_id, access.agent_run_id, ''
+    from run_access_record access
+    where access.agent_run_id = 'companion-' || access.workspace_id
+"""
+
+
 def ensure_state_schema(connection: sqlite3.Connection) -> None:
     connection.execute("PRAGMA foreign_keys = ON;")
+    backfill_run_sequences = not _table_exists(connection, "run_sequence_record")
+    backfill_companion_segments = not _table_exists(connection, "companion_segment_record")
     connection.executescript(
         """
         create table if not exists invitation_record (
@@ -54,6 +215,7 @@ def ensure_state_schema(connection: sqlite3.Connection) -> None:
         create table if not exists audit_event_record (
           id text primary key,
           workspace_id text not null,
+          seq integer not null default 0,
           actor_id text not null,
           action text not null,
           outcome text not null,
@@ -62,8 +224,32 @@ def ensure_state_schema(connection: sqlite3.Connection) -> None:
           event_hash text not null,
           created_at text not null
         );
-        create index if not exists idx_audit_event_workspace_created
-          on audit_event_record(workspace_id, created_at);
+
+        create table if not exists audit_chain_head_record (
+          workspace_id text primary key,
+          last_seq integer not null,
+          last_event_hash text not null,
+          last_created_at text not null
+        );
+
+        create table if not exists audit_chain_checkpoint_record (
+          workspace_id text primary key,
+          last_event_id text not null,
+          last_event_hash text not null,
+          last_created_at text not null,
+          event_count integer not null,
+          signature text not null,
+          created_at text not null
+        );
+
+        create table if not exists completion_cache_record (
+          cache_key text primary key,
+          completion text not null,
+          expires_at real not null,
+          latency_seconds real not null
+        );
+        create index if not exists idx_completion_cache_expires
+          on completion_cache_record(expires_at);
 
         create table if not exists run_event_record (
           agent_run_id text not null,
@@ -78,12 +264,20 @@ def ensure_state_schema(connection: sqlite3.Connection) -> None:
           agent_run_id text not null,
           seq integer not null,
           published integer not null default 0 check (published in (0, 1)),
+          created_at text not null default '',
+          claimed_by text,
+          lease_until real,
           primary key (agent_run_id, seq),
           foreign key (agent_run_id, seq)
             references run_event_record(agent_run_id, seq)
             on delete cascade
         );
 
+        create table if not exists run_sequence_record (
+          agent_run_id text primary key,
+          last_seq integer not null
+        );
+
         create table if not exists run_access_record (
           agent_run_id text not null,
           workspace_id text not null,
@@ -91,6 +285,18 @@ def ensure_state_schema(connection: sqlite3.Connection) -> None:
           primary key (agent_run_id, actor_id)
         );
 
+        create table if not exists companion_segment_record (
+          workspace_id text not null,
+          agent_run_id text not null unique,
+          started_at text not null,
+          primary key (workspace_id, started_at, agent_run_id)
+        );
+
+        create table if not exists state_migration_record (
+          name text primary key,
+          applied_at text not null
+        );
+
         create table if not exists memory_record (
           backend text not null,
           workspace_id text not null,
@@ -100,17 +306,81 @@ def ensure_state_schema(connection: sqlite3.Connection) -> None:
           embedding_model text not null,
           embedding_dim integer not null,
           embedding_json text,
+          embedding_blob blob,
+          embedding_encoding text,
           created_at text not null,
           updated_at text not null,
           primary key (backend, workspace_id, agent_id, memory_id)
         );
+
+        create table if not exists memory_token_record (
+          backend text not null,
+          workspace_id text not null,
+          agent_id text not null,
+          token text not null,
+          memory_id text not null,
+          primary key (backend, workspace_id, agent_id, token, memory_id)
+        ) without rowid;
+        create index if not exists idx_memory_token_memory
+          on memory_token_record(backend, workspace_id, agent_id, memory_id);
+
+        create table if not exists memory_vector_index_record (
+          backend text not null,
+          workspace_id text not null,
+          agent_id text not null,
+          embedding_dim integer not null,
+          list_count integer not null,
+          trained_count integer not null,
+          vector_count integer not null,
+          centroids blob not null,
+          built_at text not null,
+          primary key (backend, workspace_id, agent_id, embedding_dim)
+        );
+
+        create table if not exists memory_vector_list_record (
+          backend text not null,
+          workspace_id text not null,
+          agent_id text not null,
+          memory_id text not null,
+          embedding_dim integer not null,
+          list_id integer not null,
+          primary key (backend, workspace_id, agent_id, memory_id)
+        ) without rowid;
+        create index if not exists idx_memory_vector_list
+          on memory_vector_list_record(backend, workspace_id, agent_id, embedding_dim, list_id);
         """
     )
+    ensure_column(connection, table="memory_record", column="embedding_blob", definition="blob")
+    ensure_column(
+        connection,
+        table="memory_record",
+        column="embedding_encoding",
+        definition="text",
+    )
+    _ensure_outbox_claim_columns(connection)
+    _ensure_audit_event_seq(connection)
+    if backfill_run_sequences:
+        connection.execute(
+            """
+            insert or ignore into run_sequence_record (agent_run_id, last_seq)
+            select agent_run_id, max(seq)
+            from run_event_record
+            group by agent_run_id
+            """
+        )
+    if backfill_companion_segments:
+        connection.execute(_BACKFILL_COMPANION_SEGMENTS)
     connection.commit()
 
 
-def connect_state_db(database_path: str | None = None) -> sqlite3.Connection:
+def connect_state_db(
+    database_path: str | None = None,
+    *,
+    durability: DurabilityProfile | None = None,
+) -> sqlite3.Connection:
+    """Open the state database with the durability profile from ``ELARA_SQLITE_DURABILITY``."""
     path = resolve_state_db_path(database_path)
     connection = sqlite3.connect(path, check_same_thread=False)
+    apply_durability_profile(connection, resolve_durability_profile(durability))
     ensure_state_schema(connection)
     return connection
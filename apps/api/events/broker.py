@@ -0,0 +1,156 @@
+import asyncio
+import os
+from collections import deque
+from collections.abc import Sequence
+
+from apps.api.events.outbox import AgentRunEvent
+
+DEFAULT_STREAM_MAX_PENDING = 256
+
+
+def resolve_stream_max_pending(max_pending: int | None = None) -> int:
+    if max_pending is not None:
+        return max_pending
+    return int(os.getenv("ELARA_EVENT_STREAM_MAX_PENDING", str(DEFAULT_STREAM_MAX_PENDING)))
+
+
+class RunEventSubscription:
+    """Bounded per-subscriber buffer of events published for one run.
+
+    A subscriber that falls more than ``max_pending`` events behind is dropped instead of
+    buffering without limit; ``get()`` then returns ``None`` and the client is expected to
+    resume from its last seen seq through replay.
+    """
+
+    def __init__(self, broker: "RunEventBroker", *, agent_run_id: str, max_pending: int) -> None:
+        self.agent_run_id = agent_run_id
+        self.overflowed = False
+        self._broker = broker
+        self._max_pending = max_pending
+        self._pending: deque[AgentRunEvent] = deque()
+        self._ready = asyncio.Event()
+        self._closed = False
+
+    @property
+    def closed(self) -> bool:
+        return self._closed
+
+    def offer(self, events: Sequence[AgentRunEvent]) -> None:
+        if self._closed:
+            return
+        if len(self._pending) + len(events) > self._max_pending:
+            self.overflowed = True
+            self._pending.clear()
+            self.close()
+            return
+        self._pending.extend(events)
+        self._ready.set()
+
+    async def get(self, *, timeout: float | None = None) -> list[AgentRunEvent] | None:
+        """Return the buffered events, ``[]`` on timeout, or ``None`` once closed."""
+        if not self._pending and not self._closed:
+            try:
+                await asyncio.wait_for(self._ready.wait(), timeout=timeout)
+            except TimeoutError:
+                return []
+        if not self._pending:
+            return None if self._closed else []
+        events = list(self._pending)
+        self._pending.clear()
+        self._ready.clear()
+        return events
+
+    def close(self) -> None:
+        if self._closed:
+            return
+        self._closed = True
+        self._ready.set()
+        self._broker.unsubscribe(self)
+
+
+class RunEventBroker:
+    """In-process fan-out of appended run events to live subscribers.
+
+    Publishing only touches the subscribers of the runs in the batch, so appends to runs
+    nobody watches cost a dictionary lookup. Events appended by other processes are not
+    seen here; subscribers pick those up through replay.
+    """
+
+    def __init__(self, *, max_pending: int | None = None) -> None:
+        self._max_pending = resolve_stream_max_pending(max_pending)
+        self._subscribers_by_run: dict[str, set[RunEventSubscription]] = {}
+
+    def subscribe(self, agent_run_id: str) -> RunEventSubscription:
+        subscription = RunEventSubscription(
+            self,
+            agent_run_id=agent_run_id,
+            max_pending=self._max_pending,
+        )
+        self._subscribers_by_run.setdefault(agent_run_id, set()).add(subscription)
+        return subscription
+
+    def unsubscribe(self, subscription: RunEventSubscription) -> None:
+        subscribers = self._subscribers_by_run.get(subscription.agent_run_id)
+        if subscribers is None:
+            return
+        subscribers.discard(subscription)
+        if not subscribers:
+            del self._subscribers_by_run[subscription.agent_run_id]
+
+    def subscriber_count(self, agent_run_id: str) -> int:
+        return len(self._subscribers_by_run.get(agent_run_id, ()))
+
+    def publish(self, events: Sequence[AgentRunEvent]) -> None:
+        if not self._subscribers_by_run:
+            return
+        events_by_run: dict[str, list[AgentRunEvent]] = {}
+        for event in events:
+            if event.agent_run_id in self._subscribers_by_run:
+                events_by_run.setdefault(event.agent_run_id, []).append(event)
+        for agent_run_id, run_events in events_by_run.items():
+            for subscription in list(self._subscribers_by_run.get(agent_run_id, ())):
+                subscription.offer(run_events)
+
+
+class RunEventStream:
+    """Backlog after ``last_seq`` followed by live events, without gaps or duplicates.
+
+    The subscription must be opened before the backlog is read so that events appended in
+    between are buffered; anything at or below the last delivered seq is skipped.
+    """
+
+    def __init__(
+        self,
+        *,
+        subscription: RunEventSubscription,
+        backlog: Sequence[AgentRunEvent],
+        last_seq: int,
+    ) -> None:
+        self._subscription = subscription
+        self._backlog = list(backlog)
+        self._last_seq = last_seq
+
+    @property
+    def last_seq(self) -> int:
+        return self._last_seq
+
+    @property
+    def overflowed(self) -> bool:
+        return self._subscription.overflowed
+
+    async def next_events(self, *, timeout: float | None = None) -> list[AgentRunEvent] | None:
+        """Return the next events, ``[]`` on timeout, or ``None`` once the stream has ended."""
+        if self._backlog:
+            events, self._backlog = self._backlog, []
+        else:
+            received = await self._subscription.get(timeout=timeout)
+            if received is None:
+                return None
+            events = received
+        fresh = [event for event in events if event.seq > self._last_seq]
+        if fresh:
+            self._last_seq = fresh[-1].seq
+        return fresh
+
+    def close(self) -> None:
+        self._subscription.close()
@@ -1,11 +1,13 @@
 import json
 import sqlite3
+import time
 from collections import deque
+from collections.abc import Callable, Sequence
 from dataclasses import dataclass
 from datetime import datetime, timezone
 from typing import cast
 
-from apps.api.db.state import connect_state_db
+from apps.api.db.pool import StateConnectionPool, run_state_operation
 
 
 @dataclass(frozen=True)
@@ -17,31 +19,80 @@ class AgentRunEvent:
     created_at: str
 
 
+@dataclass(frozen=True)
+class PendingRunEvent:
+    event_type: str
+    payload: dict[str, object]
+
+
+@dataclass(frozen=True)
+class RunAccessGrant:
+    agent_run_id: str
+    workspace_id: str
+    actor_id: str
+
+
+@dataclass(frozen=True)
+class CompanionSegment:
+    """One segment of a workspace's companion log, stored as its own run."""
+
+    workspace_id: str
+    agent_run_id: str
+    started_at: str
+
+
+@dataclass(frozen=True)
+class CompanionEventPage:
+    events: list[AgentRunEvent]
+    next_cursor: str | None
+
+
+AppendListener = Callable[[Sequence[AgentRunEvent]], None]
+
+
 class AgentRunEventOutbox:
     def __init__(
         self,
         *,
         database_path: str | None = None,
         connection: sqlite3.Connection | None = None,
+        pool: StateConnectionPool | None = None,
     ) -> None:
-        self._connection = connection
-        self._owns_connection = False
-        if self._connection is None and database_path is not None:
-            self._connection = connect_state_db(database_path)
-            self._owns_connection = True
+        self._pool = pool
+        self._owns_pool = False
+        if self._pool is None and (connection is not None or database_path is not None):
+            self._pool = StateConnectionPool(database_path=database_path, connection=connection)
+            self._owns_pool = connection is None
         self._events_by_run: dict[str, list[AgentRunEvent]] = {}
         self._queue: deque[AgentRunEvent] = deque()
+        self._claims: dict[tuple[str, int], tuple[str, float, AgentRunEvent]] = {}
+        self._append_listeners: list[AppendListener] = []
         self._access_by_run: dict[str, set[str]] = {}
+        self._companion_segments: dict[str, dict[str, str]] = {}
 
     def close(self) -> None:
-        if self._connection is None or not self._owns_connection:
+        if self._pool is None or not self._owns_pool:
             return
-        self._connection.close()
-        self._connection = None
+        self._pool.close()
+        self._pool = None
 
     def __del__(self) -> None:
         self.close()
 
+    @property
+    def pool(self) -> StateConnectionPool | None:
+        return self._pool
+
+    def add_append_listener(self, listener: AppendListener) -> None:
+        """Call ``listener`` on the event loop with every batch once it has been committed."""
+        self._append_listeners.append(listener)
+
+    def notify_appended(self, events: Sequence[AgentRunEvent]) -> None:
+        if not events:
+            return
+        for listener in self._append_listeners:
+            listener(events)
+
     @staticmethod
     def _from_row(row: tuple[object, ...]) -> AgentRunEvent:
         return AgentRunEvent(
@@ -52,158 +103,642 @@ class AgentRunEventOutbox:
             created_at=str(row[4]),
         )
 
-    def append_event(
+    async def append_event(
         self,
         *,
         agent_run_id: str,
         event_type: str,
         payload: dict[str, object],
     ) -> AgentRunEvent:
-        if self._connection is None:
-            events = self._events_by_run.setdefault(agent_run_id, [])
-            seq = events[-1].seq + 1 if events else 1
-        else:
-            cursor = self._connection.execute(
-                """
-                select coalesce(max(seq), 0)
-                from run_event_record
-                where agent_run_id = ?
-                """,
-                (agent_run_id,),
-            )
-            row = cursor.fetchone()
-            max_seq = 0 if row is None else int(cast(int, row[0]))
-            seq = max_seq + 1
-
-        event = AgentRunEvent(
+        event = await run_state_operation(
+            self._pool,
+            self._append_event,
             agent_run_id=agent_run_id,
-            seq=seq,
             event_type=event_type,
             payload=payload,
-            created_at=datetime.now(timezone.utc).isoformat(),
-        )
-        if self._connection is None:
-            events = self._events_by_run.setdefault(agent_run_id, [])
-            events.append(event)
-            self._queue.append(event)
-        else:
-            self._connection.execute(
-                """
-                insert into run_event_record (
-                  agent_run_id, seq, event_type, payload_json, created_at
-                ) values (?, ?, ?, ?, ?)
-                """,
+        )
+        self.notify_appended([event])
+        return event
+
+    def _append_event(
+        self,
+        *,
+        agent_run_id: str,
+        event_type: str,
+        payload: dict[str, object],
+    ) -> AgentRunEvent:
+        return self._append_events(
+            agent_run_id=agent_run_id,
+            events=[PendingRunEvent(event_type=event_type, payload=payload)],
+        )[0]
+
+    async def append_events(
+        self,
+        *,
+        agent_run_id: str,
+        events: Sequence[PendingRunEvent],
+    ) -> list[AgentRunEvent]:
+        """Append events to one run with a contiguous seq range in a single transaction."""
+        appended = await run_state_operation(
+            self._pool,
+            self._append_events,
+            agent_run_id=agent_run_id,
+            events=events,
+        )
+        self.notify_appended(appended)
+        return appended
+
+    def _append_events(
+        self,
+        *,
+        agent_run_id: str,
+        events: Sequence[PendingRunEvent],
+    ) -> list[AgentRunEvent]:
+        if self._pool is None:
+            run_events = self._events_by_run.setdefault(agent_run_id, [])
+            last_seq = run_events[-1].seq if run_events else 0
+            appended = self._build_events(
+                agent_run_id=agent_run_id,
+                events=events,
+                first_seq=last_seq + 1,
+            )
+            run_events.extend(appended)
+            self._queue.extend(appended)
+            return appended
+
+        with self._pool.writer() as connection:
+            try:
+                appended = self.write_events(
+                    connection,
+                    agent_run_id=agent_run_id,
+                    events=events,
+                )
+                connection.commit()
+            except Exception:
+                connection.rollback()
+                raise
+        return appended
+
+    def write_events(
+        self,
+        connection: sqlite3.Connection,
+        *,
+        agent_run_id: str,
+        events: Sequence[PendingRunEvent],
+    ) -> list[AgentRunEvent]:
+        """Insert events on a borrowed writer connection; the caller owns the commit."""
+        if not events:
+            return []
+
+        last_seq = self._allocate_seqs(connection, agent_run_id=agent_run_id, count=len(events))
+        appended = self._build_events(
+            agent_run_id=agent_run_id,
+            events=events,
+            first_seq=last_seq - len(events) + 1,
+        )
+        connection.executemany(
+            """
+            insert into run_event_record (
+              agent_run_id, seq, event_type, payload_json, created_at
+            ) values (?, ?, ?, ?, ?)
+            """,
+            [
                 (
                     event.agent_run_id,
                     event.seq,
                     event.event_type,
                     json.dumps(event.payload, sort_keys=True),
                     event.created_at,
-                ),
-            )
-            self._connection.execute(
-                """
-                insert into run_event_outbox_record (agent_run_id, seq, published)
-                values (?, ?, 0)
-                """,
-                (event.agent_run_id, event.seq),
+                )
+                for event in appended
+            ],
+        )
+        connection.executemany(
+            """
+            insert into run_event_outbox_record (agent_run_id, seq, published, created_at)
+            values (?, ?, 0, ?)
+            """,
+            [(event.agent_run_id, event.seq, event.created_at) for event in appended],
+        )
+        return appended
+
+    @staticmethod
+    def _build_events(
+        *,
+        agent_run_id: str,
+        events: Sequence[PendingRunEvent],
+        first_seq: int,
+    ) -> list[AgentRunEvent]:
+        created_at = datetime.now(timezone.utc).isoformat()
+        return [
+            AgentRunEvent(
+                agent_run_id=agent_run_id,
+                seq=first_seq + offset,
+                event_type=event.event_type,
+                payload=event.payload,
+                created_at=created_at,
             )
-            self._connection.commit()
-        return event
+            for offset, event in enumerate(events)
+        ]
 
-    def replay(self, *, agent_run_id: str, last_seq: int = 0) -> list[AgentRunEvent]:
-        if self._connection is None:
-            events = self._events_by_run.get(agent_run_id, [])
-            return [event for event in events if event.seq > last_seq]
+    @staticmethod
+    def _allocate_seqs(connection: sqlite3.Connection, *, agent_run_id: str, count: int) -> int:
+        """Reserve ``count`` seqs for the run and return the last one in one statement.
 
-        cursor = self._connection.execute(
+        The upsert takes the database write lock and is part of the caller's transaction, so
+        concurrent writers (including other processes) never allocate overlapping ranges.
+        """
+        cursor = connection.execute(
             """
-            select agent_run_id, seq, event_type, payload_json, created_at
-            from run_event_record
-            where agent_run_id = ? and seq > ?
-            order by seq asc
+            insert into run_sequence_record (agent_run_id, last_seq)
+            values (?, ?)
+            on conflict (agent_run_id) do update set last_seq = last_seq + excluded.last_seq
+            returning last_seq
             """,
-            (agent_run_id, last_seq),
+            (agent_run_id, count),
+        )
+        row = cursor.fetchone()
+        if row is None:
+            raise RuntimeError("sequence allocation returned no row")
+        return int(cast(int, row[0]))
+
+    async def replay(self, *, agent_run_id: str, last_seq: int = 0) -> list[AgentRunEvent]:
+        return await run_state_operation(
+            self._pool,
+            self._replay,
+            agent_run_id=agent_run_id,
+            last_seq=last_seq,
         )
-        rows = cursor.fetchall()
+
+    def _replay(self, *, agent_run_id: str, last_seq: int = 0) -> list[AgentRunEvent]:
+        if self._pool is None:
+            events = self._events_by_run.get(agent_run_id, [])
+            return [event for event in events if event.seq > last_seq]
+
+        with self._pool.reader() as connection:
+            cursor = connection.execute(
+                """
+                select agent_run_id, seq, event_type, payload_json, created_at
+                from run_event_record
+                where agent_run_id = ? and seq > ?
+                order by seq asc
+                """,
+                (agent_run_id, last_seq),
+            )
+            rows = cursor.fetchall()
         return [self._from_row(row) for row in rows]
 
-    def drain_outbox(self, *, max_items: int = 100) -> list[AgentRunEvent]:
-        if self._connection is None:
-            drained: list[AgentRunEvent] = []
-            while self._queue and len(drained) < max_items:
-                drained.append(self._queue.popleft())
+    async def drain_outbox(self, *, max_items: int = 100) -> list[AgentRunEvent]:
+        return await run_state_operation(
+            self._pool,
+            self._drain_outbox,
+            max_items=max_items,
+        )
+
+    def _drain_outbox(self, *, max_items: int = 100) -> list[AgentRunEvent]:
+        if self._pool is None:
+            drained = self._claim_in_memory(max_items=max_items, now=time.time())
+            for event in drained:
+                self._claims.pop((event.agent_run_id, event.seq), None)
             return drained
 
-        cursor = self._connection.execute(
+        with self._pool.writer() as connection:
+            try:
+                drained = self._claim_rows(
+                    connection,
+                    assignments="published = 1, claimed_by = null, lease_until = null",
+                    parameters=(),
+                    now=time.time(),
+                    max_items=max_items,
+                )
+                connection.commit()
+            except Exception:
+                connection.rollback()
+                raise
+        return drained
+
+    async def claim_events(
+        self,
+        *,
+        worker_id: str,
+        max_items: int = 100,
+        lease_seconds: float = 30.0,
+    ) -> list[AgentRunEvent]:
+        """Lease up to ``max_items`` unpublished events to ``worker_id``.
+
+        Claimed events are hidden from other workers until they are acknowledged or the lease
+        expires, after which they become claimable again (at-least-once delivery).
+        """
+        return await run_state_operation(
+            self._pool,
+            self._claim_events,
+            worker_id=worker_id,
+            max_items=max_items,
+            lease_seconds=lease_seconds,
+        )
+
+    def _claim_events(
+        self,
+        *,
+        worker_id: str,
+        max_items: int,
+        lease_seconds: float,
+    ) -> list[AgentRunEvent]:
+        now = time.time()
+        lease_until = now + lease_seconds
+        if self._pool is None:
+            claimed = self._claim_in_memory(max_items=max_items, now=now)
+            for event in claimed:
+                self._claims[(event.agent_run_id, event.seq)] = (worker_id, lease_until, event)
+            return claimed
+
+        with self._pool.writer() as connection:
+            try:
+                claimed = self._claim_rows(
+                    connection,
+                    assignments="claimed_by = ?, lease_until = ?",
+                    parameters=(worker_id, lease_until),
+                    now=now,
+                    max_items=max_items,
+                )
+                connection.commit()
+            except Exception:
+                connection.rollback()
+                raise
+        return claimed
+
+    async def acknowledge_events(
+        self,
+        *,
+        worker_id: str,
+        events: Sequence[AgentRunEvent],
+    ) -> int:
+        """Mark events claimed by ``worker_id`` as published and return how many were."""
+        return await run_state_operation(
+            self._pool,
+            self._acknowledge_events,
+            worker_id=worker_id,
+            events=events,
+        )
+
+    def _acknowledge_events(self, *, worker_id: str, events: Sequence[AgentRunEvent]) -> int:
+        if self._pool is None:
+            acknowledged = 0
+            for event in events:
+                key = (event.agent_run_id, event.seq)
+                claim = self._claims.get(key)
+                if claim is not None and claim[0] == worker_id:
+                    del self._claims[key]
+                    acknowledged += 1
+            return acknowledged
+
+        if not events:
+            return 0
+        with self._pool.writer() as connection:
+            cursor = connection.executemany(
+                """
+                update run_event_outbox_record
+                set published = 1, claimed_by = null, lease_until = null
+                where agent_run_id = ? and seq = ? and claimed_by = ? and published = 0
+                """,
+                [(event.agent_run_id, event.seq, worker_id) for event in events],
+            )
+            connection.commit()
+        return cursor.rowcount
+
+    async def release_claims(self, *, worker_id: str) -> int:
+        """Return every unacknowledged claim held by ``worker_id`` to the outbox."""
+        return await run_state_operation(self._pool, self._release_claims, worker_id=worker_id)
+
+    def _release_claims(self, *, worker_id: str) -> int:
+        if self._pool is None:
+            released = sorted(
+                (event for owner, _, event in self._claims.values() if owner == worker_id),
+                key=lambda event: (event.created_at, event.agent_run_id, event.seq),
+            )
+            for event in reversed(released):
+                del self._claims[(event.agent_run_id, event.seq)]
+                self._queue.appendleft(event)
+            return len(released)
+
+        with self._pool.writer() as connection:
+            cursor = connection.execute(
+                """
+                update run_event_outbox_record
+                set claimed_by = null, lease_until = null
+                where claimed_by = ? and published = 0
+                """,
+                (worker_id,),
+            )
+            connection.commit()
+        return cursor.rowcount
+
+    def _claim_in_memory(self, *, max_items: int, now: float) -> list[AgentRunEvent]:
+        expired = sorted(
+            (event for _, lease_until, event in self._claims.values() if lease_until <= now),
+            key=lambda event: (event.created_at, event.agent_run_id, event.seq),
+        )
+        claimed = expired[:max_items]
+        while self._queue and len(claimed) < max_items:
+            claimed.append(self._queue.popleft())
+        return claimed
+
+    def _claim_rows(
+        self,
+        connection: sqlite3.Connection,
+        *,
+        assignments: str,
+        parameters: tuple[object, ...],
+        now: float,
+        max_items: int,
+    ) -> list[AgentRunEvent]:
+        """Apply ``assignments`` to the oldest claimable rows and return their events.
+
+        The candidate rows come from the partial unpublished index and are updated by a single
+        ``update ... returning`` statement, so two workers can never claim the same row.
+        """
+        cursor = connection.execute(
+            f"""
+            update run_event_outbox_record
+            set {assignments}
+            where rowid in (
+              select rowid
+              from run_event_outbox_record
+              where published = 0 and (lease_until is null or lease_until <= ?)
+              order by created_at asc, agent_run_id asc, seq asc
+              limit ?
+            )
+            returning rowid
+            """,
+            (*parameters, now, max_items),
+        )
+        rowids = [int(cast(int, row[0])) for row in cursor.fetchall()]
+        if not rowids:
+            return []
+
+        cursor = connection.execute(
             """
             select re.agent_run_id, re.seq, re.event_type, re.payload_json, re.created_at
             from run_event_outbox_record ro
             join run_event_record re
               on ro.agent_run_id = re.agent_run_id and ro.seq = re.seq
-            where ro.published = 0
-            order by re.created_at asc
-            limit ?
+            where ro.rowid in (select value from json_each(?))
+            order by ro.created_at asc, ro.agent_run_id asc, ro.seq asc
             """,
-            (max_items,),
+            (json.dumps(rowids),),
+        )
+        return [self._from_row(row) for row in cursor.fetchall()]
+
+    async def register_run_access(
+        self,
+        *,
+        agent_run_id: str,
+        workspace_id: str,
+        actor_id: str,
+    ) -> None:
+        await run_state_operation(
+            self._pool,
+            self._register_run_access,
+            agent_run_id=agent_run_id,
+            workspace_id=workspace_id,
+            actor_id=actor_id,
         )
-        rows = cursor.fetchall()
-        drained = [self._from_row(row) for row in rows]
-        for event in drained:
-            self._connection.execute(
-                """
-                update run_event_outbox_record
-                set published = 1
-                where agent_run_id = ? and seq = ?
-                """,
-                (event.agent_run_id, event.seq),
-            )
-        self._connection.commit()
-        return drained
 
-    def register_run_access(self, *, agent_run_id: str, workspace_id: str, actor_id: str) -> None:
-        if self._connection is None:
+    def _register_run_access(self, *, agent_run_id: str, workspace_id: str, actor_id: str) -> None:
+        if self._pool is None:
             actors = self._access_by_run.setdefault(agent_run_id, set())
             actors.add(actor_id)
             return
 
-        self._connection.execute(
+        with self._pool.writer() as connection:
+            self.write_run_access(
+                connection,
+                agent_run_id=agent_run_id,
+                workspace_id=workspace_id,
+                actor_id=actor_id,
+            )
+            connection.commit()
+
+    def write_run_access(
+        self,
+        connection: sqlite3.Connection,
+        *,
+        agent_run_id: str,
+        workspace_id: str,
+        actor_id: str,
+    ) -> None:
+        """Record run access on a borrowed writer connection; the caller owns the commit."""
+        connection.execute(
             """
             insert or ignore into run_access_record (agent_run_id, workspace_id, actor_id)
             values (?, ?, ?)
             """,
             (agent_run_id, workspace_id, actor_id),
         )
-        self._connection.commit()
 
-    def is_run_access_allowed(self, *, agent_run_id: str, actor_id: str) -> bool | None:
-        if self._connection is None:
+    async def is_run_access_allowed(self, *, agent_run_id: str, actor_id: str) -> bool | None:
+        return await run_state_operation(
+            self._pool,
+            self._is_run_access_allowed,
+            agent_run_id=agent_run_id,
+            actor_id=actor_id,
+        )
+
+    def _is_run_access_allowed(self, *, agent_run_id: str, actor_id: str) -> bool | None:
+        if self._pool is None:
             actors = self._access_by_run.get(agent_run_id)
             if actors is None:
                 return None
             return actor_id in actors
 
-        actor_cursor = self._connection.execute(
+        with self._pool.snapshot() as connection:
+            actor_cursor = connection.execute(
+                """
+                select 1
+                from run_access_record
+                where agent_run_id = ? and actor_id = ?
+                limit 1
+                """,
+                (agent_run_id, actor_id),
+            )
+            if actor_cursor.fetchone() is not None:
+                return True
+
+            any_cursor = connection.execute(
+                """
+                select 1
+                from run_access_record
+                where agent_run_id = ?
+                limit 1
+                """,
+                (agent_run_id,),
+            )
+            if any_cursor.fetchone() is not None:
+                return False
+        return None
+
+    async def register_companion_segment(self, *, segment: CompanionSegment) -> None:
+        await run_state_operation(self._pool, self._register_companion_segment, segment=segment)
+
+    def _register_companion_segment(self, *, segment: CompanionSegment) -> None:
+        if self._pool is None:
+            segments = self._companion_segments.setdefault(segment.workspace_id, {})
+            segments.setdefault(segment.agent_run_id, segment.started_at)
+            return
+
+        with self._pool.writer() as connection:
+            self.write_companion_segment(connection, segment=segment)
+            connection.commit()
+
+    def write_companion_segment(
+        self,
+        connection: sqlite3.Connection,
+        *,
+        segment: CompanionSegment,
+    ) -> None:
+        """Index a companion segment on a borrowed writer connection; the caller commits."""
+        connection.execute(
             """
-            select 1
-            from run_access_record
-            where agent_run_id = ? and actor_id = ?
-            limit 1
+            insert or ignore into companion_segment_record (workspace_id, agent_run_id, started_at)
+            values (?, ?, ?)
             """,
-            (agent_run_id, actor_id),
+            (segment.workspace_id, segment.agent_run_id, segment.started_at),
         )
-        if actor_cursor.fetchone() is not None:
-            return True
 
-        any_cursor = self._connection.execute(
-            """
-            select 1
-            from run_access_record
-            where agent_run_id = ?
-            limit 1
-            """,
-            (agent_run_id,),
+    async def replay_companion(
+        self,
+        *,
+        workspace_id: str,
+        actor_id: str,
+        cursor: str | None = None,
+        limit: int = 100,
+    ) -> CompanionEventPage:
+        """Replay a workspace's companion log across segments, oldest first.
+
+        Only segments ``actor_id`` has access to are included. ``cursor`` is
+        ``"{agent_run_id}:{seq}"`` of an event already seen; the page starts after it. At most
+        ``limit`` events are returned, and ``next_cursor`` is set when more are stored.
+        Raises ``ValueError`` for a malformed cursor or one naming no segment of the workspace.
+        """
+        return await run_state_operation(
+            self._pool,
+            self._replay_companion,
+            workspace_id=workspace_id,
+            actor_id=actor_id,
+            cursor=cursor,
+            limit=limit,
         )
-        if any_cursor.fetchone() is not None:
-            return False
-        return None
+
+    def _replay_companion(
+        self,
+        *,
+        workspace_id: str,
+        actor_id: str,
+        cursor: str | None,
+        limit: int,
+    ) -> CompanionEventPage:
+        after_run_id, after_seq = _parse_companion_cursor(cursor)
+        if self._pool is None:
+            return self._replay_companion_in_memory(
+                workspace_id=workspace_id,
+                actor_id=actor_id,
+                after_run_id=after_run_id,
+                after_seq=after_seq,
+                limit=limit,
+            )
+
+        events: list[AgentRunEvent] = []
+        with self._pool.snapshot() as connection:
+            start = ("", "")
+            if after_run_id is not None:
+                row = connection.execute(
+                    """
+                    select started_at
+                    from companion_segment_record
+                    where workspace_id = ? and agent_run_id = ?
+                    """,
+                    (workspace_id, after_run_id),
+                ).fetchone()
+                if row is None:
+                    raise ValueError("cursor does not name a companion segment of this workspace")
+                start = (str(row[0]), after_run_id)
+
+            segments = connection.execute(
+                """
+                select segment.agent_run_id
+                from companion_segment_record segment
+                join run_access_record access
+                  on access.agent_run_id = segment.agent_run_id and access.actor_id = ?
+                where segment.workspace_id = ?
+                  and (segment.started_at, segment.agent_run_id) >= (?, ?)
+                order by segment.started_at, segment.agent_run_id
+                """,
+                (actor_id, workspace_id, start[0], start[1]),
+            )
+            for (agent_run_id,) in segments:
+                rows = connection.execute(
+                    """
+                    select agent_run_id, seq, event_type, payload_json, created_at
+                    from run_event_record
+                    where agent_run_id = ? and seq > ?
+                    order by seq asc
+                    limit ?
+                    """,
+                    (
+                        agent_run_id,
+                        after_seq if agent_run_id == after_run_id else 0,
+                        limit + 1 - len(events),
+                    ),
+                ).fetchall()
+                events.extend(self._from_row(row) for row in rows)
+                if len(events) > limit:
+                    break
+        return _companion_page(events, limit=limit)
+
+    def _replay_companion_in_memory(
+        self,
+        *,
+        workspace_id: str,
+        actor_id: str,
+        after_run_id: str | None,
+        after_seq: int,
+        limit: int,
+    ) -> CompanionEventPage:
+        segments = self._companion_segments.get(workspace_id, {})
+        start = ("", "")
+        if after_run_id is not None:
+            if after_run_id not in segments:
+                raise ValueError("cursor does not name a companion segment of this workspace")
+            start = (segments[after_run_id], after_run_id)
+
+        events: list[AgentRunEvent] = []
+        ordered = sorted((started_at, run_id) for run_id, started_at in segments.items())
+        for started_at, agent_run_id in ordered:
+            if (started_at, agent_run_id) < start:
+                continue
+            if actor_id not in self._access_by_run.get(agent_run_id, set()):
+                continue
+            last_seq = after_seq if agent_run_id == after_run_id else 0
+            events.extend(
+                event for event in self._events_by_run.get(agent_run_id, []) if event.seq > last_seq
+            )
+            if len(events) > limit:
+                break
+        return _companion_page(events[: limit + 1], limit=limit)
+
+
+def _parse_companion_cursor(cursor: str | None) -> tuple[str | None, int]:
+    if cursor is None:
+        return None, 0
+    agent_run_id, separator, seq = cursor.rpartition(":")
+    if not separator or not agent_run_id or not seq.isdigit():
+        raise ValueError("cursor must be '<agent_run_id>:<seq>'")
+    return agent_run_id, int(seq)
+
+
+def _companion_page(events: list[AgentRunEvent], *, limit: int) -> CompanionEventPage:
+    if len(events) <= limit:
+        return CompanionEventPage(events=events, next_cursor=None)
+    page = events[:limit]
+    last = page[-1]
+    return CompanionEventPage(events=page, next_cursor=f"{last.agent_run_id}:{last.seq}")
@@ -1,26 +1,53 @@
-from collections.abc import AsyncIterator
+import asyncio
+import json
+from collections.abc import AsyncIterator, Awaitable, Callable
 from contextlib import asynccontextmanager
+from datetime import datetime, timezone
 from hashlib import sha256
 from typing import Literal, cast
 
-from fastapi import Depends, FastAPI, Header, HTTPException, Request, status
+from fastapi import Depends, FastAPI, Header, HTTPException, Request, Response, status
+from fastapi.responses import StreamingResponse
 from pydantic import BaseModel, Field
 
 from apps.api.agents import (
     ActorContext,
     AgentRuntime,
+    CompanionStageTimings,
+    CompletionClient,
+    PartialOutput,
     PolicyEngine,
     SpecialistAgent,
     StubCompletionClient,
 )
+from apps.api.agents.completion_batching import (
+    BatchingCompletionClient,
+    StubBatchCompletionBackend,
+    resolve_completion_batching,
+)
+from apps.api.agents.completion_cache import (
+    CachedCompletionClient,
+    resolve_completion_cache_mode,
+)
+from apps.api.agents.completion_http import (
+    HttpCompletionClient,
+    resolve_http_completion_settings,
+)
+from apps.api.agents.runtime import ExecutionReply
 from apps.api.audit import ImmutableAuditLog
 from apps.api.auth import InvitationService, WorkspaceAccessService
+from apps.api.db.pool import StateConnectionPool
 from apps.api.db.sqlite import enforce_sqlite_security_if_enabled
-from apps.api.db.state import connect_state_db
+from apps.api.events.broker import RunEventStream
 from apps.api.events.outbox import AgentRunEventOutbox
-from apps.api.memory import SqliteMemoryStore
+from apps.api.memory import MemoryCorpusCache, SqliteMemoryStore
 from apps.api.safety import ApprovalRequiredError, ApprovalService
 
+EVENT_STREAM_KEEPALIVE_SECONDS = 15.0
+PARTIAL_OUTPUT_BUFFER_SIZE = 64
+AUDIT_EVENTS_MAX_PAGE_SIZE = 500
+COMPANION_EVENTS_MAX_PAGE_SIZE = 500
+
 Role = Literal["owner", "member"]
 Capability = Literal[
     "read_memory",
@@ -37,6 +64,7 @@ class CompanionMessageRequest(BaseModel):
 
 
 class CompanionMessageResponse(BaseModel):
+    agent_run_id: str
     response: str
     memory_hits: list[str]
 
@@ -134,27 +162,46 @@ class AuditEventResponse(BaseModel):
     previous_hash: str
     event_hash: str
     created_at: str
+    seq: int
 
 
 @asynccontextmanager
 async def lifespan(app: FastAPI) -> AsyncIterator[None]:
     enforce_sqlite_security_if_enabled()
-    state_connection = connect_state_db()
+    state_pool = StateConnectionPool()
 
-    memory_store = SqliteMemoryStore(connection=state_connection)
+    memory_store = SqliteMemoryStore(
+        pool=state_pool,
+        corpus_cache=MemoryCorpusCache(),
+    )
     policy_engine = PolicyEngine()
-    outbox = AgentRunEventOutbox(connection=state_connection)
-    completion_client = StubCompletionClient()
-    approval_service = ApprovalService(connection=state_connection)
-    audit_log = ImmutableAuditLog(connection=state_connection)
-    invitation_service = InvitationService(connection=state_connection)
-    workspace_access_service = WorkspaceAccessService(connection=state_connection)
-    for workspace_id, owner_id in workspace_access_service.list_workspace_owners():
+    outbox = AgentRunEventOutbox(pool=state_pool)
+    completion_client: CompletionClient = StubCompletionClient()
+    http_completion_settings = resolve_http_completion_settings()
+    http_client: HttpCompletionClient | None = None
+    batching_client: BatchingCompletionClient | None = None
+    if http_completion_settings is not None:
+        http_client = HttpCompletionClient(http_completion_settings)
+        completion_client = http_client
+    elif resolve_completion_batching():
+        batching_client = BatchingCompletionClient(StubBatchCompletionBackend())
+        completion_client = batching_client
+    cache_mode = resolve_completion_cache_mode()
+    if cache_mode != "off":
+        completion_client = CachedCompletionClient(
+            completion_client,
+            pool=state_pool if cache_mode == "persistent" else None,
+        )
+    approval_service = ApprovalService(pool=state_pool)
+    audit_log = ImmutableAuditLog(pool=state_pool)
+    invitation_service = InvitationService(pool=state_pool)
+    workspace_access_service = WorkspaceAccessService(pool=state_pool)
+    for workspace_id, owner_id in await workspace_access_service.list_workspace_owners():
         workspace_access_service.add_workspace_owner(
             workspace_id=workspace_id,
             owner_id=owner_id,
         )
-    for membership in invitation_service.list_memberships():
+    for membership in await invitation_service.list_memberships():
         workspace_access_service.add_workspace_member(
             workspace_id=membership.workspace_id,
             user_id=membership.user_id,
@@ -178,7 +225,11 @@ async def lifespan(app: FastAPI) -> AsyncIterator[None]:
     del app.state.audit_log
     del app.state.invitations
     del app.state.workspace_access
-    state_connection.close()
+    if batching_client is not None:
+        await batching_client.aclose()
+    if http_client is not None:
+        await http_client.aclose()
+    state_pool.close()
 
 
 app = FastAPI(
@@ -266,14 +317,14 @@ def invitation_token_fingerprint(token: str) -> str:
     return sha256(token.encode("utf-8")).hexdigest()[:12]
 
 
-def authorize_workspace_access(
+async def authorize_workspace_access(
     *,
     workspace_id: str,
     actor: ActorContext,
     workspace_access: WorkspaceAccessService,
 ) -> None:
     try:
-        workspace_access.ensure_workspace_access(
+        await workspace_access.ensure_workspace_access(
             workspace_id=workspace_id,
             actor=actor,
         )
@@ -288,7 +339,7 @@ async def list_specialists(
     actor: ActorContext = Depends(get_actor),
     workspace_access: WorkspaceAccessService = Depends(get_workspace_access),
 ) -> list[SpecialistResponse]:
-    authorize_workspace_access(
+    await authorize_workspace_access(
         workspace_id=workspace_id,
         actor=actor,
         workspace_access=workspace_access,
@@ -318,7 +369,7 @@ async def upsert_specialist(
     actor: ActorContext = Depends(get_actor),
     workspace_access: WorkspaceAccessService = Depends(get_workspace_access),
 ) -> SpecialistResponse:
-    authorize_workspace_access(
+    await authorize_workspace_access(
         workspace_id=workspace_id,
         actor=actor,
         workspace_access=workspace_access,
@@ -331,7 +382,7 @@ async def upsert_specialist(
         capabilities=set(payload.capabilities),
     )
     try:
-        stored = runtime.upsert_specialist(
+        stored = await runtime.upsert_specialist(
             workspace_id=workspace_id,
             actor=actor,
             specialist=specialist,
@@ -358,11 +409,13 @@ async def upsert_specialist(
 async def send_companion_message(
     workspace_id: str,
     payload: CompanionMessageRequest,
+    response: Response,
     runtime: AgentRuntime = Depends(get_runtime),
     actor: ActorContext = Depends(get_actor),
     workspace_access: WorkspaceAccessService = Depends(get_workspace_access),
 ) -> CompanionMessageResponse:
-    authorize_workspace_access(
+    """Reply to a companion message; the ``Server-Timing`` header breaks down the latency."""
+    await authorize_workspace_access(
         workspace_id=workspace_id,
         actor=actor,
         workspace_access=workspace_access,
@@ -372,7 +425,93 @@ async def send_companion_message(
         actor_id=actor.user_id,
         message=payload.message,
     )
-    return CompanionMessageResponse(response=reply.response, memory_hits=reply.memory_hits)
+    response.headers["Server-Timing"] = _server_timing(reply.timings)
+    return CompanionMessageResponse(
+        agent_run_id=reply.agent_run_id,
+        response=reply.response,
+        memory_hits=reply.memory_hits,
+    )
+
+
+def _server_timing(timings: CompanionStageTimings) -> str:
+    stages = {
+        "memory_write": timings.memory_write_seconds,
+        "memory_search": timings.memory_search_seconds,
+        "completion": timings.completion_seconds,
+        "bookkeeping": timings.bookkeeping_seconds,
+        "total": timings.total_seconds,
+    }
+    return ", ".join(f"{name};dur={seconds * 1000:.1f}" for name, seconds in stages.items())
+
+
+@app.post("/workspaces/{workspace_id}/companion/messages/stream")
+async def stream_companion_message(
+    workspace_id: str,
+    payload: CompanionMessageRequest,
+    runtime: AgentRuntime = Depends(get_runtime),
+    actor: ActorContext = Depends(get_actor),
+    workspace_access: WorkspaceAccessService = Depends(get_workspace_access),
+) -> StreamingResponse:
+    """Server-Sent Events: ``partial`` chunks as the reply is generated, then the ``reply``."""
+    await authorize_workspace_access(
+        workspace_id=workspace_id,
+        actor=actor,
+        workspace_access=workspace_access,
+    )
+
+    async def call(on_partial: Callable[[PartialOutput], Awaitable[None]]) -> BaseModel:
+        reply = await runtime.companion_message(
+            workspace_id=workspace_id,
+            actor_id=actor.user_id,
+            message=payload.message,
+            on_partial=on_partial,
+        )
+        return CompanionMessageResponse(
+            agent_run_id=reply.agent_run_id,
+            response=reply.response,
+            memory_hits=reply.memory_hits,
+        )
+
+    return await _partial_output_response(call)
+
+
+@app.get("/workspaces/{workspace_id}/companion/events")
+async def list_companion_events(
+    workspace_id: str,
+    response: Response,
+    cursor: str | None = None,
+    limit: int = 100,
+    runtime: AgentRuntime = Depends(get_runtime),
+    actor: ActorContext = Depends(get_actor),
+    workspace_access: WorkspaceAccessService = Depends(get_workspace_access),
+) -> list[dict[str, object]]:
+    """Page through the workspace's companion log, oldest first, across its segments.
+
+    When more events remain, the ``X-Next-Cursor`` header carries the cursor for the next
+    page; pass it back as ``cursor`` to continue.
+    """
+    await authorize_workspace_access(
+        workspace_id=workspace_id,
+        actor=actor,
+        workspace_access=workspace_access,
+    )
+    if not 1 <= limit <= COMPANION_EVENTS_MAX_PAGE_SIZE:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=f"limit must be between 1 and {COMPANION_EVENTS_MAX_PAGE_SIZE}",
+        )
+    try:
+        page = await runtime.replay_companion_events(
+            workspace_id=workspace_id,
+            actor=actor,
+            cursor=cursor,
+            limit=limit,
+        )
+    except ValueError as exc:
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=str(exc)) from exc
+    if page.next_cursor is not None:
+        response.headers["X-Next-Cursor"] = page.next_cursor
+    return [runtime.serialize_event(event) for event in page.events]
 
 
 @app.post(
@@ -386,7 +525,7 @@ async def execute_goal(
     actor: ActorContext = Depends(get_actor),
     workspace_access: WorkspaceAccessService = Depends(get_workspace_access),
 ) -> ExecutionGoalResponse:
-    authorize_workspace_access(
+    await authorize_workspace_access(
         workspace_id=workspace_id,
         actor=actor,
         workspace_access=workspace_access,
@@ -398,19 +537,59 @@ async def execute_goal(
             goal=payload.goal,
             approved_request_ids=set(payload.approved_request_ids),
         )
-    except ApprovalRequiredError as exc:
-        raise HTTPException(
+    except (ApprovalRequiredError, ValueError, PermissionError) as exc:
+        raise _execution_error(exc) from exc
+
+    return _execution_response(result)
+
+
+@app.post("/workspaces/{workspace_id}/execution/goals/stream")
+async def stream_execute_goal(
+    workspace_id: str,
+    payload: ExecutionGoalRequest,
+    runtime: AgentRuntime = Depends(get_runtime),
+    actor: ActorContext = Depends(get_actor),
+    workspace_access: WorkspaceAccessService = Depends(get_workspace_access),
+) -> StreamingResponse:
+    """Server-Sent Events: specialists' ``partial`` output as it is generated, then the ``reply``.
+
+    Approval and eligibility failures are reported with the same status codes as the
+    non-streaming endpoint, since they happen before any output is produced.
+    """
+    await authorize_workspace_access(
+        workspace_id=workspace_id,
+        actor=actor,
+        workspace_access=workspace_access,
+    )
+
+    async def call(on_partial: Callable[[PartialOutput], Awaitable[None]]) -> BaseModel:
+        result = await runtime.execute_goal(
+            workspace_id=workspace_id,
+            actor=actor,
+            goal=payload.goal,
+            approved_request_ids=set(payload.approved_request_ids),
+            on_partial=on_partial,
+        )
+        return _execution_response(result)
+
+    return await _partial_output_response(call)
+
+
+def _execution_error(exc: Exception) -> HTTPException:
+    if isinstance(exc, ApprovalRequiredError):
+        return HTTPException(
             status_code=status.HTTP_409_CONFLICT,
             detail={
                 "message": str(exc),
                 "approval_id": exc.approval_id,
             },
-        ) from exc
-    except ValueError as exc:
-        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=str(exc)) from exc
-    except PermissionError as exc:
-        raise HTTPException(status_code=status.HTTP_403_FORBIDDEN, detail=str(exc)) from exc
+        )
+    if isinstance(exc, ValueError):
+        return HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=str(exc))
+    return HTTPException(status_code=status.HTTP_403_FORBIDDEN, detail=str(exc))
 
+
+def _execution_response(result: ExecutionReply) -> ExecutionGoalResponse:
     return ExecutionGoalResponse(
         agent_run_id=result.agent_run_id,
         summary=result.summary,
@@ -426,6 +605,65 @@ async def execute_goal(
     )
 
 
+async def _partial_output_response(
+    call: Callable[[Callable[[PartialOutput], Awaitable[None]]], Awaitable[BaseModel]],
+) -> StreamingResponse:
+    """Run ``call`` in the background and stream its partial output as Server-Sent Events.
+
+    The response only starts once the first chunk (or the result) is available, so errors
+    raised before any output still map onto ordinary HTTP errors. The bounded buffer makes
+    a slow client pause generation instead of queueing output without limit.
+    """
+    queue: asyncio.Queue[PartialOutput | BaseModel | Exception] = asyncio.Queue(
+        maxsize=PARTIAL_OUTPUT_BUFFER_SIZE
+    )
+
+    async def run() -> None:
+        try:
+            result = await call(queue.put)
+        except Exception as exc:
+            await queue.put(exc)
+            return
+        await queue.put(result)
+
+    task = asyncio.create_task(run())
+    first = await queue.get()
+    if isinstance(first, Exception):
+        await task
+        if isinstance(first, (ApprovalRequiredError, ValueError, PermissionError)):
+            raise _execution_error(first) from first
+        raise first
+
+    return StreamingResponse(
+        _partial_output_frames(first, queue, task),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"},
+    )
+
+
+async def _partial_output_frames(
+    first: PartialOutput | BaseModel,
+    queue: asyncio.Queue[PartialOutput | BaseModel | Exception],
+    task: asyncio.Task[None],
+) -> AsyncIterator[str]:
+    item: PartialOutput | BaseModel | Exception = first
+    try:
+        while True:
+            if isinstance(item, PartialOutput):
+                data = json.dumps({"source": item.source, "text": item.text})
+                yield f"event: partial\ndata: {data}\n\n"
+            elif isinstance(item, BaseModel):
+                yield f"event: reply\ndata: {item.model_dump_json()}\n\n"
+                return
+            else:
+                yield f"event: error\ndata: {json.dumps({'detail': str(item)})}\n\n"
+                return
+            item = await queue.get()
+    finally:
+        if not task.done():
+            task.cancel()
+
+
 @app.get("/agent-runs/{agent_run_id}/events")
 async def replay_events(
     agent_run_id: str,
@@ -440,7 +678,7 @@ async def replay_events(
         )
 
     try:
-        return runtime.replay_events(
+        return await runtime.replay_events(
             agent_run_id=agent_run_id,
             actor=actor,
             last_seq=last_seq,
@@ -449,6 +687,71 @@ async def replay_events(
         raise HTTPException(status_code=status.HTTP_403_FORBIDDEN, detail=str(exc)) from exc
 
 
+async def _event_stream_frames(
+    stream: RunEventStream,
+    *,
+    keepalive_seconds: float,
+) -> AsyncIterator[str]:
+    try:
+        while True:
+            events = await stream.next_events(timeout=keepalive_seconds)
+            if events is None:
+                if stream.overflowed:
+                    yield f"event: overflow\ndata: {json.dumps({'last_seq': stream.last_seq})}\n\n"
+                return
+            if not events:
+                yield ": keepalive\n\n"
+                continue
+            for event in events:
+                data = json.dumps(AgentRuntime.serialize_event(event), sort_keys=True)
+                yield f"id: {event.seq}\ndata: {data}\n\n"
+    finally:
+        stream.close()
+
+
+@app.get("/agent-runs/{agent_run_id}/events/stream")
+async def stream_events(
+    agent_run_id: str,
+    last_seq: int = 0,
+    last_event_id: str | None = Header(default=None),
+    runtime: AgentRuntime = Depends(get_runtime),
+    actor: ActorContext = Depends(get_actor),
+) -> StreamingResponse:
+    """Server-Sent Events: the backlog after ``last_seq``, then events as they are appended.
+
+    Reconnecting clients resume from the ``Last-Event-ID`` header. A client that falls too
+    far behind receives an ``overflow`` event and should reconnect from its last seq.
+    """
+    if last_event_id is not None:
+        try:
+            last_seq = int(last_event_id)
+        except ValueError as exc:
+            raise HTTPException(
+                status_code=status.HTTP_400_BAD_REQUEST,
+                detail="Last-Event-ID must be an event seq",
+            ) from exc
+    if last_seq < 0:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="last_seq must be >= 0",
+        )
+
+    try:
+        stream = await runtime.open_event_stream(
+            agent_run_id=agent_run_id,
+            actor=actor,
+            last_seq=last_seq,
+        )
+    except PermissionError as exc:
+        raise HTTPException(status_code=status.HTTP_403_FORBIDDEN, detail=str(exc)) from exc
+
+    return StreamingResponse(
+        _event_stream_frames(stream, keepalive_seconds=EVENT_STREAM_KEEPALIVE_SECONDS),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"},
+    )
+
+
 @app.post(
     "/workspaces/{workspace_id}/invitations",
     response_model=InvitationResponse,
@@ -462,7 +765,7 @@ async def create_invitation(
     actor: ActorContext = Depends(get_actor),
     workspace_access: WorkspaceAccessService = Depends(get_workspace_access),
 ) -> InvitationResponse:
-    authorize_workspace_access(
+    await authorize_workspace_access(
         workspace_id=workspace_id,
         actor=actor,
         workspace_access=workspace_access,
@@ -470,12 +773,12 @@ async def create_invitation(
     if actor.role != "owner":
         raise HTTPException(status_code=status.HTTP_403_FORBIDDEN, detail="owner role required")
 
-    invitation = invitations.create_invitation(
+    invitation = await invitations.create_invitation(
         workspace_id=workspace_id,
         email=payload.email,
         invited_by=actor.user_id,
     )
-    audit_log.append_event(
+    await audit_log.append_event(
         workspace_id=workspace_id,
         actor_id=actor.user_id,
         action="invitation.created",
@@ -504,7 +807,7 @@ async def list_invitations(
     actor: ActorContext = Depends(get_actor),
     workspace_access: WorkspaceAccessService = Depends(get_workspace_access),
 ) -> list[InvitationResponse]:
-    authorize_workspace_access(
+    await authorize_workspace_access(
         workspace_id=workspace_id,
         actor=actor,
         workspace_access=workspace_access,
@@ -512,7 +815,7 @@ async def list_invitations(
     if actor.role != "owner":
         raise HTTPException(status_code=status.HTTP_403_FORBIDDEN, detail="owner role required")
 
-    records = invitations.list_invitations(workspace_id=workspace_id)
+    records = await invitations.list_invitations(workspace_id=workspace_id)
     return [
         InvitationResponse(
             token=record.token,
@@ -537,11 +840,11 @@ async def accept_invitation(
     workspace_access: WorkspaceAccessService = Depends(get_workspace_access),
 ) -> MembershipResponse:
     try:
-        membership = invitations.accept_invitation(token=token, user_id=payload.user_id)
+        membership = await invitations.accept_invitation(token=token, user_id=payload.user_id)
     except ValueError as exc:
         raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=str(exc)) from exc
 
-    audit_log.append_event(
+    await audit_log.append_event(
         workspace_id=membership.workspace_id,
         actor_id=payload.user_id,
         action="invitation.accepted",
@@ -576,19 +879,19 @@ async def create_approval(
     actor: ActorContext = Depends(get_actor),
     workspace_access: WorkspaceAccessService = Depends(get_workspace_access),
 ) -> ApprovalResponse:
-    authorize_workspace_access(
+    await authorize_workspace_access(
         workspace_id=workspace_id,
         actor=actor,
         workspace_access=workspace_access,
     )
-    request = approvals.create_request(
+    request = await approvals.create_request(
         workspace_id=workspace_id,
         actor_id=actor.user_id,
         capability=payload.capability,
         action=payload.action,
         reason=payload.reason,
     )
-    audit_log.append_event(
+    await audit_log.append_event(
         workspace_id=workspace_id,
         actor_id=actor.user_id,
         action="approval.created",
@@ -621,7 +924,7 @@ async def decide_approval(
         raise HTTPException(status_code=status.HTTP_403_FORBIDDEN, detail="owner role required")
 
     try:
-        decided = approvals.decide_request(
+        decided = await approvals.decide_request(
             approval_id=approval_id,
             approver_id=actor.user_id,
             decision=payload.decision,
@@ -631,7 +934,7 @@ async def decide_approval(
     except ValueError as exc:
         raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=str(exc)) from exc
 
-    audit_log.append_event(
+    await audit_log.append_event(
         workspace_id=decided.workspace_id,
         actor_id=actor.user_id,
         action="approval.decided",
@@ -659,7 +962,7 @@ async def list_approvals(
     actor: ActorContext = Depends(get_actor),
     workspace_access: WorkspaceAccessService = Depends(get_workspace_access),
 ) -> list[ApprovalResponse]:
-    authorize_workspace_access(
+    await authorize_workspace_access(
         workspace_id=workspace_id,
         actor=actor,
         workspace_access=workspace_access,
@@ -667,7 +970,7 @@ async def list_approvals(
     if actor.role != "owner":
         raise HTTPException(status_code=status.HTTP_403_FORBIDDEN, detail="owner role required")
 
-    records = approvals.list_requests(workspace_id=workspace_id)
+    records = await approvals.list_requests(workspace_id=workspace_id)
     return [
         ApprovalResponse(
             id=record.id,
@@ -685,22 +988,75 @@ async def list_approvals(
     ]
 
 
+def _normalize_audit_timestamp(name: str, value: str | None) -> str | None:
+    """Render a time bound in the UTC ISO format audit timestamps are stored in."""
+    if value is None:
+        return None
+    try:
+        parsed = datetime.fromisoformat(value)
+    except ValueError as exc:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=f"{name} must be an ISO 8601 timestamp",
+        ) from exc
+    if parsed.tzinfo is None:
+        parsed = parsed.replace(tzinfo=timezone.utc)
+    return parsed.astimezone(timezone.utc).isoformat()
+
+
 @app.get("/workspaces/{workspace_id}/audit-events", response_model=list[AuditEventResponse])
 async def list_audit_events(
     workspace_id: str,
+    response: Response,
+    cursor: int | None = None,
+    limit: int = 100,
+    action: str | None = None,
+    actor_id: str | None = None,
+    outcome: str | None = None,
+    since: str | None = None,
+    until: str | None = None,
     audit_log: ImmutableAuditLog = Depends(get_audit_log),
     actor: ActorContext = Depends(get_actor),
     workspace_access: WorkspaceAccessService = Depends(get_workspace_access),
 ) -> list[AuditEventResponse]:
-    authorize_workspace_access(
+    """A page of audit history, oldest first.
+
+    When older events remain, the ``X-Next-Cursor`` header carries the cursor for the
+    next page; pass it back as ``cursor`` to keep scrolling.
+    """
+    await authorize_workspace_access(
         workspace_id=workspace_id,
         actor=actor,
         workspace_access=workspace_access,
     )
     if actor.role != "owner":
         raise HTTPException(status_code=status.HTTP_403_FORBIDDEN, detail="owner role required")
+    if not 1 <= limit <= AUDIT_EVENTS_MAX_PAGE_SIZE:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=f"limit must be between 1 and {AUDIT_EVENTS_MAX_PAGE_SIZE}",
+        )
+    if cursor is not None and cursor < 1:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="cursor must be >= 1",
+        )
+    since = _normalize_audit_timestamp("since", since)
+    until = _normalize_audit_timestamp("until", until)
 
-    events = audit_log.list_events(workspace_id=workspace_id)
+    page = await audit_log.list_event_page(
+        workspace_id=workspace_id,
+        limit=limit,
+        before_seq=cursor,
+        action=action,
+        actor_id=actor_id,
+        outcome=outcome,
+        since=since,
+        until=until,
+    )
+    if page.next_cursor is not None:
+        response.headers["X-Next-Cursor"] = str(page.next_cursor)
+    events = page.events
     return [
         AuditEventResponse(
             id=event.id,
@@ -712,6 +1068,7 @@ async def list_audit_events(
             previous_hash=event.previous_hash,
             event_hash=event.event_hash,
             created_at=event.created_at,
+            seq=event.seq,
         )
         for event in events
     ]
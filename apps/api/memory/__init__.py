@@ -1,11 +1,22 @@
-from apps.api.memory.store_base import MemoryItem, MemoryMatch, MemoryStore
+from apps.api.memory.corpus_cache import CorpusCacheStats, MemoryCorpusCache
+from apps.api.memory.store_base import (
+    MemoryItem,
+    MemoryMatch,
+    MemoryStore,
+    MemoryUpsert,
+    MemoryUpsertResult,
+)
 from apps.api.memory.store_postgres import PostgresMemoryStore
 from apps.api.memory.store_sqlite import SqliteMemoryStore
 
 __all__ = [
+    "CorpusCacheStats",
+    "MemoryCorpusCache",
     "MemoryItem",
     "MemoryMatch",
     "MemoryStore",
+    "MemoryUpsert",
+    "MemoryUpsertResult",
     "PostgresMemoryStore",
     "SqliteMemoryStore",
 ]
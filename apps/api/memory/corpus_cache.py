@@ -0,0 +1,292 @@
+import os
+from array import array
+from collections import OrderedDict
+from collections.abc import Iterable
+from dataclasses import dataclass
+
+import numpy as np
+import numpy.typing as npt
+
+from apps.api.memory.vector_index import FloatMatrix, FloatVector
+
+CorpusKey = tuple[str, str, str]
+
+DEFAULT_MEMORY_CACHE_BYTES = 64 * 1024 * 1024
+_ROW_OVERHEAD_BYTES = 96
+_TOKEN_OVERHEAD_BYTES = 64
+_POSTING_BYTES = 4
+
+
+def resolve_memory_cache_bytes(max_bytes: int | None = None) -> int:
+    if max_bytes is not None:
+        return max_bytes
+    return int(os.getenv("ELARA_MEMORY_CACHE_BYTES", str(DEFAULT_MEMORY_CACHE_BYTES)))
+
+
+@dataclass(frozen=True)
+class CorpusCacheStats:
+    hits: int
+    misses: int
+    evictions: int
+    entries: int
+    bytes_used: int
+    max_bytes: int
+
+
+_FREE_SLOT = 0xFFFFFFFF
+
+
+@dataclass(frozen=True)
+class VectorSnapshot:
+    """The published slots of one vector block; stays valid after the corpus lock is released.
+
+    ``slots`` holds the corpus row stored in each matrix slot, or ``_FREE_SLOT`` for a slot
+    whose row has since moved or been removed.
+    """
+
+    slots: npt.NDArray[np.uint32]
+    matrix: FloatMatrix
+
+    def live(self) -> tuple[npt.NDArray[np.uint32], FloatMatrix]:
+        occupied = self.slots != _FREE_SLOT
+        if bool(occupied.all()):
+            return self.slots, self.matrix
+        return self.slots[occupied], self.matrix[occupied]
+
+
+class _VectorBlock:
+    """Embeddings of one dimension packed into a growable float32 matrix.
+
+    Published slots are never overwritten: replacing a row's vector appends a new slot and
+    frees the old one, and growth or compaction moves rows into a new matrix. A snapshot's
+    matrix view therefore never changes underneath a reader.
+    """
+
+    def __init__(self, dim: int) -> None:
+        self.dim = dim
+        self.rows = array("I")
+        self._position_by_row: dict[int, int] = {}
+        self._matrix: FloatMatrix = np.empty((0, dim), dtype=np.float32)
+        self._free_slots = 0
+
+    @property
+    def nbytes(self) -> int:
+        return int(self._matrix.nbytes) + self.rows.itemsize * len(self.rows)
+
+    def snapshot(self) -> VectorSnapshot:
+        slots = np.frombuffer(self.rows, dtype=np.uint32).copy()
+        return VectorSnapshot(slots=slots, matrix=self._matrix[: len(slots)])
+
+    def put(self, row: int, vector: FloatVector) -> None:
+        self._free(row)
+        position = len(self.rows)
+        if position == self._matrix.shape[0]:
+            grown = np.empty((max(8, 2 * position), self.dim), dtype=np.float32)
+            grown[:position] = self._matrix[:position]
+            self._matrix = grown
+        self._matrix[position] = vector
+        self.rows.append(row)
+        self._position_by_row[row] = position
+        self._compact_if_sparse()
+
+    def discard(self, row: int) -> None:
+        self._free(row)
+        self._compact_if_sparse()
+
+    def _free(self, row: int) -> None:
+        position = self._position_by_row.pop(row, None)
+        if position is not None:
+            self.rows[position] = _FREE_SLOT
+            self._free_slots += 1
+
+    def _compact_if_sparse(self) -> None:
+        if 2 * self._free_slots <= len(self.rows):
+            return
+        slots = np.frombuffer(self.rows, dtype=np.uint32)
+        occupied = np.flatnonzero(slots != _FREE_SLOT)
+        matrix: FloatMatrix = np.empty((max(8, 2 * len(occupied)), self.dim), dtype=np.float32)
+        matrix[: len(occupied)] = self._matrix[occupied]
+        rows = array("I", slots[occupied].tobytes())
+        del slots
+        self.rows = rows
+        self._position_by_row = {row: position for position, row in enumerate(rows)}
+        self._matrix = matrix
+        self._free_slots = 0
+
+
+class AgentCorpus:
+    """Array-backed snapshot of one agent's memories: contents, token postings and vectors.
+
+    Writes update the corpus in place and must hold the owner's lock, as must reads of
+    contents and postings. Rows are append-only (a row's memory id never changes) and vector
+    snapshots are immutable, so scoring a ``vector_snapshot`` needs no lock.
+    """
+
+    def __init__(self) -> None:
+        self.memory_ids: list[str] = []
+        self.contents: list[str] = []
+        self._tokens_by_row: list[frozenset[str]] = []
+        self._row_by_id: dict[str, int] = {}
+        # Removing a row from a posting list is deferred: entries whose row no longer has the
+        # token are skipped on read and dropped once they outnumber the live ones.
+        self._postings: dict[str, array[int]] = {}
+        self._stale_postings: dict[str, int] = {}
+        self._vector_dim_by_row: dict[int, int] = {}
+        self._blocks: dict[int, _VectorBlock] = {}
+        self._text_bytes = 0
+        self._posting_bytes = 0
+
+    @property
+    def nbytes(self) -> int:
+        return (
+            self._text_bytes
+            + self._posting_bytes
+            + sum(block.nbytes for block in self._blocks.values())
+        )
+
+    def __len__(self) -> int:
+        return len(self.memory_ids)
+
+    def upsert(
+        self,
+        *,
+        memory_id: str,
+        content: str,
+        tokens: list[str],
+        vector: FloatVector | None,
+    ) -> None:
+        row = self._row_by_id.get(memory_id)
+        if row is None:
+            row = len(self.memory_ids)
+            self._row_by_id[memory_id] = row
+            self.memory_ids.append(memory_id)
+            self.contents.append(content)
+            self._tokens_by_row.append(frozenset())
+            self._text_bytes += _ROW_OVERHEAD_BYTES + len(memory_id) + len(content)
+        else:
+            self._text_bytes += len(content) - len(self.contents[row])
+            self.contents[row] = content
+
+        previous_tokens = self._tokens_by_row[row]
+        unique_tokens = frozenset(tokens)
+        self._tokens_by_row[row] = unique_tokens
+        for token in previous_tokens - unique_tokens:
+            self._retire_posting(token)
+        for token in sorted(unique_tokens - previous_tokens):
+            postings = self._postings.get(token)
+            if postings is None:
+                postings = array("I")
+                self._postings[token] = postings
+                self._posting_bytes += _TOKEN_OVERHEAD_BYTES + len(token)
+            postings.append(row)
+            self._posting_bytes += _POSTING_BYTES
+
+        previous_dim = self._vector_dim_by_row.pop(row, None)
+        if previous_dim is not None and (vector is None or vector.shape[0] != previous_dim):
+            self._blocks[previous_dim].discard(row)
+        if vector is not None:
+            dim = int(vector.shape[0])
+            block = self._blocks.get(dim)
+            if block is None:
+                block = _VectorBlock(dim)
+                self._blocks[dim] = block
+            block.put(row, vector)
+            self._vector_dim_by_row[row] = dim
+
+    def _retire_posting(self, token: str) -> None:
+        postings = self._postings[token]
+        stale = self._stale_postings.get(token, 0) + 1
+        if 2 * stale <= len(postings):
+            self._stale_postings[token] = stale
+            return
+        live = array(
+            "I",
+            dict.fromkeys(row for row in postings if token in self._tokens_by_row[row]),
+        )
+        self._stale_postings.pop(token, None)
+        self._posting_bytes -= _POSTING_BYTES * (len(postings) - len(live))
+        if live:
+            self._postings[token] = live
+        else:
+            del self._postings[token]
+            self._posting_bytes -= _TOKEN_OVERHEAD_BYTES + len(token)
+
+    def postings_for(self, tokens: list[str]) -> list[tuple[str, str]]:
+        matches: list[tuple[str, str]] = []
+        for token in tokens:
+            rows: Iterable[int] = self._postings.get(token, ())
+            if token in self._stale_postings:
+                rows = dict.fromkeys(row for row in rows if token in self._tokens_by_row[row])
+            matches.extend((token, self.memory_ids[row]) for row in rows)
+        return matches
+
+    def content_for(self, memory_id: str) -> str:
+        return self.contents[self._row_by_id[memory_id]]
+
+    def vector_snapshot(self, dim: int) -> VectorSnapshot:
+        block = self._blocks.get(dim)
+        if block is None:
+            return VectorSnapshot(
+                slots=np.empty(0, dtype=np.uint32),
+                matrix=np.empty((0, dim), dtype=np.float32),
+            )
+        return block.snapshot()
+
+
+class MemoryCorpusCache:
+    """Byte-bounded LRU of per-agent corpora keyed by ``(backend, workspace_id, agent_id)``.
+
+    The owning store updates cached corpora in place on write and calls ``put`` again to
+    re-measure them. The cache is not thread-safe; callers serialise access to it. It is per
+    process: writes made by other processes against the same database are not observed.
+    """
+
+    def __init__(self, *, max_bytes: int | None = None) -> None:
+        self._max_bytes = resolve_memory_cache_bytes(max_bytes)
+        self._entries: OrderedDict[CorpusKey, AgentCorpus] = OrderedDict()
+        self._bytes_by_key: dict[CorpusKey, int] = {}
+        self._bytes_used = 0
+        self._hits = 0
+        self._misses = 0
+        self._evictions = 0
+
+    def get(self, key: CorpusKey) -> AgentCorpus | None:
+        corpus = self._entries.get(key)
+        if corpus is None:
+            self._misses += 1
+            return None
+        self._hits += 1
+        self._entries.move_to_end(key)
+        return corpus
+
+    def put(self, key: CorpusKey, corpus: AgentCorpus) -> None:
+        self._entries[key] = corpus
+        self._entries.move_to_end(key)
+        self._account(key)
+
+    def peek(self, key: CorpusKey) -> AgentCorpus | None:
+        """Return a cached corpus for a write-through update without touching counters."""
+        return self._entries.get(key)
+
+    def invalidate(self, key: CorpusKey) -> None:
+        if self._entries.pop(key, None) is not None:
+            self._bytes_used -= self._bytes_by_key.pop(key)
+
+    def stats(self) -> CorpusCacheStats:
+        return CorpusCacheStats(
+            hits=self._hits,
+            misses=self._misses,
+            evictions=self._evictions,
+            entries=len(self._entries),
+            bytes_used=self._bytes_used,
+            max_bytes=self._max_bytes,
+        )
+
+    def _account(self, key: CorpusKey) -> None:
+        size = self._entries[key].nbytes
+        self._bytes_used += size - self._bytes_by_key.get(key, 0)
+        self._bytes_by_key[key] = size
+        while self._bytes_used > self._max_bytes and self._entries:
+            evicted_key, _corpus = self._entries.popitem(last=False)
+            self._bytes_used -= self._bytes_by_key.pop(evicted_key)
+            self._evictions += 1
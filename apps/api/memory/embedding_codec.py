@@ -0,0 +1,70 @@
+import struct
+from typing import Literal
+
+import numpy as np
+import numpy.typing as npt
+
+from apps.api.memory.vector_index import FloatMatrix, FloatVector
+
+EmbeddingEncoding = Literal["float32", "float16", "int8"]
+
+_INT8_SCALE_BYTES = struct.calcsize("<f")
+
+
+def encode_embedding(embedding: list[float], *, encoding: EmbeddingEncoding = "float32") -> bytes:
+    """Pack an embedding as little-endian bytes.
+
+    ``int8`` is symmetric per-vector quantisation: a float32 scale followed by one signed
+    byte per dimension.
+    """
+    vector = np.asarray(embedding, dtype=np.float32)
+    if encoding == "float32":
+        return vector.astype("<f4", copy=False).tobytes()
+    if encoding == "float16":
+        return vector.astype("<f2").tobytes()
+
+    peak = float(np.max(np.abs(vector))) if vector.size else 0.0
+    scale = peak / 127.0 if peak > 0.0 else 1.0
+    quantized: npt.NDArray[np.int8] = np.clip(np.rint(vector / scale), -127, 127).astype(
+        np.int8
+    )
+    return struct.pack("<f", scale) + quantized.tobytes()
+
+
+def decode_embedding(blob: bytes, *, encoding: EmbeddingEncoding, dim: int) -> FloatVector:
+    """Decode to a 1-D float32 vector; ``float32`` blobs are viewed without copying."""
+    if encoding == "float32":
+        vector = np.frombuffer(blob, dtype="<f4")
+    elif encoding == "float16":
+        vector = np.frombuffer(blob, dtype="<f2").astype(np.float32)
+    else:
+        (scale,) = struct.unpack_from("<f", blob)
+        quantized = np.frombuffer(blob, dtype=np.int8, offset=_INT8_SCALE_BYTES)
+        vector = quantized.astype(np.float32) * np.float32(scale)
+    if vector.shape[0] != dim:
+        raise ValueError("embedding dimension mismatch for stored vector")
+    return vector.astype(np.float32, copy=False)
+
+
+def decode_matrix(
+    blobs: list[bytes],
+    *,
+    encodings: list[EmbeddingEncoding],
+    dim: int,
+) -> FloatMatrix:
+    """Decode many stored embeddings into one contiguous ``(n, dim)`` float32 matrix."""
+    if not blobs:
+        return np.empty((0, dim), dtype=np.float32)
+    if all(encoding == "float32" for encoding in encodings):
+        matrix = np.frombuffer(b"".join(blobs), dtype="<f4")
+        if matrix.shape[0] != len(blobs) * dim:
+            raise ValueError("embedding dimension mismatch for stored vector")
+        return matrix.reshape(len(blobs), dim).astype(np.float32, copy=False)
+    return np.ascontiguousarray(
+        np.stack(
+            [
+                decode_embedding(blob, encoding=encoding, dim=dim)
+                for blob, encoding in zip(blobs, encodings, strict=True)
+            ]
+        )
+    )
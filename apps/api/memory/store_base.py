@@ -1,6 +1,8 @@
 from dataclasses import dataclass
 from typing import Protocol
 
+from apps.api.memory.vector_index import VectorMetric
+
 
 @dataclass(frozen=True)
 class MemoryItem:
@@ -10,6 +12,23 @@ class MemoryItem:
     content: str
 
 
+@dataclass(frozen=True)
+class MemoryUpsert:
+    workspace_id: str
+    agent_id: str
+    memory_id: str
+    content: str
+    embedding: list[float] | None = None
+    embedding_model: str = "text-embedding-3-small"
+
+
+@dataclass(frozen=True)
+class MemoryUpsertResult:
+    memory_id: str
+    item: MemoryItem | None
+    error: str | None = None
+
+
 @dataclass(frozen=True)
 class MemoryMatch:
     memory_id: str
@@ -29,6 +48,8 @@ class MemoryStore(Protocol):
         embedding_model: str = "text-embedding-3-small",
     ) -> MemoryItem: ...
 
+    async def upsert_memories(self, items: list[MemoryUpsert]) -> list[MemoryUpsertResult]: ...
+
     async def search(
         self,
         *,
@@ -37,3 +58,14 @@ class MemoryStore(Protocol):
         query: str,
         top_k: int = 5,
     ) -> list[MemoryMatch]: ...
+
+    async def search_vector(
+        self,
+        *,
+        workspace_id: str,
+        agent_id: str,
+        embedding: list[float],
+        top_k: int = 5,
+        metric: VectorMetric = "cosine",
+        exact: bool = False,
+    ) -> list[MemoryMatch]: ...
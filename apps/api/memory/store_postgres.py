@@ -1,5 +1,6 @@
 import sqlite3
 
+from apps.api.db.pool import StateConnectionPool
 from apps.api.memory.store_sqlite import SqliteMemoryStore
 
 
@@ -11,9 +12,11 @@ class PostgresMemoryStore(SqliteMemoryStore):
         *,
         database_path: str | None = None,
         connection: sqlite3.Connection | None = None,
+        pool: StateConnectionPool | None = None,
     ) -> None:
         super().__init__(
             database_path=database_path,
             connection=connection,
+            pool=pool,
             backend_name="postgres",
         )
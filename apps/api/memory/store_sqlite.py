@@ -1,13 +1,62 @@
 import json
+import re
 import sqlite3
+import threading
+from collections import Counter
+from collections.abc import Callable
 from datetime import datetime, timezone
 
-from apps.api.db.state import connect_state_db
-from apps.api.memory.store_base import MemoryItem, MemoryMatch
+from apps.api.db.pool import StateConnectionPool, run_state_operation
+from apps.api.db.state import migration_applied, record_migration
+from apps.api.memory.corpus_cache import AgentCorpus, CorpusKey, MemoryCorpusCache
+from apps.api.memory.embedding_codec import (
+    EmbeddingEncoding,
+    decode_embedding,
+    decode_matrix,
+    encode_embedding,
+)
+from apps.api.memory.store_base import (
+    MemoryItem,
+    MemoryMatch,
+    MemoryUpsert,
+    MemoryUpsertResult,
+)
+from apps.api.memory.vector_index import (
+    FloatMatrix,
+    FloatVector,
+    IvfIndex,
+    VectorMetric,
+    rank_by_similarity,
+    to_matrix,
+    train_ivf,
+)
+
+_EMBEDDING_MIGRATION_BATCH = 1_000
+_DIMENSION_LOOKUP_BATCH = 500
+_DIMENSION_MISMATCH = "embedding dimension mismatch for existing memory id"
+_TOKEN_PATTERN = re.compile(r"\w+")
+
+
+def tokenize(text: str) -> list[str]:
+    return _TOKEN_PATTERN.findall(text.lower())
 
 
 class SqliteMemoryStore:
-    """Memory store with deterministic retrieval contract and optional SQLite persistence."""
+    """Memory store with deterministic retrieval contract and optional SQLite persistence.
+
+    Retrieval is backed by an inverted token index (``memory_token_record``) so a search
+    only reads the postings for the query tokens instead of scanning every memory.
+
+    Vector retrieval is exact below ``ann_min_vectors`` embeddings per agent and dimension.
+    Above it, a persisted IVF index narrows the scan to the ``ann_probe_lists`` buckets
+    nearest the query before exact re-ranking.
+
+    Embeddings are persisted as packed little-endian BLOBs (``embedding_encoding``:
+    float32 by default, or float16/int8 to trade precision for space).
+
+    An optional ``MemoryCorpusCache`` keeps hot agent corpora in process; lexical and exact
+    vector searches are then served from it, and upserts update cached corpora in place.
+    """
 
     def __init__(
         self,
@@ -15,25 +64,191 @@ class SqliteMemoryStore:
         database_path: str | None = None,
         connection: sqlite3.Connection | None = None,
         backend_name: str = "sqlite",
+        ann_min_vectors: int = 4_096,
+        ann_probe_lists: int = 8,
+        embedding_encoding: EmbeddingEncoding = "float32",
+        corpus_cache: MemoryCorpusCache | None = None,
+        pool: StateConnectionPool | None = None,
     ) -> None:
-        self._connection = connection
-        self._owns_connection = False
-        if self._connection is None and database_path is not None:
-            self._connection = connect_state_db(database_path)
-            self._owns_connection = True
+        self._pool = pool
+        self._owns_pool = False
+        if self._pool is None and (connection is not None or database_path is not None):
+            self._pool = StateConnectionPool(database_path=database_path, connection=connection)
+            self._owns_pool = connection is None
         self._backend_name = backend_name
         self._records: dict[tuple[str, str, str], MemoryItem] = {}
         self._embedding_dim_by_key: dict[tuple[str, str, str], int] = {}
+        self._postings: dict[tuple[str, str], dict[str, set[str]]] = {}
+        self._tokens_by_key: dict[tuple[str, str, str], set[str]] = {}
+        self._embeddings_by_key: dict[tuple[str, str, str], list[float]] = {}
+        self._ann_min_vectors = ann_min_vectors
+        self._ann_probe_lists = ann_probe_lists
+        self._embedding_encoding: EmbeddingEncoding = embedding_encoding
+        self._corpus_cache = corpus_cache
+        self._corpus_lock = threading.Lock()
+        self._corpus_versions: dict[CorpusKey, int] = {}
+        if self._pool is not None:
+            with self._pool.writer() as connection:
+                self._run_migration(connection, "memory_token_index", self._backfill_token_index)
+                self._run_migration(
+                    connection, "memory_embedding_blob", self._migrate_json_embeddings
+                )
 
     def close(self) -> None:
-        if self._connection is None or not self._owns_connection:
+        if self._pool is None or not self._owns_pool:
             return
-        self._connection.close()
-        self._connection = None
+        self._pool.close()
+        self._pool = None
 
     def __del__(self) -> None:
         self.close()
 
+    def _run_migration(
+        self,
+        connection: sqlite3.Connection,
+        name: str,
+        migrate: Callable[[sqlite3.Connection], None],
+    ) -> None:
+        """Run a one-time data migration for this backend unless it is already recorded."""
+        marker = f"{name}:{self._backend_name}"
+        if migration_applied(connection, marker):
+            return
+        migrate(connection)
+        record_migration(connection, marker)
+        connection.commit()
+
+    def _backfill_token_index(self, connection: sqlite3.Connection) -> None:
+        """Index memories missing from the token index or indexed with punctuation attached."""
+        cursor = connection.execute(
+            """
+            select m.workspace_id, m.agent_id, m.memory_id, m.content
+            from memory_record m
+            where m.backend = ?
+              and not exists (
+                select 1
+                from memory_token_record t
+                where t.backend = m.backend
+                  and t.workspace_id = m.workspace_id
+                  and t.agent_id = m.agent_id
+                  and t.memory_id = m.memory_id
+              )
+            """,
+            (self._backend_name,),
+        )
+        rows = cursor.fetchall()
+        # The GLOB is a cheap superset (it also matches non-ASCII words); the pattern decides.
+        cursor = connection.execute(
+            """
+            select m.workspace_id, m.agent_id, m.memory_id, m.content, t.token
+            from memory_token_record t
+            join memory_record m
+              on m.backend = t.backend
+             and m.workspace_id = t.workspace_id
+             and m.agent_id = t.agent_id
+             and m.memory_id = t.memory_id
+            where t.backend = ? and t.token glob '*[^0-9A-Za-z_]*'
+            """,
+            (self._backend_name,),
+        )
+        stale = {
+            (row[0], row[1], row[2]): row[3]
+            for row in cursor.fetchall()
+            if _TOKEN_PATTERN.fullmatch(str(row[4])) is None
+        }
+        rows.extend((*key, content) for key, content in stale.items())
+        if rows:
+            self._index_tokens_in_db(
+                connection,
+                [
+                    MemoryItem(
+                        workspace_id=str(row[0]),
+                        agent_id=str(row[1]),
+                        memory_id=str(row[2]),
+                        content=str(row[3]),
+                    )
+                    for row in rows
+                ],
+            )
+            connection.commit()
+
+    def _migrate_json_embeddings(self, connection: sqlite3.Connection) -> None:
+        """Re-encode legacy ``embedding_json`` rows as BLOBs and clear the JSON column."""
+        while True:
+            cursor = connection.execute(
+                """
+                select workspace_id, agent_id, memory_id, embedding_json
+                from memory_record
+                where backend = ? and embedding_json is not null
+                limit ?
+                """,
+                (self._backend_name, _EMBEDDING_MIGRATION_BATCH),
+            )
+            rows = cursor.fetchall()
+            if not rows:
+                return
+            connection.executemany(
+                """
+                update memory_record
+                set embedding_blob = ?, embedding_encoding = ?, embedding_json = null
+                where backend = ? and workspace_id = ? and agent_id = ? and memory_id = ?
+                """,
+                [
+                    (
+                        encode_embedding(
+                            json.loads(str(row[3])),
+                            encoding=self._embedding_encoding,
+                        ),
+                        self._embedding_encoding,
+                        self._backend_name,
+                        row[0],
+                        row[1],
+                        row[2],
+                    )
+                    for row in rows
+                ],
+            )
+            connection.commit()
+
+    def _index_tokens_in_db(self, connection: sqlite3.Connection, items: list[MemoryItem]) -> None:
+        connection.executemany(
+            """
+            delete from memory_token_record
+            where backend = ? and workspace_id = ? and agent_id = ? and memory_id = ?
+            """,
+            [
+                (self._backend_name, item.workspace_id, item.agent_id, item.memory_id)
+                for item in items
+            ],
+        )
+        connection.executemany(
+            """
+            insert into memory_token_record (
+              backend, workspace_id, agent_id, token, memory_id
+            ) values (?, ?, ?, ?, ?)
+            """,
+            [
+                (self._backend_name, item.workspace_id, item.agent_id, token, item.memory_id)
+                for item in items
+                for token in sorted(set(tokenize(item.content)))
+            ],
+        )
+
+    def _index_tokens_in_memory(self, *, item: MemoryItem) -> None:
+        key = (item.workspace_id, item.agent_id, item.memory_id)
+        postings = self._postings.setdefault((item.workspace_id, item.agent_id), {})
+        for token in self._tokens_by_key.get(key, set()):
+            memory_ids = postings.get(token)
+            if memory_ids is None:
+                continue
+            memory_ids.discard(item.memory_id)
+            if not memory_ids:
+                del postings[token]
+
+        tokens = set(tokenize(item.content))
+        for token in tokens:
+            postings.setdefault(token, set()).add(item.memory_id)
+        self._tokens_by_key[key] = tokens
+
     async def upsert_memory(
         self,
         *,
@@ -44,69 +259,283 @@ class SqliteMemoryStore:
         embedding: list[float] | None = None,
         embedding_model: str = "text-embedding-3-small",
     ) -> MemoryItem:
-        embedding_dim = len(embedding) if embedding is not None else 0
-        item = MemoryItem(
-            workspace_id=workspace_id,
-            agent_id=agent_id,
-            memory_id=memory_id,
-            content=content,
+        [result] = await self.upsert_memories(
+            [
+                MemoryUpsert(
+                    workspace_id=workspace_id,
+                    agent_id=agent_id,
+                    memory_id=memory_id,
+                    content=content,
+                    embedding=embedding,
+                    embedding_model=embedding_model,
+                )
+            ]
         )
+        if result.item is None:
+            raise ValueError(result.error)
+        return result.item
 
-        key = (workspace_id, agent_id, memory_id)
-        if self._connection is None:
-            existing_dim = self._embedding_dim_by_key.get(key, 0)
-            if existing_dim > 0 and embedding_dim > 0 and existing_dim != embedding_dim:
-                raise ValueError("embedding dimension mismatch for existing memory id")
-            self._records[key] = item
-            self._embedding_dim_by_key[key] = (
-                existing_dim if existing_dim > 0 and embedding_dim == 0 else embedding_dim
+    async def upsert_memories(self, items: list[MemoryUpsert]) -> list[MemoryUpsertResult]:
+        """Validate and write a batch of memories in a single transaction.
+
+        Items whose embedding dimension conflicts with the stored memory are reported as
+        failed results and skipped; the rest of the batch is still written. When a batch
+        repeats a memory id, the last accepted item wins.
+        """
+        return await run_state_operation(self._pool, self._upsert_memories, items)
+
+    def _upsert_memories(self, items: list[MemoryUpsert]) -> list[MemoryUpsertResult]:
+        if self._pool is None:
+            results, accepted = self._accept_upserts(
+                items,
+                dims=self._existing_embedding_dims(items),
             )
-            return item
+            for key, (upsert, persisted_dim) in accepted.items():
+                item = MemoryItem(
+                    workspace_id=upsert.workspace_id,
+                    agent_id=upsert.agent_id,
+                    memory_id=upsert.memory_id,
+                    content=upsert.content,
+                )
+                self._records[key] = item
+                self._embedding_dim_by_key[key] = persisted_dim
+                self._index_tokens_in_memory(item=item)
+                if upsert.embedding is None:
+                    self._embeddings_by_key.pop(key, None)
+                else:
+                    self._embeddings_by_key[key] = list(upsert.embedding)
+            return results
 
-        cursor = self._connection.execute(
-            """
-            select embedding_dim
-            from memory_record
-            where backend = ? and workspace_id = ? and agent_id = ? and memory_id = ?
-            """,
-            (self._backend_name, workspace_id, agent_id, memory_id),
-        )
-        row = cursor.fetchone()
-        existing_dim = 0 if row is None else int(row[0])
-        if existing_dim > 0 and embedding_dim > 0 and existing_dim != embedding_dim:
-            raise ValueError("embedding dimension mismatch for existing memory id")
+        with self._pool.writer() as connection:
+            results, accepted = self._accept_upserts(
+                items,
+                dims=self._existing_embedding_dims(items, connection=connection),
+            )
+            if not accepted:
+                return results
+            try:
+                stale_indexes = self._write_upserts(connection, list(accepted.values()))
+            except Exception:
+                connection.rollback()
+                raise
+            connection.commit()
+
+        self._write_through([upsert for upsert, _persisted_dim in accepted.values()])
+        for workspace_id, agent_id, dim in stale_indexes:
+            self.build_vector_index(workspace_id=workspace_id, agent_id=agent_id, dim=dim)
+        return results
 
-        persisted_dim = existing_dim if existing_dim > 0 and embedding_dim == 0 else embedding_dim
+    @staticmethod
+    def _accept_upserts(
+        items: list[MemoryUpsert],
+        *,
+        dims: dict[tuple[str, str, str], int],
+    ) -> tuple[list[MemoryUpsertResult], dict[tuple[str, str, str], tuple[MemoryUpsert, int]]]:
+        results: list[MemoryUpsertResult] = []
+        accepted: dict[tuple[str, str, str], tuple[MemoryUpsert, int]] = {}
+        for upsert in items:
+            key = (upsert.workspace_id, upsert.agent_id, upsert.memory_id)
+            embedding_dim = len(upsert.embedding) if upsert.embedding is not None else 0
+            existing_dim = dims.get(key, 0)
+            if existing_dim > 0 and embedding_dim > 0 and existing_dim != embedding_dim:
+                results.append(
+                    MemoryUpsertResult(
+                        memory_id=upsert.memory_id,
+                        item=None,
+                        error=_DIMENSION_MISMATCH,
+                    )
+                )
+                continue
+
+            dims[key] = existing_dim if existing_dim > 0 and embedding_dim == 0 else embedding_dim
+            accepted.pop(key, None)
+            accepted[key] = (upsert, dims[key])
+            results.append(
+                MemoryUpsertResult(
+                    memory_id=upsert.memory_id,
+                    item=MemoryItem(
+                        workspace_id=upsert.workspace_id,
+                        agent_id=upsert.agent_id,
+                        memory_id=upsert.memory_id,
+                        content=upsert.content,
+                    ),
+                )
+            )
+        return results, accepted
+
+    def _write_upserts(
+        self,
+        connection: sqlite3.Connection,
+        accepted: list[tuple[MemoryUpsert, int]],
+    ) -> list[tuple[str, str, int]]:
+        """Write accepted upserts; returns the vector corpora whose IVF index is now stale."""
         now = datetime.now(timezone.utc).isoformat()
-        self._connection.execute(
+        connection.executemany(
             """
             insert into memory_record (
               backend, workspace_id, agent_id, memory_id, content,
-              embedding_model, embedding_dim, embedding_json, created_at, updated_at
-            ) values (?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
+              embedding_model, embedding_dim, embedding_json, embedding_blob,
+              embedding_encoding, created_at, updated_at
+            ) values (?, ?, ?, ?, ?, ?, ?, null, ?, ?, ?, ?)
             on conflict(backend, workspace_id, agent_id, memory_id)
             do update set
               content = excluded.content,
               embedding_model = excluded.embedding_model,
               embedding_dim = excluded.embedding_dim,
-              embedding_json = excluded.embedding_json,
+              embedding_json = null,
+              embedding_blob = excluded.embedding_blob,
+              embedding_encoding = excluded.embedding_encoding,
               updated_at = excluded.updated_at
             """,
-            (
-                self._backend_name,
-                workspace_id,
-                agent_id,
-                memory_id,
-                content,
-                embedding_model,
-                persisted_dim,
-                None if embedding is None else json.dumps(embedding),
-                now,
-                now,
-            ),
+            [
+                (
+                    self._backend_name,
+                    upsert.workspace_id,
+                    upsert.agent_id,
+                    upsert.memory_id,
+                    upsert.content,
+                    upsert.embedding_model,
+                    persisted_dim,
+                    (
+                        None
+                        if upsert.embedding is None
+                        else encode_embedding(upsert.embedding, encoding=self._embedding_encoding)
+                    ),
+                    None if upsert.embedding is None else self._embedding_encoding,
+                    now,
+                    now,
+                )
+                for upsert, persisted_dim in accepted
+            ],
         )
-        self._connection.commit()
-        return item
+        self._index_tokens_in_db(
+            connection,
+            [
+                MemoryItem(
+                    workspace_id=upsert.workspace_id,
+                    agent_id=upsert.agent_id,
+                    memory_id=upsert.memory_id,
+                    content=upsert.content,
+                )
+                for upsert, _persisted_dim in accepted
+            ],
+        )
+        return self._assign_vector_lists(
+            connection, [upsert for upsert, _persisted_dim in accepted]
+        )
+
+    def _existing_embedding_dims(
+        self,
+        items: list[MemoryUpsert],
+        *,
+        connection: sqlite3.Connection | None = None,
+    ) -> dict[tuple[str, str, str], int]:
+        keys = sorted({(item.workspace_id, item.agent_id, item.memory_id) for item in items})
+        if connection is None:
+            return {
+                key: self._embedding_dim_by_key[key]
+                for key in keys
+                if key in self._embedding_dim_by_key
+            }
+
+        dims: dict[tuple[str, str, str], int] = {}
+        for start in range(0, len(keys), _DIMENSION_LOOKUP_BATCH):
+            batch = keys[start : start + _DIMENSION_LOOKUP_BATCH]
+            values = ", ".join("(?, ?, ?)" for _ in batch)
+            cursor = connection.execute(
+                f"""
+                with batch(workspace_id, agent_id, memory_id) as (values {values})
+                select m.workspace_id, m.agent_id, m.memory_id, m.embedding_dim
+                from batch b
+                join memory_record m
+                  on m.backend = ?
+                  and m.workspace_id = b.workspace_id
+                  and m.agent_id = b.agent_id
+                  and m.memory_id = b.memory_id
+                """,
+                (*(value for key in batch for value in key), self._backend_name),
+            )
+            for row in cursor.fetchall():
+                dims[(str(row[0]), str(row[1]), str(row[2]))] = int(row[3])
+        return dims
+
+    def _write_through(self, upserts: list[MemoryUpsert]) -> None:
+        """Apply committed upserts to cached corpora in place.
+
+        Tokens and vectors are prepared before taking ``_corpus_lock``, so the lock covers
+        only the row updates. Bumping the key's version stops a concurrent cold load that
+        predates this write from caching its stale corpus.
+        """
+        if self._corpus_cache is None:
+            return
+        rows_by_key: dict[CorpusKey, list[tuple[MemoryUpsert, list[str], FloatVector | None]]] = {}
+        for upsert in upserts:
+            key = (self._backend_name, upsert.workspace_id, upsert.agent_id)
+            vector = (
+                None
+                if upsert.embedding is None
+                else decode_embedding(
+                    encode_embedding(upsert.embedding, encoding=self._embedding_encoding),
+                    encoding=self._embedding_encoding,
+                    dim=len(upsert.embedding),
+                )
+            )
+            rows_by_key.setdefault(key, []).append((upsert, tokenize(upsert.content), vector))
+
+        with self._corpus_lock:
+            for key, rows in rows_by_key.items():
+                self._corpus_versions[key] = self._corpus_versions.get(key, 0) + 1
+                corpus = self._corpus_cache.peek(key)
+                if corpus is None:
+                    continue
+                for upsert, tokens, vector in rows:
+                    corpus.upsert(
+                        memory_id=upsert.memory_id,
+                        content=upsert.content,
+                        tokens=tokens,
+                        vector=vector,
+                    )
+                self._corpus_cache.put(key, corpus)
+
+    def _cached_corpus(self, *, workspace_id: str, agent_id: str) -> AgentCorpus | None:
+        if self._corpus_cache is None or self._pool is None:
+            return None
+
+        key = (self._backend_name, workspace_id, agent_id)
+        with self._corpus_lock:
+            corpus = self._corpus_cache.get(key)
+            version = self._corpus_versions.get(key, 0)
+        if corpus is not None:
+            return corpus
+
+        with self._pool.reader() as connection:
+            cursor = connection.execute(
+                """
+                select memory_id, content, embedding_dim, embedding_blob, embedding_encoding
+                from memory_record
+                where backend = ? and workspace_id = ? and agent_id = ?
+                order by memory_id asc
+                """,
+                (self._backend_name, workspace_id, agent_id),
+            )
+            rows = cursor.fetchall()
+        corpus = AgentCorpus()
+        for row in rows:
+            content = str(row[1])
+            corpus.upsert(
+                memory_id=str(row[0]),
+                content=content,
+                tokens=tokenize(content),
+                vector=(
+                    None
+                    if row[3] is None
+                    else decode_embedding(bytes(row[3]), encoding=row[4], dim=int(row[2]))
+                ),
+            )
+        with self._corpus_lock:
+            if self._corpus_versions.get(key, 0) == version:
+                self._corpus_cache.put(key, corpus)
+        return corpus
 
     async def search(
         self,
@@ -118,44 +547,610 @@ class SqliteMemoryStore:
     ) -> list[MemoryMatch]:
         if top_k <= 0:
             return []
+        return await run_state_operation(
+            self._pool,
+            self._search,
+            workspace_id=workspace_id,
+            agent_id=agent_id,
+            query=query,
+            top_k=top_k,
+        )
+
+    def _search(
+        self,
+        *,
+        workspace_id: str,
+        agent_id: str,
+        query: str,
+        top_k: int,
+    ) -> list[MemoryMatch]:
+        return self._search_corpus(
+            workspace_id=workspace_id,
+            agent_id=agent_id,
+            query=query,
+            top_k=top_k,
+            corpus=self._cached_corpus(workspace_id=workspace_id, agent_id=agent_id),
+        )
+
+    def _search_corpus(
+        self,
+        *,
+        workspace_id: str,
+        agent_id: str,
+        query: str,
+        top_k: int,
+        corpus: AgentCorpus | None,
+    ) -> list[MemoryMatch]:
+        tokens = tokenize(query)
+        if not tokens:
+            return self._unranked(
+                workspace_id=workspace_id,
+                agent_id=agent_id,
+                top_k=top_k,
+                corpus=corpus,
+            )
+
+        weights = Counter(tokens)
+        scores: dict[str, float] = {}
+        for token, memory_id in self._postings_for(
+            workspace_id=workspace_id,
+            agent_id=agent_id,
+            tokens=sorted(weights),
+            corpus=corpus,
+        ):
+            scores[memory_id] = scores.get(memory_id, 0.0) + float(weights[token])
+
+        ranked = sorted(scores.items(), key=lambda entry: (-entry[1], entry[0]))[:top_k]
+        contents = self._contents_for(
+            workspace_id=workspace_id,
+            agent_id=agent_id,
+            memory_ids=[memory_id for memory_id, _score in ranked],
+            corpus=corpus,
+        )
+        return [
+            MemoryMatch(memory_id=memory_id, score=score, content=contents[memory_id])
+            for memory_id, score in ranked
+        ]
+
+    def _postings_for(
+        self,
+        *,
+        workspace_id: str,
+        agent_id: str,
+        tokens: list[str],
+        corpus: AgentCorpus | None = None,
+    ) -> list[tuple[str, str]]:
+        if corpus is not None:
+            with self._corpus_lock:
+                return corpus.postings_for(tokens)
+        if self._pool is None:
+            postings = self._postings.get((workspace_id, agent_id), {})
+            return [
+                (token, memory_id)
+                for token in tokens
+                for memory_id in postings.get(token, set())
+            ]
+
+        placeholders = ", ".join("?" for _ in tokens)
+        with self._pool.reader() as connection:
+            cursor = connection.execute(
+                f"""
+                select token, memory_id
+                from memory_token_record
+                where backend = ? and workspace_id = ? and agent_id = ?
+                  and token in ({placeholders})
+                """,
+                (self._backend_name, workspace_id, agent_id, *tokens),
+            )
+            return [(str(row[0]), str(row[1])) for row in cursor.fetchall()]
+
+    def _contents_for(
+        self,
+        *,
+        workspace_id: str,
+        agent_id: str,
+        memory_ids: list[str],
+        corpus: AgentCorpus | None = None,
+    ) -> dict[str, str]:
+        if not memory_ids:
+            return {}
+        if corpus is not None:
+            with self._corpus_lock:
+                return {memory_id: corpus.content_for(memory_id) for memory_id in memory_ids}
+        if self._pool is None:
+            return {
+                memory_id: self._records[(workspace_id, agent_id, memory_id)].content
+                for memory_id in memory_ids
+            }
+
+        placeholders = ", ".join("?" for _ in memory_ids)
+        with self._pool.reader() as connection:
+            cursor = connection.execute(
+                f"""
+                select memory_id, content
+                from memory_record
+                where backend = ? and workspace_id = ? and agent_id = ?
+                  and memory_id in ({placeholders})
+                """,
+                (self._backend_name, workspace_id, agent_id, *memory_ids),
+            )
+            return {str(row[0]): str(row[1]) for row in cursor.fetchall()}
 
-        if self._connection is not None:
-            cursor = self._connection.execute(
+    def _unranked(
+        self,
+        *,
+        workspace_id: str,
+        agent_id: str,
+        top_k: int,
+        corpus: AgentCorpus | None = None,
+    ) -> list[MemoryMatch]:
+        """An empty query matches every scoped memory with a zero score."""
+        if corpus is not None:
+            with self._corpus_lock:
+                memory_ids = list(corpus.memory_ids)
+            memory_ids = sorted(memory_ids)[:top_k]
+            contents = self._contents_for(
+                workspace_id=workspace_id,
+                agent_id=agent_id,
+                memory_ids=memory_ids,
+                corpus=corpus,
+            )
+            return [
+                MemoryMatch(memory_id=memory_id, score=0.0, content=contents[memory_id])
+                for memory_id in memory_ids
+            ]
+        if self._pool is None:
+            records = sorted(
+                (
+                    item
+                    for item in self._records.values()
+                    if item.workspace_id == workspace_id and item.agent_id == agent_id
+                ),
+                key=lambda item: item.memory_id,
+            )
+            return [
+                MemoryMatch(memory_id=item.memory_id, score=0.0, content=item.content)
+                for item in records[:top_k]
+            ]
+
+        with self._pool.reader() as connection:
+            cursor = connection.execute(
                 """
                 select memory_id, content
                 from memory_record
                 where backend = ? and workspace_id = ? and agent_id = ?
+                order by memory_id asc
+                limit ?
                 """,
-                (self._backend_name, workspace_id, agent_id),
+                (self._backend_name, workspace_id, agent_id, top_k),
             )
-            rows = cursor.fetchall()
-            records = [
-                MemoryItem(
-                    workspace_id=workspace_id,
-                    agent_id=agent_id,
-                    memory_id=str(row[0]),
-                    content=str(row[1]),
-                )
-                for row in rows
+            return [
+                MemoryMatch(memory_id=str(row[0]), score=0.0, content=str(row[1]))
+                for row in cursor.fetchall()
             ]
-        else:
-            records = [
-                item
-                for item in self._records.values()
-                if item.workspace_id == workspace_id and item.agent_id == agent_id
+
+    async def search_vector(
+        self,
+        *,
+        workspace_id: str,
+        agent_id: str,
+        embedding: list[float],
+        top_k: int = 5,
+        metric: VectorMetric = "cosine",
+        exact: bool = False,
+    ) -> list[MemoryMatch]:
+        if top_k <= 0 or not embedding:
+            return []
+        return await run_state_operation(
+            self._pool,
+            self._search_vector,
+            workspace_id=workspace_id,
+            agent_id=agent_id,
+            embedding=embedding,
+            top_k=top_k,
+            metric=metric,
+            exact=exact,
+        )
+
+    def _search_vector(
+        self,
+        *,
+        workspace_id: str,
+        agent_id: str,
+        embedding: list[float],
+        top_k: int,
+        metric: VectorMetric,
+        exact: bool,
+    ) -> list[MemoryMatch]:
+        dim = len(embedding)
+        index: IvfIndex | None = None
+        if not exact and self._pool is not None:
+            index = self._vector_index_for(workspace_id=workspace_id, agent_id=agent_id, dim=dim)
+
+        if index is not None:
+            memory_ids, contents, matrix = self._vector_rows(
+                workspace_id=workspace_id,
+                agent_id=agent_id,
+                dim=dim,
+                list_ids=index.probe(embedding, probe_lists=self._ann_probe_lists),
+            )
+            return self._rank_vectors(
+                memory_ids=memory_ids,
+                contents=contents,
+                matrix=matrix,
+                embedding=embedding,
+                top_k=top_k,
+                metric=metric,
+            )
+
+        corpus = self._cached_corpus(workspace_id=workspace_id, agent_id=agent_id)
+        if corpus is not None:
+            with self._corpus_lock:
+                snapshot = corpus.vector_snapshot(dim)
+            rows, matrix = snapshot.live()
+            ranked = rank_by_similarity(
+                memory_ids=[corpus.memory_ids[row] for row in rows.tolist()],
+                matrix=matrix,
+                query=embedding,
+                top_k=top_k,
+                metric=metric,
+            )
+            content_by_id = self._contents_for(
+                workspace_id=workspace_id,
+                agent_id=agent_id,
+                memory_ids=[memory_id for memory_id, _score in ranked],
+                corpus=corpus,
+            )
+            return [
+                MemoryMatch(memory_id=memory_id, score=score, content=content_by_id[memory_id])
+                for memory_id, score in ranked
             ]
 
-        results: list[MemoryMatch] = []
-        tokens = [token for token in query.lower().split() if token]
-        for item in records:
-            haystack = item.content.lower()
-            score = float(sum(1 for token in tokens if token in haystack))
-            if score == 0.0 and tokens:
+        memory_ids, contents, matrix = self._vector_rows(
+            workspace_id=workspace_id,
+            agent_id=agent_id,
+            dim=dim,
+        )
+        return self._rank_vectors(
+            memory_ids=memory_ids,
+            contents=contents,
+            matrix=matrix,
+            embedding=embedding,
+            top_k=top_k,
+            metric=metric,
+        )
+
+    @staticmethod
+    def _rank_vectors(
+        *,
+        memory_ids: list[str],
+        contents: list[str],
+        matrix: FloatMatrix,
+        embedding: list[float],
+        top_k: int,
+        metric: VectorMetric,
+    ) -> list[MemoryMatch]:
+        content_by_id = dict(zip(memory_ids, contents, strict=True))
+        ranked = rank_by_similarity(
+            memory_ids=memory_ids,
+            matrix=matrix,
+            query=embedding,
+            top_k=top_k,
+            metric=metric,
+        )
+        return [
+            MemoryMatch(memory_id=memory_id, score=score, content=content_by_id[memory_id])
+            for memory_id, score in ranked
+        ]
+
+    def build_vector_index(self, *, workspace_id: str, agent_id: str, dim: int) -> int:
+        """Train and persist the IVF index for one agent corpus; returns the list count.
+
+        k-means runs on a reader snapshot without holding the writer. The corpus is then
+        re-read under the writer so rows written while training are assigned too.
+        """
+        if self._pool is None:
+            raise RuntimeError("database connection is required")
+
+        with self._pool.reader() as connection:
+            trained_ids, _contents, trained_matrix = self._select_vector_rows(
+                connection,
+                workspace_id=workspace_id,
+                agent_id=agent_id,
+                dim=dim,
+            )
+        if not trained_ids:
+            return 0
+        index = train_ivf(trained_matrix)
+
+        with self._pool.writer() as connection:
+            memory_ids, _contents, matrix = self._select_vector_rows(
+                connection,
+                workspace_id=workspace_id,
+                agent_id=agent_id,
+                dim=dim,
+            )
+            assignments = index.assign(matrix)
+            connection.execute(
+                """
+                delete from memory_vector_list_record
+                where backend = ? and workspace_id = ? and agent_id = ? and embedding_dim = ?
+                """,
+                (self._backend_name, workspace_id, agent_id, dim),
+            )
+            connection.execute(
+                """
+                insert into memory_vector_index_record (
+                  backend, workspace_id, agent_id, embedding_dim, list_count,
+                  trained_count, vector_count, centroids, built_at
+                ) values (?, ?, ?, ?, ?, ?, ?, ?, ?)
+                on conflict(backend, workspace_id, agent_id, embedding_dim)
+                do update set
+                  list_count = excluded.list_count,
+                  trained_count = excluded.trained_count,
+                  vector_count = excluded.vector_count,
+                  centroids = excluded.centroids,
+                  built_at = excluded.built_at
+                """,
+                (
+                    self._backend_name,
+                    workspace_id,
+                    agent_id,
+                    dim,
+                    index.list_count,
+                    len(trained_ids),
+                    len(memory_ids),
+                    index.to_bytes(),
+                    datetime.now(timezone.utc).isoformat(),
+                ),
+            )
+            connection.executemany(
+                """
+                insert or replace into memory_vector_list_record (
+                  backend, workspace_id, agent_id, memory_id, embedding_dim, list_id
+                ) values (?, ?, ?, ?, ?, ?)
+                """,
+                [
+                    (self._backend_name, workspace_id, agent_id, memory_id, dim, int(list_id))
+                    for memory_id, list_id in zip(memory_ids, assignments, strict=True)
+                ],
+            )
+            connection.commit()
+        return index.list_count
+
+    def _load_vector_index(
+        self,
+        connection: sqlite3.Connection,
+        *,
+        workspace_id: str,
+        agent_id: str,
+        dim: int,
+    ) -> tuple[IvfIndex, int, int] | None:
+        cursor = connection.execute(
+            """
+            select list_count, trained_count, vector_count, centroids
+            from memory_vector_index_record
+            where backend = ? and workspace_id = ? and agent_id = ? and embedding_dim = ?
+            """,
+            (self._backend_name, workspace_id, agent_id, dim),
+        )
+        row = cursor.fetchone()
+        if row is None:
+            return None
+        index = IvfIndex.from_bytes(bytes(row[3]), list_count=int(row[0]), dim=dim)
+        return index, int(row[1]), int(row[2])
+
+    def _vector_index_for(self, *, workspace_id: str, agent_id: str, dim: int) -> IvfIndex | None:
+        """Return the last built ANN index to probe, or None to scan exactly.
+
+        Searches never train: indexes are (re)built by the upserts that make them stale.
+        """
+        if self._pool is None:
+            raise RuntimeError("database connection is required")
+
+        with self._pool.reader() as connection:
+            loaded = self._load_vector_index(
+                connection,
+                workspace_id=workspace_id,
+                agent_id=agent_id,
+                dim=dim,
+            )
+        if loaded is None or loaded[2] < self._ann_min_vectors:
+            return None
+        return loaded[0]
+
+    def _assign_vector_lists(
+        self,
+        connection: sqlite3.Connection,
+        upserts: list[MemoryUpsert],
+    ) -> list[tuple[str, str, int]]:
+        """Keep existing IVF indexes current for a batch of freshly written embeddings.
+
+        Stale list rows are dropped, and each embedding is assigned to a list of its agent's
+        index. Every index is loaded once and assigned the stacked matrix of its rows.
+        Returns the corpora to (re)train: those that reached ``ann_min_vectors`` without an
+        index, and those that have doubled since their index was trained.
+        """
+        count_deltas: Counter[tuple[str, str, int]] = Counter()
+        keys = sorted({(item.workspace_id, item.agent_id, item.memory_id) for item in upserts})
+        for start in range(0, len(keys), _DIMENSION_LOOKUP_BATCH):
+            batch = keys[start : start + _DIMENSION_LOOKUP_BATCH]
+            values = ", ".join("(?, ?, ?)" for _ in batch)
+            cursor = connection.execute(
+                f"""
+                with batch(workspace_id, agent_id, memory_id) as (values {values})
+                select l.workspace_id, l.agent_id, l.embedding_dim
+                from batch b
+                join memory_vector_list_record l
+                  on l.backend = ?
+                  and l.workspace_id = b.workspace_id
+                  and l.agent_id = b.agent_id
+                  and l.memory_id = b.memory_id
+                """,
+                (*(value for key in batch for value in key), self._backend_name),
+            )
+            for row in cursor.fetchall():
+                count_deltas[(str(row[0]), str(row[1]), int(row[2]))] -= 1
+        connection.executemany(
+            """
+            delete from memory_vector_list_record
+            where backend = ? and workspace_id = ? and agent_id = ? and memory_id = ?
+            """,
+            [(self._backend_name, *key) for key in keys],
+        )
+
+        groups: dict[tuple[str, str, int], list[MemoryUpsert]] = {}
+        for upsert in upserts:
+            if upsert.embedding:
+                group = (upsert.workspace_id, upsert.agent_id, len(upsert.embedding))
+                groups.setdefault(group, []).append(upsert)
+
+        list_rows: list[tuple[str, str, str, str, int, int]] = []
+        stale: list[tuple[str, str, int]] = []
+        for (workspace_id, agent_id, dim), members in groups.items():
+            loaded = self._load_vector_index(
+                connection,
+                workspace_id=workspace_id,
+                agent_id=agent_id,
+                dim=dim,
+            )
+            if loaded is None:
+                if self._has_ann_min_vectors(
+                    connection, workspace_id=workspace_id, agent_id=agent_id, dim=dim
+                ):
+                    stale.append((workspace_id, agent_id, dim))
                 continue
+            index, trained_count, vector_count = loaded
+            matrix = to_matrix([list(member.embedding or []) for member in members], dim=dim)
+            assignments = index.assign(matrix)
+            list_rows.extend(
+                (self._backend_name, workspace_id, agent_id, member.memory_id, dim, int(list_id))
+                for member, list_id in zip(members, assignments, strict=True)
+            )
+            count_deltas[(workspace_id, agent_id, dim)] += len(members)
+            if vector_count + count_deltas[(workspace_id, agent_id, dim)] >= 2 * trained_count:
+                stale.append((workspace_id, agent_id, dim))
 
-            results.append(
-                MemoryMatch(memory_id=item.memory_id, score=score, content=item.content)
+        connection.executemany(
+            """
+            insert into memory_vector_list_record (
+              backend, workspace_id, agent_id, memory_id, embedding_dim, list_id
+            ) values (?, ?, ?, ?, ?, ?)
+            """,
+            list_rows,
+        )
+        connection.executemany(
+            """
+            update memory_vector_index_record
+            set vector_count = vector_count + ?
+            where backend = ? and workspace_id = ? and agent_id = ? and embedding_dim = ?
+            """,
+            [
+                (delta, self._backend_name, workspace_id, agent_id, dim)
+                for (workspace_id, agent_id, dim), delta in count_deltas.items()
+                if delta != 0
+            ],
+        )
+        return stale
+
+    def _has_ann_min_vectors(
+        self,
+        connection: sqlite3.Connection,
+        *,
+        workspace_id: str,
+        agent_id: str,
+        dim: int,
+    ) -> bool:
+        cursor = connection.execute(
+            """
+            select count(*)
+            from (
+              select 1
+              from memory_record
+              where backend = ? and workspace_id = ? and agent_id = ?
+                and embedding_dim = ? and embedding_blob is not null
+              limit ?
+            )
+            """,
+            (self._backend_name, workspace_id, agent_id, dim, self._ann_min_vectors),
+        )
+        row = cursor.fetchone()
+        return row is not None and int(row[0]) >= self._ann_min_vectors
+
+    def _vector_rows(
+        self,
+        *,
+        workspace_id: str,
+        agent_id: str,
+        dim: int,
+        list_ids: list[int] | None = None,
+    ) -> tuple[list[str], list[str], FloatMatrix]:
+        """Return ``(memory_ids, contents, matrix)`` for embeddings of one dimension."""
+        if self._pool is None:
+            keys = sorted(
+                key
+                for key, vector in self._embeddings_by_key.items()
+                if key[0] == workspace_id and key[1] == agent_id and len(vector) == dim
+            )
+            return (
+                [key[2] for key in keys],
+                [self._records[key].content for key in keys],
+                to_matrix([self._embeddings_by_key[key] for key in keys], dim=dim),
+            )
+
+        with self._pool.reader() as connection:
+            return self._select_vector_rows(
+                connection,
+                workspace_id=workspace_id,
+                agent_id=agent_id,
+                dim=dim,
+                list_ids=list_ids,
             )
 
-        results.sort(key=lambda match: (-match.score, match.memory_id))
-        return results[:top_k]
+    def _select_vector_rows(
+        self,
+        connection: sqlite3.Connection,
+        *,
+        workspace_id: str,
+        agent_id: str,
+        dim: int,
+        list_ids: list[int] | None = None,
+    ) -> tuple[list[str], list[str], FloatMatrix]:
+        if list_ids is None:
+            cursor = connection.execute(
+                """
+                select memory_id, content, embedding_blob, embedding_encoding
+                from memory_record
+                where backend = ? and workspace_id = ? and agent_id = ?
+                  and embedding_dim = ? and embedding_blob is not null
+                order by memory_id asc
+                """,
+                (self._backend_name, workspace_id, agent_id, dim),
+            )
+        else:
+            placeholders = ", ".join("?" for _ in list_ids)
+            cursor = connection.execute(
+                f"""
+                select m.memory_id, m.content, m.embedding_blob, m.embedding_encoding
+                from memory_vector_list_record l
+                join memory_record m
+                  on m.backend = l.backend
+                  and m.workspace_id = l.workspace_id
+                  and m.agent_id = l.agent_id
+                  and m.memory_id = l.memory_id
+                where l.backend = ? and l.workspace_id = ? and l.agent_id = ?
+                  and l.embedding_dim = ? and l.list_id in ({placeholders})
+                order by m.memory_id asc
+                """,
+                (self._backend_name, workspace_id, agent_id, dim, *list_ids),
+            )
+        rows = cursor.fetchall()
+        return (
+            [str(row[0]) for row in rows],
+            [str(row[1]) for row in rows],
+            decode_matrix(
+                [bytes(row[2]) for row in rows],
+                encodings=[row[3] for row in rows],
+                dim=dim,
+            ),
+        )
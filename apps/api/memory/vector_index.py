@@ -0,0 +1,133 @@
+from dataclasses import dataclass
+from typing import Literal
+
+import numpy as np
+import numpy.typing as npt
+
+VectorMetric = Literal["cosine", "dot"]
+FloatMatrix = npt.NDArray[np.float32]
+FloatVector = npt.NDArray[np.float32]
+
+_ASSIGN_BATCH_ROWS = 8_192
+
+
+def to_matrix(vectors: list[list[float]], *, dim: int) -> FloatMatrix:
+    """Pack vectors into one contiguous ``(n, dim)`` float32 matrix."""
+    if not vectors:
+        return np.empty((0, dim), dtype=np.float32)
+    matrix = np.asarray(vectors, dtype=np.float32)
+    if matrix.ndim != 2 or matrix.shape[1] != dim:
+        raise ValueError("embedding dimension mismatch for vector matrix")
+    return np.ascontiguousarray(matrix)
+
+
+def normalize_rows(matrix: FloatMatrix) -> FloatMatrix:
+    norms = np.linalg.norm(matrix, axis=1, keepdims=True)
+    norms[norms == 0.0] = 1.0
+    return np.ascontiguousarray(matrix / norms, dtype=np.float32)
+
+
+def similarity_scores(
+    matrix: FloatMatrix,
+    query: list[float],
+    *,
+    metric: VectorMetric = "cosine",
+) -> FloatMatrix:
+    vector = np.asarray(query, dtype=np.float32)
+    if metric == "cosine":
+        norm = float(np.linalg.norm(vector))
+        vector = vector / norm if norm > 0.0 else vector
+        return normalize_rows(matrix) @ vector
+    return matrix @ vector
+
+
+def rank_by_similarity(
+    *,
+    memory_ids: list[str],
+    matrix: FloatMatrix,
+    query: list[float],
+    top_k: int,
+    metric: VectorMetric = "cosine",
+) -> list[tuple[str, float]]:
+    """Exact top-k over every row, ordered by ``(-score, memory_id)``."""
+    if top_k <= 0 or not memory_ids:
+        return []
+
+    scores = similarity_scores(matrix, query, metric=metric)
+    candidates = np.arange(len(memory_ids))
+    if len(memory_ids) > top_k:
+        # Partitioning splits rows tied on the k-th score arbitrarily, so keep every row
+        # at or above it and let the memory_id tie-break choose among them.
+        kth_score = scores[np.argpartition(-scores, top_k - 1)[top_k - 1]]
+        candidates = np.flatnonzero(scores >= kth_score)
+    candidate_ids = np.asarray(memory_ids)[candidates]
+    order = np.lexsort((candidate_ids, -scores[candidates]))[:top_k]
+    return [(str(candidate_ids[index]), float(scores[candidates[index]])) for index in order]
+
+
+@dataclass(frozen=True)
+class IvfIndex:
+    """Inverted-file ANN index: vectors are bucketed by their nearest unit centroid."""
+
+    centroids: FloatMatrix
+
+    @property
+    def list_count(self) -> int:
+        return int(self.centroids.shape[0])
+
+    @property
+    def dim(self) -> int:
+        return int(self.centroids.shape[1])
+
+    def assign(self, matrix: FloatMatrix) -> npt.NDArray[np.int64]:
+        assignments = np.empty(matrix.shape[0], dtype=np.int64)
+        for start in range(0, matrix.shape[0], _ASSIGN_BATCH_ROWS):
+            batch = normalize_rows(matrix[start : start + _ASSIGN_BATCH_ROWS])
+            assignments[start : start + batch.shape[0]] = np.argmax(
+                batch @ self.centroids.T,
+                axis=1,
+            )
+        return assignments
+
+    def probe(self, query: list[float], *, probe_lists: int) -> list[int]:
+        scores = similarity_scores(self.centroids, query, metric="cosine")
+        count = min(max(probe_lists, 1), self.list_count)
+        nearest = np.argsort(-scores, kind="stable")[:count]
+        return [int(list_id) for list_id in nearest]
+
+    def to_bytes(self) -> bytes:
+        return self.centroids.astype("<f4", copy=False).tobytes()
+
+    @classmethod
+    def from_bytes(cls, blob: bytes, *, list_count: int, dim: int) -> "IvfIndex":
+        centroids = np.frombuffer(blob, dtype="<f4").reshape(list_count, dim)
+        return cls(centroids=centroids.astype(np.float32, copy=False))
+
+
+def train_ivf(
+    matrix: FloatMatrix,
+    *,
+    list_count: int | None = None,
+    iterations: int = 10,
+    seed: int = 0,
+) -> IvfIndex:
+    """Spherical k-means over the corpus; defaults to ``sqrt(n)`` lists."""
+    if matrix.shape[0] == 0:
+        raise ValueError("cannot train a vector index without vectors")
+
+    data = normalize_rows(matrix)
+    lists = list_count if list_count is not None else int(np.sqrt(data.shape[0]))
+    lists = min(max(lists, 1), data.shape[0])
+    rng = np.random.default_rng(seed)
+    centroids = data[rng.choice(data.shape[0], size=lists, replace=False)].copy()
+    index = IvfIndex(centroids=centroids)
+    for _ in range(iterations):
+        assignments = index.assign(data)
+        sums = np.zeros_like(centroids)
+        np.add.at(sums, assignments, data)
+        counts = np.bincount(assignments, minlength=lists)
+        occupied = counts > 0
+        centroids[occupied] = sums[occupied]
+        index = IvfIndex(centroids=normalize_rows(centroids))
+        centroids = index.centroids.copy()
+    return index
@@ -5,7 +5,7 @@ from typing import Literal
 from uuid import uuid4
 
 from apps.api.agents.policy import Capability
-from apps.api.db.state import connect_state_db
+from apps.api.db.pool import StateConnectionPool, run_state_operation
 
 ApprovalStatus = Literal["pending", "approved", "denied"]
 ApprovalDecision = Literal["approved", "denied"]
@@ -37,19 +37,20 @@ class ApprovalService:
         *,
         database_path: str | None = None,
         connection: sqlite3.Connection | None = None,
+        pool: StateConnectionPool | None = None,
     ) -> None:
-        self._connection = connection
-        self._owns_connection = False
-        if self._connection is None and database_path is not None:
-            self._connection = connect_state_db(database_path)
-            self._owns_connection = True
+        self._pool = pool
+        self._owns_pool = False
+        if self._pool is None and (connection is not None or database_path is not None):
+            self._pool = StateConnectionPool(database_path=database_path, connection=connection)
+            self._owns_pool = connection is None
         self._requests: dict[str, ApprovalRequest] = {}
 
     def close(self) -> None:
-        if self._connection is None or not self._owns_connection:
+        if self._pool is None or not self._owns_pool:
             return
-        self._connection.close()
-        self._connection = None
+        self._pool.close()
+        self._pool = None
 
     def __del__(self) -> None:
         self.close()
@@ -68,7 +69,26 @@ class ApprovalService:
             decided_by=None if row[9] is None else str(row[9]),
         )
 
-    def create_request(
+    async def create_request(
+        self,
+        *,
+        workspace_id: str,
+        actor_id: str,
+        capability: Capability,
+        action: str,
+        reason: str,
+    ) -> ApprovalRequest:
+        return await run_state_operation(
+            self._pool,
+            self._create_request,
+            workspace_id=workspace_id,
+            actor_id=actor_id,
+            capability=capability,
+            action=action,
+            reason=reason,
+        )
+
+    def _create_request(
         self,
         *,
         workspace_id: str,
@@ -89,10 +109,12 @@ class ApprovalService:
             decided_at=None,
             decided_by=None,
         )
-        if self._connection is None:
+        if self._pool is None:
             self._requests[request.id] = request
-        else:
-            self._connection.execute(
+            return request
+
+        with self._pool.writer() as connection:
+            connection.execute(
                 """
                 insert into approval_request_record (
                   id, workspace_id, actor_id, capability, action, reason, status,
@@ -112,17 +134,64 @@ class ApprovalService:
                     request.decided_by,
                 ),
             )
-            self._connection.commit()
+            connection.commit()
         return request
 
-    def decide_request(
+    async def decide_request(
         self,
         *,
         approval_id: str,
         approver_id: str,
         decision: ApprovalDecision,
     ) -> ApprovalRequest:
-        request = self.get_request(approval_id=approval_id)
+        return await run_state_operation(
+            self._pool,
+            self._decide_request,
+            approval_id=approval_id,
+            approver_id=approver_id,
+            decision=decision,
+        )
+
+    def _decide_request(
+        self,
+        *,
+        approval_id: str,
+        approver_id: str,
+        decision: ApprovalDecision,
+    ) -> ApprovalRequest:
+        if self._pool is None:
+            decided = self._decide(
+                request=self._requests.get(approval_id),
+                approver_id=approver_id,
+                decision=decision,
+            )
+            self._requests[approval_id] = decided
+            return decided
+
+        with self._pool.writer() as connection:
+            decided = self._decide(
+                request=self._select_request(connection, approval_id=approval_id),
+                approver_id=approver_id,
+                decision=decision,
+            )
+            connection.execute(
+                """
+                update approval_request_record
+                set status = ?, decided_at = ?, decided_by = ?
+                where id = ?
+                """,
+                (decided.status, decided.decided_at, decided.decided_by, approval_id),
+            )
+            connection.commit()
+        return decided
+
+    @staticmethod
+    def _decide(
+        *,
+        request: ApprovalRequest | None,
+        approver_id: str,
+        decision: ApprovalDecision,
+    ) -> ApprovalRequest:
         if request is None:
             raise ValueError("approval request not found")
         if request.status != "pending":
@@ -130,7 +199,7 @@ class ApprovalService:
         if approver_id != request.actor_id:
             raise PermissionError("approver is not authorized for this approval request")
 
-        decided = ApprovalRequest(
+        return ApprovalRequest(
             id=request.id,
             workspace_id=request.workspace_id,
             actor_id=request.actor_id,
@@ -142,67 +211,62 @@ class ApprovalService:
             decided_at=datetime.now(timezone.utc).isoformat(),
             decided_by=approver_id,
         )
-        if self._connection is None:
-            self._requests[approval_id] = decided
-        else:
-            self._connection.execute(
-                """
-                update approval_request_record
-                set status = ?, decided_at = ?, decided_by = ?
-                where id = ?
-                """,
-                (decided.status, decided.decided_at, decided.decided_by, approval_id),
-            )
-            self._connection.commit()
-        return decided
 
-    def get_request(self, *, approval_id: str) -> ApprovalRequest | None:
-        if self._connection is not None:
-            cursor = self._connection.execute(
-                """
-                select id, workspace_id, actor_id, capability, action, reason, status,
-                       created_at, decided_at, decided_by
-                from approval_request_record
-                where id = ?
-                """,
-                (approval_id,),
-            )
-            row = cursor.fetchone()
-            if row is None:
-                return None
-            return self._from_row(row)
+    def _select_request(
+        self,
+        connection: sqlite3.Connection,
+        *,
+        approval_id: str,
+    ) -> ApprovalRequest | None:
+        cursor = connection.execute(
+            """
+            select id, workspace_id, actor_id, capability, action, reason, status,
+                   created_at, decided_at, decided_by
+            from approval_request_record
+            where id = ?
+            """,
+            (approval_id,),
+        )
+        row = cursor.fetchone()
+        if row is None:
+            return None
+        return self._from_row(row)
+
+    async def get_request(self, *, approval_id: str) -> ApprovalRequest | None:
+        return await run_state_operation(
+            self._pool,
+            self._get_request,
+            approval_id=approval_id,
+        )
+
+    def _get_request(self, *, approval_id: str) -> ApprovalRequest | None:
+        if self._pool is not None:
+            with self._pool.reader() as connection:
+                return self._select_request(connection, approval_id=approval_id)
         return self._requests.get(approval_id)
 
-    def list_requests(
+    async def list_requests(
         self,
         *,
         workspace_id: str,
         status: ApprovalStatus | None = None,
     ) -> list[ApprovalRequest]:
-        if self._connection is not None:
-            if status is None:
-                cursor = self._connection.execute(
-                    """
-                    select id, workspace_id, actor_id, capability, action, reason, status,
-                           created_at, decided_at, decided_by
-                    from approval_request_record
-                    where workspace_id = ?
-                    order by created_at asc
-                    """,
-                    (workspace_id,),
-                )
-            else:
-                cursor = self._connection.execute(
-                    """
-                    select id, workspace_id, actor_id, capability, action, reason, status,
-                           created_at, decided_at, decided_by
-                    from approval_request_record
-                    where workspace_id = ? and status = ?
-                    order by created_at asc
-                    """,
-                    (workspace_id, status),
-                )
-            rows = cursor.fetchall()
+        return await run_state_operation(
+            self._pool,
+            self._list_requests,
+            workspace_id=workspace_id,
+            status=status,
+        )
+
+    def _list_requests(
+        self,
+        *,
+        workspace_id: str,
+        status: ApprovalStatus | None = None,
+    ) -> list[ApprovalRequest]:
+        if self._pool is not None:
+            with self._pool.reader() as connection:
+                rows = self._select_requests(connection, workspace_id=workspace_id, status=status)
             return [self._from_row(row) for row in rows]
 
         requests = [
@@ -214,7 +278,57 @@ class ApprovalService:
             requests = [request for request in requests if request.status == status]
         return sorted(requests, key=lambda request: request.created_at)
 
-    def is_approved(
+    @staticmethod
+    def _select_requests(
+        connection: sqlite3.Connection,
+        *,
+        workspace_id: str,
+        status: ApprovalStatus | None,
+    ) -> list[tuple[object, ...]]:
+        if status is None:
+            cursor = connection.execute(
+                """
+                select id, workspace_id, actor_id, capability, action, reason, status,
+                       created_at, decided_at, decided_by
+                from approval_request_record
+                where workspace_id = ?
+                order by created_at asc
+                """,
+                (workspace_id,),
+            )
+        else:
+            cursor = connection.execute(
+                """
+                select id, workspace_id, actor_id, capability, action, reason, status,
+                       created_at, decided_at, decided_by
+                from approval_request_record
+                where workspace_id = ? and status = ?
+                order by created_at asc
+                """,
+                (workspace_id, status),
+            )
+        return list(cursor.fetchall())
+
+    async def is_approved(
+        self,
+        *,
+        approval_id: str,
+        workspace_id: str,
+        actor_id: str,
+        capability: Capability,
+        action: str,
+    ) -> bool:
+        return await run_state_operation(
+            self._pool,
+            self._is_approved,
+            approval_id=approval_id,
+            workspace_id=workspace_id,
+            actor_id=actor_id,
+            capability=capability,
+            action=action,
+        )
+
+    def _is_approved(
         self,
         *,
         approval_id: str,
@@ -223,7 +337,7 @@ class ApprovalService:
         capability: Capability,
         action: str,
     ) -> bool:
-        request = self.get_request(approval_id=approval_id)
+        request = self._get_request(approval_id=approval_id)
         if request is None:
             return False
 
@@ -375,18 +375,19 @@ class DualModeFlowE2ETest(unittest.TestCase):
                 headers={"x-user-id": "owner-e2e", "x-user-role": "owner"},
             )
             self.assertEqual(companion_reply.status_code, 200)
+            events_path = f"/agent-runs/{companion_reply.json()['agent_run_id']}/events"
 
-            unauthenticated_replay = client.get("/agent-runs/companion-ws-e2e-replay/events")
+            unauthenticated_replay = client.get(events_path)
             self.assertEqual(unauthenticated_replay.status_code, 401)
 
             cross_actor_replay = client.get(
-                "/agent-runs/companion-ws-e2e-replay/events",
+                events_path,
                 headers={"x-user-id": "intruder-e2e", "x-user-role": "member"},
             )
             self.assertEqual(cross_actor_replay.status_code, 403)
 
             owner_replay = client.get(
-                "/agent-runs/companion-ws-e2e-replay/events",
+                events_path,
                 headers={"x-user-id": "owner-e2e", "x-user-role": "owner"},
             )
             self.assertEqual(owner_replay.status_code, 200)
@@ -72,7 +72,7 @@ class RuntimeIntegrationTest(unittest.IsolatedAsyncioTestCase):
                 )
 
                 owner = ActorContext(user_id="owner-int-restart", role="owner")
-                first_runtime.upsert_specialist(
+                await first_runtime.upsert_specialist(
                     workspace_id="ws-int-restart",
                     actor=owner,
                     specialist=SpecialistAgent(
@@ -89,7 +89,7 @@ class RuntimeIntegrationTest(unittest.IsolatedAsyncioTestCase):
                     actor=owner,
                     goal="persist runtime events",
                 )
-                replay_before_restart = first_runtime.replay_events(
+                replay_before_restart = await first_runtime.replay_events(
                     agent_run_id=first_execution.agent_run_id,
                     actor=owner,
                     last_seq=0,
@@ -105,7 +105,7 @@ class RuntimeIntegrationTest(unittest.IsolatedAsyncioTestCase):
                     audit_log=ImmutableAuditLog(database_path=db_path),
                 )
 
-                replay_after_restart = second_runtime.replay_events(
+                replay_after_restart = await second_runtime.replay_events(
                     agent_run_id=first_execution.agent_run_id,
                     actor=owner,
                     last_seq=1,
@@ -125,7 +125,7 @@ class RuntimeIntegrationTest(unittest.IsolatedAsyncioTestCase):
         )
 
         owner = ActorContext(user_id="owner-int", role="owner")
-        runtime.upsert_specialist(
+        await runtime.upsert_specialist(
             workspace_id="ws-int",
             actor=owner,
             specialist=SpecialistAgent(
@@ -151,7 +151,7 @@ class RuntimeIntegrationTest(unittest.IsolatedAsyncioTestCase):
         )
         self.assertEqual(len(execution.delegated_results), 1)
 
-        replay_all = runtime.replay_events(
+        replay_all = await runtime.replay_events(
             agent_run_id=execution.agent_run_id,
             actor=owner,
             last_seq=0,
@@ -171,7 +171,7 @@ class RuntimeIntegrationTest(unittest.IsolatedAsyncioTestCase):
         )
 
         owner = ActorContext(user_id="owner-int", role="owner")
-        runtime.upsert_specialist(
+        await runtime.upsert_specialist(
             workspace_id="ws-int",
             actor=owner,
             specialist=SpecialistAgent(
@@ -191,7 +191,7 @@ class RuntimeIntegrationTest(unittest.IsolatedAsyncioTestCase):
             )
 
         approval_id = context.exception.approval_id
-        decided = approvals.decide_request(
+        decided = await approvals.decide_request(
             approval_id=approval_id,
             approver_id="owner-int",
             decision="approved",
@@ -219,22 +219,22 @@ class RuntimeIntegrationTest(unittest.IsolatedAsyncioTestCase):
         owner = ActorContext(user_id="owner-int", role="owner")
         intruder = ActorContext(user_id="intruder-int", role="member")
 
-        await runtime.companion_message(
+        reply = await runtime.companion_message(
             workspace_id="ws-int",
             actor_id=owner.user_id,
             message="private memory",
         )
 
-        allowed_events = runtime.replay_events(
-            agent_run_id="companion-ws-int",
+        allowed_events = await runtime.replay_events(
+            agent_run_id=reply.agent_run_id,
             actor=owner,
             last_seq=0,
         )
         self.assertGreaterEqual(len(allowed_events), 1)
 
         with self.assertRaises(PermissionError):
-            runtime.replay_events(
-                agent_run_id="companion-ws-int",
+            await runtime.replay_events(
+                agent_run_id=reply.agent_run_id,
                 actor=intruder,
                 last_seq=0,
             )
@@ -243,7 +243,7 @@ class RuntimeIntegrationTest(unittest.IsolatedAsyncioTestCase):
         with tempfile.TemporaryDirectory() as tmp_dir:
             db_path = os.path.join(tmp_dir, "runtime-legacy-replay.sqlite3")
             seeded_outbox = AgentRunEventOutbox(database_path=db_path)
-            seeded_outbox.append_event(
+            await seeded_outbox.append_event(
                 agent_run_id="run-legacy-int",
                 event_type="run.started",
                 payload={"goal": "legacy replay"},
@@ -260,7 +260,7 @@ class RuntimeIntegrationTest(unittest.IsolatedAsyncioTestCase):
             actor = ActorContext(user_id="owner-int", role="owner")
 
             with self.assertRaises(PermissionError):
-                runtime.replay_events(
+                await runtime.replay_events(
                     agent_run_id="run-legacy-int",
                     actor=actor,
                     last_seq=0,
@@ -280,7 +280,7 @@ class RuntimeIntegrationTest(unittest.IsolatedAsyncioTestCase):
         owner = ActorContext(user_id="owner-int", role="owner")
         member = ActorContext(user_id="member-int", role="member")
 
-        runtime.upsert_specialist(
+        await runtime.upsert_specialist(
             workspace_id="ws-int-member-risk",
             actor=owner,
             specialist=SpecialistAgent(
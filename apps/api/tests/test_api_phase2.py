@@ -1,3 +1,4 @@
+import json
 import unittest
 from hashlib import sha256
 
@@ -95,6 +96,73 @@ class Phase2ApiTest(unittest.TestCase):
             payload = response.json()
             self.assertIn("response", payload)
             self.assertIn("memory_hits", payload)
+            stages = [
+                entry.split(";")[0] for entry in response.headers["Server-Timing"].split(", ")
+            ]
+            self.assertEqual(
+                stages,
+                ["memory_write", "memory_search", "completion", "bookkeeping", "total"],
+            )
+
+    def test_companion_events_page_with_a_cursor(self) -> None:
+        headers = {"x-user-id": "owner-log", "x-user-role": "owner"}
+        with TestClient(app) as client:
+            run_ids = {
+                client.post(
+                    "/workspaces/ws-log/companion/messages",
+                    json={"message": f"message {index}"},
+                    headers=headers,
+                ).json()["agent_run_id"]
+                for index in range(3)
+            }
+
+            first = client.get("/workspaces/ws-log/companion/events?limit=2", headers=headers)
+            cursor = first.headers["X-Next-Cursor"]
+            second = client.get(
+                "/workspaces/ws-log/companion/events",
+                params={"cursor": cursor, "limit": 2},
+                headers=headers,
+            )
+            malformed = client.get(
+                "/workspaces/ws-log/companion/events?cursor=nope", headers=headers
+            )
+
+        self.assertEqual(len(first.json()), 2)
+        self.assertEqual(len(second.json()), 1)
+        self.assertNotIn("X-Next-Cursor", second.headers)
+        self.assertEqual(
+            {event["agent_run_id"] for event in first.json() + second.json()}, run_ids
+        )
+        self.assertEqual(malformed.status_code, 400)
+
+    def test_companion_message_stream_sends_partials_then_reply(self) -> None:
+        with TestClient(app) as client:
+            response = client.post(
+                "/workspaces/ws-3-stream/companion/messages/stream",
+                json={"message": "hello streaming companion"},
+                headers={"x-user-id": "owner-3", "x-user-role": "owner"},
+            )
+            self.assertEqual(response.status_code, 200)
+            self.assertTrue(response.headers["content-type"].startswith("text/event-stream"))
+
+            frames = [frame for frame in response.text.split("\n\n") if frame]
+            kinds = [frame.split("\n")[0] for frame in frames]
+            self.assertEqual(kinds[-1], "event: reply")
+            self.assertGreater(kinds.count("event: partial"), 2)
+            partial_text = "".join(
+                json.loads(frame.split("data: ", 1)[1])["text"] for frame in frames[:-1]
+            )
+            reply = json.loads(frames[-1].split("data: ", 1)[1])
+            self.assertEqual(partial_text, reply["response"])
+
+    def test_execute_goal_stream_reports_errors_before_streaming(self) -> None:
+        with TestClient(app) as client:
+            response = client.post(
+                "/workspaces/ws-5-stream/execution/goals/stream",
+                json={"goal": "goal with no specialists"},
+                headers={"x-user-id": "owner-5", "x-user-role": "owner"},
+            )
+            self.assertEqual(response.status_code, 400)
 
     def test_invalid_role_header_returns_400(self) -> None:
         with TestClient(app) as client:
@@ -123,6 +191,30 @@ class Phase2ApiTest(unittest.TestCase):
             )
             self.assertEqual(response.status_code, 400)
 
+    def test_event_stream_rejects_bad_cursor_and_foreign_actor(self) -> None:
+        with TestClient(app) as client:
+            negative = client.get(
+                "/agent-runs/missing/events/stream",
+                params={"last_seq": -1},
+                headers={"x-user-id": "owner-1", "x-user-role": "owner"},
+            )
+            bad_event_id = client.get(
+                "/agent-runs/missing/events/stream",
+                headers={
+                    "x-user-id": "owner-1",
+                    "x-user-role": "owner",
+                    "last-event-id": "not-a-seq",
+                },
+            )
+            forbidden = client.get(
+                "/agent-runs/missing/events/stream",
+                headers={"x-user-id": "owner-1", "x-user-role": "owner"},
+            )
+
+            self.assertEqual(negative.status_code, 400)
+            self.assertEqual(bad_event_id.status_code, 400)
+            self.assertEqual(forbidden.status_code, 403)
+
     def test_owner_can_create_and_list_invitations(self) -> None:
         with TestClient(app) as client:
             create = client.post(
@@ -231,6 +323,57 @@ class Phase2ApiTest(unittest.TestCase):
                 expected_fingerprint,
             )
 
+    def test_audit_events_page_with_cursor_and_filters(self) -> None:
+        owner = {"x-user-id": "owner-audit-page", "x-user-role": "owner"}
+        with TestClient(app) as client:
+            for index in range(3):
+                created = client.post(
+                    "/workspaces/ws-audit-page/invitations",
+                    json={"email": f"user-{index}@example.com"},
+                    headers=owner,
+                )
+                self.assertEqual(created.status_code, 201)
+
+            first = client.get(
+                "/workspaces/ws-audit-page/audit-events",
+                params={"limit": 2, "action": "invitation.created"},
+                headers=owner,
+            )
+            self.assertEqual(first.status_code, 200)
+            first_seqs = [event["seq"] for event in first.json()]
+            self.assertEqual(len(first_seqs), 2)
+            self.assertEqual(first_seqs, sorted(first_seqs))
+            self.assertEqual(first.headers["x-next-cursor"], str(first_seqs[0]))
+
+            second = client.get(
+                "/workspaces/ws-audit-page/audit-events",
+                params={
+                    "limit": 2,
+                    "action": "invitation.created",
+                    "cursor": first.headers["x-next-cursor"],
+                },
+                headers=owner,
+            )
+            self.assertEqual(second.status_code, 200)
+            self.assertEqual(len(second.json()), 1)
+            self.assertLess(second.json()[0]["seq"], first_seqs[0])
+            self.assertNotIn("x-next-cursor", second.headers)
+
+            future = client.get(
+                "/workspaces/ws-audit-page/audit-events",
+                params={"since": "2999-01-01T00:00:00Z"},
+                headers=owner,
+            )
+            self.assertEqual(future.json(), [])
+
+            for params in ({"limit": 0}, {"cursor": 0}, {"until": "yesterday"}):
+                rejected = client.get(
+                    "/workspaces/ws-audit-page/audit-events",
+                    params=params,
+                    headers=owner,
+                )
+                self.assertEqual(rejected.status_code, 400)
+
     def test_owner_can_create_and_decide_approval(self) -> None:
         with TestClient(app) as client:
             create = client.post(
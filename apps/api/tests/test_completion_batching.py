@@ -0,0 +1,114 @@
+import asyncio
+import unittest
+from collections.abc import Sequence
+from unittest import mock
+
+from apps.api.agents import BatchingCompletionClient, CompletionRequest
+from apps.api.agents.completion_batching import (
+    StubBatchCompletionBackend,
+    resolve_completion_batch_max_size,
+    resolve_completion_batching,
+)
+
+
+class FailingBatchBackend:
+    async def complete_batch(self, requests: Sequence[CompletionRequest]) -> list[str]:
+        raise RuntimeError("backend unavailable")
+
+
+class ShortBatchBackend:
+    async def complete_batch(self, requests: Sequence[CompletionRequest]) -> list[str]:
+        return ["only one"]
+
+
+class BatchingCompletionClientTest(unittest.IsolatedAsyncioTestCase):
+    async def test_concurrent_requests_share_one_backend_call(self) -> None:
+        backend = StubBatchCompletionBackend()
+        client = BatchingCompletionClient(backend, window_seconds=0.01, max_batch_size=16)
+
+        results = await asyncio.gather(
+            *(client.complete(system_prompt="companion", user_input=f"m{i}") for i in range(5))
+        )
+
+        self.assertEqual(results, [f"[companion] m{i}" for i in range(5)])
+        self.assertEqual(backend.batch_sizes, [5])
+        stats = client.stats()
+        self.assertEqual((stats.requests, stats.batches), (5, 1))
+        self.assertEqual(stats.batch_size_histogram, {5: 1})
+        self.assertGreater(stats.mean_queue_delay_seconds, 0.0)
+        self.assertGreaterEqual(stats.max_queue_delay_seconds, stats.mean_queue_delay_seconds)
+
+    async def test_full_batches_dispatch_without_waiting_for_the_window(self) -> None:
+        backend = StubBatchCompletionBackend()
+        client = BatchingCompletionClient(backend, window_seconds=10.0, max_batch_size=3)
+
+        results = await asyncio.wait_for(
+            asyncio.gather(
+                *(client.complete(system_prompt="s", user_input=str(i)) for i in range(6))
+            ),
+            timeout=1.0,
+        )
+
+        self.assertEqual(len(results), 6)
+        self.assertEqual(backend.batch_sizes, [3, 3])
+        self.assertEqual(client.stats().mean_batch_size, 3.0)
+
+    async def test_requests_after_the_window_start_a_new_batch(self) -> None:
+        backend = StubBatchCompletionBackend(batch_delay_seconds=0.02)
+        client = BatchingCompletionClient(backend, window_seconds=0.005, max_batch_size=16)
+
+        first = asyncio.create_task(client.complete(system_prompt="s", user_input="early"))
+        await asyncio.sleep(0.01)
+        second = await client.complete(system_prompt="s", user_input="late")
+
+        self.assertEqual(await first, "[s] early")
+        self.assertEqual(second, "[s] late")
+        self.assertEqual(client.stats().batch_size_histogram, {1: 2})
+
+    async def test_backend_errors_fail_every_request_in_the_batch(self) -> None:
+        for backend, message in (
+            (FailingBatchBackend(), "backend unavailable"),
+            (ShortBatchBackend(), "1 completions for 2 requests"),
+        ):
+            client = BatchingCompletionClient(backend, window_seconds=0.001)
+            results = await asyncio.gather(
+                client.complete(system_prompt="s", user_input="a"),
+                client.complete(system_prompt="s", user_input="b"),
+                return_exceptions=True,
+            )
+            for result in results:
+                self.assertIsInstance(result, RuntimeError)
+                self.assertIn(message, str(result))
+
+    async def test_aclose_flushes_queued_requests(self) -> None:
+        backend = StubBatchCompletionBackend()
+        client = BatchingCompletionClient(backend, window_seconds=10.0)
+        pending = asyncio.create_task(client.complete(system_prompt="s", user_input="u"))
+        await asyncio.sleep(0)
+
+        await client.aclose()
+
+        self.assertEqual(await pending, "[s] u")
+
+    async def test_stream_yields_the_batched_completion(self) -> None:
+        client = BatchingCompletionClient(StubBatchCompletionBackend(), window_seconds=0.001)
+
+        chunks = [chunk async for chunk in client.stream(system_prompt="s", user_input="u")]
+
+        self.assertEqual(chunks, ["[s] u"])
+
+
+class CompletionBatchingSettingsTest(unittest.TestCase):
+    def test_settings_come_from_environment(self) -> None:
+        with mock.patch.dict(
+            "os.environ",
+            {"ELARA_COMPLETION_BATCHING": "1", "ELARA_COMPLETION_BATCH_MAX_SIZE": "32"},
+        ):
+            self.assertTrue(resolve_completion_batching())
+            self.assertEqual(resolve_completion_batch_max_size(), 32)
+        self.assertFalse(resolve_completion_batching("0"))
+        self.assertEqual(resolve_completion_batch_max_size(4), 4)
+
+
+if __name__ == "__main__":
+    unittest.main()
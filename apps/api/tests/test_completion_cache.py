@@ -0,0 +1,190 @@
+import asyncio
+import os
+import tempfile
+import unittest
+from collections.abc import AsyncIterator
+from unittest import mock
+
+from apps.api.agents import CachedCompletionClient, StubCompletionClient
+from apps.api.agents.completion_cache import resolve_completion_cache_mode
+
+
+class CountingCompletionClient:
+    def __init__(self, *, delay: float = 0.0, error: Exception | None = None) -> None:
+        self.calls = 0
+        self._delay = delay
+        self._error = error
+
+    async def complete(self, *, system_prompt: str, user_input: str) -> str:
+        self.calls += 1
+        await asyncio.sleep(self._delay)
+        if self._error is not None:
+            raise self._error
+        return f"{system_prompt}:{user_input}:{self.calls}"
+
+    async def stream(self, *, system_prompt: str, user_input: str) -> AsyncIterator[str]:
+        yield await self.complete(system_prompt=system_prompt, user_input=user_input)
+
+
+class CachedCompletionClientTest(unittest.IsolatedAsyncioTestCase):
+    async def test_repeated_requests_hit_and_report_saved_latency(self) -> None:
+        upstream = CountingCompletionClient(delay=0.01)
+        cache = CachedCompletionClient(upstream, max_entries=8, ttl_seconds=60)
+
+        first = await cache.complete(system_prompt="spec", user_input="task")
+        second = await cache.complete(system_prompt="spec", user_input="task")
+        other = await cache.complete(system_prompt="spec", user_input="other task")
+
+        stats = cache.stats()
+        self.assertEqual(first, second)
+        self.assertNotEqual(first, other)
+        self.assertEqual(upstream.calls, 2)
+        self.assertEqual((stats.hits, stats.misses), (1, 2))
+        self.assertAlmostEqual(stats.hit_rate, 1 / 3)
+        self.assertGreaterEqual(stats.saved_seconds, 0.01)
+
+    async def test_model_and_params_are_part_of_the_key(self) -> None:
+        upstream = CountingCompletionClient()
+        cold = CachedCompletionClient(upstream, model="model-a", params={"temperature": 0})
+        warm = CachedCompletionClient(upstream, model="model-a", params={"temperature": 0})
+        other = CachedCompletionClient(upstream, model="model-a", params={"temperature": 1})
+
+        self.assertEqual(
+            cold.cache_key(system_prompt="s", user_input="u"),
+            warm.cache_key(system_prompt="s", user_input="u"),
+        )
+        self.assertNotEqual(
+            cold.cache_key(system_prompt="s", user_input="u"),
+            other.cache_key(system_prompt="s", user_input="u"),
+        )
+
+    async def test_least_recently_used_entry_is_evicted(self) -> None:
+        upstream = CountingCompletionClient()
+        cache = CachedCompletionClient(upstream, max_entries=2, ttl_seconds=60)
+
+        await cache.complete(system_prompt="s", user_input="a")
+        await cache.complete(system_prompt="s", user_input="b")
+        await cache.complete(system_prompt="s", user_input="a")
+        await cache.complete(system_prompt="s", user_input="c")
+        await cache.complete(system_prompt="s", user_input="a")
+        await cache.complete(system_prompt="s", user_input="b")
+
+        stats = cache.stats()
+        self.assertEqual(upstream.calls, 4)
+        self.assertEqual(stats.evictions, 2)
+        self.assertEqual(stats.entries, 2)
+
+    async def test_expired_entries_go_back_upstream(self) -> None:
+        upstream = CountingCompletionClient()
+        cache = CachedCompletionClient(upstream, ttl_seconds=30)
+
+        with mock.patch("apps.api.agents.completion_cache.time.time", return_value=1_000.0):
+            await cache.complete(system_prompt="s", user_input="u")
+        with mock.patch("apps.api.agents.completion_cache.time.time", return_value=1_029.0):
+            await cache.complete(system_prompt="s", user_input="u")
+        with mock.patch("apps.api.agents.completion_cache.time.time", return_value=1_031.0):
+            await cache.complete(system_prompt="s", user_input="u")
+
+        self.assertEqual(upstream.calls, 2)
+
+    async def test_concurrent_identical_requests_share_one_upstream_call(self) -> None:
+        upstream = CountingCompletionClient(delay=0.02)
+        cache = CachedCompletionClient(upstream)
+
+        results = await asyncio.gather(
+            *(cache.complete(system_prompt="s", user_input="u") for _ in range(5))
+        )
+
+        self.assertEqual(upstream.calls, 1)
+        self.assertEqual(len(set(results)), 1)
+        self.assertEqual(cache.stats().coalesced, 4)
+
+    async def test_upstream_failures_reach_every_waiter_and_are_not_cached(self) -> None:
+        upstream = CountingCompletionClient(delay=0.01, error=RuntimeError("upstream down"))
+        cache = CachedCompletionClient(upstream)
+
+        results = await asyncio.gather(
+            *(cache.complete(system_prompt="s", user_input="u") for _ in range(3)),
+            return_exceptions=True,
+        )
+
+        self.assertTrue(all(isinstance(result, RuntimeError) for result in results))
+        self.assertEqual(upstream.calls, 1)
+        self.assertEqual(cache.stats().entries, 0)
+
+    async def test_cancelled_leader_hands_the_request_to_a_waiter(self) -> None:
+        upstream = CountingCompletionClient(delay=0.05)
+        cache = CachedCompletionClient(upstream)
+
+        leader = asyncio.create_task(cache.complete(system_prompt="s", user_input="u"))
+        await asyncio.sleep(0)
+        waiters = [
+            asyncio.create_task(cache.complete(system_prompt="s", user_input="u")) for _ in range(2)
+        ]
+        await asyncio.sleep(0.01)
+        leader.cancel()
+
+        results = await asyncio.gather(*waiters)
+
+        with self.assertRaises(asyncio.CancelledError):
+            await leader
+        self.assertEqual(results, ["s:u:2", "s:u:2"])
+        self.assertEqual(upstream.calls, 2)
+        stats = cache.stats()
+        self.assertEqual((stats.misses, stats.coalesced, stats.entries), (2, 1, 1))
+
+    async def test_cancelled_waiter_leaves_the_shared_request_running(self) -> None:
+        upstream = CountingCompletionClient(delay=0.03)
+        cache = CachedCompletionClient(upstream)
+
+        leader = asyncio.create_task(cache.complete(system_prompt="s", user_input="u"))
+        await asyncio.sleep(0)
+        waiter = asyncio.create_task(cache.complete(system_prompt="s", user_input="u"))
+        await asyncio.sleep(0.01)
+        waiter.cancel()
+
+        with self.assertRaises(asyncio.CancelledError):
+            await waiter
+        self.assertEqual(await leader, "s:u:1")
+        self.assertEqual(upstream.calls, 1)
+
+    async def test_streams_pass_through_misses_and_replay_hits(self) -> None:
+        cache = CachedCompletionClient(StubCompletionClient())
+
+        missed = [chunk async for chunk in cache.stream(system_prompt="s", user_input="a b")]
+        hit = [chunk async for chunk in cache.stream(system_prompt="s", user_input="a b")]
+
+        self.assertEqual(missed, ["[s]", " a", " b"])
+        self.assertEqual(hit, ["[s] a b"])
+        self.assertEqual(await cache.complete(system_prompt="s", user_input="a b"), "[s] a b")
+
+    async def test_persistent_tier_survives_a_new_cache_instance(self) -> None:
+        with tempfile.TemporaryDirectory() as tmp_dir:
+            db_path = os.path.join(tmp_dir, "cache.sqlite3")
+            upstream = CountingCompletionClient()
+            first = CachedCompletionClient(upstream, database_path=db_path)
+            await first.complete(system_prompt="s", user_input="u")
+            first.close()
+
+            second = CachedCompletionClient(upstream, database_path=db_path)
+            cached = await second.complete(system_prompt="s", user_input="u")
+            second.close()
+
+        self.assertEqual(cached, "s:u:1")
+        self.assertEqual(upstream.calls, 1)
+        self.assertEqual(second.stats().persistent_hits, 1)
+
+
+class CompletionCacheModeTest(unittest.TestCase):
+    def test_mode_comes_from_environment(self) -> None:
+        self.assertEqual(resolve_completion_cache_mode("memory"), "memory")
+        with mock.patch.dict("os.environ", {"ELARA_COMPLETION_CACHE": "persistent"}):
+            self.assertEqual(resolve_completion_cache_mode(), "persistent")
+        with mock.patch.dict("os.environ", {}, clear=True):
+            self.assertEqual(resolve_completion_cache_mode(), "off")
+        with self.assertRaises(ValueError):
+            resolve_completion_cache_mode("redis")
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,221 @@
+import asyncio
+import json
+import re
+import threading
+import time
+import unittest
+from dataclasses import replace
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from unittest import mock
+
+from fastapi.testclient import TestClient
+
+from apps.api.agents import (
+    CompletionCircuitOpenError,
+    CompletionError,
+    HttpCompletionClient,
+    HttpCompletionSettings,
+)
+from apps.api.agents.completion_http import resolve_http_completion_settings
+from apps.api.main import app
+
+
+class MockCompletionServer:
+    """Local HTTP/1.1 completion server that records connections and concurrency."""
+
+    def __init__(self) -> None:
+        self.statuses: list[int] = []
+        self.delay_seconds = 0.0
+        self.requests = 0
+        self.connections: set[tuple[str, int]] = set()
+        self.active = 0
+        self.peak_active = 0
+        self._lock = threading.Lock()
+        server = self
+
+        class Handler(BaseHTTPRequestHandler):
+            protocol_version = "HTTP/1.1"
+
+            def log_message(self, format: str, *args: object) -> None:
+                return None
+
+            def do_POST(self) -> None:
+                body = json.loads(self.rfile.read(int(self.headers["Content-Length"])))
+                with server._lock:
+                    server.requests += 1
+                    server.connections.add(self.client_address)
+                    server.active += 1
+                    server.peak_active = max(server.peak_active, server.active)
+                    status = server.statuses.pop(0) if server.statuses else 200
+                try:
+                    time.sleep(server.delay_seconds)
+                    if status != 200:
+                        self._send(status, b"{}", "application/json")
+                        return
+                    completion = f"[{body['system_prompt']}] {body['user_input']}"
+                    if body.get("stream"):
+                        lines = [
+                            json.dumps({"text": token}) + "\n"
+                            for token in re.findall(r"\s*\S+", completion)
+                        ]
+                        self._send(200, "".join(lines).encode(), "application/x-ndjson")
+                    else:
+                        payload = json.dumps({"completion": completion}).encode()
+                        self._send(200, payload, "application/json")
+                finally:
+                    with server._lock:
+                        server.active -= 1
+
+            def _send(self, status: int, payload: bytes, content_type: str) -> None:
+                self.send_response(status)
+                self.send_header("Content-Type", content_type)
+                self.send_header("Content-Length", str(len(payload)))
+                self.end_headers()
+                self.wfile.write(payload)
+
+        self._httpd = ThreadingHTTPServer(("127.0.0.1", 0), Handler)
+        self._httpd.daemon_threads = True
+        self.base_url = f"http://127.0.0.1:{self._httpd.server_address[1]}"
+        self._thread = threading.Thread(
+            target=self._httpd.serve_forever, kwargs={"poll_interval": 0.01}, daemon=True
+        )
+
+    def start(self) -> None:
+        self._thread.start()
+
+    def stop(self) -> None:
+        self._httpd.shutdown()
+        self._httpd.server_close()
+
+
+class HttpCompletionClientTest(unittest.IsolatedAsyncioTestCase):
+    async def asyncSetUp(self) -> None:
+        self.server = MockCompletionServer()
+        self.server.start()
+        self.addCleanup(self.server.stop)
+        self.settings = HttpCompletionSettings(
+            base_url=self.server.base_url,
+            backoff_base_seconds=0.001,
+            backoff_max_seconds=0.002,
+            deadline_seconds=5.0,
+        )
+
+    async def _client(self, **overrides: object) -> HttpCompletionClient:
+        client = HttpCompletionClient(replace(self.settings, **overrides))
+        self.addAsyncCleanup(client.aclose)
+        return client
+
+    async def test_sequential_requests_reuse_one_keep_alive_connection(self) -> None:
+        client = await self._client()
+
+        results = [
+            await client.complete(system_prompt="spec", user_input=f"task {index}")
+            for index in range(5)
+        ]
+
+        self.assertEqual(results[0], "[spec] task 0")
+        self.assertEqual(self.server.requests, 5)
+        self.assertEqual(len(self.server.connections), 1)
+
+    async def test_global_semaphore_caps_requests_in_flight(self) -> None:
+        self.server.delay_seconds = 0.02
+        client = await self._client(max_concurrency=2)
+
+        await asyncio.gather(
+            *(client.complete(system_prompt="s", user_input=str(index)) for index in range(6))
+        )
+
+        self.assertEqual(self.server.peak_active, 2)
+
+    async def test_retryable_statuses_are_retried(self) -> None:
+        self.server.statuses = [503, 429]
+        client = await self._client(max_attempts=3)
+
+        result = await client.complete(system_prompt="s", user_input="u")
+
+        self.assertEqual(result, "[s] u")
+        self.assertEqual(self.server.requests, 3)
+        self.assertEqual(client.breaker.state, "closed")
+
+    async def test_client_errors_are_not_retried(self) -> None:
+        self.server.statuses = [400]
+        client = await self._client(max_attempts=3)
+
+        with self.assertRaisesRegex(CompletionError, "400"):
+            await client.complete(system_prompt="s", user_input="u")
+        self.assertEqual(self.server.requests, 1)
+
+    async def test_deadline_covers_the_whole_request(self) -> None:
+        self.server.delay_seconds = 0.5
+        client = await self._client(deadline_seconds=0.05)
+
+        with self.assertRaises(TimeoutError):
+            await client.complete(system_prompt="s", user_input="u")
+
+    async def test_circuit_opens_fails_fast_and_recovers_after_a_trial(self) -> None:
+        self.server.statuses = [500, 500]
+        client = await self._client(
+            max_attempts=1, breaker_failure_threshold=2, breaker_reset_seconds=0.05
+        )
+
+        for _ in range(2):
+            with self.assertRaises(CompletionError):
+                await client.complete(system_prompt="s", user_input="u")
+        with self.assertRaises(CompletionCircuitOpenError):
+            await client.complete(system_prompt="s", user_input="u")
+        self.assertEqual(self.server.requests, 2)
+
+        await asyncio.sleep(0.06)
+        self.assertEqual(client.breaker.state, "half_open")
+        self.assertEqual(await client.complete(system_prompt="s", user_input="u"), "[s] u")
+        self.assertEqual(client.breaker.state, "closed")
+
+    async def test_stream_yields_chunks_and_retries_before_the_first_one(self) -> None:
+        self.server.statuses = [502]
+        client = await self._client(max_attempts=2)
+
+        chunks = [chunk async for chunk in client.stream(system_prompt="s", user_input="a b")]
+
+        self.assertEqual("".join(chunks), "[s] a b")
+        self.assertGreater(len(chunks), 1)
+        self.assertEqual(self.server.requests, 2)
+
+
+class HttpCompletionSettingsTest(unittest.TestCase):
+    def test_no_url_means_no_http_client(self) -> None:
+        with mock.patch.dict("os.environ", {}, clear=True):
+            self.assertIsNone(resolve_http_completion_settings())
+
+    def test_settings_come_from_environment(self) -> None:
+        with mock.patch.dict(
+            "os.environ",
+            {"ELARA_COMPLETION_URL": "http://model:8080", "ELARA_COMPLETION_MAX_ATTEMPTS": "5"},
+        ):
+            settings = resolve_http_completion_settings()
+
+        assert settings is not None
+        self.assertEqual(settings.base_url, "http://model:8080")
+        self.assertEqual(settings.max_attempts, 5)
+
+    def test_lifespan_shares_one_http_client_with_the_runtime(self) -> None:
+        server = MockCompletionServer()
+        server.start()
+        self.addCleanup(server.stop)
+        with mock.patch.dict("os.environ", {"ELARA_COMPLETION_URL": server.base_url}):
+            with TestClient(app) as client:
+                runtime = app.state.runtime
+                self.assertIsInstance(runtime._completion_client, HttpCompletionClient)
+                for _ in range(2):
+                    response = client.post(
+                        "/workspaces/ws-http/companion/messages",
+                        json={"message": "hello"},
+                        headers={"x-user-id": "owner-http", "x-user-role": "owner"},
+                    )
+                    self.assertIn("[companion_primary] hello", response.json()["response"])
+
+        self.assertEqual(server.requests, 2)
+        self.assertEqual(len(server.connections), 1)
+
+
+if __name__ == "__main__":
+    unittest.main()
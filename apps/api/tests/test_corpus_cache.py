@@ -0,0 +1,164 @@
+import unittest
+from unittest.mock import patch
+
+import numpy as np
+
+from apps.api.memory.corpus_cache import AgentCorpus, MemoryCorpusCache
+from apps.api.memory.vector_index import FloatMatrix
+
+
+def build_corpus(*contents: str) -> AgentCorpus:
+    corpus = AgentCorpus()
+    for index, content in enumerate(contents):
+        corpus.upsert(
+            memory_id=f"m-{index}",
+            content=content,
+            tokens=content.lower().split(),
+            vector=None,
+        )
+    return corpus
+
+
+def vector_rows(corpus: AgentCorpus, dim: int) -> tuple[list[str], list[str], FloatMatrix]:
+    rows, matrix = corpus.vector_snapshot(dim).live()
+    return (
+        [corpus.memory_ids[row] for row in rows.tolist()],
+        [corpus.contents[row] for row in rows.tolist()],
+        matrix,
+    )
+
+
+class AgentCorpusTest(unittest.TestCase):
+    def test_upsert_replaces_postings_and_vectors_in_place(self) -> None:
+        corpus = AgentCorpus()
+        corpus.upsert(
+            memory_id="m-1",
+            content="alpha beta",
+            tokens=["alpha", "beta"],
+            vector=np.asarray([1.0, 0.0], dtype=np.float32),
+        )
+        corpus.upsert(
+            memory_id="m-2",
+            content="beta",
+            tokens=["beta"],
+            vector=np.asarray([0.0, 1.0], dtype=np.float32),
+        )
+        corpus.upsert(memory_id="m-1", content="gamma", tokens=["gamma"], vector=None)
+
+        self.assertEqual(
+            corpus.postings_for(["alpha", "beta", "gamma"]),
+            [("beta", "m-2"), ("gamma", "m-1")],
+        )
+        self.assertEqual(corpus.content_for("m-1"), "gamma")
+        memory_ids, contents, matrix = vector_rows(corpus, 2)
+        self.assertEqual(memory_ids, ["m-2"])
+        self.assertEqual(contents, ["beta"])
+        self.assertEqual(matrix.tolist(), [[0.0, 1.0]])
+        self.assertEqual(vector_rows(corpus, 3)[0], [])
+        self.assertEqual(len(corpus), 2)
+
+    def test_vector_block_grows_and_switches_dimension(self) -> None:
+        corpus = AgentCorpus()
+        for index in range(20):
+            corpus.upsert(
+                memory_id=f"m-{index:02d}",
+                content="v",
+                tokens=["v"],
+                vector=np.full(3, float(index), dtype=np.float32),
+            )
+        corpus.upsert(
+            memory_id="m-00",
+            content="v",
+            tokens=["v"],
+            vector=np.ones(4, dtype=np.float32),
+        )
+
+        memory_ids, _contents, matrix = vector_rows(corpus, 3)
+        self.assertEqual(len(memory_ids), 19)
+        self.assertNotIn("m-00", memory_ids)
+        self.assertEqual(matrix.shape, (19, 3))
+        self.assertEqual(matrix[memory_ids.index("m-19")].tolist(), [19.0, 19.0, 19.0])
+        self.assertEqual(vector_rows(corpus, 4)[0], ["m-00"])
+
+    def test_snapshots_are_unaffected_by_later_writes(self) -> None:
+        corpus = AgentCorpus()
+        for index in range(4):
+            corpus.upsert(
+                memory_id=f"m-{index}",
+                content="v",
+                tokens=["v"],
+                vector=np.full(2, float(index), dtype=np.float32),
+            )
+        snapshot = corpus.vector_snapshot(2)
+        before = snapshot.matrix.copy()
+
+        for round_ in range(10):
+            for index in range(4):
+                corpus.upsert(
+                    memory_id=f"m-{index}",
+                    content="v",
+                    tokens=["v"],
+                    vector=np.full(2, float(100 * round_ + index), dtype=np.float32),
+                )
+
+        rows, matrix = snapshot.live()
+        self.assertEqual(rows.tolist(), [0, 1, 2, 3])
+        self.assertEqual(matrix.tolist(), before.tolist())
+        memory_ids, _contents, latest = vector_rows(corpus, 2)
+        self.assertEqual(sorted(memory_ids), ["m-0", "m-1", "m-2", "m-3"])
+        self.assertEqual(sorted(latest[:, 0].tolist()), [900.0, 901.0, 902.0, 903.0])
+        self.assertLessEqual(corpus.vector_snapshot(2).slots.shape[0], 8)
+
+    def test_retired_postings_are_skipped_and_compacted(self) -> None:
+        corpus = build_corpus(*(["alpha"] * 6))
+        corpus.upsert(memory_id="m-0", content="beta", tokens=["beta"], vector=None)
+        corpus.upsert(memory_id="m-0", content="alpha", tokens=["alpha"], vector=None)
+        corpus.upsert(memory_id="m-1", content="beta", tokens=["beta"], vector=None)
+
+        self.assertEqual(
+            sorted(corpus.postings_for(["alpha"])),
+            [("alpha", f"m-{index}") for index in (0, 2, 3, 4, 5)],
+        )
+
+        for index in range(6):
+            corpus.upsert(memory_id=f"m-{index}", content="beta", tokens=["beta"], vector=None)
+
+        self.assertEqual(corpus.postings_for(["alpha"]), [])
+        self.assertEqual(len(corpus.postings_for(["beta"])), 6)
+        self.assertEqual(corpus.nbytes, build_corpus(*(["beta"] * 6)).nbytes)
+
+
+class MemoryCorpusCacheTest(unittest.TestCase):
+    def test_counts_hits_misses_and_evicts_least_recently_used_by_bytes(self) -> None:
+        first = build_corpus("alpha " * 50)
+        second = build_corpus("beta " * 50)
+        cache = MemoryCorpusCache(max_bytes=first.nbytes + second.nbytes)
+        first_key = ("sqlite", "ws", "agent-1")
+        second_key = ("sqlite", "ws", "agent-2")
+
+        self.assertIsNone(cache.get(first_key))
+        cache.put(first_key, first)
+        cache.put(second_key, second)
+        self.assertIs(cache.get(second_key), second)
+
+        second.upsert(memory_id="m-9", content="extra", tokens=["extra"], vector=None)
+        cache.put(second_key, second)
+
+        stats = cache.stats()
+        self.assertEqual((stats.hits, stats.misses, stats.evictions), (1, 1, 1))
+        self.assertEqual(stats.entries, 1)
+        self.assertIsNone(cache.peek(first_key))
+        self.assertIs(cache.peek(second_key), second)
+        self.assertEqual(stats.bytes_used, second.nbytes)
+
+        cache.invalidate(second_key)
+        cache.invalidate(second_key)
+        self.assertEqual(cache.stats().bytes_used, 0)
+
+    def test_max_bytes_defaults_from_environment(self) -> None:
+        with patch.dict("os.environ", {"ELARA_MEMORY_CACHE_BYTES": "2048"}):
+            self.assertEqual(MemoryCorpusCache().stats().max_bytes, 2048)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,62 @@
+import unittest
+
+import numpy as np
+
+from apps.api.memory.embedding_codec import decode_embedding, decode_matrix, encode_embedding
+
+
+class EmbeddingCodecTest(unittest.TestCase):
+    def test_float32_round_trip_is_packed_and_zero_copy(self) -> None:
+        blob = encode_embedding([0.25, -1.5, 3.0])
+
+        vector = decode_embedding(blob, encoding="float32", dim=3)
+
+        self.assertEqual(len(blob), 12)
+        self.assertEqual(vector.tolist(), [0.25, -1.5, 3.0])
+        self.assertFalse(vector.flags.writeable)
+
+    def test_reduced_precision_encodings_shrink_and_stay_close(self) -> None:
+        embedding = [0.5, -0.25, 0.125, -1.0]
+
+        half = encode_embedding(embedding, encoding="float16")
+        quantized = encode_embedding(embedding, encoding="int8")
+
+        self.assertEqual(len(half), 8)
+        self.assertEqual(len(quantized), 4 + 4)
+        np.testing.assert_allclose(
+            decode_embedding(half, encoding="float16", dim=4),
+            embedding,
+            atol=1e-3,
+        )
+        np.testing.assert_allclose(
+            decode_embedding(quantized, encoding="int8", dim=4),
+            embedding,
+            atol=1.0 / 127,
+        )
+        self.assertEqual(
+            decode_embedding(encode_embedding([0.0, 0.0], encoding="int8"), encoding="int8", dim=2)
+            .tolist(),
+            [0.0, 0.0],
+        )
+
+    def test_decode_matrix_handles_mixed_encodings_and_rejects_wrong_dimensions(self) -> None:
+        float_rows = [encode_embedding([1.0, 2.0]), encode_embedding([3.0, 4.0])]
+        mixed_rows = [
+            encode_embedding([1.0, 2.0]),
+            encode_embedding([3.0, 4.0], encoding="float16"),
+        ]
+
+        fast = decode_matrix(float_rows, encodings=["float32", "float32"], dim=2)
+        mixed = decode_matrix(mixed_rows, encodings=["float32", "float16"], dim=2)
+
+        self.assertEqual(fast.tolist(), [[1.0, 2.0], [3.0, 4.0]])
+        self.assertEqual(mixed.tolist(), [[1.0, 2.0], [3.0, 4.0]])
+        self.assertEqual(decode_matrix([], encodings=[], dim=5).shape, (0, 5))
+        with self.assertRaises(ValueError):
+            decode_matrix(float_rows, encodings=["float32", "float32"], dim=3)
+        with self.assertRaises(ValueError):
+            decode_embedding(float_rows[0], encoding="float32", dim=3)
+
+
+if __name__ == "__main__":
+    unittest.main()
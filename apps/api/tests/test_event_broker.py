@@ -0,0 +1,81 @@
+import unittest
+
+from apps.api.events.broker import RunEventBroker, RunEventStream
+from apps.api.events.outbox import AgentRunEvent, AgentRunEventOutbox, PendingRunEvent
+
+
+def _event(seq: int, *, agent_run_id: str = "run-1") -> AgentRunEvent:
+    return AgentRunEvent(
+        agent_run_id=agent_run_id,
+        seq=seq,
+        event_type="tick",
+        payload={},
+        created_at="2026-01-01T00:00:00+00:00",
+    )
+
+
+class RunEventBrokerTest(unittest.IsolatedAsyncioTestCase):
+    async def test_publish_fans_out_only_to_subscribers_of_the_run(self) -> None:
+        broker = RunEventBroker(max_pending=8)
+        first = broker.subscribe("run-1")
+        second = broker.subscribe("run-1")
+        other = broker.subscribe("run-2")
+
+        broker.publish([_event(1), _event(2)])
+
+        self.assertEqual([event.seq for event in await first.get()], [1, 2])
+        self.assertEqual([event.seq for event in await second.get()], [1, 2])
+        self.assertEqual(await other.get(timeout=0.01), [])
+
+    async def test_slow_subscriber_is_dropped_on_overflow(self) -> None:
+        broker = RunEventBroker(max_pending=2)
+        slow = broker.subscribe("run-1")
+
+        broker.publish([_event(1), _event(2)])
+        broker.publish([_event(3)])
+
+        self.assertTrue(slow.overflowed)
+        self.assertIsNone(await slow.get())
+        self.assertEqual(broker.subscriber_count("run-1"), 0)
+
+    async def test_close_unsubscribes(self) -> None:
+        broker = RunEventBroker()
+        subscription = broker.subscribe("run-1")
+
+        subscription.close()
+        broker.publish([_event(1)])
+
+        self.assertIsNone(await subscription.get())
+        self.assertEqual(broker.subscriber_count("run-1"), 0)
+
+    async def test_stream_skips_live_events_already_in_the_backlog(self) -> None:
+        broker = RunEventBroker()
+        subscription = broker.subscribe("run-1")
+        broker.publish([_event(2), _event(3)])
+        stream = RunEventStream(subscription=subscription, backlog=[_event(2)], last_seq=1)
+
+        backlog = await stream.next_events()
+        live = await stream.next_events()
+
+        self.assertEqual([event.seq for event in backlog or []], [2])
+        self.assertEqual([event.seq for event in live or []], [3])
+        self.assertEqual(stream.last_seq, 3)
+
+    async def test_outbox_appends_are_published_after_commit(self) -> None:
+        broker = RunEventBroker()
+        outbox = AgentRunEventOutbox()
+        outbox.add_append_listener(broker.publish)
+        subscription = broker.subscribe("run-1")
+
+        await outbox.append_event(agent_run_id="run-1", event_type="a", payload={})
+        await outbox.append_events(
+            agent_run_id="run-1",
+            events=[PendingRunEvent(event_type="b", payload={})],
+        )
+
+        received = await subscription.get()
+        self.assertEqual([event.event_type for event in received or []], ["a", "b"])
+
+
+if __name__ == "__main__":
+    unittest.main()
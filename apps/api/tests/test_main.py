@@ -10,12 +10,16 @@ class MainAppTest(unittest.TestCase):
         self.assertIn("/workspaces/{workspace_id}/specialists", registered_routes)
         self.assertIn("/workspaces/{workspace_id}/companion/messages", registered_routes)
         self.assertIn("/workspaces/{workspace_id}/execution/goals", registered_routes)
+        self.assertIn("/workspaces/{workspace_id}/companion/messages/stream", registered_routes)
+        self.assertIn("/workspaces/{workspace_id}/companion/events", registered_routes)
+        self.assertIn("/workspaces/{workspace_id}/execution/goals/stream", registered_routes)
         self.assertIn("/workspaces/{workspace_id}/invitations", registered_routes)
         self.assertIn("/workspaces/{workspace_id}/approvals", registered_routes)
         self.assertIn("/workspaces/{workspace_id}/audit-events", registered_routes)
         self.assertIn("/invitations/{token}/accept", registered_routes)
         self.assertIn("/approvals/{approval_id}/decision", registered_routes)
         self.assertIn("/agent-runs/{agent_run_id}/events", registered_routes)
+        self.assertIn("/agent-runs/{agent_run_id}/events/stream", registered_routes)
 
 
 if __name__ == "__main__":
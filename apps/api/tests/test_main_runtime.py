@@ -1,9 +1,22 @@
+import json
 import unittest
 from types import SimpleNamespace
 
 from fastapi import HTTPException
 
-from apps.api.main import get_runtime
+from apps.api.events.broker import RunEventBroker, RunEventStream
+from apps.api.events.outbox import AgentRunEvent
+from apps.api.main import _event_stream_frames, get_runtime
+
+
+def _event(seq: int) -> AgentRunEvent:
+    return AgentRunEvent(
+        agent_run_id="run-sse",
+        seq=seq,
+        event_type="tick",
+        payload={"seq": seq},
+        created_at="2026-01-01T00:00:00+00:00",
+    )
 
 
 class RuntimeDependencyTest(unittest.TestCase):
@@ -16,5 +29,26 @@ class RuntimeDependencyTest(unittest.TestCase):
         self.assertEqual(context.exception.status_code, 503)
 
 
+class EventStreamFramesTest(unittest.IsolatedAsyncioTestCase):
+    async def test_frames_carry_seq_ids_keepalives_and_overflow(self) -> None:
+        broker = RunEventBroker(max_pending=1)
+        subscription = broker.subscribe("run-sse")
+        stream = RunEventStream(subscription=subscription, backlog=[_event(1)], last_seq=0)
+        frames = _event_stream_frames(stream, keepalive_seconds=0.01)
+
+        first = await anext(frames)
+        keepalive = await anext(frames)
+        broker.publish([_event(2), _event(3)])
+        overflow = await anext(frames)
+
+        self.assertTrue(first.startswith("id: 1\ndata: "))
+        self.assertEqual(json.loads(first.split("data: ", 1)[1])["payload"], {"seq": 1})
+        self.assertEqual(keepalive, ": keepalive\n\n")
+        self.assertTrue(overflow.startswith("event: overflow\n"))
+        with self.assertRaises(StopAsyncIteration):
+            await anext(frames)
+        self.assertEqual(broker.subscriber_count("run-sse"), 0)
+
+
 if __name__ == "__main__":
     unittest.main()
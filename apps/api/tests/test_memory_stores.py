@@ -1,9 +1,16 @@
 import os
+import random
+import sqlite3
 import tempfile
+import threading
 import unittest
+from unittest import mock
 
+from apps.api.db.state import connect_state_db
 from apps.api.db.store_postgres import PostgresMemoryStore
 from apps.api.db.store_sqlite import SqliteMemoryStore
+from apps.api.memory import MemoryCorpusCache, MemoryMatch, MemoryUpsert
+from apps.api.memory.vector_index import IvfIndex, rank_by_similarity, to_matrix, train_ivf
 
 
 class MemoryStoreContractTest(unittest.IsolatedAsyncioTestCase):
@@ -120,6 +127,724 @@ class MemoryStoreContractTest(unittest.IsolatedAsyncioTestCase):
 
         self.assertEqual([match.memory_id for match in matches], ["m1"])
 
+    async def test_reupsert_replaces_indexed_tokens(self) -> None:
+        with tempfile.TemporaryDirectory() as tmp_dir:
+            stores = (
+                SqliteMemoryStore(),
+                SqliteMemoryStore(database_path=os.path.join(tmp_dir, "reindex.sqlite3")),
+            )
+            for store in stores:
+                await store.upsert_memory(
+                    workspace_id="ws-reindex",
+                    agent_id="agent-reindex",
+                    memory_id="m1",
+                    content="Launch Checklist",
+                )
+                await store.upsert_memory(
+                    workspace_id="ws-reindex",
+                    agent_id="agent-reindex",
+                    memory_id="m1",
+                    content="rollback checklist",
+                )
+
+                stale = await store.search(
+                    workspace_id="ws-reindex",
+                    agent_id="agent-reindex",
+                    query="launch",
+                )
+                fresh = await store.search(
+                    workspace_id="ws-reindex",
+                    agent_id="agent-reindex",
+                    query="ROLLBACK checklist",
+                )
+
+                self.assertEqual(stale, [])
+                self.assertEqual([match.memory_id for match in fresh], ["m1"])
+                self.assertEqual(fresh[0].score, 2.0)
+                self.assertEqual(fresh[0].content, "rollback checklist")
+
+    async def test_empty_query_returns_scoped_memories_in_id_order(self) -> None:
+        store = SqliteMemoryStore()
+        for memory_id in ("m-b", "m-a", "m-c"):
+            await store.upsert_memory(
+                workspace_id="ws-empty-query",
+                agent_id="agent-1",
+                memory_id=memory_id,
+                content=f"note {memory_id}",
+            )
+
+        matches = await store.search(
+            workspace_id="ws-empty-query",
+            agent_id="agent-1",
+            query="   ",
+            top_k=2,
+        )
+
+        self.assertEqual([match.memory_id for match in matches], ["m-a", "m-b"])
+        self.assertEqual([match.score for match in matches], [0.0, 0.0])
+
+    async def test_token_index_is_backfilled_for_existing_memory_rows(self) -> None:
+        with tempfile.TemporaryDirectory() as tmp_dir:
+            db_path = os.path.join(tmp_dir, "backfill.sqlite3")
+            connection = connect_state_db(db_path)
+            connection.execute(
+                """
+                insert into memory_record (
+                  backend, workspace_id, agent_id, memory_id, content,
+                  embedding_model, embedding_dim, embedding_json, created_at, updated_at
+                ) values ('sqlite', 'ws-legacy', 'agent-legacy', 'm-legacy',
+                          'legacy release notes', 'text-embedding-3-small', 0, null,
+                          '2026-02-11T00:00:00+00:00', '2026-02-11T00:00:00+00:00')
+                """
+            )
+            connection.commit()
+            connection.close()
+
+            store = SqliteMemoryStore(database_path=db_path)
+            matches = await store.search(
+                workspace_id="ws-legacy",
+                agent_id="agent-legacy",
+                query="release",
+            )
+
+            self.assertEqual([match.memory_id for match in matches], ["m-legacy"])
+            verify = sqlite3.connect(db_path)
+            token_count = verify.execute("select count(*) from memory_token_record").fetchone()
+            verify.close()
+            self.assertEqual(token_count, (3,))
+
+    async def test_punctuation_is_not_part_of_a_token(self) -> None:
+        with tempfile.TemporaryDirectory() as tmp_dir:
+            stores = (
+                SqliteMemoryStore(),
+                SqliteMemoryStore(database_path=os.path.join(tmp_dir, "punctuation.sqlite3")),
+                SqliteMemoryStore(
+                    database_path=os.path.join(tmp_dir, "punctuation-cached.sqlite3"),
+                    corpus_cache=MemoryCorpusCache(max_bytes=1_000_000),
+                ),
+            )
+            for index, store in enumerate(stores):
+                with self.subTest(store=index):
+                    await store.upsert_memory(
+                        workspace_id="ws-punct",
+                        agent_id="agent-punct",
+                        memory_id="m-1",
+                        content="I like coffee.",
+                    )
+                    await store.upsert_memory(
+                        workspace_id="ws-punct",
+                        agent_id="agent-punct",
+                        memory_id="m-2",
+                        content="(tea), not coffee!",
+                    )
+
+                    matches = await store.search(
+                        workspace_id="ws-punct",
+                        agent_id="agent-punct",
+                        query="Coffee? tea",
+                    )
+
+                    self.assertEqual(
+                        [(match.memory_id, match.score) for match in matches],
+                        [("m-2", 2.0), ("m-1", 1.0)],
+                    )
+
+    async def test_tokens_indexed_with_punctuation_are_reindexed(self) -> None:
+        with tempfile.TemporaryDirectory() as tmp_dir:
+            db_path = os.path.join(tmp_dir, "retokenize.sqlite3")
+            connection = connect_state_db(db_path)
+            connection.execute(
+                """
+                insert into memory_record (
+                  backend, workspace_id, agent_id, memory_id, content,
+                  embedding_model, embedding_dim, embedding_json, created_at, updated_at
+                ) values ('sqlite', 'ws-split', 'agent-split', 'm-split',
+                          'Café, coffee.', 'text-embedding-3-small', 0, null,
+                          '2026-02-11T00:00:00+00:00', '2026-02-11T00:00:00+00:00')
+                """
+            )
+            connection.executemany(
+                """
+                insert into memory_token_record (backend, workspace_id, agent_id, token, memory_id)
+                values ('sqlite', 'ws-split', 'agent-split', ?, 'm-split')
+                """,
+                [("café,",), ("coffee.",)],
+            )
+            connection.commit()
+            connection.close()
+
+            store = SqliteMemoryStore(database_path=db_path)
+            self.addCleanup(store.close)
+            matches = await store.search(
+                workspace_id="ws-split",
+                agent_id="agent-split",
+                query="coffee café",
+            )
+
+            self.assertEqual(
+                [(match.memory_id, match.score) for match in matches], [("m-split", 2.0)]
+            )
+            verify = sqlite3.connect(db_path)
+            tokens = verify.execute(
+                "select token from memory_token_record order by token"
+            ).fetchall()
+            verify.close()
+            self.assertEqual(tokens, [("café",), ("coffee",)])
+
+    async def test_one_time_memory_migrations_run_once_per_database(self) -> None:
+        connection = connect_state_db(":memory:")
+        self.addCleanup(connection.close)
+        first = SqliteMemoryStore(connection=connection)
+        await first.upsert_memory(
+            workspace_id="ws-once",
+            agent_id="agent-once",
+            memory_id="m-empty",
+            content="...",
+        )
+        statements: list[str] = []
+        connection.set_trace_callback(statements.append)
+
+        SqliteMemoryStore(connection=connection)
+        connection.set_trace_callback(None)
+
+        self.assertFalse(
+            [sql for sql in statements if "memory_token_record" in sql or "embedding_json" in sql]
+        )
+        markers = connection.execute(
+            "select name from state_migration_record order by name"
+        ).fetchall()
+        self.assertEqual(
+            markers,
+            [("memory_embedding_blob:sqlite",), ("memory_token_index:sqlite",)],
+        )
+
+    async def test_vector_search_ranks_by_cosine_similarity(self) -> None:
+        with tempfile.TemporaryDirectory() as tmp_dir:
+            stores = (
+                SqliteMemoryStore(),
+                SqliteMemoryStore(database_path=os.path.join(tmp_dir, "vector.sqlite3")),
+            )
+            for store in stores:
+                for memory_id, embedding in (
+                    ("m-near", [1.0, 0.1, 0.0]),
+                    ("m-far", [0.0, 0.0, 1.0]),
+                    ("m-mid", [1.0, 1.0, 0.0]),
+                    ("m-other-dim", [1.0, 0.0]),
+                ):
+                    await store.upsert_memory(
+                        workspace_id="ws-vector",
+                        agent_id="agent-vector",
+                        memory_id=memory_id,
+                        content=f"content {memory_id}",
+                        embedding=embedding,
+                    )
+                await store.upsert_memory(
+                    workspace_id="ws-vector",
+                    agent_id="agent-vector",
+                    memory_id="m-text-only",
+                    content="no embedding",
+                )
+
+                matches = await store.search_vector(
+                    workspace_id="ws-vector",
+                    agent_id="agent-vector",
+                    embedding=[2.0, 0.0, 0.0],
+                    top_k=2,
+                )
+
+                self.assertEqual([match.memory_id for match in matches], ["m-near", "m-mid"])
+                self.assertEqual(matches[0].content, "content m-near")
+                self.assertAlmostEqual(matches[1].score, 0.7071, places=3)
+
+    async def test_ann_vector_search_matches_exact_recall_and_tracks_new_vectors(self) -> None:
+        rng = random.Random(7)
+        centers = [[rng.gauss(0.0, 1.0) for _ in range(16)] for _ in range(12)]
+        with tempfile.TemporaryDirectory() as tmp_dir:
+            db_path = os.path.join(tmp_dir, "ann.sqlite3")
+            store = SqliteMemoryStore(
+                database_path=db_path,
+                ann_min_vectors=200,
+                ann_probe_lists=4,
+            )
+            for index in range(480):
+                center = centers[index % len(centers)]
+                await store.upsert_memory(
+                    workspace_id="ws-ann",
+                    agent_id="agent-ann",
+                    memory_id=f"m-{index:04d}",
+                    content=f"vector {index}",
+                    embedding=[value + rng.gauss(0.0, 0.05) for value in center],
+                )
+
+            hits = 0
+            for center in centers:
+                exact = await store.search_vector(
+                    workspace_id="ws-ann",
+                    agent_id="agent-ann",
+                    embedding=center,
+                    top_k=10,
+                    exact=True,
+                )
+                approximate = await store.search_vector(
+                    workspace_id="ws-ann",
+                    agent_id="agent-ann",
+                    embedding=center,
+                    top_k=10,
+                )
+                hits += len(
+                    {match.memory_id for match in exact}
+                    & {match.memory_id for match in approximate}
+                )
+            self.assertGreaterEqual(hits / (10 * len(centers)), 0.9)
+
+            await store.upsert_memory(
+                workspace_id="ws-ann",
+                agent_id="agent-ann",
+                memory_id="m-late",
+                content="late vector",
+                embedding=[value * 3.0 for value in centers[0]],
+            )
+            late = await store.search_vector(
+                workspace_id="ws-ann",
+                agent_id="agent-ann",
+                embedding=centers[0],
+                top_k=480,
+            )
+            self.assertIn("m-late", [match.memory_id for match in late])
+
+            verify = sqlite3.connect(db_path)
+            index_row = verify.execute(
+                """
+                select trained_count, vector_count
+                from memory_vector_index_record
+                where workspace_id = 'ws-ann' and agent_id = 'agent-ann'
+                """
+            ).fetchone()
+            verify.close()
+            self.assertEqual(index_row, (400, 481))
+
+    async def test_vector_search_never_trains_the_ivf_index(self) -> None:
+        with tempfile.TemporaryDirectory() as tmp_dir:
+            store = SqliteMemoryStore(
+                database_path=os.path.join(tmp_dir, "ann-search.sqlite3"), ann_min_vectors=8
+            )
+            for index in range(8):
+                await store.upsert_memory(
+                    workspace_id="ws-ann",
+                    agent_id="agent-ann",
+                    memory_id=f"m-{index}",
+                    content=f"vector {index}",
+                    embedding=[float(index), 1.0, 0.5],
+                )
+
+            with mock.patch(
+                "apps.api.memory.store_sqlite.train_ivf",
+                side_effect=AssertionError("search must not train"),
+            ):
+                results = await store.search_vector(
+                    workspace_id="ws-ann",
+                    agent_id="agent-ann",
+                    embedding=[3.0, 1.0, 0.5],
+                    top_k=3,
+                )
+            self.assertEqual(len(results), 3)
+
+            with mock.patch("apps.api.memory.store_sqlite.train_ivf", wraps=train_ivf) as train:
+                for index in range(8, 16):
+                    await store.upsert_memory(
+                        workspace_id="ws-ann",
+                        agent_id="agent-ann",
+                        memory_id=f"m-{index}",
+                        content=f"vector {index}",
+                        embedding=[float(index), 1.0, 0.5],
+                    )
+            self.assertEqual(train.call_count, 1)
+
+    async def test_bulk_upsert_assigns_ivf_lists_with_one_index_load_per_corpus(self) -> None:
+        rng = random.Random(11)
+        with tempfile.TemporaryDirectory() as tmp_dir:
+            db_path = os.path.join(tmp_dir, "ann-bulk.sqlite3")
+            store = SqliteMemoryStore(database_path=db_path)
+            await store.upsert_memories(
+                [
+                    MemoryUpsert(
+                        workspace_id="ws-ann",
+                        agent_id="agent-ann",
+                        memory_id=f"m-{index:03d}",
+                        content=f"vector {index}",
+                        embedding=[rng.gauss(0.0, 1.0) for _ in range(8)],
+                    )
+                    for index in range(40)
+                ]
+            )
+            store.build_vector_index(workspace_id="ws-ann", agent_id="agent-ann", dim=8)
+
+            batch = [
+                MemoryUpsert(
+                    workspace_id="ws-ann",
+                    agent_id="agent-ann",
+                    memory_id=f"m-{index:03d}",
+                    content=f"vector {index}",
+                    embedding=[rng.gauss(0.0, 1.0) for _ in range(8)],
+                )
+                for index in range(30, 70)
+            ]
+            load_vector_index = store._load_vector_index
+            loaded: list[IvfIndex] = []
+
+            def counting_load(
+                connection: sqlite3.Connection, *, workspace_id: str, agent_id: str, dim: int
+            ) -> tuple[IvfIndex, int, int] | None:
+                result = load_vector_index(
+                    connection, workspace_id=workspace_id, agent_id=agent_id, dim=dim
+                )
+                if result is not None:
+                    loaded.append(result[0])
+                return result
+
+            with mock.patch.object(store, "_load_vector_index", side_effect=counting_load):
+                await store.upsert_memories(batch)
+
+            self.assertEqual(len(loaded), 1)
+            verify = sqlite3.connect(db_path)
+            vector_count = verify.execute(
+                "select vector_count from memory_vector_index_record where workspace_id = 'ws-ann'"
+            ).fetchone()
+            list_ids = dict(
+                verify.execute(
+                    """
+                    select memory_id, list_id
+                    from memory_vector_list_record
+                    where workspace_id = 'ws-ann'
+                    """
+                ).fetchall()
+            )
+            verify.close()
+            self.assertEqual(vector_count, (70,))
+            self.assertEqual(len(list_ids), 70)
+            index = loaded[0]
+            for upsert in batch:
+                expected = index.assign(to_matrix([list(upsert.embedding or [])], dim=8))[0]
+                self.assertEqual(list_ids[upsert.memory_id], int(expected))
+
+    async def test_legacy_json_embeddings_are_migrated_to_packed_blobs(self) -> None:
+        with tempfile.TemporaryDirectory() as tmp_dir:
+            db_path = os.path.join(tmp_dir, "embedding-migration.sqlite3")
+            connection = connect_state_db(db_path)
+            connection.execute(
+                """
+                insert into memory_record (
+                  backend, workspace_id, agent_id, memory_id, content,
+                  embedding_model, embedding_dim, embedding_json, created_at, updated_at
+                ) values ('sqlite', 'ws-blob', 'agent-blob', 'm-json', 'legacy vector',
+                          'text-embedding-3-small', 3, '[0.5, 0.25, -1.0]',
+                          '2026-02-11T00:00:00+00:00', '2026-02-11T00:00:00+00:00')
+                """
+            )
+            connection.commit()
+            connection.close()
+
+            store = SqliteMemoryStore(database_path=db_path)
+            await store.upsert_memory(
+                workspace_id="ws-blob",
+                agent_id="agent-blob",
+                memory_id="m-new",
+                content="fresh vector",
+                embedding=[-0.5, -0.25, 1.0],
+            )
+            matches = await store.search_vector(
+                workspace_id="ws-blob",
+                agent_id="agent-blob",
+                embedding=[0.5, 0.25, -1.0],
+                top_k=2,
+            )
+
+            self.assertEqual([match.memory_id for match in matches], ["m-json", "m-new"])
+            self.assertAlmostEqual(matches[0].score, 1.0, places=5)
+            verify = sqlite3.connect(db_path)
+            rows = verify.execute(
+                """
+                select memory_id, embedding_json, length(embedding_blob), embedding_encoding
+                from memory_record
+                order by memory_id
+                """
+            ).fetchall()
+            verify.close()
+            self.assertEqual(
+                rows,
+                [("m-json", None, 12, "float32"), ("m-new", None, 12, "float32")],
+            )
+
+    async def test_int8_encoding_keeps_vector_ranking(self) -> None:
+        with tempfile.TemporaryDirectory() as tmp_dir:
+            store = SqliteMemoryStore(
+                database_path=os.path.join(tmp_dir, "int8.sqlite3"),
+                embedding_encoding="int8",
+            )
+            for memory_id, embedding in (
+                ("m-a", [0.9, 0.1, 0.0, 0.0]),
+                ("m-b", [0.0, 0.8, 0.2, 0.0]),
+                ("m-c", [0.0, 0.0, 0.1, 0.9]),
+            ):
+                await store.upsert_memory(
+                    workspace_id="ws-int8",
+                    agent_id="agent-int8",
+                    memory_id=memory_id,
+                    content=memory_id,
+                    embedding=embedding,
+                )
+
+            matches = await store.search_vector(
+                workspace_id="ws-int8",
+                agent_id="agent-int8",
+                embedding=[0.0, 0.1, 0.0, 1.0],
+                top_k=3,
+            )
+
+            self.assertEqual([match.memory_id for match in matches], ["m-c", "m-b", "m-a"])
+
+    async def test_corpus_cache_serves_repeat_searches_and_is_updated_on_write(self) -> None:
+        with tempfile.TemporaryDirectory() as tmp_dir:
+            cache = MemoryCorpusCache(max_bytes=1_000_000)
+            store = SqliteMemoryStore(
+                database_path=os.path.join(tmp_dir, "cache.sqlite3"),
+                corpus_cache=cache,
+            )
+            await store.upsert_memory(
+                workspace_id="ws-cache",
+                agent_id="agent-cache",
+                memory_id="m-1",
+                content="quarterly roadmap",
+                embedding=[1.0, 0.0],
+            )
+
+            first = await store.search(
+                workspace_id="ws-cache",
+                agent_id="agent-cache",
+                query="roadmap",
+            )
+            await store.upsert_memory(
+                workspace_id="ws-cache",
+                agent_id="agent-cache",
+                memory_id="m-2",
+                content="roadmap review notes",
+                embedding=[0.0, 1.0],
+            )
+            second = await store.search(
+                workspace_id="ws-cache",
+                agent_id="agent-cache",
+                query="roadmap review",
+            )
+            unranked = await store.search(
+                workspace_id="ws-cache",
+                agent_id="agent-cache",
+                query="",
+            )
+            vector = await store.search_vector(
+                workspace_id="ws-cache",
+                agent_id="agent-cache",
+                embedding=[0.1, 1.0],
+                top_k=1,
+            )
+
+            self.assertEqual([match.memory_id for match in first], ["m-1"])
+            self.assertEqual([match.memory_id for match in second], ["m-2", "m-1"])
+            self.assertEqual(second[0].content, "roadmap review notes")
+            self.assertEqual([match.memory_id for match in unranked], ["m-1", "m-2"])
+            self.assertEqual([match.memory_id for match in vector], ["m-2"])
+            stats = cache.stats()
+            self.assertEqual((stats.hits, stats.misses, stats.entries), (3, 1, 1))
+
+    async def test_cached_vector_search_scores_its_snapshot_outside_the_corpus_lock(
+        self,
+    ) -> None:
+        with tempfile.TemporaryDirectory() as tmp_dir:
+            cache = MemoryCorpusCache(max_bytes=1_000_000)
+            store = SqliteMemoryStore(
+                database_path=os.path.join(tmp_dir, "snapshot.sqlite3"),
+                corpus_cache=cache,
+            )
+            self.addCleanup(store.close)
+            await store.upsert_memory(
+                workspace_id="ws-snap",
+                agent_id="agent-snap",
+                memory_id="m-1",
+                content="roadmap",
+                embedding=[1.0, 0.0],
+            )
+            await store.search(workspace_id="ws-snap", agent_id="agent-snap", query="roadmap")
+            cached = cache.peek(("sqlite", "ws-snap", "agent-snap"))
+
+            scoring = threading.Event()
+            release = threading.Event()
+            released: list[bool] = []
+            paused_results: list[list[MemoryMatch]] = []
+
+            def paused_rank(**kwargs: object) -> list[tuple[str, float]]:
+                if threading.current_thread() is paused:
+                    scoring.set()
+                    released.append(release.wait(timeout=2))
+                return rank_by_similarity(**kwargs)  # type: ignore[arg-type]
+
+            def search_paused() -> None:
+                paused_results.append(
+                    store._search_vector(
+                        workspace_id="ws-snap",
+                        agent_id="agent-snap",
+                        embedding=[1.0, 0.0],
+                        top_k=5,
+                        metric="dot",
+                        exact=True,
+                    )
+                )
+
+            paused = threading.Thread(target=search_paused)
+            with mock.patch(
+                "apps.api.memory.store_sqlite.rank_by_similarity", side_effect=paused_rank
+            ):
+                paused.start()
+                self.assertTrue(scoring.wait(timeout=5))
+                concurrent = store._search(
+                    workspace_id="ws-snap",
+                    agent_id="agent-snap",
+                    query="roadmap",
+                    top_k=5,
+                )
+                await store.upsert_memory(
+                    workspace_id="ws-snap",
+                    agent_id="agent-snap",
+                    memory_id="m-1",
+                    content="roadmap",
+                    embedding=[3.0, 0.0],
+                )
+                await store.upsert_memory(
+                    workspace_id="ws-snap",
+                    agent_id="agent-snap",
+                    memory_id="m-2",
+                    content="roadmap review",
+                    embedding=[2.0, 0.0],
+                )
+                release.set()
+                paused.join(timeout=5)
+
+            after = await store.search_vector(
+                workspace_id="ws-snap",
+                agent_id="agent-snap",
+                embedding=[1.0, 0.0],
+                metric="dot",
+            )
+
+            self.assertEqual(released, [True])
+            self.assertEqual([match.memory_id for match in concurrent], ["m-1"])
+            self.assertEqual(
+                [(match.memory_id, match.score) for match in paused_results[0]], [("m-1", 1.0)]
+            )
+            self.assertIs(cache.peek(("sqlite", "ws-snap", "agent-snap")), cached)
+            self.assertEqual(
+                [(match.memory_id, match.score) for match in after], [("m-1", 3.0), ("m-2", 2.0)]
+            )
+            self.assertEqual((cache.stats().misses, cache.stats().entries), (1, 1))
+
+    async def test_bulk_upsert_reports_per_item_results_in_one_transaction(self) -> None:
+        with tempfile.TemporaryDirectory() as tmp_dir:
+            connection = connect_state_db(os.path.join(tmp_dir, "bulk.sqlite3"))
+            self.addCleanup(connection.close)
+            store = SqliteMemoryStore(connection=connection)
+            await store.upsert_memory(
+                workspace_id="ws-bulk",
+                agent_id="agent-bulk",
+                memory_id="m-existing",
+                content="existing vector",
+                embedding=[1.0, 0.0, 0.0],
+            )
+
+            statements: list[str] = []
+            connection.set_trace_callback(statements.append)
+            results = await store.upsert_memories(
+                [
+                    MemoryUpsert(
+                        workspace_id="ws-bulk",
+                        agent_id="agent-bulk",
+                        memory_id="m-1",
+                        content="alpha draft",
+                        embedding=[0.0, 1.0],
+                    ),
+                    MemoryUpsert(
+                        workspace_id="ws-bulk",
+                        agent_id="agent-bulk",
+                        memory_id="m-existing",
+                        content="wrong dimension",
+                        embedding=[0.0, 1.0],
+                    ),
+                    MemoryUpsert(
+                        workspace_id="ws-bulk",
+                        agent_id="agent-bulk",
+                        memory_id="m-1",
+                        content="alpha final",
+                        embedding=[0.0, 1.0],
+                    ),
+                    MemoryUpsert(
+                        workspace_id="ws-bulk",
+                        agent_id="agent-bulk",
+                        memory_id="m-2",
+                        content="beta",
+                    ),
+                ]
+            )
+            connection.set_trace_callback(None)
+
+            self.assertEqual(
+                [(result.memory_id, result.error) for result in results],
+                [
+                    ("m-1", None),
+                    ("m-existing", "embedding dimension mismatch for existing memory id"),
+                    ("m-1", None),
+                    ("m-2", None),
+                ],
+            )
+            self.assertEqual(sum(1 for sql in statements if sql == "COMMIT"), 1)
+            matches = await store.search(
+                workspace_id="ws-bulk",
+                agent_id="agent-bulk",
+                query="alpha draft vector",
+            )
+            self.assertEqual(
+                [(match.memory_id, match.content) for match in matches],
+                [("m-1", "alpha final"), ("m-existing", "existing vector")],
+            )
+
+    async def test_bulk_upsert_matches_single_upserts_without_a_connection(self) -> None:
+        store = SqliteMemoryStore(connection=None)
+        results = await store.upsert_memories(
+            [
+                MemoryUpsert(
+                    workspace_id="ws-bulk",
+                    agent_id="agent-bulk",
+                    memory_id="m-1",
+                    content="gamma",
+                    embedding=[0.1, 0.2],
+                ),
+                MemoryUpsert(
+                    workspace_id="ws-bulk",
+                    agent_id="agent-bulk",
+                    memory_id="m-1",
+                    content="gamma again",
+                    embedding=[0.1, 0.2, 0.3],
+                ),
+            ]
+        )
+
+        self.assertIsNone(results[0].error)
+        self.assertIsNone(results[1].item)
+        with self.assertRaises(ValueError):
+            await store.upsert_memory(
+                workspace_id="ws-bulk",
+                agent_id="agent-bulk",
+                memory_id="m-1",
+                content="gamma",
+                embedding=[0.1],
+            )
+
 
 if __name__ == "__main__":
     unittest.main()
@@ -1,33 +1,139 @@
 import os
+import sqlite3
 import tempfile
 import unittest
 
-from apps.api.events.outbox import AgentRunEventOutbox
+from apps.api.db.state import connect_state_db
+from apps.api.events.outbox import AgentRunEventOutbox, PendingRunEvent
 
 
-class AgentRunEventOutboxTest(unittest.TestCase):
-    def test_sequence_and_replay_cursor_persist_across_outbox_instances(self) -> None:
+class AgentRunEventOutboxTest(unittest.IsolatedAsyncioTestCase):
+    async def test_sequence_and_replay_cursor_persist_across_outbox_instances(self) -> None:
         with tempfile.TemporaryDirectory() as tmp_dir:
             db_path = os.path.join(tmp_dir, "outbox.sqlite3")
             first = AgentRunEventOutbox(database_path=db_path)
-            first.append_event(agent_run_id="run-persist", event_type="a", payload={})
-            first.append_event(agent_run_id="run-persist", event_type="b", payload={})
+            await first.append_event(agent_run_id="run-persist", event_type="a", payload={})
+            await first.append_event(agent_run_id="run-persist", event_type="b", payload={})
 
             second = AgentRunEventOutbox(database_path=db_path)
-            second.append_event(agent_run_id="run-persist", event_type="c", payload={})
+            await second.append_event(agent_run_id="run-persist", event_type="c", payload={})
 
-            replayed = second.replay(agent_run_id="run-persist", last_seq=1)
+            replayed = await second.replay(agent_run_id="run-persist", last_seq=1)
             self.assertEqual([event.seq for event in replayed], [2, 3])
 
-    def test_append_assigns_monotonic_sequence(self) -> None:
+    async def test_interleaved_writers_allocate_distinct_sequences(self) -> None:
+        with tempfile.TemporaryDirectory() as tmp_dir:
+            db_path = os.path.join(tmp_dir, "outbox.sqlite3")
+            first = AgentRunEventOutbox(database_path=db_path)
+            second = AgentRunEventOutbox(database_path=db_path)
+            self.addCleanup(first.close)
+            self.addCleanup(second.close)
+
+            seqs = []
+            for index in range(6):
+                writer = first if index % 2 == 0 else second
+                event = await writer.append_event(
+                    agent_run_id="run-shared",
+                    event_type="tick",
+                    payload={"index": index},
+                )
+                seqs.append(event.seq)
+
+            self.assertEqual(seqs, [1, 2, 3, 4, 5, 6])
+            replayed = await first.replay(agent_run_id="run-shared")
+            self.assertEqual([event.payload["index"] for event in replayed], list(range(6)))
+
+    async def test_sequence_counters_are_backfilled_from_existing_events(self) -> None:
+        with tempfile.TemporaryDirectory() as tmp_dir:
+            db_path = os.path.join(tmp_dir, "legacy.sqlite3")
+            legacy = sqlite3.connect(db_path)
+            legacy.executescript(
+                """
+                create table run_event_record (
+                  agent_run_id text not null,
+                  seq integer not null,
+                  event_type text not null,
+                  payload_json text not null,
+                  created_at text not null,
+                  primary key (agent_run_id, seq)
+                );
+                insert into run_event_record values ('run-old', 1, 'a', '{}', 't1');
+                insert into run_event_record values ('run-old', 2, 'b', '{}', 't2');
+                """
+            )
+            legacy.close()
+
+            connection = connect_state_db(db_path)
+            self.addCleanup(connection.close)
+            outbox = AgentRunEventOutbox(connection=connection)
+            event = await outbox.append_event(agent_run_id="run-old", event_type="c", payload={})
+
+            self.assertEqual(event.seq, 3)
+
+    async def test_failed_append_does_not_consume_a_sequence(self) -> None:
+        connection = connect_state_db(":memory:")
+        self.addCleanup(connection.close)
+        outbox = AgentRunEventOutbox(connection=connection)
+        await outbox.append_event(agent_run_id="run-fail", event_type="a", payload={})
+
+        with self.assertRaises(TypeError):
+            await outbox.append_event(
+                agent_run_id="run-fail",
+                event_type="b",
+                payload={"bad": object()},
+            )
+        event = await outbox.append_event(agent_run_id="run-fail", event_type="c", payload={})
+
+        self.assertEqual(event.seq, 2)
+
+    async def test_append_events_allocates_a_contiguous_range_in_one_commit(self) -> None:
+        connection = connect_state_db(":memory:")
+        self.addCleanup(connection.close)
+        outbox = AgentRunEventOutbox(connection=connection)
+        await outbox.append_event(agent_run_id="run-batch", event_type="a", payload={})
+
+        statements: list[str] = []
+        connection.set_trace_callback(statements.append)
+        appended = await outbox.append_events(
+            agent_run_id="run-batch",
+            events=[
+                PendingRunEvent(event_type="b", payload={"n": 1}),
+                PendingRunEvent(event_type="c", payload={"n": 2}),
+                PendingRunEvent(event_type="d", payload={"n": 3}),
+            ],
+        )
+        connection.set_trace_callback(None)
+
+        self.assertEqual([event.seq for event in appended], [2, 3, 4])
+        self.assertEqual(sum(statement == "COMMIT" for statement in statements), 1)
+        drained = await outbox.drain_outbox()
+        self.assertEqual([event.event_type for event in drained], ["a", "b", "c", "d"])
+        self.assertEqual(await outbox.append_events(agent_run_id="run-batch", events=[]), [])
+
+    async def test_in_memory_append_events_continues_the_run_sequence(self) -> None:
         outbox = AgentRunEventOutbox()
+        await outbox.append_event(agent_run_id="run-mem", event_type="a", payload={})
+
+        appended = await outbox.append_events(
+            agent_run_id="run-mem",
+            events=[
+                PendingRunEvent(event_type="b", payload={}),
+                PendingRunEvent(event_type="c", payload={}),
+            ],
+        )
 
-        event_a = outbox.append_event(
+        self.assertEqual([event.seq for event in appended], [2, 3])
+        self.assertEqual(len(await outbox.drain_outbox()), 3)
+
+    async def test_append_assigns_monotonic_sequence(self) -> None:
+        outbox = AgentRunEventOutbox()
+
+        event_a = await outbox.append_event(
             agent_run_id="run-1",
             event_type="task.started",
             payload={"task": "A"},
         )
-        event_b = outbox.append_event(
+        event_b = await outbox.append_event(
             agent_run_id="run-1",
             event_type="task.completed",
             payload={"task": "A"},
@@ -36,28 +142,126 @@ class AgentRunEventOutboxTest(unittest.TestCase):
         self.assertEqual(event_a.seq, 1)
         self.assertEqual(event_b.seq, 2)
 
-    def test_replay_resumes_from_last_sequence(self) -> None:
+    async def test_replay_resumes_from_last_sequence(self) -> None:
         outbox = AgentRunEventOutbox()
 
-        outbox.append_event(agent_run_id="run-2", event_type="a", payload={})
-        outbox.append_event(agent_run_id="run-2", event_type="b", payload={})
-        outbox.append_event(agent_run_id="run-2", event_type="c", payload={})
+        await outbox.append_event(agent_run_id="run-2", event_type="a", payload={})
+        await outbox.append_event(agent_run_id="run-2", event_type="b", payload={})
+        await outbox.append_event(agent_run_id="run-2", event_type="c", payload={})
 
-        replayed = outbox.replay(agent_run_id="run-2", last_seq=1)
+        replayed = await outbox.replay(agent_run_id="run-2", last_seq=1)
 
         self.assertEqual([event.seq for event in replayed], [2, 3])
 
-    def test_drain_outbox_respects_max_items(self) -> None:
+    async def test_drain_outbox_respects_max_items(self) -> None:
         outbox = AgentRunEventOutbox()
-        outbox.append_event(agent_run_id="run-3", event_type="a", payload={})
-        outbox.append_event(agent_run_id="run-3", event_type="b", payload={})
+        await outbox.append_event(agent_run_id="run-3", event_type="a", payload={})
+        await outbox.append_event(agent_run_id="run-3", event_type="b", payload={})
 
-        drained_once = outbox.drain_outbox(max_items=1)
-        drained_twice = outbox.drain_outbox(max_items=10)
+        drained_once = await outbox.drain_outbox(max_items=1)
+        drained_twice = await outbox.drain_outbox(max_items=10)
 
         self.assertEqual(len(drained_once), 1)
         self.assertEqual(len(drained_twice), 1)
 
+    async def test_claims_are_exclusive_until_the_lease_expires(self) -> None:
+        connection = connect_state_db(":memory:")
+        self.addCleanup(connection.close)
+        outbox = AgentRunEventOutbox(connection=connection)
+        await outbox.append_events(
+            agent_run_id="run-claim",
+            events=[PendingRunEvent(event_type=str(index), payload={}) for index in range(3)],
+        )
+
+        first = await outbox.claim_events(worker_id="worker-a", max_items=2)
+        second = await outbox.claim_events(worker_id="worker-b", max_items=10)
+        self.assertEqual([event.seq for event in first], [1, 2])
+        self.assertEqual([event.seq for event in second], [3])
+
+        self.assertEqual(await outbox.acknowledge_events(worker_id="worker-b", events=first), 0)
+        self.assertEqual(await outbox.acknowledge_events(worker_id="worker-a", events=first), 2)
+
+        expired = await outbox.claim_events(worker_id="worker-c", lease_seconds=-1.0)
+        self.assertEqual(expired, [])
+        connection.execute("update run_event_outbox_record set lease_until = 0 where seq = 3")
+        connection.commit()
+        reclaimed = await outbox.claim_events(worker_id="worker-c")
+        self.assertEqual([event.seq for event in reclaimed], [3])
+        self.assertEqual(await outbox.acknowledge_events(worker_id="worker-b", events=second), 0)
+        self.assertEqual(await outbox.drain_outbox(), [])
+
+    async def test_in_memory_claims_expire_and_acknowledge(self) -> None:
+        outbox = AgentRunEventOutbox()
+        await outbox.append_event(agent_run_id="run-mem", event_type="a", payload={})
+
+        claimed = await outbox.claim_events(worker_id="worker-a", lease_seconds=-1.0)
+        reclaimed = await outbox.claim_events(worker_id="worker-b")
+
+        self.assertEqual(reclaimed, claimed)
+        self.assertEqual(await outbox.acknowledge_events(worker_id="worker-a", events=claimed), 0)
+        self.assertEqual(await outbox.acknowledge_events(worker_id="worker-b", events=claimed), 1)
+        self.assertEqual(await outbox.claim_events(worker_id="worker-a"), [])
+
+    async def test_unpublished_drain_uses_the_partial_index(self) -> None:
+        connection = connect_state_db(":memory:")
+        self.addCleanup(connection.close)
+
+        plan = connection.execute(
+            """
+            explain query plan
+            select rowid from run_event_outbox_record
+            where published = 0 and (lease_until is null or lease_until <= 0)
+            order by created_at asc, agent_run_id asc, seq asc
+            limit 10
+            """
+        ).fetchall()
+
+        self.assertIn("idx_run_event_outbox_unpublished", " ".join(str(row[3]) for row in plan))
+
+    async def test_legacy_outbox_rows_gain_claim_columns(self) -> None:
+        with tempfile.TemporaryDirectory() as tmp_dir:
+            db_path = os.path.join(tmp_dir, "legacy-outbox.sqlite3")
+            legacy = sqlite3.connect(db_path)
+            legacy.executescript(
+                """
+                create table run_event_record (
+                  agent_run_id text not null,
+                  seq integer not null,
+                  event_type text not null,
+                  payload_json text not null,
+                  created_at text not null,
+                  primary key (agent_run_id, seq)
+                );
+                create table run_event_outbox_record (
+                  agent_run_id text not null,
+                  seq integer not null,
+                  published integer not null default 0,
+                  primary key (agent_run_id, seq)
+                );
+                insert into run_event_record values ('run-old', 1, 'a', '{}', 't1');
+                insert into run_event_outbox_record values ('run-old', 1, 0);
+                """
+            )
+            legacy.close()
+
+            connection = connect_state_db(db_path)
+            self.addCleanup(connection.close)
+            outbox = AgentRunEventOutbox(connection=connection)
+            claimed = await outbox.claim_events(worker_id="worker-a")
+
+            self.assertEqual([(event.seq, event.created_at) for event in claimed], [(1, "t1")])
+
+    async def test_release_claims_returns_events_in_order(self) -> None:
+        outbox = AgentRunEventOutbox()
+        for event_type in ("a", "b", "c"):
+            await outbox.append_event(agent_run_id="run-release", event_type=event_type, payload={})
+
+        await outbox.claim_events(worker_id="worker-a", max_items=2)
+
+        self.assertEqual(await outbox.release_claims(worker_id="worker-a"), 2)
+        drained = await outbox.drain_outbox()
+        self.assertEqual([event.seq for event in drained], [1, 2, 3])
+
 
 if __name__ == "__main__":
     unittest.main()
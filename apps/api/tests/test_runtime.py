@@ -49,7 +49,7 @@ class AgentRuntimeTest(unittest.IsolatedAsyncioTestCase):
         )
         actor = ActorContext(user_id="owner-1", role="owner")
 
-        runtime.upsert_specialist(
+        await runtime.upsert_specialist(
             workspace_id="ws-1",
             actor=actor,
             specialist=SpecialistAgent(
@@ -70,7 +70,7 @@ class AgentRuntimeTest(unittest.IsolatedAsyncioTestCase):
         self.assertEqual(len(result.delegated_results), 1)
         self.assertIn("delegated", result.summary.lower())
 
-        replay = runtime.replay_events(
+        replay = await runtime.replay_events(
             agent_run_id=result.agent_run_id,
             actor=actor,
             last_seq=0,
@@ -96,6 +96,35 @@ class AgentRuntimeTest(unittest.IsolatedAsyncioTestCase):
                 goal="No specialists available",
             )
 
+    async def test_event_stream_sends_backlog_then_live_events(self) -> None:
+        runtime = AgentRuntime(
+            memory_store=SqliteMemoryStore(),
+            policy_engine=PolicyEngine(),
+            outbox=AgentRunEventOutbox(),
+            completion_client=StubCompletionClient(),
+            approval_service=ApprovalService(),
+            audit_log=ImmutableAuditLog(),
+        )
+        actor = ActorContext(user_id="owner-1", role="owner")
+        reply = await runtime.companion_message(
+            workspace_id="ws-1", actor_id="owner-1", message="one"
+        )
+
+        with self.assertRaises(PermissionError):
+            await runtime.open_event_stream(
+                agent_run_id=reply.agent_run_id,
+                actor=ActorContext(user_id="intruder", role="owner"),
+            )
+
+        stream = await runtime.open_event_stream(agent_run_id=reply.agent_run_id, actor=actor)
+        self.addCleanup(stream.close)
+        backlog = await stream.next_events(timeout=1.0)
+        await runtime.companion_message(workspace_id="ws-1", actor_id="owner-1", message="two")
+        live = await stream.next_events(timeout=1.0)
+
+        self.assertEqual([event.seq for event in backlog or []], [1])
+        self.assertEqual([event.seq for event in live or []], [2])
+
 
 if __name__ == "__main__":
     unittest.main()
@@ -60,6 +60,32 @@ class SqlCipherConnectionTest(unittest.TestCase):
         )
         self.assertIn(("PRAGMA key = ?;", ("secret",)), connection.commands)
 
+    def test_durability_profile_is_applied_after_key_and_validation(self) -> None:
+        connection = FakeConnection(cipher_version="4.5.0")
+
+        connect_sqlcipher(lambda _: connection, "memory.db", "secret", durability="strict")
+
+        queries = [query for query, _params in connection.commands]
+        self.assertEqual(queries[0], "PRAGMA key = ?;")
+        self.assertLess(
+            queries.index("PRAGMA cipher_version;"),
+            queries.index("PRAGMA journal_mode = WAL;"),
+        )
+        self.assertIn("PRAGMA synchronous = FULL;", queries)
+
+    def test_secure_mode_validation_connection_skips_the_durability_profile(self) -> None:
+        connection = FakeConnection(cipher_version="4.5.0")
+        enforce_sqlite_security_if_enabled(
+            secure_mode_env="1",
+            db_key_env="secret",
+            database_url_env="memory.db",
+            connect_fn=lambda _: connection,
+        )
+
+        queries = [query for query, _params in connection.commands]
+        self.assertNotIn("PRAGMA journal_mode = WAL;", queries)
+        self.assertFalse(any(query.startswith("PRAGMA synchronous") for query in queries))
+
 
 if __name__ == "__main__":
     unittest.main()
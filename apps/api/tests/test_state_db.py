@@ -0,0 +1,192 @@
+import asyncio
+import os
+import sqlite3
+import tempfile
+import threading
+import unittest
+from concurrent.futures import ThreadPoolExecutor
+from unittest.mock import patch
+
+from apps.api.db.pool import StateConnectionPool, run_state_operation
+from apps.api.db.sqlite import resolve_durability_profile
+from apps.api.db.state import connect_state_db
+from apps.api.events.outbox import AgentRunEventOutbox
+
+
+class StateDatabaseDurabilityTest(unittest.TestCase):
+    def test_balanced_profile_is_the_default_and_enables_wal(self) -> None:
+        with tempfile.TemporaryDirectory() as tmp_dir, patch.dict(os.environ, {}, clear=False):
+            os.environ.pop("ELARA_SQLITE_DURABILITY", None)
+            connection = connect_state_db(os.path.join(tmp_dir, "state.sqlite3"))
+            try:
+                journal_mode = connection.execute("pragma journal_mode").fetchone()
+                synchronous = connection.execute("pragma synchronous").fetchone()
+                temp_store = connection.execute("pragma temp_store").fetchone()
+            finally:
+                connection.close()
+
+        self.assertEqual(journal_mode, ("wal",))
+        self.assertEqual(synchronous, (1,))
+        self.assertEqual(temp_store, (2,))
+
+    def test_profile_can_be_selected_per_connection_or_from_the_environment(self) -> None:
+        with tempfile.TemporaryDirectory() as tmp_dir:
+            strict = connect_state_db(os.path.join(tmp_dir, "strict.sqlite3"), durability="strict")
+            with patch.dict(os.environ, {"ELARA_SQLITE_DURABILITY": "fast"}):
+                fast = connect_state_db(os.path.join(tmp_dir, "fast.sqlite3"))
+            try:
+                self.assertEqual(strict.execute("pragma synchronous").fetchone(), (2,))
+                self.assertEqual(fast.execute("pragma synchronous").fetchone(), (0,))
+            finally:
+                strict.close()
+                fast.close()
+
+    def test_unknown_profile_is_rejected(self) -> None:
+        with self.assertRaises(ValueError):
+            resolve_durability_profile("reckless")
+
+
+class StateConnectionPoolTest(unittest.TestCase):
+    def test_readers_see_committed_writes_and_reject_writes(self) -> None:
+        with tempfile.TemporaryDirectory() as tmp_dir:
+            pool = StateConnectionPool(database_path=os.path.join(tmp_dir, "pool.sqlite3"))
+            self.addCleanup(pool.close)
+            with pool.writer() as connection:
+                connection.execute(
+                    "insert into run_access_record values (?, ?, ?)",
+                    ("run-1", "ws-1", "actor-1"),
+                )
+                connection.commit()
+
+            with pool.reader() as reader:
+                rows = reader.execute("select actor_id from run_access_record").fetchall()
+                with self.assertRaises(sqlite3.OperationalError):
+                    reader.execute("delete from run_access_record")
+
+        self.assertEqual(rows, [("actor-1",)])
+
+    def test_reader_count_is_bounded_under_concurrent_borrowing(self) -> None:
+        with tempfile.TemporaryDirectory() as tmp_dir:
+            pool = StateConnectionPool(
+                database_path=os.path.join(tmp_dir, "bounded.sqlite3"),
+                readers=2,
+            )
+            self.addCleanup(pool.close)
+
+            def count_rows(_: int) -> int:
+                with pool.reader() as connection:
+                    row = connection.execute("select count(*) from run_event_record").fetchone()
+                    return int(row[0])
+
+            with ThreadPoolExecutor(max_workers=8) as executor:
+                counts = list(executor.map(count_rows, range(32)))
+
+            self.assertEqual(counts, [0] * 32)
+            self.assertLessEqual(pool.reader_count, 2)
+
+    def test_snapshot_reads_ignore_writes_committed_between_statements(self) -> None:
+        with tempfile.TemporaryDirectory() as tmp_dir:
+            pool = StateConnectionPool(database_path=os.path.join(tmp_dir, "snapshot.sqlite3"))
+            self.addCleanup(pool.close)
+            count = "select count(*) from run_access_record"
+
+            with pool.snapshot() as reader:
+                before = reader.execute(count).fetchone()
+                with pool.writer() as connection:
+                    connection.execute(
+                        "insert into run_access_record values (?, ?, ?)",
+                        ("run-1", "ws-1", "actor-1"),
+                    )
+                    connection.commit()
+                during = reader.execute(count).fetchone()
+
+            self.assertFalse(reader.in_transaction)
+            with pool.reader() as connection:
+                after = connection.execute(count).fetchone()
+
+        self.assertEqual((before, during, after), ((0,), (0,), (1,)))
+
+    def test_snapshot_on_the_writer_leaves_an_open_transaction_to_its_owner(self) -> None:
+        connection = connect_state_db(":memory:")
+        self.addCleanup(connection.close)
+        pool = StateConnectionPool(connection=connection)
+        connection.execute(
+            "insert into run_access_record values (?, ?, ?)", ("run-1", "ws-1", "actor-1")
+        )
+
+        with pool.snapshot() as reader:
+            rows = reader.execute("select actor_id from run_access_record").fetchall()
+
+        self.assertEqual(rows, [("actor-1",)])
+        self.assertTrue(connection.in_transaction)
+        connection.rollback()
+        with pool.snapshot():
+            pass
+        self.assertFalse(connection.in_transaction)
+
+    def test_in_memory_and_wrapped_connections_route_reads_through_the_writer(self) -> None:
+        connection = connect_state_db(":memory:")
+        self.addCleanup(connection.close)
+        wrapped = StateConnectionPool(connection=connection)
+        in_memory = StateConnectionPool(database_path=":memory:")
+        self.addCleanup(in_memory.close)
+
+        with wrapped.reader() as reader:
+            self.assertIs(reader, connection)
+        with in_memory.writer() as writer, in_memory.reader() as reader:
+            self.assertIs(reader, writer)
+        wrapped.close()
+        self.assertEqual(connection.execute("select 1").fetchone(), (1,))
+
+
+class StateConnectionPoolAsyncTest(unittest.IsolatedAsyncioTestCase):
+    async def test_run_executes_blocking_work_on_the_pool_threads(self) -> None:
+        pool = StateConnectionPool(database_path=":memory:")
+        self.addCleanup(pool.close)
+
+        thread_name = await pool.run(lambda: threading.current_thread().name)
+
+        self.assertTrue(thread_name.startswith("state-db"))
+
+    async def test_services_share_a_pool_across_concurrent_requests(self) -> None:
+        with tempfile.TemporaryDirectory() as tmp_dir:
+            pool = StateConnectionPool(database_path=os.path.join(tmp_dir, "shared.sqlite3"))
+            self.addCleanup(pool.close)
+            outbox = AgentRunEventOutbox(pool=pool)
+
+            events = await asyncio.gather(
+                *(
+                    outbox.append_event(
+                        agent_run_id="run-pool",
+                        event_type="task.completed",
+                        payload={"index": index},
+                    )
+                    for index in range(20)
+                )
+            )
+
+            replayed = await outbox.replay(agent_run_id="run-pool")
+            seqs = sorted(event.seq for event in events)
+            self.assertEqual(seqs, list(range(1, 21)))
+            self.assertEqual([event.seq for event in replayed], seqs)
+
+    async def test_service_finalized_on_a_pool_thread_closes_its_pool(self) -> None:
+        with tempfile.TemporaryDirectory() as tmp_dir:
+            outbox = AgentRunEventOutbox(database_path=os.path.join(tmp_dir, "owned.sqlite3"))
+            pool = outbox.pool
+            assert pool is not None
+            references = [outbox]
+            del outbox
+
+            with patch("sys.unraisablehook") as unraisable:
+                # The outbox's last reference goes away on the pool's own worker thread.
+                await run_state_operation(pool, references.clear)
+
+            unraisable.assert_not_called()
+            with self.assertRaisesRegex(RuntimeError, "closed"):
+                with pool.writer():
+                    pass
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,77 @@
+import unittest
+
+import numpy as np
+
+from apps.api.memory.vector_index import (
+    IvfIndex,
+    rank_by_similarity,
+    to_matrix,
+    train_ivf,
+)
+
+
+class VectorIndexTest(unittest.TestCase):
+    def test_rank_by_similarity_supports_dot_and_cosine_metrics(self) -> None:
+        matrix = to_matrix([[1.0, 0.0], [3.0, 3.0], [0.0, 1.0]], dim=2)
+
+        cosine = rank_by_similarity(
+            memory_ids=["a", "b", "c"],
+            matrix=matrix,
+            query=[1.0, 0.0],
+            top_k=2,
+        )
+        dot = rank_by_similarity(
+            memory_ids=["a", "b", "c"],
+            matrix=matrix,
+            query=[1.0, 0.0],
+            top_k=2,
+            metric="dot",
+        )
+
+        self.assertEqual([memory_id for memory_id, _score in cosine], ["a", "b"])
+        self.assertEqual([memory_id for memory_id, _score in dot], ["b", "a"])
+        self.assertEqual(rank_by_similarity(memory_ids=[], matrix=matrix, query=[1.0], top_k=3), [])
+
+    def test_rank_by_similarity_breaks_ties_at_the_cutoff_by_memory_id(self) -> None:
+        memory_ids = [f"m-{index:03d}" for index in range(200)]
+        rows = [[1.0, 0.0] for _ in memory_ids]
+        rows[150] = [2.0, 0.0]
+        order = np.random.default_rng(7).permutation(len(memory_ids))
+
+        ranked = rank_by_similarity(
+            memory_ids=[memory_ids[index] for index in order],
+            matrix=to_matrix([rows[index] for index in order], dim=2),
+            query=[1.0, 0.0],
+            top_k=3,
+            metric="dot",
+        )
+
+        self.assertEqual(ranked, [("m-150", 2.0), ("m-000", 1.0), ("m-001", 1.0)])
+
+    def test_to_matrix_rejects_ragged_dimensions(self) -> None:
+        with self.assertRaises(ValueError):
+            to_matrix([[1.0, 2.0], [1.0, 2.0]], dim=3)
+        self.assertEqual(to_matrix([], dim=4).shape, (0, 4))
+
+    def test_ivf_index_separates_clusters_and_round_trips_through_bytes(self) -> None:
+        matrix = to_matrix(
+            [[1.0, 0.0, 0.0]] * 5 + [[0.0, 1.0, 0.0]] * 5 + [[0.0, 0.0, 1.0]] * 5,
+            dim=3,
+        )
+
+        index = train_ivf(matrix, list_count=3)
+        assignments = index.assign(matrix)
+        restored = IvfIndex.from_bytes(index.to_bytes(), list_count=3, dim=3)
+
+        self.assertEqual(len(set(assignments[:5].tolist())), 1)
+        self.assertEqual(len(set(assignments.tolist())), 3)
+        self.assertTrue(np.array_equal(restored.centroids, index.centroids))
+        self.assertEqual(restored.probe([0.0, 0.9, 0.1], probe_lists=1), [int(assignments[5])])
+
+    def test_train_ivf_requires_vectors(self) -> None:
+        with self.assertRaises(ValueError):
+            train_ivf(to_matrix([], dim=2))
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -5,12 +5,12 @@ import unittest
 from apps.api.safety import ApprovalService
 
 
-class ApprovalsUnitTest(unittest.TestCase):
-    def test_approvals_persist_across_service_instances_when_db_path_is_used(self) -> None:
+class ApprovalsUnitTest(unittest.IsolatedAsyncioTestCase):
+    async def test_approvals_persist_across_service_instances_when_db_path_is_used(self) -> None:
         with tempfile.TemporaryDirectory() as tmp_dir:
             db_path = os.path.join(tmp_dir, "approvals.sqlite3")
             first = ApprovalService(database_path=db_path)
-            request = first.create_request(
+            request = await first.create_request(
                 workspace_id="ws-approval-persist",
                 actor_id="owner-1",
                 capability="run_tool",
@@ -19,14 +19,14 @@ class ApprovalsUnitTest(unittest.TestCase):
             )
 
             second = ApprovalService(database_path=db_path)
-            persisted = second.get_request(approval_id=request.id)
+            persisted = await second.get_request(approval_id=request.id)
             self.assertIsNotNone(persisted)
             if persisted is not None:
                 self.assertEqual(persisted.workspace_id, "ws-approval-persist")
 
-    def test_create_and_decide_approval(self) -> None:
+    async def test_create_and_decide_approval(self) -> None:
         approvals = ApprovalService()
-        request = approvals.create_request(
+        request = await approvals.create_request(
             workspace_id="ws-approval",
             actor_id="owner-1",
             capability="external_action",
@@ -34,7 +34,7 @@ class ApprovalsUnitTest(unittest.TestCase):
             reason="need confirmation",
         )
 
-        decided = approvals.decide_request(
+        decided = await approvals.decide_request(
             approval_id=request.id,
             approver_id="owner-1",
             decision="approved",
@@ -42,7 +42,7 @@ class ApprovalsUnitTest(unittest.TestCase):
 
         self.assertEqual(decided.status, "approved")
         self.assertTrue(
-            approvals.is_approved(
+            await approvals.is_approved(
                 approval_id=request.id,
                 workspace_id="ws-approval",
                 actor_id="owner-1",
@@ -51,9 +51,9 @@ class ApprovalsUnitTest(unittest.TestCase):
             )
         )
 
-    def test_deciding_request_with_different_approver_fails(self) -> None:
+    async def test_deciding_request_with_different_approver_fails(self) -> None:
         approvals = ApprovalService()
-        request = approvals.create_request(
+        request = await approvals.create_request(
             workspace_id="ws-approval",
             actor_id="owner-a",
             capability="run_tool",
@@ -62,17 +62,17 @@ class ApprovalsUnitTest(unittest.TestCase):
         )
 
         with self.assertRaises(PermissionError):
-            approvals.decide_request(
+            await approvals.decide_request(
                 approval_id=request.id,
                 approver_id="owner-b",
                 decision="approved",
             )
 
-    def test_deciding_missing_request_fails(self) -> None:
+    async def test_deciding_missing_request_fails(self) -> None:
         approvals = ApprovalService()
 
         with self.assertRaises(ValueError):
-            approvals.decide_request(
+            await approvals.decide_request(
                 approval_id="missing",
                 approver_id="owner-1",
                 decision="approved",
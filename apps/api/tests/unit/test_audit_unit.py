@@ -1,17 +1,34 @@
 import os
+import sqlite3
 import tempfile
 import unittest
 from dataclasses import replace
+from unittest import mock
 
-from apps.api.audit import ImmutableAuditLog
+from apps.api.audit import ImmutableAuditLog, PendingAuditEvent
+from apps.api.db.state import connect_state_db
 
 
-class AuditLogUnitTest(unittest.TestCase):
-    def test_audit_events_persist_across_log_instances_when_db_path_is_used(self) -> None:
+async def _append_actions(audit_log: ImmutableAuditLog, workspace_id: str, count: int) -> None:
+    await audit_log.append_events(
+        events=[
+            PendingAuditEvent(
+                workspace_id=workspace_id,
+                actor_id="owner-1",
+                action=f"action.{index}",
+                outcome="success",
+            )
+            for index in range(count)
+        ]
+    )
+
+
+class AuditLogUnitTest(unittest.IsolatedAsyncioTestCase):
+    async def test_audit_events_persist_across_log_instances_when_db_path_is_used(self) -> None:
         with tempfile.TemporaryDirectory() as tmp_dir:
             db_path = os.path.join(tmp_dir, "audit.sqlite3")
             first_log = ImmutableAuditLog(database_path=db_path)
-            first_log.append_event(
+            await first_log.append_event(
                 workspace_id="ws-audit-persist",
                 actor_id="owner-1",
                 action="audit.persisted",
@@ -20,20 +37,53 @@ class AuditLogUnitTest(unittest.TestCase):
             )
 
             second_log = ImmutableAuditLog(database_path=db_path)
-            events = second_log.list_events(workspace_id="ws-audit-persist")
+            events = await second_log.list_events(workspace_id="ws-audit-persist")
             self.assertEqual(len(events), 1)
             self.assertEqual(events[0].action, "audit.persisted")
 
-    def test_append_and_verify_chain(self) -> None:
+    async def test_append_events_chains_a_batch_in_order(self) -> None:
+        with tempfile.TemporaryDirectory() as tmp_dir:
+            audit_log = ImmutableAuditLog(database_path=os.path.join(tmp_dir, "audit.sqlite3"))
+            self.addCleanup(audit_log.close)
+            await audit_log.append_event(
+                workspace_id="ws-batch",
+                actor_id="owner-1",
+                action="first",
+                outcome="success",
+            )
+
+            appended = await audit_log.append_events(
+                events=[
+                    PendingAuditEvent(
+                        workspace_id="ws-batch",
+                        actor_id="owner-1",
+                        action=f"batch.{index}",
+                        outcome="success",
+                    )
+                    for index in range(5)
+                ]
+            )
+
+            created = [event.created_at for event in appended]
+            self.assertEqual(created, sorted(set(created)))
+            self.assertEqual(appended[1].previous_hash, appended[0].event_hash)
+            events = await audit_log.list_events(workspace_id="ws-batch")
+            self.assertEqual(
+                [event.action for event in events],
+                ["first", *(f"batch.{index}" for index in range(5))],
+            )
+            self.assertTrue(await audit_log.verify_chain(workspace_id="ws-batch"))
+
+    async def test_append_and_verify_chain(self) -> None:
         audit_log = ImmutableAuditLog()
-        audit_log.append_event(
+        await audit_log.append_event(
             workspace_id="ws-audit",
             actor_id="owner-1",
             action="test.action",
             outcome="success",
             metadata={"k": "v"},
         )
-        audit_log.append_event(
+        await audit_log.append_event(
             workspace_id="ws-audit",
             actor_id="owner-1",
             action="test.action.2",
@@ -41,11 +91,11 @@ class AuditLogUnitTest(unittest.TestCase):
             metadata={},
         )
 
-        self.assertTrue(audit_log.verify_chain(workspace_id="ws-audit"))
+        self.assertTrue(await audit_log.verify_chain(workspace_id="ws-audit"))
 
-    def test_verify_chain_detects_tampering(self) -> None:
+    async def test_verify_chain_detects_tampering(self) -> None:
         audit_log = ImmutableAuditLog()
-        event = audit_log.append_event(
+        event = await audit_log.append_event(
             workspace_id="ws-audit",
             actor_id="owner-1",
             action="test.action",
@@ -56,7 +106,354 @@ class AuditLogUnitTest(unittest.TestCase):
         tampered = replace(event, outcome="tampered")
         audit_log._events_by_workspace["ws-audit"] = [tampered]
 
-        self.assertFalse(audit_log.verify_chain(workspace_id="ws-audit"))
+        self.assertFalse(await audit_log.verify_chain(workspace_id="ws-audit"))
+
+    async def test_verify_chain_resumes_from_the_signed_checkpoint(self) -> None:
+        with tempfile.TemporaryDirectory() as tmp_dir:
+            db_path = os.path.join(tmp_dir, "audit.sqlite3")
+            first_log = ImmutableAuditLog(database_path=db_path, checkpoint_key="k1")
+            self.addCleanup(first_log.close)
+            await _append_actions(first_log, "ws-checkpoint", 4)
+
+            initial = await first_log.verify_chain(workspace_id="ws-checkpoint")
+            await _append_actions(first_log, "ws-checkpoint", 2)
+            second_log = ImmutableAuditLog(database_path=db_path, checkpoint_key="k1")
+            self.addCleanup(second_log.close)
+            resumed = await second_log.verify_chain(workspace_id="ws-checkpoint")
+            other_key_log = ImmutableAuditLog(database_path=db_path, checkpoint_key="k2")
+            self.addCleanup(other_key_log.close)
+            untrusted = await other_key_log.verify_chain(workspace_id="ws-checkpoint")
+
+            self.assertEqual(
+                (initial.valid, initial.checked_count, initial.resumed_from), (True, 4, None)
+            )
+            self.assertEqual(resumed.resumed_from, initial.last_event_id)
+            self.assertEqual((resumed.checked_count, resumed.verified_count), (2, 6))
+            self.assertTrue(resumed)
+            self.assertEqual((untrusted.resumed_from, untrusted.checked_count), (None, 6))
+
+    async def test_checkpoint_key_from_environment_survives_a_restart(self) -> None:
+        with tempfile.TemporaryDirectory() as tmp_dir:
+            db_path = os.path.join(tmp_dir, "audit.sqlite3")
+            with mock.patch.dict("os.environ", {"ELARA_AUDIT_CHECKPOINT_KEY": "env-key"}):
+                before_restart = ImmutableAuditLog(database_path=db_path)
+                await _append_actions(before_restart, "ws-restart", 3)
+                initial = await before_restart.verify_chain(workspace_id="ws-restart")
+                before_restart.close()
+
+                after_restart = ImmutableAuditLog(database_path=db_path)
+                self.addCleanup(after_restart.close)
+                resumed = await after_restart.verify_chain(workspace_id="ws-restart")
+
+            self.assertEqual(resumed.resumed_from, initial.last_event_id)
+            self.assertEqual((resumed.checked_count, resumed.verified_count), (0, 3))
+
+    async def test_missing_checkpoint_key_disables_stored_checkpoints_loudly(self) -> None:
+        with tempfile.TemporaryDirectory() as tmp_dir:
+            db_path = os.path.join(tmp_dir, "audit.sqlite3")
+            with mock.patch.dict("os.environ", clear=True):
+                with self.assertLogs("apps.api.audit.logging", level="WARNING") as logs:
+                    before_restart = ImmutableAuditLog(database_path=db_path)
+                await _append_actions(before_restart, "ws-restart", 3)
+                initial = await before_restart.verify_chain(workspace_id="ws-restart")
+                before_restart.close()
+
+                after_restart = ImmutableAuditLog(database_path=db_path)
+                self.addCleanup(after_restart.close)
+                rerun = await after_restart.verify_chain(workspace_id="ws-restart")
+                connection = connect_state_db(db_path)
+                self.addCleanup(connection.close)
+                with self.assertRaises(RuntimeError):
+                    after_restart.write_checkpoint(connection, rerun)
+                stored = connection.execute(
+                    "select count(*) from audit_chain_checkpoint_record"
+                ).fetchone()
+
+            self.assertIn("ELARA_AUDIT_CHECKPOINT_KEY", logs.output[0])
+            self.assertFalse(after_restart.stores_checkpoints)
+            self.assertTrue(initial and rerun)
+            self.assertEqual((rerun.resumed_from, rerun.checked_count), (None, 3))
+            self.assertEqual(stored, (0,))
+
+    async def test_verify_chain_reports_the_first_broken_link(self) -> None:
+        connection = connect_state_db(":memory:")
+        self.addCleanup(connection.close)
+        audit_log = ImmutableAuditLog(connection=connection, checkpoint_key="k1")
+        await _append_actions(audit_log, "ws-broken", 3)
+        self.assertTrue(await audit_log.verify_chain(workspace_id="ws-broken"))
+        await _append_actions(audit_log, "ws-broken", 3)
+        events = await audit_log.list_events(workspace_id="ws-broken")
+        connection.execute(
+            "update audit_event_record set outcome = 'tampered' where id = ?",
+            (events[4].id,),
+        )
+        connection.commit()
+
+        result = await audit_log.verify_chain(workspace_id="ws-broken")
+
+        self.assertFalse(result)
+        self.assertEqual(result.broken_event_id, events[4].id)
+        self.assertEqual(result.broken_reason, "event_hash does not match the event contents")
+        self.assertEqual((result.verified_count, result.last_event_id), (4, events[3].id))
+        self.assertEqual(result.resumed_from, events[2].id)
+
+    async def test_forged_checkpoint_falls_back_to_full_verification(self) -> None:
+        connection = connect_state_db(":memory:")
+        self.addCleanup(connection.close)
+        audit_log = ImmutableAuditLog(connection=connection, checkpoint_key="k1")
+        await _append_actions(audit_log, "ws-forged", 3)
+        await audit_log.verify_chain(workspace_id="ws-forged")
+        events = await audit_log.list_events(workspace_id="ws-forged")
+        connection.execute(
+            "update audit_event_record set outcome = 'tampered' where id = ?", (events[0].id,)
+        )
+        connection.execute(
+            "update audit_chain_checkpoint_record set event_count = 99 where workspace_id = ?",
+            ("ws-forged",),
+        )
+        connection.commit()
+
+        incremental = await audit_log.verify_chain(workspace_id="ws-forged")
+        full = await audit_log.verify_chain(workspace_id="ws-forged", full=True)
+
+        self.assertIsNone(incremental.resumed_from)
+        self.assertEqual(incremental.broken_event_id, events[0].id)
+        self.assertEqual(full.broken_event_id, events[0].id)
+
+    async def test_in_memory_verify_chain_keeps_checkpoints(self) -> None:
+        audit_log = ImmutableAuditLog()
+        await _append_actions(audit_log, "ws-memory", 3)
+        await audit_log.verify_chain(workspace_id="ws-memory")
+        await _append_actions(audit_log, "ws-memory", 1)
+
+        result = await audit_log.verify_chain(workspace_id="ws-memory")
+
+        self.assertTrue(result)
+        self.assertEqual((result.checked_count, result.verified_count), (1, 4))
+
+    async def test_appends_reuse_the_cached_chain_head(self) -> None:
+        connection = connect_state_db(":memory:")
+        self.addCleanup(connection.close)
+        audit_log = ImmutableAuditLog(connection=connection)
+        await _append_actions(audit_log, "ws-head", 1)
+        statements: list[str] = []
+        connection.set_trace_callback(statements.append)
+
+        await _append_actions(audit_log, "ws-head", 2)
+        connection.set_trace_callback(None)
+
+        self.assertFalse([sql for sql in statements if sql.lstrip().lower().startswith("select")])
+        events = await audit_log.list_events(workspace_id="ws-head")
+        self.assertEqual([event.seq for event in events], [1, 2, 3])
+
+    async def test_rolled_back_write_leaves_the_chain_head_and_cache_untouched(self) -> None:
+        with tempfile.TemporaryDirectory() as tmp_dir:
+            audit_log = ImmutableAuditLog(database_path=os.path.join(tmp_dir, "audit.sqlite3"))
+            self.addCleanup(audit_log.close)
+            await _append_actions(audit_log, "ws-rollback", 1)
+            pool = audit_log.pool
+            assert pool is not None
+
+            with pool.writer() as connection:
+                audit_log.write_events(
+                    connection,
+                    events=[
+                        PendingAuditEvent(
+                            workspace_id="ws-rollback",
+                            actor_id="owner-1",
+                            action="discarded",
+                            outcome="success",
+                        )
+                    ],
+                )
+                connection.rollback()
+                head = connection.execute(
+                    "select last_seq from audit_chain_head_record where workspace_id = ?",
+                    ("ws-rollback",),
+                ).fetchone()
+            await _append_actions(audit_log, "ws-rollback", 1)
+
+            self.assertEqual(head, (1,))
+            events = await audit_log.list_events(workspace_id="ws-rollback")
+            self.assertEqual([event.seq for event in events], [1, 2])
+            self.assertTrue(await audit_log.verify_chain(workspace_id="ws-rollback", full=True))
+
+    async def test_interleaved_writers_recover_from_a_stale_chain_head(self) -> None:
+        with tempfile.TemporaryDirectory() as tmp_dir:
+            db_path = os.path.join(tmp_dir, "audit.sqlite3")
+            first_log = ImmutableAuditLog(database_path=db_path)
+            second_log = ImmutableAuditLog(database_path=db_path)
+            self.addCleanup(first_log.close)
+            self.addCleanup(second_log.close)
+
+            for index in range(6):
+                writer = first_log if index % 2 == 0 else second_log
+                await _append_actions(writer, "ws-shared", 1)
+
+            events = await first_log.list_events(workspace_id="ws-shared")
+            self.assertEqual([event.seq for event in events], [1, 2, 3, 4, 5, 6])
+            self.assertTrue(await second_log.verify_chain(workspace_id="ws-shared"))
+
+    async def test_legacy_audit_rows_are_numbered_in_chain_order(self) -> None:
+        with tempfile.TemporaryDirectory() as tmp_dir:
+            db_path = os.path.join(tmp_dir, "legacy-audit.sqlite3")
+            seed_log = ImmutableAuditLog()
+            await _append_actions(seed_log, "ws-legacy", 3)
+            seeded = seed_log._events_by_workspace["ws-legacy"]
+            legacy = sqlite3.connect(db_path)
+            legacy.execute(
+                """
+                create table audit_event_record (
+                  id text primary key,
+                  workspace_id text not null,
+                  actor_id text not null,
+                  action text not null,
+                  outcome text not null,
+                  metadata_json text not null,
+                  previous_hash text not null,
+                  event_hash text not null,
+                  created_at text not null
+                )
+                """
+            )
+            legacy.executemany(
+                "insert into audit_event_record values (?, ?, ?, ?, ?, '{}', ?, ?, ?)",
+                [
+                    (
+                        event.id,
+                        event.workspace_id,
+                        event.actor_id,
+                        event.action,
+                        event.outcome,
+                        event.previous_hash,
+                        event.event_hash,
+                        event.created_at,
+                    )
+                    for event in reversed(seeded)
+                ],
+            )
+            legacy.commit()
+            legacy.close()
+
+            audit_log = ImmutableAuditLog(database_path=db_path)
+            self.addCleanup(audit_log.close)
+            appended = await audit_log.append_event(
+                workspace_id="ws-legacy",
+                actor_id="owner-1",
+                action="after.upgrade",
+                outcome="success",
+            )
+
+            self.assertEqual(appended.seq, 4)
+            self.assertEqual(appended.previous_hash, seeded[-1].event_hash)
+            self.assertTrue(await audit_log.verify_chain(workspace_id="ws-legacy"))
+
+    async def test_list_event_page_walks_history_with_a_seq_cursor(self) -> None:
+        connection = connect_state_db(":memory:")
+        self.addCleanup(connection.close)
+        for audit_log in (ImmutableAuditLog(connection=connection), ImmutableAuditLog()):
+            with self.subTest(persistent=audit_log.pool is not None):
+                await _append_actions(audit_log, "ws-audit-page", 7)
+
+                seqs: list[list[int]] = []
+                cursor: int | None = None
+                while True:
+                    page = await audit_log.list_event_page(
+                        workspace_id="ws-audit-page", limit=3, before_seq=cursor
+                    )
+                    seqs.append([event.seq for event in page.events])
+                    cursor = page.next_cursor
+                    if cursor is None:
+                        break
+
+                self.assertEqual(seqs, [[5, 6, 7], [2, 3, 4], [1]])
+
+    async def test_list_event_page_filters_by_action_actor_outcome_and_time(self) -> None:
+        connection = connect_state_db(":memory:")
+        self.addCleanup(connection.close)
+        for audit_log in (ImmutableAuditLog(connection=connection), ImmutableAuditLog()):
+            with self.subTest(persistent=audit_log.pool is not None):
+                events = await audit_log.append_events(
+                    events=[
+                        PendingAuditEvent(
+                            workspace_id="ws-audit-filter",
+                            actor_id=f"owner-{index % 2}",
+                            action="memory.write" if index % 3 else "approval.decided",
+                            outcome="denied" if index == 4 else "success",
+                        )
+                        for index in range(8)
+                    ]
+                )
+
+                by_action = await audit_log.list_events(
+                    workspace_id="ws-audit-filter", action="approval.decided"
+                )
+                by_actor = await audit_log.list_event_page(
+                    workspace_id="ws-audit-filter", actor_id="owner-1", limit=2
+                )
+                denied = await audit_log.list_events(
+                    workspace_id="ws-audit-filter", outcome="denied"
+                )
+                windowed = await audit_log.list_events(
+                    workspace_id="ws-audit-filter",
+                    since=events[2].created_at,
+                    until=events[5].created_at,
+                )
+                after_last = await audit_log.list_events(
+                    workspace_id="ws-audit-filter", since=events[-1].created_at + "9"
+                )
+
+                self.assertEqual([event.seq for event in by_action], [1, 4, 7])
+                self.assertEqual([event.seq for event in by_actor.events], [6, 8])
+                self.assertEqual(by_actor.next_cursor, 6)
+                self.assertEqual([event.seq for event in denied], [5])
+                self.assertEqual([event.seq for event in windowed], [3, 4, 5])
+                self.assertEqual(after_last, [])
+
+    async def test_filtered_audit_pages_use_composite_indexes(self) -> None:
+        connection = connect_state_db(":memory:")
+        self.addCleanup(connection.close)
+        plans: list[str] = []
+        audit_log = ImmutableAuditLog(connection=connection)
+        await _append_actions(audit_log, "ws-audit-plan", 3)
+
+        def explain(statement: str) -> None:
+            if statement.lstrip().startswith("select") and "audit_event_record" in statement:
+                plans.append(statement)
+
+        connection.set_trace_callback(explain)
+        await audit_log.list_event_page(
+            workspace_id="ws-audit-plan", action="action.1", since="2000-01-01", before_seq=3
+        )
+        connection.set_trace_callback(None)
+
+        details = [
+            str(row[3])
+            for statement in plans
+            for row in connection.execute(f"explain query plan {statement}")
+        ]
+        self.assertTrue(any("idx_audit_event_workspace_action" in detail for detail in details))
+        self.assertTrue(any("idx_audit_event_workspace_created" in detail for detail in details))
+        self.assertFalse(any("TEMP B-TREE" in detail for detail in details))
+
+    async def test_verify_stored_chain_runs_on_a_read_only_connection(self) -> None:
+        with tempfile.TemporaryDirectory() as tmp_dir:
+            db_path = os.path.join(tmp_dir, "audit.sqlite3")
+            audit_log = ImmutableAuditLog(database_path=db_path, checkpoint_key="k1")
+            self.addCleanup(audit_log.close)
+            await _append_actions(audit_log, "ws-readonly", 3)
+            reader = sqlite3.connect(f"file:{db_path}?mode=ro", uri=True)
+            self.addCleanup(reader.close)
+
+            result = audit_log.verify_stored_chain(reader, workspace_id="ws-readonly")
+            writer = connect_state_db(db_path)
+            self.addCleanup(writer.close)
+            audit_log.write_checkpoint(writer, result)
+            writer.commit()
+            resumed = audit_log.verify_stored_chain(reader, workspace_id="ws-readonly")
+
+            self.assertEqual((result.valid, result.checked_count), (True, 3))
+            self.assertEqual((resumed.resumed_count, resumed.checked_count), (3, 0))
 
 
 if __name__ == "__main__":
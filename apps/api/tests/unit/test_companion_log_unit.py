@@ -0,0 +1,215 @@
+import os
+import tempfile
+import unittest
+from datetime import datetime, timezone
+from unittest import mock
+
+from apps.api.agents import ActorContext, AgentRuntime, PolicyEngine, StubCompletionClient
+from apps.api.agents.companion_log import companion_segment
+from apps.api.audit import ImmutableAuditLog
+from apps.api.db.pool import StateConnectionPool
+from apps.api.db.state import connect_state_db
+from apps.api.events.outbox import AgentRunEventOutbox
+from apps.api.memory import SqliteMemoryStore
+from apps.api.safety import ApprovalService
+
+OWNER = ActorContext(user_id="owner-1", role="owner")
+
+
+class CompanionSegmentUnitTest(unittest.TestCase):
+    def test_messages_in_the_same_window_share_a_segment(self) -> None:
+        morning = companion_segment(
+            workspace_id="ws-1",
+            at=datetime(2026, 10, 17, 8, 30, tzinfo=timezone.utc),
+            segment_seconds=86_400,
+        )
+        evening = companion_segment(
+            workspace_id="ws-1",
+            at=datetime(2026, 10, 17, 23, 59, tzinfo=timezone.utc),
+            segment_seconds=86_400,
+        )
+        next_day = companion_segment(
+            workspace_id="ws-1",
+            at=datetime(2026, 10, 18, 0, 0, tzinfo=timezone.utc),
+            segment_seconds=86_400,
+        )
+
+        self.assertEqual(morning, evening)
+        self.assertEqual(morning.agent_run_id, "companion-ws-1-20261017T000000Z")
+        self.assertEqual(morning.started_at, "2026-10-17T00:00:00+00:00")
+        self.assertEqual(next_day.agent_run_id, "companion-ws-1-20261018T000000Z")
+
+
+class CompanionLogUnitTest(unittest.IsolatedAsyncioTestCase):
+    def _runtime(self, outbox: AgentRunEventOutbox, audit_log: ImmutableAuditLog) -> AgentRuntime:
+        return AgentRuntime(
+            memory_store=SqliteMemoryStore(),
+            policy_engine=PolicyEngine(),
+            outbox=outbox,
+            completion_client=StubCompletionClient(),
+            approval_service=ApprovalService(),
+            audit_log=audit_log,
+        )
+
+    def _shared_pool_runtime(self) -> AgentRuntime:
+        connection = connect_state_db(":memory:")
+        self.addCleanup(connection.close)
+        pool = StateConnectionPool(connection=connection)
+        return self._runtime(AgentRunEventOutbox(pool=pool), ImmutableAuditLog(pool=pool))
+
+    async def _message_on(
+        self, runtime: AgentRuntime, day: int, *, actor_id: str = "owner-1"
+    ) -> str:
+        with mock.patch("apps.api.agents.runtime.datetime") as clock:
+            clock.now.return_value = datetime(2026, 10, day, 12, tzinfo=timezone.utc)
+            reply = await runtime.companion_message(
+                workspace_id="ws-log", actor_id=actor_id, message=f"day {day}"
+            )
+        return reply.agent_run_id
+
+    async def _page_through(self, runtime: AgentRuntime, *, limit: int) -> list[list[str]]:
+        pages: list[list[str]] = []
+        cursor: str | None = None
+        while True:
+            page = await runtime.replay_companion_events(
+                workspace_id="ws-log", actor=OWNER, cursor=cursor, limit=limit
+            )
+            pages.append([f"{event.agent_run_id}:{event.seq}" for event in page.events])
+            if page.next_cursor is None:
+                return pages
+            cursor = page.next_cursor
+
+    async def test_each_window_is_its_own_run_and_replay_spans_them(self) -> None:
+        for runtime in (
+            self._shared_pool_runtime(),
+            self._runtime(AgentRunEventOutbox(), ImmutableAuditLog()),
+        ):
+            with self.subTest(shared_pool=runtime._outbox.pool is not None):
+                first, _ = [await self._message_on(runtime, 17) for _ in range(2)]
+                second = await self._message_on(runtime, 18)
+                third, _ = [await self._message_on(runtime, 20) for _ in range(2)]
+
+                pages = await self._page_through(runtime, limit=2)
+
+                self.assertEqual(len({first, second, third}), 3)
+                self.assertEqual(
+                    pages,
+                    [
+                        [f"{first}:1", f"{first}:2"],
+                        [f"{second}:1", f"{third}:1"],
+                        [f"{third}:2"],
+                    ],
+                )
+
+    async def test_replay_only_covers_segments_the_actor_joined(self) -> None:
+        runtime = self._shared_pool_runtime()
+        await self._message_on(runtime, 17)
+        shared = await self._message_on(runtime, 18)
+        await self._message_on(runtime, 18, actor_id="member-2")
+
+        page = await runtime.replay_companion_events(
+            workspace_id="ws-log", actor=ActorContext(user_id="member-2", role="member")
+        )
+
+        self.assertEqual([event.agent_run_id for event in page.events], [shared, shared])
+
+    async def test_malformed_and_foreign_cursors_are_rejected(self) -> None:
+        runtime = self._shared_pool_runtime()
+        segment = await self._message_on(runtime, 17)
+
+        for cursor in ("not-a-cursor", f"{segment}:x", "companion-elsewhere:1"):
+            with self.subTest(cursor=cursor), self.assertRaises(ValueError):
+                await runtime.replay_companion_events(
+                    workspace_id="ws-log", actor=OWNER, cursor=cursor
+                )
+
+    async def test_legacy_single_run_becomes_the_first_segment(self) -> None:
+        with tempfile.TemporaryDirectory() as tmp_dir:
+            db_path = os.path.join(tmp_dir, "legacy-companion.sqlite3")
+            connection = connect_state_db(db_path)
+            connection.execute("drop table companion_segment_record")
+            connection.execute(
+                """
+                insert into run_access_record (agent_run_id, workspace_id, actor_id)
+                values ('companion-ws-log', 'ws-log', 'owner-1')
+                """
+            )
+            connection.execute(
+                """
+                insert into run_event_record (
+                  agent_run_id, seq, event_type, payload_json, created_at
+                )
+                values ('companion-ws-log', 1, 'companion.message', '{}', ?)
+                """,
+                ("2026-01-01T00:00:00+00:00",),
+            )
+            connection.commit()
+            connection.close()
+
+            connection = connect_state_db(db_path)
+            self.addCleanup(connection.close)
+            pool = StateConnectionPool(connection=connection)
+            runtime = self._runtime(AgentRunEventOutbox(pool=pool), ImmutableAuditLog(pool=pool))
+            current = await self._message_on(runtime, 17)
+
+            page = await runtime.replay_companion_events(workspace_id="ws-log", actor=OWNER)
+
+        self.assertEqual(
+            [f"{event.agent_run_id}:{event.seq}" for event in page.events],
+            ["companion-ws-log:1", f"{current}:1"],
+        )
+
+    async def test_legacy_run_replays_before_a_window_opened_earlier_that_day(self) -> None:
+        migration_path = os.path.join(
+            os.path.dirname(__file__), "..", "..", "db", "migrations", "0012_companion_segments.sql"
+        )
+        with open(migration_path, encoding="utf-8") as migration_file:
+            migration = migration_file.read()
+
+        for via_migration in (False, True):
+            with (
+                self.subTest(via_migration=via_migration),
+                tempfile.TemporaryDirectory() as tmp_dir,
+            ):
+                db_path = os.path.join(tmp_dir, "legacy-companion.sqlite3")
+                connection = connect_state_db(db_path)
+                connection.execute("drop table companion_segment_record")
+                connection.execute(
+                    """
+                    insert into run_access_record (agent_run_id, workspace_id, actor_id)
+                    values ('companion-ws-log', 'ws-log', 'owner-1')
+                    """
+                )
+                connection.execute(
+                    """
+                    insert into run_event_record (
+                      agent_run_id, seq, event_type, payload_json, created_at
+                    )
+                    values ('companion-ws-log', 1, 'companion.message', '{}', ?)
+                    """,
+                    ("2026-10-17T09:30:00+00:00",),
+                )
+                if via_migration:
+                    connection.executescript(migration)
+                connection.commit()
+                connection.close()
+
+                connection = connect_state_db(db_path)
+                self.addCleanup(connection.close)
+                pool = StateConnectionPool(connection=connection)
+                runtime = self._runtime(
+                    AgentRunEventOutbox(pool=pool), ImmutableAuditLog(pool=pool)
+                )
+                current = await self._message_on(runtime, 17)
+
+                page = await runtime.replay_companion_events(workspace_id="ws-log", actor=OWNER)
+
+                self.assertEqual(current, "companion-ws-log-20261017T000000Z")
+                self.assertEqual(
+                    [f"{event.agent_run_id}:{event.seq}" for event in page.events],
+                    ["companion-ws-log:1", f"{current}:1"],
+                )
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,107 @@
+import unittest
+from unittest import mock
+
+from apps.api.agents import (
+    ActorContext,
+    AgentRuntime,
+    PolicyEngine,
+    RunAccessCache,
+    StubCompletionClient,
+)
+from apps.api.audit import ImmutableAuditLog
+from apps.api.db.pool import StateConnectionPool
+from apps.api.db.state import connect_state_db
+from apps.api.events.outbox import AgentRunEventOutbox
+from apps.api.memory import SqliteMemoryStore
+from apps.api.safety import ApprovalService
+
+
+class RunAccessCacheUnitTest(unittest.TestCase):
+    def test_least_recently_used_grant_is_evicted(self) -> None:
+        cache = RunAccessCache(max_entries=2, ttl_seconds=60)
+
+        cache.add(agent_run_id="run-a", actor_id="owner-1")
+        cache.add(agent_run_id="run-b", actor_id="owner-1")
+        self.assertTrue(cache.contains(agent_run_id="run-a", actor_id="owner-1"))
+        cache.add(agent_run_id="run-c", actor_id="owner-1")
+
+        self.assertTrue(cache.contains(agent_run_id="run-a", actor_id="owner-1"))
+        self.assertFalse(cache.contains(agent_run_id="run-b", actor_id="owner-1"))
+        stats = cache.stats()
+        self.assertEqual((stats.entries, stats.evictions), (2, 1))
+
+    def test_grants_expire_after_the_ttl(self) -> None:
+        cache = RunAccessCache(ttl_seconds=30)
+
+        with mock.patch("apps.api.agents.run_access.time.monotonic", return_value=100.0):
+            cache.add(agent_run_id="run-a", actor_id="owner-1")
+        with mock.patch("apps.api.agents.run_access.time.monotonic", return_value=129.0):
+            self.assertTrue(cache.contains(agent_run_id="run-a", actor_id="owner-1"))
+        with mock.patch("apps.api.agents.run_access.time.monotonic", return_value=131.0):
+            self.assertFalse(cache.contains(agent_run_id="run-a", actor_id="owner-1"))
+
+        self.assertEqual(cache.stats().entries, 0)
+
+    def test_limits_come_from_environment(self) -> None:
+        with mock.patch.dict("os.environ", {"ELARA_RUN_ACCESS_CACHE_MAX_ENTRIES": "1"}):
+            cache = RunAccessCache()
+
+        cache.add(agent_run_id="run-a", actor_id="owner-1")
+        cache.add(agent_run_id="run-b", actor_id="owner-1")
+
+        self.assertEqual(cache.stats().entries, 1)
+
+
+class RuntimeRunAccessUnitTest(unittest.IsolatedAsyncioTestCase):
+    async def asyncSetUp(self) -> None:
+        self.connection = connect_state_db(":memory:")
+        self.addCleanup(self.connection.close)
+        pool = StateConnectionPool(connection=self.connection)
+        self.cache = RunAccessCache(max_entries=2, ttl_seconds=60)
+        self.runtime = AgentRuntime(
+            memory_store=SqliteMemoryStore(),
+            policy_engine=PolicyEngine(),
+            outbox=AgentRunEventOutbox(pool=pool),
+            completion_client=StubCompletionClient(),
+            approval_service=ApprovalService(),
+            audit_log=ImmutableAuditLog(pool=pool),
+            run_access_cache=self.cache,
+        )
+
+    async def test_repeat_companion_messages_skip_the_access_write(self) -> None:
+        statements: list[str] = []
+        self.connection.set_trace_callback(statements.append)
+        for _ in range(3):
+            await self.runtime.companion_message(
+                workspace_id="ws-acl", actor_id="owner-1", message="hello"
+            )
+        self.connection.set_trace_callback(None)
+
+        access_writes = [statement for statement in statements if "run_access_record" in statement]
+        self.assertEqual(len(access_writes), 1)
+
+    async def test_evicted_grants_fall_back_to_the_outbox(self) -> None:
+        owner = ActorContext(user_id="owner-1", role="owner")
+        replies = [
+            await self.runtime.companion_message(
+                workspace_id=workspace_id, actor_id="owner-1", message="hello"
+            )
+            for workspace_id in ("ws-1", "ws-2", "ws-3")
+        ]
+        evicted = replies[0].agent_run_id
+        self.assertEqual(self.cache.stats().entries, 2)
+        self.assertFalse(self.cache.contains(agent_run_id=evicted, actor_id="owner-1"))
+
+        events = await self.runtime.replay_events(agent_run_id=evicted, actor=owner)
+
+        self.assertEqual(len(events), 1)
+        self.assertTrue(self.cache.contains(agent_run_id=evicted, actor_id="owner-1"))
+        with self.assertRaises(PermissionError):
+            await self.runtime.replay_events(
+                agent_run_id=evicted,
+                actor=ActorContext(user_id="member-2", role="member"),
+            )
+
+
+if __name__ == "__main__":
+    unittest.main()
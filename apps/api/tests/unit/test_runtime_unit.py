@@ -1,11 +1,24 @@
+import asyncio
 import unittest
 from types import SimpleNamespace
 from unittest.mock import AsyncMock
 
-from apps.api.agents import ActorContext, AgentRuntime, PolicyEngine, SpecialistAgent
+from apps.api.agents import (
+    ActorContext,
+    AgentRuntime,
+    CachedCompletionClient,
+    DelegationSettings,
+    PartialOutput,
+    PolicyEngine,
+    SpecialistAgent,
+    StreamingCompletionClient,
+    StubCompletionClient,
+)
 from apps.api.audit import ImmutableAuditLog
+from apps.api.db.pool import StateConnectionPool
+from apps.api.db.state import connect_state_db
 from apps.api.events.outbox import AgentRunEvent, AgentRunEventOutbox
-from apps.api.memory import SqliteMemoryStore
+from apps.api.memory import MemoryItem, SqliteMemoryStore
 from apps.api.safety import ApprovalService
 
 
@@ -48,7 +61,7 @@ class RuntimeUnitTest(unittest.IsolatedAsyncioTestCase):
         )
         actor = ActorContext(user_id="owner-unit", role="owner")
 
-        runtime.upsert_specialist(
+        await runtime.upsert_specialist(
             workspace_id="ws-unit",
             actor=actor,
             specialist=SpecialistAgent(
@@ -83,14 +96,14 @@ class RuntimeUnitTest(unittest.IsolatedAsyncioTestCase):
         )
         actor = ActorContext(user_id="owner-unit", role="owner")
 
-        await runtime.companion_message(
+        reply = await runtime.companion_message(
             workspace_id="ws-unit",
             actor_id=actor.user_id,
             message="remember secret",
         )
 
-        events = runtime.replay_events(
-            agent_run_id="companion-ws-unit",
+        events = await runtime.replay_events(
+            agent_run_id=reply.agent_run_id,
             actor=actor,
             last_seq=0,
         )
@@ -102,18 +115,20 @@ class RuntimeUnitTest(unittest.IsolatedAsyncioTestCase):
 
     async def test_replay_denies_when_persisted_acl_is_missing(self) -> None:
         outbox = SimpleNamespace(
-            register_run_access=lambda **_kwargs: None,
-            append_event=lambda **_kwargs: None,
-            is_run_access_allowed=lambda **_kwargs: None,
-            replay=lambda **_kwargs: [
-                AgentRunEvent(
-                    agent_run_id="run-unit-legacy",
-                    seq=1,
-                    event_type="run.started",
-                    payload={"goal": "legacy replay"},
-                    created_at="2026-02-11T00:00:00+00:00",
-                )
-            ],
+            register_run_access=AsyncMock(return_value=None),
+            append_event=AsyncMock(return_value=None),
+            is_run_access_allowed=AsyncMock(return_value=None),
+            replay=AsyncMock(
+                return_value=[
+                    AgentRunEvent(
+                        agent_run_id="run-unit-legacy",
+                        seq=1,
+                        event_type="run.started",
+                        payload={"goal": "legacy replay"},
+                        created_at="2026-02-11T00:00:00+00:00",
+                    )
+                ]
+            ),
         )
         runtime = AgentRuntime(
             memory_store=SqliteMemoryStore(),
@@ -126,12 +141,331 @@ class RuntimeUnitTest(unittest.IsolatedAsyncioTestCase):
         actor = ActorContext(user_id="owner-unit", role="owner")
 
         with self.assertRaises(PermissionError):
-            runtime.replay_events(
+            await runtime.replay_events(
                 agent_run_id="run-unit-legacy",
                 actor=actor,
                 last_seq=0,
             )
 
 
+class StreamingOutputUnitTest(unittest.IsolatedAsyncioTestCase):
+    async def test_stub_stream_yields_tokens_with_the_configured_delay(self) -> None:
+        client = StubCompletionClient(token_delay_seconds=0.01)
+        loop = asyncio.get_running_loop()
+
+        started = loop.time()
+        chunks = [chunk async for chunk in client.stream(system_prompt="stub", user_input="a b c")]
+
+        self.assertEqual(chunks, ["[stub]", " a", " b", " c"])
+        self.assertEqual(
+            "".join(chunks), await client.complete(system_prompt="stub", user_input="a b c")
+        )
+        self.assertGreaterEqual(loop.time() - started, 0.04)
+
+    def test_only_clients_with_stream_are_streaming_clients(self) -> None:
+        self.assertIsInstance(StubCompletionClient(), StreamingCompletionClient)
+        self.assertIsInstance(
+            CachedCompletionClient(StubCompletionClient()), StreamingCompletionClient
+        )
+        self.assertNotIsInstance(
+            SimpleNamespace(complete=AsyncMock(return_value="ok")), StreamingCompletionClient
+        )
+
+    async def test_partial_outputs_concatenate_to_the_final_outputs(self) -> None:
+        runtime = AgentRuntime(
+            memory_store=SqliteMemoryStore(),
+            policy_engine=PolicyEngine(),
+            outbox=AgentRunEventOutbox(),
+            completion_client=StubCompletionClient(),
+            approval_service=ApprovalService(),
+            audit_log=ImmutableAuditLog(),
+        )
+        actor = ActorContext(user_id="owner-unit", role="owner")
+        for specialist_id in ("spec-a", "spec-b"):
+            await runtime.upsert_specialist(
+                workspace_id="ws-stream",
+                actor=actor,
+                specialist=SpecialistAgent(
+                    id=specialist_id,
+                    name=specialist_id,
+                    prompt=f"prompt for {specialist_id}",
+                    soul="Calm",
+                    capabilities={"delegate"},
+                ),
+            )
+        partials: list[PartialOutput] = []
+
+        async def collect(partial: PartialOutput) -> None:
+            partials.append(partial)
+
+        reply = await runtime.companion_message(
+            workspace_id="ws-stream",
+            actor_id=actor.user_id,
+            message="stream me",
+            on_partial=collect,
+        )
+        companion_text = "".join(partial.text for partial in partials)
+        partials.clear()
+        result = await runtime.execute_goal(
+            workspace_id="ws-stream", actor=actor, goal="stream goal", on_partial=collect
+        )
+
+        self.assertEqual(companion_text, reply.response)
+        for delegated in result.delegated_results:
+            self.assertEqual(
+                "".join(
+                    partial.text
+                    for partial in partials
+                    if partial.source == delegated.specialist_id
+                ),
+                delegated.output,
+            )
+
+    async def test_clients_without_stream_fall_back_to_a_single_chunk(self) -> None:
+        complete_mock = AsyncMock(return_value="whole completion")
+        runtime = AgentRuntime(
+            memory_store=SqliteMemoryStore(),
+            policy_engine=PolicyEngine(),
+            outbox=AgentRunEventOutbox(),
+            completion_client=SimpleNamespace(complete=complete_mock),
+            approval_service=ApprovalService(),
+            audit_log=ImmutableAuditLog(),
+        )
+        texts: list[str] = []
+
+        async def collect(partial: PartialOutput) -> None:
+            texts.append(partial.text)
+
+        await runtime.companion_message(
+            workspace_id="ws-stream", actor_id="owner-unit", message="hi", on_partial=collect
+        )
+
+        self.assertEqual(texts[1], "whole completion")
+        complete_mock.assert_awaited_once()
+
+
+class CompanionPipelineUnitTest(unittest.IsolatedAsyncioTestCase):
+    async def test_memory_branch_overlaps_the_completion(self) -> None:
+        async def complete(*, system_prompt: str, user_input: str) -> str:
+            await asyncio.sleep(0.05)
+            return "done"
+
+        memory_store = SqliteMemoryStore()
+        upsert_memory = memory_store.upsert_memory
+
+        async def slow_upsert_memory(
+            *,
+            workspace_id: str,
+            agent_id: str,
+            memory_id: str,
+            content: str,
+            embedding: list[float] | None = None,
+            embedding_model: str = "text-embedding-3-small",
+        ) -> MemoryItem:
+            await asyncio.sleep(0.05)
+            return await upsert_memory(
+                workspace_id=workspace_id,
+                agent_id=agent_id,
+                memory_id=memory_id,
+                content=content,
+                embedding=embedding,
+                embedding_model=embedding_model,
+            )
+
+        memory_store.upsert_memory = slow_upsert_memory  # type: ignore[method-assign]
+        runtime = AgentRuntime(
+            memory_store=memory_store,
+            policy_engine=PolicyEngine(),
+            outbox=AgentRunEventOutbox(),
+            completion_client=SimpleNamespace(complete=complete),
+            approval_service=ApprovalService(),
+            audit_log=ImmutableAuditLog(),
+        )
+
+        reply = await runtime.companion_message(
+            workspace_id="ws-dag", actor_id="owner-unit", message="overlap please"
+        )
+
+        timings = reply.timings
+        self.assertEqual(len(reply.memory_hits), 1)
+        self.assertGreaterEqual(timings.memory_write_seconds, 0.05)
+        self.assertGreaterEqual(timings.completion_seconds, 0.05)
+        self.assertLess(timings.total_seconds, 0.095)
+        self.assertEqual(timings.critical_path[-1], "bookkeeping")
+
+    async def test_bookkeeping_commits_once_on_a_shared_pool(self) -> None:
+        connection = connect_state_db(":memory:")
+        self.addCleanup(connection.close)
+        pool = StateConnectionPool(connection=connection)
+        outbox = AgentRunEventOutbox(pool=pool)
+        runtime = AgentRuntime(
+            memory_store=SqliteMemoryStore(),
+            policy_engine=PolicyEngine(),
+            outbox=outbox,
+            completion_client=StubCompletionClient(),
+            approval_service=ApprovalService(),
+            audit_log=ImmutableAuditLog(pool=pool),
+        )
+
+        statements: list[str] = []
+        connection.set_trace_callback(statements.append)
+        reply = await runtime.companion_message(
+            workspace_id="ws-dag", actor_id="owner-unit", message="hi"
+        )
+        connection.set_trace_callback(None)
+
+        self.assertEqual(sum(statement == "COMMIT" for statement in statements), 1)
+        self.assertTrue(
+            await outbox.is_run_access_allowed(
+                agent_run_id=reply.agent_run_id, actor_id="owner-unit"
+            )
+        )
+
+    async def test_memory_errors_propagate_unwrapped(self) -> None:
+        memory_store = SqliteMemoryStore()
+        memory_store.search = AsyncMock(side_effect=RuntimeError("memory index unavailable"))  # type: ignore[method-assign]
+        runtime = AgentRuntime(
+            memory_store=memory_store,
+            policy_engine=PolicyEngine(),
+            outbox=AgentRunEventOutbox(),
+            completion_client=StubCompletionClient(),
+            approval_service=ApprovalService(),
+            audit_log=ImmutableAuditLog(),
+        )
+
+        with self.assertRaisesRegex(RuntimeError, "memory index unavailable"):
+            await runtime.companion_message(
+                workspace_id="ws-dag", actor_id="owner-unit", message="hi"
+            )
+
+
+class ConcurrentDelegationUnitTest(unittest.IsolatedAsyncioTestCase):
+    actor = ActorContext(user_id="owner-unit", role="owner")
+
+    async def _runtime(
+        self, complete: object, delegation: DelegationSettings, specialists: int
+    ) -> AgentRuntime:
+        runtime = AgentRuntime(
+            memory_store=SqliteMemoryStore(),
+            policy_engine=PolicyEngine(),
+            outbox=AgentRunEventOutbox(),
+            completion_client=SimpleNamespace(complete=complete),
+            approval_service=ApprovalService(),
+            audit_log=ImmutableAuditLog(),
+            delegation=delegation,
+        )
+        for index in range(specialists):
+            await runtime.upsert_specialist(
+                workspace_id="ws-delegate",
+                actor=self.actor,
+                specialist=SpecialistAgent(
+                    id=f"spec-{index}",
+                    name=f"Specialist {index}",
+                    prompt=f"prompt-{index}",
+                    soul="Calm",
+                    capabilities={"delegate"},
+                ),
+            )
+        return runtime
+
+    async def _event_types(self, runtime: AgentRuntime, agent_run_id: str) -> list[str]:
+        events = await runtime.replay_events(agent_run_id=agent_run_id, actor=self.actor)
+        return [str(event["event_type"]) for event in events]
+
+    async def test_delegations_overlap_and_record_events_in_specialist_order(self) -> None:
+        active = 0
+        peak = 0
+
+        async def complete(*, system_prompt: str, user_input: str) -> str:
+            nonlocal active, peak
+            active += 1
+            peak = max(peak, active)
+            # Earlier specialists finish last, so arrival order differs from specialist order.
+            await asyncio.sleep(0.03 - 0.01 * int(system_prompt[len("prompt-")]))
+            active -= 1
+            return system_prompt
+
+        runtime = await self._runtime(
+            complete, DelegationSettings(max_specialists=3, max_concurrency_per_run=3), 4
+        )
+        result = await runtime.execute_goal(
+            workspace_id="ws-delegate", actor=self.actor, goal="overlap"
+        )
+
+        self.assertEqual(peak, 3)
+        self.assertEqual(
+            [item.specialist_id for item in result.delegated_results],
+            ["spec-0", "spec-1", "spec-2"],
+        )
+        self.assertEqual(
+            await self._event_types(runtime, result.agent_run_id),
+            ["run.started"] + ["task.delegated"] * 3 + ["task.completed"] * 3 + ["run.completed"],
+        )
+
+    async def test_per_run_and_global_limits_bound_concurrency(self) -> None:
+        active = 0
+        peak = 0
+
+        async def complete(*, system_prompt: str, user_input: str) -> str:
+            nonlocal active, peak
+            active += 1
+            peak = max(peak, active)
+            await asyncio.sleep(0.01)
+            active -= 1
+            return "ok"
+
+        per_run = await self._runtime(
+            complete, DelegationSettings(max_specialists=4, max_concurrency_per_run=2), 4
+        )
+        await per_run.execute_goal(workspace_id="ws-delegate", actor=self.actor, goal="per run")
+        self.assertEqual(peak, 2)
+
+        peak = 0
+        shared = await self._runtime(
+            complete,
+            DelegationSettings(max_specialists=2, max_concurrency_per_run=2, max_concurrency=3),
+            2,
+        )
+        await asyncio.gather(
+            *(
+                shared.execute_goal(workspace_id="ws-delegate", actor=self.actor, goal=goal)
+                for goal in ("a", "b", "c")
+            )
+        )
+        self.assertEqual(peak, 3)
+
+    async def test_timed_out_delegation_is_recorded_as_failed(self) -> None:
+        async def complete(*, system_prompt: str, user_input: str) -> str:
+            if system_prompt.startswith("prompt-1"):
+                await asyncio.sleep(1)
+            return "ok"
+
+        runtime = await self._runtime(complete, DelegationSettings(task_timeout_seconds=0.02), 2)
+        result = await runtime.execute_goal(
+            workspace_id="ws-delegate", actor=self.actor, goal="timeout"
+        )
+
+        self.assertEqual([item.specialist_id for item in result.delegated_results], ["spec-0"])
+        self.assertEqual(
+            await self._event_types(runtime, result.agent_run_id),
+            [
+                "run.started",
+                "task.delegated",
+                "task.delegated",
+                "task.completed",
+                "task.failed",
+                "run.completed",
+            ],
+        )
+
+    async def test_delegation_errors_propagate_unwrapped(self) -> None:
+        async def complete(*, system_prompt: str, user_input: str) -> str:
+            raise RuntimeError("completion backend unavailable")
+
+        runtime = await self._runtime(complete, DelegationSettings(), 2)
+        with self.assertRaisesRegex(RuntimeError, "completion backend unavailable"):
+            await runtime.execute_goal(workspace_id="ws-delegate", actor=self.actor, goal="boom")
+
+
 if __name__ == "__main__":
     unittest.main()
@@ -0,0 +1,89 @@
+import os
+import tempfile
+import unittest
+
+from apps.api.agents.unit_of_work import RunStepUnitOfWork
+from apps.api.audit import ImmutableAuditLog
+from apps.api.db.pool import StateConnectionPool
+from apps.api.db.state import connect_state_db
+from apps.api.events.outbox import AgentRunEventOutbox
+
+
+class RunStepUnitOfWorkUnitTest(unittest.IsolatedAsyncioTestCase):
+    async def test_shared_pool_flushes_the_step_in_one_commit(self) -> None:
+        connection = connect_state_db(":memory:")
+        self.addCleanup(connection.close)
+        pool = StateConnectionPool(connection=connection)
+        outbox = AgentRunEventOutbox(pool=pool)
+        audit_log = ImmutableAuditLog(pool=pool)
+
+        statements: list[str] = []
+        connection.set_trace_callback(statements.append)
+        async with RunStepUnitOfWork(outbox=outbox, audit_log=audit_log) as step:
+            step.add_run_access(agent_run_id="run-uow", workspace_id="ws-uow", actor_id="owner-1")
+            step.add_run_event(agent_run_id="run-uow", event_type="run.started", payload={})
+            step.add_run_event(agent_run_id="run-uow", event_type="task.delegated", payload={})
+            step.add_audit_event(
+                workspace_id="ws-uow",
+                actor_id="owner-1",
+                action="goal.execute",
+                outcome="started",
+            )
+            self.assertEqual(await outbox.replay(agent_run_id="run-uow"), [])
+        connection.set_trace_callback(None)
+
+        writes = [
+            statement
+            for statement in statements
+            if statement.lstrip().lower().startswith(("begin", "insert", "update"))
+        ]
+        self.assertEqual(writes[0], "begin immediate")
+        self.assertEqual(sum(statement == "COMMIT" for statement in statements), 1)
+        replayed = await outbox.replay(agent_run_id="run-uow")
+        self.assertEqual([event.seq for event in replayed], [1, 2])
+        self.assertEqual(len(await audit_log.list_events(workspace_id="ws-uow")), 1)
+        self.assertTrue(
+            await outbox.is_run_access_allowed(agent_run_id="run-uow", actor_id="owner-1")
+        )
+
+    async def test_step_is_discarded_when_the_block_raises(self) -> None:
+        outbox = AgentRunEventOutbox()
+        audit_log = ImmutableAuditLog()
+
+        with self.assertRaises(RuntimeError):
+            async with RunStepUnitOfWork(outbox=outbox, audit_log=audit_log) as step:
+                step.add_run_event(agent_run_id="run-fail", event_type="task.delegated", payload={})
+                step.add_audit_event(
+                    workspace_id="ws-fail",
+                    actor_id="owner-1",
+                    action="task.delegated",
+                    outcome="completed",
+                )
+                raise RuntimeError("completion failed")
+
+        self.assertEqual(await outbox.replay(agent_run_id="run-fail"), [])
+        self.assertEqual(await audit_log.list_events(workspace_id="ws-fail"), [])
+
+    async def test_separate_pools_flush_each_service(self) -> None:
+        with tempfile.TemporaryDirectory() as tmp_dir:
+            outbox = AgentRunEventOutbox(database_path=os.path.join(tmp_dir, "events.sqlite3"))
+            audit_log = ImmutableAuditLog(database_path=os.path.join(tmp_dir, "audit.sqlite3"))
+            self.addCleanup(outbox.close)
+            self.addCleanup(audit_log.close)
+
+            async with RunStepUnitOfWork(outbox=outbox, audit_log=audit_log) as step:
+                step.add_run_event(agent_run_id="run-split", event_type="run.started", payload={})
+                step.add_audit_event(
+                    workspace_id="ws-split",
+                    actor_id="owner-1",
+                    action="goal.execute",
+                    outcome="started",
+                )
+
+            self.assertEqual(len(await outbox.replay(agent_run_id="run-split")), 1)
+            self.assertTrue(await audit_log.verify_chain(workspace_id="ws-split"))
+            self.assertEqual(len(await audit_log.list_events(workspace_id="ws-split")), 1)
+
+
+if __name__ == "__main__":
+    unittest.main()
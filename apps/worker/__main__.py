@@ -0,0 +1,22 @@
+import asyncio
+import signal
+
+from apps.api.db.state import resolve_state_db_path
+from apps.api.events.outbox import AgentRunEventOutbox
+from apps.worker.service import OutboxWorker
+
+
+async def main() -> None:
+    outbox = AgentRunEventOutbox(database_path=resolve_state_db_path())
+    worker = OutboxWorker(outbox)
+    loop = asyncio.get_running_loop()
+    for signum in (signal.SIGINT, signal.SIGTERM):
+        loop.add_signal_handler(signum, worker.stop)
+    try:
+        await worker.run()
+    finally:
+        outbox.close()
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
@@ -1,8 +1,26 @@
+import os
+import socket
+
 from apps.api.events.outbox import AgentRunEventOutbox
 
 
-async def run_once(outbox: AgentRunEventOutbox) -> list[str]:
-    """Drain outbox messages and return run-local delivery IDs for observability."""
+def default_worker_id() -> str:
+    return f"{socket.gethostname()}:{os.getpid()}"
+
+
+async def run_once(
+    outbox: AgentRunEventOutbox,
+    *,
+    worker_id: str | None = None,
+    max_items: int = 100,
+) -> list[str]:
+    """Claim, deliver and acknowledge outbox messages; return run-local delivery IDs.
+
+    Claims are leased to ``worker_id`` so several worker processes can drain the same outbox
+    without delivering a message twice while its lease is live.
+    """
 
-    drained = outbox.drain_outbox()
-    return [f"{event.agent_run_id}:{event.seq}" for event in drained]
+    claimant = worker_id or default_worker_id()
+    claimed = await outbox.claim_events(worker_id=claimant, max_items=max_items)
+    await outbox.acknowledge_events(worker_id=claimant, events=claimed)
+    return [f"{event.agent_run_id}:{event.seq}" for event in claimed]
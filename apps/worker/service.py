@@ -0,0 +1,252 @@
+import asyncio
+import os
+import time
+from collections.abc import Awaitable, Callable
+from dataclasses import dataclass
+from datetime import datetime, timezone
+
+from apps.api.events.outbox import AgentRunEvent, AgentRunEventOutbox
+from apps.worker.runner import default_worker_id
+
+DeliverFn = Callable[[AgentRunEvent], Awaitable[None]]
+
+# Weight of the newest delivery in the moving average of delivery time.
+_DELIVERY_SMOOTHING = 0.2
+
+
+@dataclass(frozen=True)
+class WorkerSettings:
+    concurrency: int = 4
+    batch_size: int = 100
+    max_in_flight: int = 400
+    lease_seconds: float = 30.0
+    min_poll_interval: float = 0.05
+    max_poll_interval: float = 5.0
+    backoff_factor: float = 2.0
+
+
+def resolve_worker_settings(settings: WorkerSettings | None = None) -> WorkerSettings:
+    if settings is not None:
+        return settings
+    defaults = WorkerSettings()
+    return WorkerSettings(
+        concurrency=int(os.getenv("ELARA_WORKER_CONCURRENCY", str(defaults.concurrency))),
+        batch_size=int(os.getenv("ELARA_WORKER_BATCH_SIZE", str(defaults.batch_size))),
+        max_in_flight=int(os.getenv("ELARA_WORKER_MAX_IN_FLIGHT", str(defaults.max_in_flight))),
+        lease_seconds=float(os.getenv("ELARA_WORKER_LEASE_SECONDS", str(defaults.lease_seconds))),
+        min_poll_interval=float(
+            os.getenv("ELARA_WORKER_MIN_POLL_SECONDS", str(defaults.min_poll_interval))
+        ),
+        max_poll_interval=float(
+            os.getenv("ELARA_WORKER_MAX_POLL_SECONDS", str(defaults.max_poll_interval))
+        ),
+        backoff_factor=defaults.backoff_factor,
+    )
+
+
+@dataclass(frozen=True)
+class WorkerStats:
+    delivered: int
+    failed: int
+    expired: int
+    batches: int
+    last_batch_size: int
+    mean_batch_size: float
+    throughput_per_second: float
+    last_lag_seconds: float
+    max_lag_seconds: float
+    in_flight: int
+    poll_interval: float
+
+
+async def _acknowledge_only(event: AgentRunEvent) -> None:
+    return None
+
+
+class OutboxWorker:
+    """Long-running outbox delivery loop for a dedicated worker process.
+
+    A single poller claims batches under ``worker_id`` and feeds a bounded in-flight queue
+    consumed by ``concurrency`` delivery tasks. The poller only claims as many events as the
+    queue has room for and as the deliverers can get through within ``lease_seconds`` at the
+    measured delivery time (``concurrency`` until the first delivery is timed). It polls
+    again immediately while batches come back full, and backs off exponentially up to
+    ``max_poll_interval`` while the outbox is idle. Queued events whose lease ran out are
+    dropped undelivered, since another worker may have claimed them by then. Delivered
+    events are acknowledged in bulk once per poll; failed deliveries stay claimed until
+    their lease expires so they are retried later. ``stop()`` lets in-progress deliveries
+    finish, acknowledges them and releases every other claim back to the outbox.
+    """
+
+    def __init__(
+        self,
+        outbox: AgentRunEventOutbox,
+        *,
+        deliver: DeliverFn | None = None,
+        worker_id: str | None = None,
+        settings: WorkerSettings | None = None,
+    ) -> None:
+        self._outbox = outbox
+        self._deliver = deliver or _acknowledge_only
+        self._worker_id = worker_id or default_worker_id()
+        self._settings = resolve_worker_settings(settings)
+        # Each queued event carries the monotonic time its lease runs out.
+        self._queue: asyncio.Queue[tuple[AgentRunEvent, float] | None] = asyncio.Queue(
+            maxsize=self._settings.max_in_flight
+        )
+        self._delivered_pending_ack: list[AgentRunEvent] = []
+        self._in_progress = 0
+        self._delivery_seconds: float | None = None
+        self._stopping = asyncio.Event()
+        self._poll_interval = self._settings.min_poll_interval
+        self._started_at: float | None = None
+        self._delivered = 0
+        self._failed = 0
+        self._expired = 0
+        self._batches = 0
+        self._claimed = 0
+        self._last_batch_size = 0
+        self._last_lag_seconds = 0.0
+        self._max_lag_seconds = 0.0
+
+    @property
+    def worker_id(self) -> str:
+        return self._worker_id
+
+    def stop(self) -> None:
+        self._stopping.set()
+
+    def stats(self) -> WorkerStats:
+        elapsed = 0.0 if self._started_at is None else time.monotonic() - self._started_at
+        return WorkerStats(
+            delivered=self._delivered,
+            failed=self._failed,
+            expired=self._expired,
+            batches=self._batches,
+            last_batch_size=self._last_batch_size,
+            mean_batch_size=self._claimed / self._batches if self._batches else 0.0,
+            throughput_per_second=self._delivered / elapsed if elapsed > 0 else 0.0,
+            last_lag_seconds=self._last_lag_seconds,
+            max_lag_seconds=self._max_lag_seconds,
+            in_flight=self._queue.qsize() + self._in_progress,
+            poll_interval=self._poll_interval,
+        )
+
+    async def run(self) -> None:
+        self._started_at = time.monotonic()
+        deliverers = [
+            asyncio.create_task(self._deliver_loop()) for _ in range(self._settings.concurrency)
+        ]
+        try:
+            await self._poll_loop()
+        finally:
+            self._discard_queued()
+            for _ in deliverers:
+                await self._queue.put(None)
+            await asyncio.gather(*deliverers, return_exceptions=True)
+            await self._flush_acknowledgements()
+            await self._outbox.release_claims(worker_id=self._worker_id)
+
+    async def _poll_loop(self) -> None:
+        settings = self._settings
+        while not self._stopping.is_set():
+            await self._flush_acknowledgements()
+            requested = min(settings.batch_size, self._claim_capacity())
+            claimed: list[AgentRunEvent] = []
+            if requested > 0:
+                # Taken before claiming, so it never runs past the lease the outbox records.
+                lease_until = time.monotonic() + settings.lease_seconds
+                claimed = await self._outbox.claim_events(
+                    worker_id=self._worker_id,
+                    max_items=requested,
+                    lease_seconds=settings.lease_seconds,
+                )
+                self._record_batch(len(claimed))
+                for event in claimed:
+                    self._queue.put_nowait((event, lease_until))
+
+            if requested > 0 and len(claimed) == requested:
+                self._poll_interval = settings.min_poll_interval
+                await asyncio.sleep(0)
+                continue
+            if claimed or requested <= 0:
+                self._poll_interval = settings.min_poll_interval
+            else:
+                self._poll_interval = min(
+                    self._poll_interval * settings.backoff_factor,
+                    settings.max_poll_interval,
+                )
+            try:
+                await asyncio.wait_for(self._stopping.wait(), timeout=self._poll_interval)
+            except TimeoutError:
+                pass
+
+    def _claim_capacity(self) -> int:
+        settings = self._settings
+        limit = settings.max_in_flight
+        if self._delivery_seconds is None:
+            limit = min(limit, settings.concurrency)
+        elif self._delivery_seconds > 0:
+            deliverable = int(
+                settings.concurrency * settings.lease_seconds / self._delivery_seconds
+            )
+            limit = min(limit, max(deliverable, settings.concurrency))
+        return limit - self._queue.qsize() - self._in_progress
+
+    async def _deliver_loop(self) -> None:
+        while True:
+            item = await self._queue.get()
+            if item is None:
+                return
+            if self._stopping.is_set():
+                continue
+            event, lease_until = item
+            if time.monotonic() >= lease_until:
+                self._expired += 1
+                continue
+            self._in_progress += 1
+            started = time.monotonic()
+            try:
+                await self._deliver(event)
+            except Exception:
+                self._failed += 1
+            else:
+                self._delivered += 1
+                self._delivered_pending_ack.append(event)
+                self._record_lag(event)
+            finally:
+                self._in_progress -= 1
+                self._record_delivery_time(time.monotonic() - started)
+
+    async def _flush_acknowledgements(self) -> None:
+        if not self._delivered_pending_ack:
+            return
+        delivered = self._delivered_pending_ack
+        self._delivered_pending_ack = []
+        await self._outbox.acknowledge_events(worker_id=self._worker_id, events=delivered)
+
+    def _discard_queued(self) -> None:
+        while not self._queue.empty():
+            self._queue.get_nowait()
+
+    def _record_batch(self, size: int) -> None:
+        if size == 0:
+            return
+        self._batches += 1
+        self._claimed += size
+        self._last_batch_size = size
+
+    def _record_delivery_time(self, seconds: float) -> None:
+        if self._delivery_seconds is None:
+            self._delivery_seconds = seconds
+            return
+        self._delivery_seconds += _DELIVERY_SMOOTHING * (seconds - self._delivery_seconds)
+
+    def _record_lag(self, event: AgentRunEvent) -> None:
+        try:
+            created_at = datetime.fromisoformat(event.created_at)
+        except ValueError:
+            return
+        lag = max((datetime.now(timezone.utc) - created_at).total_seconds(), 0.0)
+        self._last_lag_seconds = lag
+        self._max_lag_seconds = max(self._max_lag_seconds, lag)
@@ -0,0 +1,23 @@
+import asyncio
+import os
+import signal
+import tempfile
+import unittest
+from unittest import mock
+
+from apps.worker.__main__ import main
+
+
+class WorkerMainTest(unittest.IsolatedAsyncioTestCase):
+    async def test_main_runs_until_sigterm(self) -> None:
+        with tempfile.TemporaryDirectory() as tmp_dir:
+            db_path = os.path.join(tmp_dir, "worker.sqlite3")
+            with mock.patch.dict("os.environ", {"ELARA_STATE_DB_PATH": db_path}):
+                asyncio.get_running_loop().call_later(0.05, os.kill, os.getpid(), signal.SIGTERM)
+                await asyncio.wait_for(main(), timeout=5.0)
+
+            self.assertTrue(os.path.exists(db_path))
+
+
+if __name__ == "__main__":
+    unittest.main()
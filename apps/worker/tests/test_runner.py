@@ -1,3 +1,5 @@
+import os
+import tempfile
 import unittest
 
 from apps.api.events.outbox import AgentRunEventOutbox
@@ -7,13 +9,33 @@ from apps.worker.runner import run_once
 class WorkerRunnerTest(unittest.IsolatedAsyncioTestCase):
     async def test_run_once_drains_outbox_records(self) -> None:
         outbox = AgentRunEventOutbox()
-        outbox.append_event(agent_run_id="run-worker", event_type="run.started", payload={})
-        outbox.append_event(agent_run_id="run-worker", event_type="run.completed", payload={})
+        await outbox.append_event(agent_run_id="run-worker", event_type="run.started", payload={})
+        await outbox.append_event(agent_run_id="run-worker", event_type="run.completed", payload={})
 
         delivered = await run_once(outbox)
 
         self.assertEqual(delivered, ["run-worker:1", "run-worker:2"])
 
+    async def test_workers_sharing_a_database_never_deliver_twice(self) -> None:
+        with tempfile.TemporaryDirectory() as tmp_dir:
+            db_path = os.path.join(tmp_dir, "outbox.sqlite3")
+            first = AgentRunEventOutbox(database_path=db_path)
+            second = AgentRunEventOutbox(database_path=db_path)
+            self.addCleanup(first.close)
+            self.addCleanup(second.close)
+            for index in range(5):
+                await first.append_event(
+                    agent_run_id="run-shared",
+                    event_type="tick",
+                    payload={"index": index},
+                )
+
+            delivered = await run_once(first, worker_id="worker-a", max_items=3)
+            delivered += await run_once(second, worker_id="worker-b", max_items=3)
+            delivered += await run_once(first, worker_id="worker-a", max_items=3)
+
+            self.assertEqual(delivered, [f"run-shared:{seq}" for seq in range(1, 6)])
+
 
 if __name__ == "__main__":
     unittest.main()
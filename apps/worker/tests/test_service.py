@@ -0,0 +1,197 @@
+import asyncio
+import unittest
+from collections.abc import Callable
+from unittest import mock
+
+from apps.api.db.state import connect_state_db
+from apps.api.events.outbox import AgentRunEvent, AgentRunEventOutbox, PendingRunEvent
+from apps.worker.service import OutboxWorker, WorkerSettings, resolve_worker_settings
+
+FAST_SETTINGS = WorkerSettings(
+    concurrency=3,
+    batch_size=4,
+    max_in_flight=6,
+    min_poll_interval=0.001,
+    max_poll_interval=0.01,
+)
+
+
+async def _wait_until(predicate: Callable[[], bool], *, timeout: float = 2.0) -> None:
+    async def poll() -> None:
+        while not predicate():
+            await asyncio.sleep(0.001)
+
+    await asyncio.wait_for(poll(), timeout=timeout)
+
+
+class OutboxWorkerTest(unittest.IsolatedAsyncioTestCase):
+    async def asyncSetUp(self) -> None:
+        self.connection = connect_state_db(":memory:")
+        self.addCleanup(self.connection.close)
+        self.outbox = AgentRunEventOutbox(connection=self.connection)
+
+    async def _append(self, count: int) -> None:
+        await self.outbox.append_events(
+            agent_run_id="run-worker",
+            events=[PendingRunEvent(event_type="tick", payload={"index": i}) for i in range(count)],
+        )
+
+    async def test_delivers_backlog_with_bounded_batches_and_acknowledges(self) -> None:
+        await self._append(10)
+        delivered: list[int] = []
+
+        async def deliver(event: AgentRunEvent) -> None:
+            delivered.append(event.seq)
+
+        worker = OutboxWorker(
+            self.outbox, deliver=deliver, worker_id="worker-a", settings=FAST_SETTINGS
+        )
+        task = asyncio.create_task(worker.run())
+        await _wait_until(lambda: len(delivered) == 10)
+        worker.stop()
+        await task
+
+        stats = worker.stats()
+        self.assertEqual(sorted(delivered), list(range(1, 11)))
+        self.assertEqual(stats.delivered, 10)
+        self.assertLessEqual(stats.last_batch_size, FAST_SETTINGS.batch_size)
+        self.assertGreaterEqual(stats.batches, 3)
+        self.assertGreater(stats.throughput_per_second, 0.0)
+        self.assertGreaterEqual(stats.max_lag_seconds, stats.last_lag_seconds)
+        self.assertEqual(await self.outbox.drain_outbox(), [])
+
+    async def test_idle_worker_backs_off_to_the_max_poll_interval(self) -> None:
+        worker = OutboxWorker(self.outbox, worker_id="worker-idle", settings=FAST_SETTINGS)
+        task = asyncio.create_task(worker.run())
+        await _wait_until(lambda: worker.stats().poll_interval == FAST_SETTINGS.max_poll_interval)
+        worker.stop()
+        await task
+
+        self.assertEqual(worker.stats().batches, 0)
+
+    def _claimed_by(self, worker_id: str) -> int:
+        return int(
+            self.connection.execute(
+                "select count(*) from run_event_outbox_record where claimed_by = ?", (worker_id,)
+            ).fetchone()[0]
+        )
+
+    async def test_in_flight_queue_applies_backpressure(self) -> None:
+        await self._append(20)
+        release = asyncio.Event()
+        started: list[int] = []
+
+        async def deliver(event: AgentRunEvent) -> None:
+            started.append(event.seq)
+            if event.seq > FAST_SETTINGS.concurrency:
+                await release.wait()
+
+        worker = OutboxWorker(
+            self.outbox, deliver=deliver, worker_id="worker-slow", settings=FAST_SETTINGS
+        )
+        task = asyncio.create_task(worker.run())
+        await _wait_until(lambda: self._claimed_by("worker-slow") == FAST_SETTINGS.max_in_flight)
+        await asyncio.sleep(0.02)
+
+        self.assertEqual(worker.stats().in_flight, FAST_SETTINGS.max_in_flight)
+        self.assertEqual(self._claimed_by("worker-slow"), FAST_SETTINGS.max_in_flight)
+
+        worker.stop()
+        release.set()
+        await task
+
+    async def test_untimed_worker_claims_no_more_than_it_can_start(self) -> None:
+        await self._append(20)
+        release = asyncio.Event()
+
+        async def deliver(event: AgentRunEvent) -> None:
+            await release.wait()
+
+        worker = OutboxWorker(
+            self.outbox, deliver=deliver, worker_id="worker-cold", settings=FAST_SETTINGS
+        )
+        task = asyncio.create_task(worker.run())
+        await _wait_until(lambda: worker.stats().in_flight == FAST_SETTINGS.concurrency)
+        await asyncio.sleep(0.02)
+
+        self.assertEqual(self._claimed_by("worker-cold"), FAST_SETTINGS.concurrency)
+
+        worker.stop()
+        release.set()
+        await task
+
+    async def test_events_whose_lease_expired_in_the_queue_are_not_delivered(self) -> None:
+        await self._append(5)
+        settings = WorkerSettings(
+            concurrency=1,
+            batch_size=4,
+            max_in_flight=4,
+            lease_seconds=0.05,
+            min_poll_interval=0.001,
+            max_poll_interval=0.01,
+        )
+        delivered: list[int] = []
+        reclaimed: list[int] = []
+
+        async def deliver(event: AgentRunEvent) -> None:
+            if event.seq == 2:
+                await asyncio.sleep(settings.lease_seconds * 2)
+                # Another worker picks up everything whose lease has run out meanwhile.
+                stolen = await self.outbox.claim_events(worker_id="worker-b", max_items=10)
+                reclaimed.extend(stolen_event.seq for stolen_event in stolen)
+            delivered.append(event.seq)
+
+        worker = OutboxWorker(
+            self.outbox, deliver=deliver, worker_id="worker-lease", settings=settings
+        )
+        task = asyncio.create_task(worker.run())
+        await _wait_until(lambda: worker.stats().expired == 3)
+        worker.stop()
+        await task
+
+        self.assertEqual(delivered, [1, 2])
+        self.assertEqual(sorted(reclaimed), [2, 3, 4, 5])
+
+    async def test_shutdown_releases_undelivered_claims(self) -> None:
+        await self._append(8)
+        release = asyncio.Event()
+
+        async def deliver(event: AgentRunEvent) -> None:
+            await release.wait()
+            if event.seq == 2:
+                raise RuntimeError("delivery failed")
+
+        worker = OutboxWorker(
+            self.outbox, deliver=deliver, worker_id="worker-stop", settings=FAST_SETTINGS
+        )
+        task = asyncio.create_task(worker.run())
+        await _wait_until(lambda: worker.stats().in_flight == FAST_SETTINGS.concurrency)
+        worker.stop()
+        release.set()
+        await task
+
+        stats = worker.stats()
+        self.assertEqual((stats.delivered, stats.failed), (2, 1))
+        remaining = await self.outbox.drain_outbox()
+        self.assertEqual(len(remaining), 6)
+        self.assertIn(2, [event.seq for event in remaining])
+
+
+class WorkerSettingsTest(unittest.TestCase):
+    def test_explicit_settings_win(self) -> None:
+        self.assertIs(resolve_worker_settings(FAST_SETTINGS), FAST_SETTINGS)
+
+    def test_settings_come_from_environment(self) -> None:
+        with mock.patch.dict(
+            "os.environ",
+            {"ELARA_WORKER_CONCURRENCY": "8", "ELARA_WORKER_MAX_POLL_SECONDS": "1.5"},
+        ):
+            settings = resolve_worker_settings()
+
+        self.assertEqual(settings.concurrency, 8)
+        self.assertEqual(settings.max_poll_interval, 1.5)
+        self.assertEqual(settings.batch_size, WorkerSettings().batch_size)
+
+
+if __name__ == "__main__":
+    unittest.main()
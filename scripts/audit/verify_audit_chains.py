@@ -0,0 +1,138 @@
+import argparse
+import json
+import os
+import sqlite3
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from dataclasses import asdict
+
+from apps.api.audit import ChainVerification, ImmutableAuditLog
+from apps.api.db.state import connect_state_db, resolve_state_db_path
+
+_worker_connection: sqlite3.Connection | None = None
+_worker_log: ImmutableAuditLog | None = None
+
+
+def open_read_only(database_path: str) -> sqlite3.Connection:
+    connection = sqlite3.connect(f"file:{database_path}?mode=ro", uri=True)
+    connection.execute("PRAGMA query_only = ON;")
+    return connection
+
+
+def init_worker(database_path: str) -> None:
+    global _worker_connection, _worker_log
+    _worker_connection = open_read_only(database_path)
+    _worker_log = ImmutableAuditLog()
+
+
+def verify_workspace(workspace_id: str, full: bool) -> tuple[ChainVerification, float]:
+    if _worker_connection is None or _worker_log is None:
+        raise RuntimeError("worker is not initialized")
+    started = time.perf_counter()
+    # One read transaction, so the checkpoint and the events after it share a snapshot.
+    _worker_connection.execute("begin")
+    try:
+        result = _worker_log.verify_stored_chain(
+            _worker_connection,
+            workspace_id=workspace_id,
+            full=full,
+        )
+    finally:
+        _worker_connection.commit()
+    return result, time.perf_counter() - started
+
+
+def list_workspaces(database_path: str) -> list[tuple[str, int]]:
+    """Workspaces with their event counts, largest first so long chains start early."""
+    connection = open_read_only(database_path)
+    try:
+        cursor = connection.execute(
+            """
+            select workspace_id, count(*)
+            from audit_event_record
+            group by workspace_id
+            order by count(*) desc, workspace_id asc
+            """
+        )
+        return [(str(row[0]), int(row[1])) for row in cursor]
+    finally:
+        connection.close()
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description="Verify audit hash chains for every workspace")
+    parser.add_argument("--database", default=None, help="state database path")
+    parser.add_argument("--workers", type=int, default=os.cpu_count() or 1)
+    parser.add_argument("--workspace", action="append", default=None, help="limit to workspace")
+    parser.add_argument("--full", action="store_true", help="ignore checkpoints")
+    parser.add_argument(
+        "--no-checkpoint",
+        action="store_true",
+        help="do not record checkpoints for verified chains",
+    )
+    args = parser.parse_args()
+
+    database_path = resolve_state_db_path(args.database)
+    if database_path == ":memory:":
+        parser.error("set --database or ELARA_STATE_DB_PATH to an on-disk state database")
+    # Opening through connect_state_db applies pending schema upgrades once, up front.
+    writer = connect_state_db(database_path)
+    checkpoint_log = ImmutableAuditLog()
+    record_checkpoints = not args.no_checkpoint and checkpoint_log.stores_checkpoints
+    if not args.no_checkpoint and not record_checkpoints:
+        print(
+            "ELARA_AUDIT_CHECKPOINT_KEY is not set: verifying full chains, no checkpoints recorded",
+            file=sys.stderr,
+        )
+
+    workspaces = list_workspaces(database_path)
+    if args.workspace:
+        selected = set(args.workspace)
+        workspaces = [entry for entry in workspaces if entry[0] in selected]
+
+    started = time.perf_counter()
+    checked_events = 0
+    invalid = 0
+    try:
+        with ProcessPoolExecutor(
+            max_workers=max(1, args.workers),
+            initializer=init_worker,
+            initargs=(database_path,),
+        ) as executor:
+            futures = [
+                executor.submit(verify_workspace, workspace_id, args.full)
+                for workspace_id, _ in workspaces
+            ]
+            for future in as_completed(futures):
+                result, seconds = future.result()
+                checked_events += result.checked_count
+                if not result.valid:
+                    invalid += 1
+                if record_checkpoints and result.verified_count > result.resumed_count:
+                    checkpoint_log.write_checkpoint(writer, result)
+                    writer.commit()
+                print(json.dumps({**asdict(result), "seconds": round(seconds, 4)}), flush=True)
+    finally:
+        writer.close()
+
+    elapsed = time.perf_counter() - started
+    print(
+        json.dumps(
+            {
+                "summary": True,
+                "workspaces": len(workspaces),
+                "invalid": invalid,
+                "events_checked": checked_events,
+                "workers": max(1, args.workers),
+                "elapsed_seconds": round(elapsed, 3),
+                "events_per_second": round(checked_events / elapsed, 1) if elapsed > 0 else 0.0,
+            }
+        ),
+        flush=True,
+    )
+    return 1 if invalid else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -1,9 +1,14 @@
 import os
+import random
 import tempfile
 
 from apps.api.db.sqlite import enforce_sqlite_security_if_enabled
 from apps.api.memory import SqliteMemoryStore
 
+ANN_VECTOR_COUNT = 600
+ANN_DIM = 32
+ANN_MIN_RECALL = 0.9
+
 
 def main() -> None:
     with tempfile.TemporaryDirectory() as tmp_dir:
@@ -13,11 +18,11 @@ def main() -> None:
 
         enforce_sqlite_security_if_enabled(secure_mode_env="0")
 
-        store = SqliteMemoryStore(database_path=database_path)
+        store = SqliteMemoryStore(database_path=database_path, ann_min_vectors=256)
 
         import asyncio
 
-        async def run() -> None:
+        async def run() -> float:
             await store.upsert_memory(
                 workspace_id="ws-compat",
                 agent_id="agent-compat",
@@ -34,9 +39,56 @@ def main() -> None:
             if len(matches) != 1:
                 raise RuntimeError("expected one retrieval result for compatibility check")
 
-        asyncio.run(run())
+            vector_matches = await store.search_vector(
+                workspace_id="ws-compat",
+                agent_id="agent-compat",
+                embedding=[0.1, 0.2, 0.3],
+                top_k=1,
+            )
+            if [match.memory_id for match in vector_matches] != ["m-1"]:
+                raise RuntimeError("expected exact vector retrieval to return the stored memory")
+
+            rng = random.Random(13)
+            centers = [[rng.gauss(0.0, 1.0) for _ in range(ANN_DIM)] for _ in range(24)]
+            for index in range(ANN_VECTOR_COUNT):
+                center = centers[index % len(centers)]
+                await store.upsert_memory(
+                    workspace_id="ws-compat",
+                    agent_id="agent-ann",
+                    memory_id=f"ann-{index:05d}",
+                    content=f"ann vector {index}",
+                    embedding=[value + rng.gauss(0.0, 0.1) for value in center],
+                )
+
+            hits = 0
+            for center in centers:
+                exact = await store.search_vector(
+                    workspace_id="ws-compat",
+                    agent_id="agent-ann",
+                    embedding=center,
+                    top_k=10,
+                    exact=True,
+                )
+                approximate = await store.search_vector(
+                    workspace_id="ws-compat",
+                    agent_id="agent-ann",
+                    embedding=center,
+                    top_k=10,
+                )
+                hits += len(
+                    {match.memory_id for match in exact}
+                    & {match.memory_id for match in approximate}
+                )
+            return hits / (10 * len(centers))
+
+        recall = asyncio.run(run())
+        if recall < ANN_MIN_RECALL:
+            raise RuntimeError(f"ANN recall@10 {recall:.3f} is below {ANN_MIN_RECALL}")
 
-    print("SQLite secure-mode compatibility and vector retrieval checks passed")
+    print(
+        "SQLite secure-mode compatibility and vector retrieval checks passed "
+        f"(ANN recall@10={recall:.3f})"
+    )
 
 
 if __name__ == "__main__":
@@ -1,11 +1,16 @@
 import argparse
+import os
 import statistics
+import tempfile
 import time
+from concurrent.futures import ThreadPoolExecutor
 
 from fastapi.testclient import TestClient
 
 from apps.api.main import app
 
+DURABILITY_PROFILES = ("strict", "balanced", "fast")
+
 
 def percentile_95(values: list[float]) -> float:
     if len(values) >= 100:
@@ -13,31 +18,75 @@ def percentile_95(values: list[float]) -> float:
     return max(values)
 
 
-def main() -> None:
-    parser = argparse.ArgumentParser(description="Run API latency benchmark")
-    parser.add_argument("--iterations", type=int, default=120)
-    args = parser.parse_args()
+def post_companion_message(client: TestClient, workspace_id: str) -> float:
+    started = time.perf_counter()
+    response = client.post(
+        f"/workspaces/{workspace_id}/companion/messages",
+        json={"message": "capture latency benchmark context"},
+        headers={"x-user-id": "owner-perf", "x-user-role": "owner"},
+    )
+    if response.status_code != 200:
+        raise RuntimeError(f"unexpected status code: {response.status_code}")
+    return (time.perf_counter() - started) * 1000
+
 
-    durations_ms: list[float] = []
-    with TestClient(app) as client:
-        for _ in range(args.iterations):
+def benchmark_profile(
+    *,
+    durability: str,
+    iterations: int,
+    concurrency: int,
+    workspaces: int,
+) -> dict[str, object]:
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        os.environ["ELARA_STATE_DB_PATH"] = os.path.join(tmp_dir, "state.sqlite3")
+        os.environ["ELARA_SQLITE_DURABILITY"] = durability
+        with TestClient(app) as client, ThreadPoolExecutor(max_workers=concurrency) as pool:
             started = time.perf_counter()
-            response = client.post(
-                "/workspaces/ws-perf/companion/messages",
-                json={"message": "capture latency benchmark context"},
-                headers={"x-user-id": "owner-perf", "x-user-role": "owner"},
+            durations_ms = list(
+                pool.map(
+                    lambda index: post_companion_message(client, f"ws-perf-{index % workspaces}"),
+                    range(iterations),
+                )
             )
-            if response.status_code != 200:
-                raise RuntimeError(f"unexpected status code: {response.status_code}")
-            durations_ms.append((time.perf_counter() - started) * 1000)
+            elapsed_s = time.perf_counter() - started
 
-    p95_ms = percentile_95(durations_ms)
-    summary = {
-        "iterations": args.iterations,
+    return {
+        "durability": durability,
+        "iterations": iterations,
+        "concurrency": concurrency,
         "mean_ms": round(statistics.mean(durations_ms), 2),
-        "p95_ms": round(p95_ms, 2),
+        "p95_ms": round(percentile_95(durations_ms), 2),
+        "throughput_rps": round(iterations / elapsed_s, 1),
     }
-    print(summary)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Run API latency benchmark")
+    parser.add_argument("--iterations", type=int, default=120)
+    parser.add_argument("--concurrency", type=int, default=8, help="Concurrent client threads")
+    parser.add_argument(
+        "--workspaces",
+        type=int,
+        default=4,
+        help="Distinct workspaces to spread load over",
+    )
+    parser.add_argument(
+        "--durability",
+        choices=[*DURABILITY_PROFILES, "all"],
+        default="all",
+        help="SQLite durability profile to benchmark against a file-backed state database",
+    )
+    args = parser.parse_args()
+
+    profiles = DURABILITY_PROFILES if args.durability == "all" else (args.durability,)
+    for durability in profiles:
+        summary = benchmark_profile(
+            durability=durability,
+            iterations=args.iterations,
+            concurrency=args.concurrency,
+            workspaces=args.workspaces,
+        )
+        print(summary)
 
 
 if __name__ == "__main__":
@@ -1,28 +1,67 @@
 import argparse
 import asyncio
 import json
+import random
+import sqlite3
 import statistics
 import tempfile
 import time
 from pathlib import Path
 
-from apps.api.memory import PostgresMemoryStore, SqliteMemoryStore
+from apps.api.memory import MemoryUpsert, PostgresMemoryStore, SqliteMemoryStore
+from apps.api.memory.embedding_codec import EmbeddingEncoding
+
+
+def build_embedding(memory_id: str, dim: int) -> list[float]:
+    rng = random.Random(memory_id)
+    return [rng.uniform(-1.0, 1.0) for _ in range(dim)]
+
+
+def embedding_bytes_per_memory(*, database_path: str, backend: str) -> float:
+    connection = sqlite3.connect(database_path)
+    try:
+        row = connection.execute(
+            """
+            select avg(length(embedding_blob))
+            from memory_record
+            where backend = ? and embedding_blob is not null
+            """,
+            (backend,),
+        ).fetchone()
+    finally:
+        connection.close()
+    return 0.0 if row is None or row[0] is None else float(row[0])
 
 
 async def benchmark_store(
     *,
     name: str,
     store: SqliteMemoryStore,
+    database_path: str,
     records: list[dict[str, object]],
     iterations: int,
-) -> dict[str, float]:
+    embedding_dim: int,
+) -> dict[str, object]:
+    json_bytes: list[int] = []
+    upserts: list[MemoryUpsert] = []
     for record in records:
-        await store.upsert_memory(
-            workspace_id=str(record["workspace_id"]),
-            agent_id=str(record["agent_id"]),
-            memory_id=str(record["memory_id"]),
-            content=str(record["content"]),
+        embedding = build_embedding(str(record["memory_id"]), embedding_dim)
+        json_bytes.append(len(json.dumps(embedding).encode("utf-8")))
+        upserts.append(
+            MemoryUpsert(
+                workspace_id=str(record["workspace_id"]),
+                agent_id=str(record["agent_id"]),
+                memory_id=str(record["memory_id"]),
+                content=str(record["content"]),
+                embedding=embedding,
+            )
         )
+    seed_started = time.perf_counter()
+    seed_results = await store.upsert_memories(upserts)
+    seed_ms = (time.perf_counter() - seed_started) * 1000
+    failed = [result for result in seed_results if result.error is not None]
+    if failed:
+        raise RuntimeError(f"failed to seed {len(failed)} memories: {failed[0].error}")
 
     durations_ms: list[float] = []
     for _ in range(iterations):
@@ -35,12 +74,38 @@ async def benchmark_store(
         )
         durations_ms.append((time.perf_counter() - started) * 1000)
 
+    query_embedding = build_embedding("query", embedding_dim)
+    vector_durations_ms: list[float] = []
+    for _ in range(iterations):
+        started = time.perf_counter()
+        await store.search_vector(
+            workspace_id="ws-perf",
+            agent_id="agent-perf",
+            embedding=query_embedding,
+            top_k=5,
+        )
+        vector_durations_ms.append((time.perf_counter() - started) * 1000)
+
     p95_ms = statistics.quantiles(durations_ms, n=100)[94] if len(durations_ms) >= 100 else max(durations_ms)
+    vector_p95_ms = (
+        statistics.quantiles(vector_durations_ms, n=100)[94]
+        if len(vector_durations_ms) >= 100
+        else max(vector_durations_ms)
+    )
     return {
         "backend": name,
         "iterations": float(iterations),
+        "seed_ms": round(seed_ms, 2),
         "p95_ms": round(p95_ms, 2),
         "mean_ms": round(statistics.mean(durations_ms), 2),
+        "vector_p95_ms": round(vector_p95_ms, 2),
+        "vector_mean_ms": round(statistics.mean(vector_durations_ms), 2),
+        "embedding_dim": embedding_dim,
+        "json_bytes_per_memory": round(statistics.mean(json_bytes), 1) if json_bytes else 0.0,
+        "blob_bytes_per_memory": round(
+            embedding_bytes_per_memory(database_path=database_path, backend=name),
+            1,
+        ),
     }
 
 
@@ -52,25 +117,39 @@ async def main() -> None:
         help="Fixture JSON file path",
     )
     parser.add_argument("--iterations", type=int, default=150)
+    parser.add_argument("--embedding-dim", type=int, default=1536)
+    parser.add_argument(
+        "--encoding",
+        choices=["float32", "float16", "int8"],
+        default="float32",
+        help="Embedding BLOB encoding",
+    )
     args = parser.parse_args()
+    encoding: EmbeddingEncoding = args.encoding
 
     records = json.loads(Path(args.fixture).read_text(encoding="utf-8"))
 
     with tempfile.TemporaryDirectory() as tmp_dir:
-        sqlite_store = SqliteMemoryStore(database_path=f"{tmp_dir}/sqlite-memory.sqlite3")
-        postgres_store = PostgresMemoryStore(database_path=f"{tmp_dir}/postgres-memory.sqlite3")
+        sqlite_path = f"{tmp_dir}/sqlite-memory.sqlite3"
+        postgres_path = f"{tmp_dir}/postgres-memory.sqlite3"
+        sqlite_store = SqliteMemoryStore(database_path=sqlite_path, embedding_encoding=encoding)
+        postgres_store = PostgresMemoryStore(database_path=postgres_path)
 
         sqlite_result = await benchmark_store(
             name="sqlite",
             store=sqlite_store,
+            database_path=sqlite_path,
             records=records,
             iterations=args.iterations,
+            embedding_dim=args.embedding_dim,
         )
         postgres_result = await benchmark_store(
             name="postgres",
             store=postgres_store,
+            database_path=postgres_path,
             records=records,
             iterations=args.iterations,
+            embedding_dim=args.embedding_dim,
         )
 
     print(json.dumps([sqlite_result, postgres_result], indent=2))